@@ -0,0 +1,231 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Prefetches the latest checkpoint of a directory ahead of restore.
+
+Consumers of checkpoints written by another job, e.g. evaluators, typically
+wait for a new step and then restore it. `RestorePrefetcher` watches the
+directory of a `CheckpointManager` for newly finalized steps, and reads the
+latest one into host memory in a background thread using
+`CheckpointManager.prefetch`, so that restoring it reads from host memory
+rather than storage.
+
+The memory used is bounded by the `chunk_cache_bytes` of the handlers
+registered with the `CheckpointManager`, e.g.::
+
+  registry = ocp.handlers.DefaultCheckpointHandlerRegistry()
+  registry.add(
+      'state',
+      ocp.args.StandardRestore,
+      ocp.StandardCheckpointHandler(chunk_cache_bytes=64 << 30),
+  )
+  mngr = ocp.CheckpointManager(directory, handler_registry=registry)
+  args = ocp.args.Composite(state=ocp.args.StandardRestore(abstract_state))
+  with RestorePrefetcher(mngr, args) as prefetcher:
+    while True:
+      step = prefetcher.wait_for_new_step(last_step)
+      state = prefetcher.restore(step)
+      ...
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import threading
+import time
+from typing import Any, Optional
+
+from absl import logging
+import jax
+from orbax.checkpoint import args as args_lib
+from orbax.checkpoint import checkpoint_manager as checkpoint_manager_lib
+from orbax.checkpoint._src.path import step as step_lib
+from typing_extensions import Self  # for Python version < 3.11
+
+
+_HIT_METRIC = '/jax/checkpoint/read/prefetch_hit'
+_MISS_METRIC = '/jax/checkpoint/read/prefetch_miss'
+
+
+@dataclasses.dataclass
+class PrefetchMetrics:
+  """Counters of a `RestorePrefetcher`.
+
+  Attributes:
+    num_hits: Number of restores of a step that was prefetched.
+    num_misses: Number of restores of a step that was not prefetched.
+    prefetched_bytes: Total number of bytes prefetched on this host.
+  """
+
+  num_hits: int = 0
+  num_misses: int = 0
+  prefetched_bytes: int = 0
+
+
+class RestorePrefetcher:
+  """Prefetches the latest step of a `CheckpointManager` in the background.
+
+  Only the latest finalized step is prefetched. `restore` waits for an
+  in-flight prefetch of the requested step to complete.
+
+  Prefetching does not synchronize processes, so each process prefetches
+  independently. Steps are discovered by listing the directory from each
+  process, which must not be configured with
+  `single_host_load_and_broadcast`.
+  """
+
+  def __init__(
+      self,
+      manager: checkpoint_manager_lib.CheckpointManager,
+      args: Optional[args_lib.CheckpointArgs] = None,
+      *,
+      poll_interval_secs: float = 10.0,
+  ):
+    """Creates a RestorePrefetcher and starts watching for new steps.
+
+    Args:
+      manager: The `CheckpointManager` to restore with. Its handlers must be
+        created with `chunk_cache_bytes` for prefetching to have an effect.
+      args: `CheckpointArgs` used to prefetch and restore steps, as passed to
+        `CheckpointManager.restore`.
+      poll_interval_secs: Interval between listings of the directory.
+    """
+    self._manager = manager
+    self._args = args
+    self._poll_interval_secs = poll_interval_secs
+    self._metrics = PrefetchMetrics()
+    self._cv = threading.Condition()
+    self._latest_step: Optional[int] = None
+    self._prefetching_step: Optional[int] = None
+    self._prefetched_step: Optional[int] = None
+    self._stop = threading.Event()
+    self._thread = threading.Thread(
+        target=self._run, name='restore_prefetcher', daemon=True
+    )
+    self._thread.start()
+
+  @property
+  def metrics(self) -> PrefetchMetrics:
+    """Returns a copy of the counters."""
+    with self._cv:
+      return dataclasses.replace(self._metrics)
+
+  def _find_latest_step(self) -> Optional[int]:
+    metadata = step_lib.latest_step_metadata(
+        self._manager.directory,
+        self._manager._step_name_format,  # pylint: disable=protected-access
+    )
+    return None if metadata is None else metadata.step
+
+  def _run(self):
+    while not self._stop.is_set():
+      try:
+        self._poll()
+      except Exception:  # pylint: disable=broad-exception-caught
+        logging.exception('Failed to prefetch from %s.', self._manager.directory)
+      self._stop.wait(self._poll_interval_secs)
+
+  def _poll(self):
+    """Prefetches the latest step if it was not prefetched yet."""
+    step = self._find_latest_step()
+    with self._cv:
+      if step is not None and (
+          self._latest_step is None or step > self._latest_step
+      ):
+        self._latest_step = step
+        self._cv.notify_all()
+      if step is None or step == self._prefetched_step:
+        return
+      self._prefetching_step = step
+    prefetched_bytes = None
+    try:
+      start = time.time()
+      prefetched_bytes = self._manager.prefetch(step, args=self._args)
+      logging.info(
+          'Prefetched %d bytes of step %d in %.2f seconds.',
+          prefetched_bytes,
+          step,
+          time.time() - start,
+      )
+    finally:
+      with self._cv:
+        self._prefetching_step = None
+        if prefetched_bytes is not None:
+          self._prefetched_step = step
+          self._metrics.prefetched_bytes += prefetched_bytes
+        self._cv.notify_all()
+
+  def wait_for_new_step(
+      self, last_step: Optional[int], timeout: Optional[float] = None
+  ) -> Optional[int]:
+    """Waits for a step greater than `last_step`.
+
+    Args:
+      last_step: The last step that was processed, or None.
+      timeout: Maximum time to wait in seconds, or None to wait indefinitely.
+
+    Returns:
+      The latest step, or None if no new step was found before `timeout`.
+    """
+    with self._cv:
+      self._cv.wait_for(
+          lambda: self._latest_step is not None
+          and (last_step is None or self._latest_step > last_step),
+          timeout=timeout,
+      )
+      if self._latest_step is None or (
+          last_step is not None and self._latest_step <= last_step
+      ):
+        return None
+      return self._latest_step
+
+  def restore(
+      self,
+      step: Optional[int] = None,
+      args: Optional[args_lib.CheckpointArgs] = None,
+  ) -> Any:
+    """Restores `step`, from host memory if it was prefetched.
+
+    Should be called by all processes, as for `CheckpointManager.restore`.
+
+    Args:
+      step: The step to restore. Defaults to the latest step.
+      args: `CheckpointArgs` to restore with. Defaults to the `args` given at
+        construction; should match them for the prefetched data to be used.
+
+    Returns:
+      The restored step, see `CheckpointManager.restore`.
+    """
+    if step is None:
+      step = self._find_latest_step()
+    with self._cv:
+      self._cv.wait_for(lambda: self._prefetching_step != step)
+      hit = step is not None and step == self._prefetched_step
+      if hit:
+        self._metrics.num_hits += 1
+      else:
+        self._metrics.num_misses += 1
+    jax.monitoring.record_event(_HIT_METRIC if hit else _MISS_METRIC)
+    return self._manager.restore(step, args=args or self._args)
+
+  def close(self):
+    """Stops watching for new steps."""
+    self._stop.set()
+    self._thread.join()
+
+  def __enter__(self) -> Self:
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    self.close()
@@ -0,0 +1,108 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for restore_prefetcher module."""
+
+from absl.testing import absltest
+from etils import epath
+import jax
+import numpy as np
+from orbax.checkpoint import args as args_lib
+from orbax.checkpoint import checkpoint_manager
+from orbax.checkpoint import test_utils
+from orbax.checkpoint import utils
+from orbax.checkpoint._src.checkpoint_managers import restore_prefetcher
+from orbax.checkpoint._src.handlers import handler_registration
+from orbax.checkpoint._src.handlers import standard_checkpoint_handler
+
+
+def _state(step: int):
+  return {'a': jax.numpy.arange(1024, dtype=np.float32) + step}
+
+
+class RestorePrefetcherTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.directory = epath.Path(self.create_tempdir().full_path)
+    self.writer = checkpoint_manager.CheckpointManager(self.directory)
+    registry = handler_registration.DefaultCheckpointHandlerRegistry()
+    registry.add(
+        checkpoint_manager.DEFAULT_ITEM_NAME,
+        args_lib.StandardRestore,
+        standard_checkpoint_handler.StandardCheckpointHandler(
+            chunk_cache_bytes=1 << 20
+        ),
+    )
+    self.reader = checkpoint_manager.CheckpointManager(
+        self.directory, handler_registry=registry
+    )
+    self.args = args_lib.StandardRestore(
+        jax.tree.map(utils.to_shape_dtype_struct, _state(0))
+    )
+
+  def tearDown(self):
+    self.writer.close()
+    self.reader.close()
+    super().tearDown()
+
+  def _save(self, step: int):
+    self.writer.save(step, args=args_lib.StandardSave(_state(step)))
+    self.writer.wait_until_finished()
+
+  def test_restore_prefetched(self):
+    with restore_prefetcher.RestorePrefetcher(
+        self.reader, self.args, poll_interval_secs=0.01
+    ) as prefetcher:
+      self._save(0)
+      self.assertEqual(prefetcher.wait_for_new_step(None, timeout=60), 0)
+      self._save(1)
+      self.assertEqual(prefetcher.wait_for_new_step(0, timeout=60), 1)
+      restored = prefetcher.restore(1)
+      test_utils.assert_tree_equal(self, _state(1), restored)
+      # Step 0 is no longer the latest step, and is not prefetched.
+      restored = prefetcher.restore(0)
+      test_utils.assert_tree_equal(self, _state(0), restored)
+
+      metrics = prefetcher.metrics
+      self.assertEqual(metrics.num_hits, 1)
+      self.assertEqual(metrics.num_misses, 1)
+      self.assertGreaterEqual(metrics.prefetched_bytes, 1024 * 4)
+
+  def test_restore_prefetched_after_resave(self):
+    with restore_prefetcher.RestorePrefetcher(
+        self.reader, self.args, poll_interval_secs=0.01
+    ) as prefetcher:
+      self._save(0)
+      self.assertEqual(prefetcher.wait_for_new_step(None, timeout=60), 0)
+      test_utils.assert_tree_equal(self, _state(0), prefetcher.restore(0))
+
+      # Chunks cached for the previous step 0 must not be restored.
+      self.writer.delete(0)
+      self.writer.save(0, args=args_lib.StandardSave(_state(7)))
+      self.writer.wait_until_finished()
+      test_utils.assert_tree_equal(self, _state(7), prefetcher.restore(0))
+
+  def test_wait_for_new_step_timeout(self):
+    with restore_prefetcher.RestorePrefetcher(
+        self.reader, self.args, poll_interval_secs=0.01
+    ) as prefetcher:
+      self.assertIsNone(prefetcher.wait_for_new_step(None, timeout=0.1))
+      self._save(0)
+      self.assertEqual(prefetcher.wait_for_new_step(None, timeout=60), 0)
+      self.assertIsNone(prefetcher.wait_for_new_step(0, timeout=0.1))
+
+
+if __name__ == '__main__':
+  absltest.main()
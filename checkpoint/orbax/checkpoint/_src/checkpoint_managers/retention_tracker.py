@@ -0,0 +1,273 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Incremental bookkeeping of the checkpoints retained by CheckpointManager.
+
+`CheckpointManager` keeps the `max_to_keep` latest (or best, by `best_fn`)
+checkpoints, along with any checkpoint preserved by `keep_time_interval`,
+`keep_period` or `should_keep_fn`. Recomputing this from scratch on every save
+requires sorting all tracked checkpoints, which becomes expensive for long runs
+that preserve many checkpoints.
+
+`RetentionTracker` instead maintains:
+
+* The preservation decision of each checkpoint, made once when it is added.
+  Decisions based on `keep_time_interval` form a chain starting at the oldest
+  checkpoint, which is only recomputed if one of its checkpoints is removed.
+* The checkpoints with metrics, sorted by `best_fn`, updated by bisection.
+* The set of checkpoints that are not preserved, which are the only candidates
+  for removal.
+
+Finding the steps to remove then takes time proportional to `max_to_keep` and
+the number of candidates, rather than the number of tracked checkpoints.
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime
+import itertools
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from absl import logging
+from orbax.checkpoint._src.metadata import checkpoint_info
+
+
+CheckpointInfo = checkpoint_info.CheckpointInfo
+PyTree = Any
+
+
+class RetentionTracker:
+  """Tracks checkpoints and decides which ones to remove.
+
+  Checkpoints are expected to be added in increasing order of step, as is the
+  case for `CheckpointManager.save`.
+  """
+
+  def __init__(
+      self,
+      *,
+      max_to_keep: Optional[int] = None,
+      keep_time_interval: Optional[datetime.timedelta] = None,
+      keep_period: Optional[int] = None,
+      should_keep_fn: Optional[Callable[[int], bool]] = None,
+      best_fn: Optional[Callable[[PyTree], float]] = None,
+      best_mode: str = 'max',
+      keep_checkpoints_without_metrics: bool = True,
+  ):
+    self._max_to_keep = max_to_keep
+    self._keep_time_interval = keep_time_interval
+    self._keep_period = keep_period
+    self._should_keep_fn = should_keep_fn
+    self._best_fn = best_fn
+    self._best_mode = best_mode
+    self._keep_checkpoints_without_metrics = keep_checkpoints_without_metrics
+    self._lock = threading.RLock()
+    self._reset_state()
+
+  def _reset_state(self):
+    # All tracked checkpoints, in increasing order of step.
+    self._infos: Dict[int, CheckpointInfo] = {}
+    # Checkpoints without metrics, in increasing order of step. Only used if
+    # tracking the best checkpoints.
+    self._without_metrics: Dict[int, None] = {}
+    # Checkpoints with metrics, in increasing order of `_sort_keys`.
+    self._ranked: List[Tuple[Any, int]] = []
+    self._sort_keys: Dict[int, Tuple[Any, int]] = {}
+    # Checkpoints preserved by `keep_time_interval`.
+    self._interval_preserved: Set[int] = set()
+    self._last_interval_preserved: Optional[CheckpointInfo] = None
+    # Checkpoints preserved by `keep_period` or `should_keep_fn`.
+    self._step_preserved: Set[int] = set()
+    # Checkpoints that are not preserved, i.e. candidates for removal.
+    self._unpreserved: Set[int] = set()
+
+  @property
+  def _track_best(self) -> bool:
+    return self._best_fn is not None
+
+  def __len__(self) -> int:
+    return len(self._infos)
+
+  def reset(self, infos: Iterable[CheckpointInfo]) -> None:
+    """Replaces the tracked checkpoints with `infos`."""
+    with self._lock:
+      self._reset_state()
+      for info in sorted(infos, key=lambda info: info.step):
+        self._add(info, bulk=True)
+      self._ranked.sort()
+
+  def add(self, info: CheckpointInfo) -> None:
+    """Tracks `info`.
+
+    Adding a step lower than the latest tracked step rebuilds the tracker.
+
+    Args:
+      info: The checkpoint to track.
+    """
+    with self._lock:
+      if self._infos and info.step <= next(reversed(self._infos)):
+        infos = [i for i in self._infos.values() if i.step != info.step]
+        self.reset(infos + [info])
+      else:
+        self._add(info, bulk=False)
+
+  def _add(self, info: CheckpointInfo, *, bulk: bool) -> None:
+    """Tracks `info`, whose step is greater than all tracked steps.
+
+    Args:
+      info: The checkpoint to track.
+      bulk: If True, does not log and leaves `_ranked` unsorted, for `reset`.
+    """
+    step = info.step
+    self._infos[step] = info
+    if self._track_best and info.metrics is None:
+      self._without_metrics[step] = None
+    elif self._track_best:
+      sort_key = self._sort_key(info)
+      self._sort_keys[step] = sort_key
+      if bulk:
+        self._ranked.append(sort_key)
+      else:
+        bisect.insort(self._ranked, sort_key)
+
+    reasons = []
+    if self._keep_time_interval is not None and (
+        self._last_interval_preserved is None
+        or info.time
+        >= self._last_interval_preserved.time + self._keep_time_interval
+    ):
+      self._interval_preserved.add(step)
+      self._last_interval_preserved = info
+      reasons.append('falling on keep_time_interval')
+    if self._should_keep_fn is not None and self._should_keep_fn(step):
+      self._step_preserved.add(step)
+      reasons.append('on should_keep_fn callback')
+    elif self._keep_period is not None and step % self._keep_period == 0:
+      self._step_preserved.add(step)
+      reasons.append(f'on keep_period={self._keep_period}')
+    if not reasons:
+      self._unpreserved.add(step)
+    elif not bulk:
+      logging.info('Preserving %s: (Reason: %s).', info, ', '.join(reasons))
+
+  def remove(self, steps: Iterable[int]) -> None:
+    """Stops tracking `steps`, ignoring steps that are not tracked."""
+    with self._lock:
+      steps = [step for step in steps if step in self._infos]
+      for step in steps:
+        del self._infos[step]
+        self._without_metrics.pop(step, None)
+        if (sort_key := self._sort_keys.pop(step, None)) is not None:
+          del self._ranked[bisect.bisect_left(self._ranked, sort_key)]
+        self._step_preserved.discard(step)
+        self._unpreserved.discard(step)
+      if any(step in self._interval_preserved for step in steps):
+        self._rebuild_interval_chain()
+
+  def _rebuild_interval_chain(self):
+    """Recomputes the `keep_time_interval` chain over tracked checkpoints."""
+    self._interval_preserved = set()
+    self._last_interval_preserved = None
+    for step, info in self._infos.items():
+      if (
+          self._last_interval_preserved is None
+          or info.time
+          >= self._last_interval_preserved.time + self._keep_time_interval
+      ):
+        self._interval_preserved.add(step)
+        self._last_interval_preserved = info
+    self._unpreserved = (
+        self._infos.keys() - self._interval_preserved - self._step_preserved
+    )
+
+  def _sort_key(self, info: CheckpointInfo) -> Tuple[Any, int]:
+    """Returns a key that orders checkpoints with metrics by `best_fn`.
+
+    Ties are broken by step. For 'min' mode, the best checkpoints are at the
+    front of `_ranked`, and ties are broken in decreasing order of step, so
+    that the order from worst to best matches a stable sort.
+
+    Args:
+      info: A checkpoint with metrics.
+    """
+    metric = self._best_fn(info.metrics)
+    if self._best_mode == 'min':
+      return (metric, -info.step)
+    return (metric, info.step)
+
+  def _best_with_metrics(self, n: int) -> List[int]:
+    """Returns up to `n` best steps with metrics."""
+    if n <= 0:
+      return []
+    if self._best_mode == 'min':
+      ranked = self._ranked[:n]
+    else:
+      ranked = self._ranked[-n:]
+    return [
+        -key[1] if self._best_mode == 'min' else key[1] for key in ranked
+    ]
+
+  def best_step(self) -> Optional[int]:
+    """Returns the best step with metrics, or None."""
+    with self._lock:
+      best = self._best_with_metrics(1)
+      return best[0] if best else None
+
+  def _active_steps(self, keep: int) -> Set[int]:
+    """Returns the `keep` latest or best steps, which are always kept."""
+    if not self._track_best:
+      return set(itertools.islice(reversed(self._infos), keep))
+    active = set(self._best_with_metrics(keep))
+    if self._keep_checkpoints_without_metrics:
+      active.update(self._without_metrics)
+    elif keep > len(self._ranked):
+      active.update(
+          itertools.islice(
+              reversed(self._without_metrics), keep - len(self._ranked)
+          )
+      )
+    return active
+
+  def steps_to_remove(self) -> List[int]:
+    """Returns the tracked steps to remove, in increasing order.
+
+    Does not stop tracking them, see `remove`.
+    """
+    with self._lock:
+      if self._max_to_keep is None or len(self._infos) <= self._max_to_keep:
+        return []
+      keep = int(self._max_to_keep)
+      candidates = self._unpreserved
+      if (
+          keep == 0
+          and self._track_best
+          and not self._keep_checkpoints_without_metrics
+      ):
+        # Checkpoints without metrics are not subject to preservation.
+        candidates = candidates | (
+            self._without_metrics.keys() - self._unpreserved
+        )
+      active = self._active_steps(keep)
+      steps_to_remove = sorted(candidates - active)
+      reason = 'worse metric' if self._track_best else 'old checkpoint'
+      for step in steps_to_remove:
+        logging.info('Deleting %s: (Reason: %s).', self._infos[step], reason)
+      return steps_to_remove
+
+  @property
+  def num_candidates(self) -> int:
+    """Number of tracked steps that are not preserved."""
+    return len(self._unpreserved)
@@ -0,0 +1,172 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for retention_tracker module."""
+
+import datetime
+import random
+from typing import List
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from orbax.checkpoint._src.checkpoint_managers import retention_tracker
+from orbax.checkpoint._src.metadata import checkpoint_info
+
+CheckpointInfo = checkpoint_info.CheckpointInfo
+
+_START_TIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _reference_steps_to_remove(
+    infos: List[CheckpointInfo],
+    *,
+    max_to_keep,
+    keep_time_interval=None,
+    keep_period=None,
+    should_keep_fn=None,
+    best_fn=None,
+    best_mode='max',
+    keep_checkpoints_without_metrics=True,
+) -> List[int]:
+  """Recomputes the steps to remove from scratch."""
+  if max_to_keep is None or len(infos) <= max_to_keep:
+    return []
+  if best_fn is not None:
+    without_metrics = [info for info in infos if info.metrics is None]
+    ranked = sorted(
+        [info for info in infos if info.metrics is not None],
+        key=lambda info: best_fn(info.metrics),
+        reverse=(best_mode == 'min'),
+    )
+  else:
+    without_metrics, ranked = [], list(infos)
+  keep = max_to_keep
+  if keep_checkpoints_without_metrics:
+    maybe_delete = ranked[:-keep] if keep > 0 else ranked
+    kept = set(without_metrics + (ranked[-keep:] if keep > 0 else []))
+  else:
+    all_infos = without_metrics + ranked
+    maybe_delete = all_infos[:-keep] if keep > 0 else ranked
+    kept = set(all_infos[-keep:] if keep > 0 else [])
+  interval_preserved = [infos[0]]
+  for info in infos[1:]:
+    if (
+        keep_time_interval is not None
+        and info.time >= interval_preserved[-1].time + keep_time_interval
+    ):
+      interval_preserved.append(info)
+  for info in maybe_delete:
+    if keep_time_interval is not None and info in interval_preserved:
+      kept.add(info)
+    elif should_keep_fn is not None and should_keep_fn(info.step):
+      kept.add(info)
+    elif keep_period is not None and info.step % keep_period == 0:
+      kept.add(info)
+  return [info.step for info in infos if info not in kept]
+
+
+def _info(step: int, metrics=None) -> CheckpointInfo:
+  return CheckpointInfo(
+      step=step,
+      time=_START_TIME + datetime.timedelta(seconds=step * 10),
+      metrics=metrics,
+  )
+
+
+class RetentionTrackerTest(parameterized.TestCase):
+
+  def test_latest(self):
+    tracker = retention_tracker.RetentionTracker(max_to_keep=2)
+    for step in range(3):
+      tracker.add(_info(step))
+    self.assertEqual(tracker.steps_to_remove(), [0])
+    tracker.remove([0])
+    self.assertEqual(tracker.steps_to_remove(), [])
+
+  def test_best(self):
+    tracker = retention_tracker.RetentionTracker(
+        max_to_keep=2,
+        best_fn=lambda m: m['loss'],
+        best_mode='min',
+        keep_period=4,
+    )
+    for step, loss in enumerate([3.0, 1.0, 2.0, 1.0, 5.0, 0.5]):
+      tracker.add(_info(step, {'loss': loss}))
+    self.assertEqual(tracker.best_step(), 5)
+    # Step 3 wins the tie with step 1, step 0 and 4 fall on keep_period.
+    self.assertEqual(tracker.steps_to_remove(), [1, 2])
+
+  def test_keep_time_interval_rebuilt_on_remove(self):
+    tracker = retention_tracker.RetentionTracker(
+        max_to_keep=1, keep_time_interval=datetime.timedelta(seconds=25)
+    )
+    for step in range(6):
+      tracker.add(_info(step))
+    # Times are 0, 10, ..., 50 seconds: the chain is 0, 3.
+    self.assertEqual(tracker.steps_to_remove(), [1, 2, 4])
+    tracker.remove([0])
+    # The chain is now 1, 4.
+    self.assertEqual(tracker.steps_to_remove(), [2, 3])
+
+  def test_add_out_of_order(self):
+    tracker = retention_tracker.RetentionTracker(max_to_keep=2)
+    for step in (1, 3, 2):
+      tracker.add(_info(step))
+    self.assertEqual(tracker.steps_to_remove(), [1])
+
+  @parameterized.product(
+      best_mode=(None, 'min', 'max'),
+      max_to_keep=(0, 1, 3),
+      keep_checkpoints_without_metrics=(True, False),
+      keep_time_interval=(None, datetime.timedelta(seconds=45)),
+      keep_period=(None, 7),
+  )
+  def test_matches_reference(
+      self,
+      best_mode,
+      max_to_keep,
+      keep_checkpoints_without_metrics,
+      keep_time_interval,
+      keep_period,
+  ):
+    rng = random.Random(0)
+    options = dict(
+        max_to_keep=max_to_keep,
+        keep_time_interval=keep_time_interval,
+        keep_period=keep_period,
+        should_keep_fn=(lambda step: step % 11 == 5),
+        best_fn=None if best_mode is None else (lambda m: m['x']),
+        best_mode=best_mode or 'max',
+        keep_checkpoints_without_metrics=keep_checkpoints_without_metrics,
+    )
+    tracker = retention_tracker.RetentionTracker(**options)
+    infos = []
+    for step in range(60):
+      metrics = None if rng.random() < 0.2 else {'x': rng.randint(0, 5)}
+      info = _info(step, metrics)
+      infos.append(info)
+      tracker.add(info)
+      if rng.random() < 0.1:
+        # External deletion of a random step.
+        removed = rng.choice(infos).step
+        infos = [i for i in infos if i.step != removed]
+        tracker.remove([removed])
+      expected = _reference_steps_to_remove(infos, **options)
+      self.assertEqual(tracker.steps_to_remove(), expected, msg=f'{step=}')
+      infos = [i for i in infos if i.step not in expected]
+      tracker.remove(expected)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -14,14 +14,17 @@
 
 """AsyncCheckpointer."""
 
+import collections
+import dataclasses
 import sys
 import threading
 import time
-from typing import Any, Callable, Optional, Sequence, Type
+from typing import Any, Callable, Mapping, Optional, Sequence, Type
 
 from absl import logging
 from etils import epath
 import jax
+import numpy as np
 from orbax.checkpoint import checkpoint_args
 from orbax.checkpoint import options as options_lib
 from orbax.checkpoint import utils
@@ -30,12 +33,14 @@ from orbax.checkpoint._src.checkpointers import checkpointer
 from orbax.checkpoint._src.futures import future
 from orbax.checkpoint._src.futures import synchronization
 from orbax.checkpoint._src.handlers import async_checkpoint_handler
+from orbax.checkpoint._src.logging import tracing
 from orbax.checkpoint._src.metadata import checkpoint
 from orbax.checkpoint._src.multihost import multihost
 from orbax.checkpoint._src.path import async_utils
 from orbax.checkpoint._src.path import atomicity
 from orbax.checkpoint._src.path import atomicity_types
 from orbax.checkpoint._src.path import utils as path_utils
+from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 
 
 
@@ -69,6 +74,7 @@ def _background_wait_for_commit_futures(
     barrier_sync_key_prefix: str,
     sync_fn: Callable[[str], None],
     primary_host: int | None,
+    wait_for_previous_commit: Callable[[], None] = lambda: None,
 ):
   """A function to be run in a background thread that waits for futures."""
   current_process = multihost.process_index()
@@ -82,8 +88,9 @@ def _background_wait_for_commit_futures(
   thread_start_time = time.time()
 
   # Wait for commit operations to complete.
-  for commit_future in commit_futures:
-    commit_future.result()
+  with tracing.span('AsyncCheckpointer.wait_for_commit_futures'):
+    for commit_future in commit_futures:
+      commit_future.result()
   logging.info(
       '[process=%s][thread=%s] %d Handler Commit operations completed.',
       current_process,
@@ -105,17 +112,22 @@ def _background_wait_for_commit_futures(
   )
   logging.vlog(1, 'Async Commit duration: %s seconds', commit_duration_secs)
 
+  # Checkpoints are finalized in the order in which they were saved.
+  with tracing.span('AsyncCheckpointer.wait_for_previous_commit'):
+    wait_for_previous_commit()
+
   if process_count > 1:
     # All processes will wait at the barrier. When all processes are at the
     # barrier, the barrier will be satisfied. If not, then it will timeout.
     try:
-      sync_fn(
-          multihost.unique_barrier_key(
-              'async_write_complete',
-              prefix=barrier_sync_key_prefix,
-              suffix=f'{directory.name}',
-          )
-      )
+      with tracing.span('barrier:async_write_complete'):
+        sync_fn(
+            multihost.unique_barrier_key(
+                'async_write_complete',
+                prefix=barrier_sync_key_prefix,
+                suffix=f'{directory.name}',
+            )
+        )
     except jax.errors.JaxRuntimeError as e:
       if sys.version_info >= (3, 11):
         if 'DEADLINE_EXCEEDED' in str(e):
@@ -123,22 +135,32 @@ def _background_wait_for_commit_futures(
       raise
 
   if utils.is_primary_host(primary_host):
-    on_commit_callback()
+    with tracing.span('AsyncCheckpointer.on_commit_callback'):
+      on_commit_callback()
   if process_count > 1:
     # Block until process 0 completes on_commit_callback.
-    sync_fn(
-        multihost.unique_barrier_key(
-            'async_commit_complete',
-            prefix=barrier_sync_key_prefix,
-            suffix=f'{directory.name}',
-        )
-    )
+    with tracing.span('barrier:async_commit_complete'):
+      sync_fn(
+          multihost.unique_barrier_key(
+              'async_commit_complete',
+              prefix=barrier_sync_key_prefix,
+              suffix=f'{directory.name}',
+          )
+      )
+  # Handles cached for a previous checkpoint at `directory` are stale.
+  ts_utils.invalidate_open_handle_caches(directory)
 
   thread_duration_secs = time.time() - thread_start_time
   jax.monitoring.record_event_duration_secs(
       '/jax/checkpoint/write/async/thread_duration_sec',
       thread_duration_secs,
   )
+  tracing.record(
+      'AsyncCheckpointer.background_commit',
+      thread_start_time,
+      time.time(),
+      directory=directory.name,
+  )
   logging.vlog(1, 'Async thread duration: %s seconds', thread_duration_secs)
   logging.info(
       '[process=%s][thread=%s] Background save thread done.',
@@ -147,6 +169,37 @@ def _background_wait_for_commit_futures(
   )
 
 
+def _host_memory_size(tree: Any) -> int:
+  """Estimates the host memory used to save the arrays in `tree`.
+
+  Arrays are copied to host memory before being written in the background,
+  and each process only writes a single replica of its addressable shards.
+
+  Args:
+    tree: A PyTree, which may contain `CheckpointArgs`.
+
+  Returns:
+    The estimated size in bytes.
+  """
+  size = 0
+  for leaf in jax.tree.leaves(tree):
+    if isinstance(leaf, Mapping):
+      size += _host_memory_size(list(leaf.values()))
+    elif isinstance(leaf, checkpoint_args.CheckpointArgs):
+      size += _host_memory_size(
+          [getattr(leaf, f.name) for f in dataclasses.fields(leaf)]
+      )
+    elif isinstance(leaf, jax.Array):
+      size += sum(
+          shard.data.nbytes
+          for shard in leaf.addressable_shards
+          if shard.replica_id == 0
+      )
+    elif isinstance(leaf, np.ndarray):
+      size += leaf.nbytes
+  return size
+
+
 def _add_deadline_exceeded_notes(e: jax.errors.JaxRuntimeError):
   """Adds notes to the exception to help debug the deadline exceeded error."""
   e.add_note('1. Make sure that the job and storage are colocated.')
@@ -156,8 +209,60 @@ def _add_deadline_exceeded_notes(e: jax.errors.JaxRuntimeError):
   e.add_note('3. Make sure that the storage has enough throughput quota.')
 
 
+class _InFlightCommit(future.Future):
+  """Background commit of a single checkpoint, started by `_AsyncManager`."""
+
+  def __init__(
+      self,
+      directory: epath.Path,
+      nbytes: int,
+      previous: Optional['_InFlightCommit'],
+  ):
+    self.directory = directory
+    self.nbytes = nbytes
+    self.thread: Optional[threading.Thread] = None
+    self.exception: Optional[Exception] = None
+    # Whether `exception` was raised to the caller, by `result` or by
+    # `_AsyncManager.check_for_errors`.
+    self.reported = False
+    self._previous = previous
+    self._done = threading.Event()
+
+  def wait_for_previous(self):
+    """Waits for the previous commit to finish, whether or not it failed."""
+    if self._previous is not None:
+      self._previous.wait()
+      # Drop the reference so that finished commits can be collected.
+      self._previous = None
+
+  def set_done(self):
+    self._done.set()
+
+  def done(self) -> bool:
+    return self._done.is_set()
+
+  def wait(self, timeout: Optional[float] = None) -> bool:
+    return self._done.wait(timeout)
+
+  def result(self, timeout: Optional[float] = None) -> None:
+    """Waits for the checkpoint to be finalized, raising any error."""
+    if not self.wait(timeout):
+      raise TimeoutError(
+          f'Commit to {self.directory} did not complete within'
+          f' {timeout} seconds.'
+      )
+    if self.exception is not None:
+      self.reported = True
+      raise self.exception
+
+
 class _AsyncManager:
-  """Helper class for background checkpoint saving work orchestration."""
+  """Helper class for background checkpoint saving work orchestration.
+
+  Up to `max_in_flight_saves` commits, using up to `max_in_flight_bytes` of
+  host memory in total, run concurrently in background threads. Checkpoints
+  are finalized in the order in which their commits were started.
+  """
 
   def __init__(
       self,
@@ -166,6 +271,8 @@ class _AsyncManager:
       timeout_secs: int = 600,
       primary_host: Optional[int] = 0,
       barrier_sync_key_prefix: Optional[str] = None,
+      max_in_flight_saves: int = 1,
+      max_in_flight_bytes: Optional[int] = None,
   ):
     logging.info(
         '[process=%s][thread=%s] Using barrier_sync_fn: %s timeout: %d secs and'
@@ -176,12 +283,20 @@ class _AsyncManager:
         timeout_secs,
         primary_host,
     )
+    if max_in_flight_saves < 1:
+      raise ValueError(
+          f'max_in_flight_saves must be at least 1, got {max_in_flight_saves}.'
+      )
     self._timeout_secs = timeout_secs
     self._primary_host = primary_host
     self._barrier_sync_key_prefix = barrier_sync_key_prefix
+    self._max_in_flight_saves = max_in_flight_saves
+    self._max_in_flight_bytes = max_in_flight_bytes
 
-    self._thread = None
-    self._exception = None
+    # Commits in the order in which they were started. Finished commits are
+    # kept until their errors, if any, are reported.
+    self._commits: collections.deque[_InFlightCommit] = collections.deque()
+    self._lock = threading.Lock()
 
     timeout_in_ms = self._timeout_secs * 1000
     self._sync_fn: Callable[[str], None] = lambda key: barrier_sync_fn(
@@ -189,7 +304,7 @@ class _AsyncManager:
     )
 
   def __del__(self):
-    if self._thread is not None and self._thread.is_alive():
+    if any(not commit.done() for commit in self._commits):
       logging.warning(
           'Please add `.wait_until_finished()` in the main thread '
           'before your program finishes because there is a '
@@ -197,88 +312,151 @@ class _AsyncManager:
           'this class is deleted before writing is completed.'
       )
 
+  @property
+  def max_in_flight_bytes(self) -> Optional[int]:
+    return self._max_in_flight_bytes
+
   def _thread_func(
       self,
-      directory: epath.Path,
+      commit: _InFlightCommit,
       commit_futures: Sequence[future.Future],
       on_commit_callback: Callable[[], None],
   ):
     """Awaits on commit futures and finalizes the checkpoint."""
     try:
       _background_wait_for_commit_futures(
-          directory,
+          commit.directory,
           commit_futures,
           on_commit_callback,
           barrier_sync_key_prefix=self._barrier_sync_key_prefix,
           sync_fn=self._sync_fn,
           primary_host=self._primary_host,
+          wait_for_previous_commit=commit.wait_for_previous,
       )
     except Exception as e:  # pylint: disable=broad-exception-caught
       msg = (
           f'[process={multihost.process_index()}] Failed to run'
           f' {len(commit_futures)} Handler Commit operations or the Commit'
-          f' callback in background save thread, directory: {directory}'
+          f' callback in background save thread, directory:'
+          f' {commit.directory}'
       )
       logging.error(msg, exc_info=True)
-      self._exception = e
+      commit.exception = e
+    finally:
+      commit.set_done()
+
+  def _in_flight(self) -> list[_InFlightCommit]:
+    with self._lock:
+      return [commit for commit in self._commits if not commit.done()]
+
+  def _has_capacity(self, nbytes: int) -> bool:
+    in_flight = self._in_flight()
+    if len(in_flight) >= self._max_in_flight_saves:
+      return False
+    if self._max_in_flight_bytes is None or not in_flight:
+      return True
+    in_flight_bytes = sum(commit.nbytes for commit in in_flight)
+    return in_flight_bytes + nbytes <= self._max_in_flight_bytes
+
+  def wait_for_capacity(self, nbytes: int = 0):
+    """Waits until a commit using `nbytes` of host memory can be started.
+
+    Surfaces any errors from finished commits.
+
+    Args:
+      nbytes: Host memory used by the commit to start.
+    """
+    while not self._has_capacity(nbytes):
+      oldest = self._in_flight()[0]
+      logging.info(
+          '[process=%s][thread=%s] Waiting for background save to %s before'
+          ' starting a new save.',
+          multihost.process_index(),
+          threading.current_thread().name,
+          oldest.directory,
+      )
+      oldest.wait()
+    self.check_for_errors()
 
   def start_async_commit(
       self,
       directory: epath.Path,
       commit_futures: Sequence[future.Future],
       on_commit_callback: Callable[[], None],
-  ):
-    """Completes checkpoint save in a background thread."""
-    self._thread = threading.Thread(
+      nbytes: int = 0,
+  ) -> future.Future:
+    """Completes checkpoint save in a background thread.
+
+    Args:
+      directory: The final checkpoint directory.
+      commit_futures: Futures to wait for before finalizing the checkpoint.
+      on_commit_callback: Finalizes the checkpoint.
+      nbytes: Host memory used by the commit, see `max_in_flight_bytes`.
+
+    Returns:
+      A future that completes once the checkpoint is finalized, and raises any
+      error of this commit.
+    """
+    with self._lock:
+      previous = self._commits[-1] if self._commits else None
+      commit = _InFlightCommit(directory, nbytes, previous)
+      self._commits.append(commit)
+    commit.thread = threading.Thread(
         name='async_save',
         target=self._thread_func,
         args=(
-            directory,
+            commit,
             commit_futures,
             on_commit_callback,
         ),
     )
-    self._thread.start()
+    commit.thread.start()
+    return commit
 
   def check_for_errors(self):
-    """Surfaces any errors from the background commit operations."""
-    if self._exception is not None:
-      # Clears self._exception so it is only raised once.
-      exception = self._exception
-      self._exception = None
-      raise exception  # pylint: disable=raising-bad-type
+    """Surfaces any errors from the background commit operations.
+
+    Errors are raised once each, in the order in which the commits were
+    started. Forgets finished commits.
+    """
+    with self._lock:
+      while self._commits and self._commits[0].done():
+        commit = self._commits.popleft()
+        if commit.exception is not None and not commit.reported:
+          commit.reported = True
+          raise commit.exception
 
   def wait_until_finished(self):
     """Waits for any outstanding operations to complete."""
     current_thread_name = threading.current_thread().name
-    background_thread_name = (
-        self._thread.name if self._thread is not None else None
-    )
-    if self._thread is not None:
+    with self._lock:
+      commits = list(self._commits)
+    for commit in commits:
+      if commit.done():
+        continue
       logging.info(
           '[process=%s][thread=%s] Waiting for background save thread=%s.',
           multihost.process_index(),
           current_thread_name,
-          background_thread_name,
+          commit.thread.name,
       )
-      self._thread.join()
-      self._thread = None
+      commit.thread.join()
       logging.info(
           '[process=%s][thread=%s] Done with waiting for background save'
           ' thread=%s.',
           multihost.process_index(),
           current_thread_name,
-          background_thread_name,
+          commit.thread.name,
       )
 
     self.check_for_errors()
-    if background_thread_name is not None:
+    if commits:
       logging.info(
           '[process=%s][thread=%s] No errors found in background save'
           ' thread=%s.',
           multihost.process_index(),
           current_thread_name,
-          background_thread_name,
+          commits[-1].thread.name,
       )
 
 
@@ -289,6 +467,14 @@ class AsyncCheckpointer(checkpointer.Checkpointer):
   provided by AsyncManager). Users should call `wait_until_finished` to block
   until a save operation running in the background is complete.
 
+  By default, a save blocks until the previous save is complete. With
+  `AsyncOptions.max_in_flight_saves` greater than 1, up to that many saves may
+  be in flight at once, so that saving more often than a single save takes to
+  commit does not block the caller. `AsyncOptions.max_in_flight_bytes`
+  additionally bounds the host memory held by in-flight saves, estimated from
+  the arrays being saved. Checkpoints are always finalized in the order in
+  which they were saved, and each save returns a future for its own commit.
+
   Like its parent, AsyncCheckpointer also makes use of an underlying
   CheckpointHandler to deal with type-specific logic.
 
@@ -355,6 +541,8 @@ class AsyncCheckpointer(checkpointer.Checkpointer):
         timeout_secs=timeout_secs,
         primary_host=multiprocessing_options.primary_host,
         barrier_sync_key_prefix=barrier_sync_key_prefix,
+        max_in_flight_saves=async_options.max_in_flight_saves,
+        max_in_flight_bytes=async_options.max_in_flight_bytes,
     )
     self._multiprocessing_options = multiprocessing_options
 
@@ -486,12 +674,14 @@ class AsyncCheckpointer(checkpointer.Checkpointer):
       force: bool = False,
       custom_metadata: dict[str, Any] | None = None,
       **kwargs,
-  ):
+  ) -> future.Future:
     """Saves the given item to the provided directory.
 
     Delegates to the underlying CheckpointHandler. Ensures save operation
-    atomicity. Must first block until any previous save operations running in
-    the background are completed.
+    atomicity. Must first block until previous save operations running in the
+    background are completed, or until fewer than
+    `AsyncOptions.max_in_flight_saves` saves are in flight, within
+    `AsyncOptions.max_in_flight_bytes` of host memory.
 
     This method should be called by all hosts - process synchronization and
     actions that need to be performed on only one host are managed internally.
@@ -506,6 +696,10 @@ class AsyncCheckpointer(checkpointer.Checkpointer):
       **kwargs: additional keyword args to provide to the CheckpointHandler's
         save method.
 
+    Returns:
+      A future that completes once the checkpoint is finalized. Its `result`
+      raises any error encountered while committing this checkpoint.
+
     Raises:
       ValueError if the provided directory already exists.
     """
@@ -522,7 +716,14 @@ class AsyncCheckpointer(checkpointer.Checkpointer):
     )
     directory = epath.Path(directory)
     tmpdir = self.get_temporary_path(directory)
-    self.wait_until_finished()
+    nbytes = (
+        0
+        if self._async_manager.max_in_flight_bytes is None
+        else _host_memory_size((args, kwargs))
+    )
+    with tracing.span('AsyncCheckpointer.wait_for_previous_save'):
+      self._async_manager.wait_for_capacity(nbytes)
+      self._metadata_store.wait_until_finished()
     self.synchronize_next_awaitable_signal_operation_id()
     on_commit_callback = self._make_on_commit_callback(
         tmpdir, custom_metadata, checkpoint_start_time
@@ -535,22 +736,30 @@ class AsyncCheckpointer(checkpointer.Checkpointer):
             **kwargs,
         )
     )
-    self._async_manager.start_async_commit(
+    commit_future = self._async_manager.start_async_commit(
         directory,
         commit_futures=commit_ops,
         on_commit_callback=on_commit_callback,
+        nbytes=nbytes,
     )
     blocking_duration_secs = time.time() - checkpoint_start_time
     jax.monitoring.record_event_duration_secs(
         '/jax/checkpoint/write/async/blocking_duration_secs',
         blocking_duration_secs,
     )
+    tracing.record(
+        'AsyncCheckpointer.save',
+        checkpoint_start_time,
+        time.time(),
+        directory=directory.name,
+    )
     logging.info(
         'Finished blocking save in %.2f seconds. Continuing to save'
         ' asynchronously to %s.',
         blocking_duration_secs,
         directory,
     )
+    return commit_future
 
   def restore(self, directory: epath.PathLike, *args, **kwargs) -> Any:
     """See superclass documentation."""
@@ -0,0 +1,207 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for in-flight saves of async_checkpointer module."""
+
+# pylint: disable=protected-access
+import threading
+from typing import Optional
+
+from absl.testing import absltest
+from etils import epath
+import jax
+import numpy as np
+from orbax.checkpoint import args as args_lib
+from orbax.checkpoint import options as options_lib
+from orbax.checkpoint import test_utils
+from orbax.checkpoint._src.checkpointers import async_checkpointer
+from orbax.checkpoint._src.handlers import composite_checkpoint_handler
+from orbax.checkpoint._src.handlers import pytree_checkpoint_handler
+
+
+class _EventFuture:
+  """Future that completes when `set` is called."""
+
+  def __init__(self):
+    self._event = threading.Event()
+    self._exception = None
+
+  def set(self, exception: Optional[Exception] = None):
+    self._exception = exception
+    self._event.set()
+
+  def result(self, timeout: Optional[float] = None):
+    self._event.wait(timeout)
+    if self._exception is not None:
+      raise self._exception
+
+
+def _async_manager(**kwargs) -> async_checkpointer._AsyncManager:
+  return async_checkpointer._AsyncManager(
+      barrier_sync_fn=lambda **_: None, **kwargs
+  )
+
+
+class AsyncManagerTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.directory = epath.Path(self.create_tempdir().full_path)
+    self.committed = []
+
+  def _start(self, manager, name: str, nbytes: int = 0):
+    commit_future = _EventFuture()
+    future = manager.start_async_commit(
+        self.directory / name,
+        commit_futures=[commit_future],
+        on_commit_callback=lambda: self.committed.append(name),
+        nbytes=nbytes,
+    )
+    return commit_future, future
+
+  def test_finalizes_in_order(self):
+    manager = _async_manager(max_in_flight_saves=2)
+    first, first_future = self._start(manager, 'first')
+    second, second_future = self._start(manager, 'second')
+    second.set()
+    with self.assertRaises(TimeoutError):
+      second_future.result(timeout=0.1)
+    self.assertEqual(self.committed, [])
+
+    first.set()
+    first_future.result()
+    second_future.result()
+    self.assertEqual(self.committed, ['first', 'second'])
+    manager.wait_until_finished()
+
+  def test_max_in_flight_saves(self):
+    manager = _async_manager(max_in_flight_saves=2)
+    first, _ = self._start(manager, 'first')
+    self._start(manager, 'second')[0].set()
+    self.assertFalse(manager._has_capacity(0))
+
+    waiter = threading.Thread(target=manager.wait_for_capacity)
+    waiter.start()
+    waiter.join(timeout=0.1)
+    self.assertTrue(waiter.is_alive())
+    first.set()
+    waiter.join()
+    manager.wait_until_finished()
+    self.assertEqual(self.committed, ['first', 'second'])
+
+  def test_max_in_flight_bytes(self):
+    manager = _async_manager(max_in_flight_saves=3, max_in_flight_bytes=10)
+    self.assertTrue(manager._has_capacity(20))
+    first, _ = self._start(manager, 'first', nbytes=6)
+    self.assertTrue(manager._has_capacity(4))
+    self.assertFalse(manager._has_capacity(5))
+    first.set()
+    manager.wait_for_capacity(5)
+    self.assertEqual(self.committed, ['first'])
+
+  def test_errors_per_commit(self):
+    manager = _async_manager(max_in_flight_saves=2)
+    first, first_future = self._start(manager, 'first')
+    second, second_future = self._start(manager, 'second')
+    first.set(ValueError('first failed'))
+    second.set()
+
+    with self.assertRaisesRegex(ValueError, 'first failed'):
+      first_future.result()
+    second_future.result()
+    self.assertEqual(self.committed, ['second'])
+    # Errors already raised by the future are not raised again.
+    manager.wait_until_finished()
+
+  def test_check_for_errors_raises_once(self):
+    manager = _async_manager()
+    commit, _ = self._start(manager, 'first')
+    commit.set(ValueError('failed'))
+    with self.assertRaisesRegex(ValueError, 'failed'):
+      manager.wait_until_finished()
+    manager.check_for_errors()
+
+
+class AsyncCheckpointerInFlightTest(absltest.TestCase):
+
+  def test_save_restore(self):
+    directory = epath.Path(self.create_tempdir().full_path)
+    checkpointer = async_checkpointer.AsyncCheckpointer(
+        pytree_checkpoint_handler.PyTreeCheckpointHandler(),
+        async_options=options_lib.AsyncOptions(
+            max_in_flight_saves=2, max_in_flight_bytes=1 << 20
+        ),
+    )
+    trees = [
+        {'a': jax.numpy.arange(16) + i, 'b': np.ones(4) * i} for i in (0, 1)
+    ]
+    futures = [
+        checkpointer.save(directory / str(i), args=args_lib.PyTreeSave(tree))
+        for i, tree in enumerate(trees)
+    ]
+    for future in futures:
+      future.result()
+    for i, tree in enumerate(trees):
+      restored = checkpointer.restore(
+          directory / str(i), args=args_lib.PyTreeRestore()
+      )
+      test_utils.assert_tree_equal(self, tree, restored)
+    checkpointer.close()
+
+  def test_composite_save_restore(self):
+    directory = epath.Path(self.create_tempdir().full_path)
+    checkpointer = async_checkpointer.AsyncCheckpointer(
+        composite_checkpoint_handler.CompositeCheckpointHandler(),
+        async_options=options_lib.AsyncOptions(max_in_flight_saves=2),
+    )
+    trees = [{'a': jax.numpy.arange(16) + i} for i in (0, 1)]
+    futures = [
+        checkpointer.save(
+            directory / str(i),
+            args=args_lib.Composite(
+                state=args_lib.PyTreeSave(tree),
+                metadata=args_lib.JsonSave({'step': i}),
+            ),
+        )
+        for i, tree in enumerate(trees)
+    ]
+    for future in futures:
+      future.result()
+    for i, tree in enumerate(trees):
+      restored = checkpointer.restore(
+          directory / str(i),
+          args=args_lib.Composite(
+              state=args_lib.PyTreeRestore(),
+              metadata=args_lib.JsonRestore(),
+          ),
+      )
+      test_utils.assert_tree_equal(self, tree, restored.state)
+      self.assertEqual(restored.metadata, {'step': i})
+    checkpointer.close()
+
+  def test_host_memory_size(self):
+    tree = {'a': jax.numpy.zeros((4,), np.float32), 'b': np.zeros((2,))}
+    self.assertEqual(
+        async_checkpointer._host_memory_size(args_lib.PyTreeSave(tree)), 32
+    )
+    self.assertEqual(
+        async_checkpointer._host_memory_size(
+            args_lib.Composite(state=args_lib.PyTreeSave(tree))
+        ),
+        32,
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
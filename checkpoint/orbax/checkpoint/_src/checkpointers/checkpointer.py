@@ -29,6 +29,7 @@ from orbax.checkpoint._src.checkpointers import abstract_checkpointer
 from orbax.checkpoint._src.futures import synchronization
 from orbax.checkpoint._src.handlers import checkpoint_handler
 from orbax.checkpoint._src.handlers import composite_checkpoint_handler
+from orbax.checkpoint._src.logging import tracing
 from orbax.checkpoint._src.metadata import checkpoint
 from orbax.checkpoint._src.metadata import step_metadata_serialization
 from orbax.checkpoint._src.multihost import multihost
@@ -36,6 +37,7 @@ from orbax.checkpoint._src.path import atomicity
 from orbax.checkpoint._src.path import atomicity_defaults
 from orbax.checkpoint._src.path import atomicity_types
 from orbax.checkpoint._src.path import utils as path_utils
+from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 from typing_extensions import Self  # for Python version < 3.11
 
 
@@ -280,7 +282,15 @@ class Checkpointer(
         ),
         processes=self._active_processes,
     )
+    # Handles cached for a previous checkpoint at `directory` are stale.
+    ts_utils.invalidate_open_handle_caches(directory)
     save_duration_secs = time.time() - checkpoint_start_time
+    tracing.record(
+        'Checkpointer.save',
+        checkpoint_start_time,
+        time.time(),
+        directory=directory.name,
+    )
     logging.info(
         'Finished synchronous save in %.2f seconds to %s',
         save_duration_secs,
@@ -306,6 +316,12 @@ class Checkpointer(
         processes=self._active_processes,
     )
     restore_duration_secs = time.time() - restore_start_time
+    tracing.record(
+        'Checkpointer.restore',
+        restore_start_time,
+        time.time(),
+        directory=directory.name,
+    )
     logging.info(
         'Finished restoring checkpoint in %.2f seconds from %s.',
         restore_duration_secs,
@@ -313,6 +329,32 @@ class Checkpointer(
     )
     return restored
 
+  def prefetch(self, directory: epath.PathLike, *args, **kwargs) -> int:
+    """Reads the checkpoint at `directory` into the handler's chunk cache.
+
+    Unlike `restore`, this method does not synchronize processes, and may be
+    called from a background thread by any subset of processes. Each process
+    only reads the data it would read on `restore`.
+
+    Args:
+      directory: the checkpoint to prefetch.
+      *args: same as for `restore`.
+      **kwargs: same as for `restore`.
+
+    Returns:
+      The number of bytes prefetched, or 0 if the handler does not support
+      prefetching.
+    """
+    directory = epath.Path(directory)
+    if not directory.exists():
+      raise FileNotFoundError(f'Checkpoint at {directory} not found.')
+    if not utils.is_checkpoint_finalized(directory):
+      raise ValueError(f'Found incomplete checkpoint at {directory}.')
+    if not hasattr(self._handler, 'prefetch'):
+      return 0
+    ckpt_args = construct_checkpoint_args(self._handler, False, *args, **kwargs)
+    return self._handler.prefetch(directory, args=ckpt_args)
+
   def _restore(
       self, directory: epath.PathLike, args: checkpoint_args.CheckpointArgs
   ) -> Any:
@@ -170,6 +170,26 @@ class CheckpointerTestBase:
         expected = self.doubled_pytree
         test_utils.assert_tree_equal(self, expected, restored)
 
+    @parameterized.parameters(True, False)
+    def test_overwrite_existing_with_cached_handles(self, use_ocdbt):
+      """Test restoring an overwritten path does not reuse stale handles."""
+      handler = PyTreeCheckpointHandler(
+          use_ocdbt=use_ocdbt, cache_tensorstore_handles=True
+      )
+      with self.checkpointer(handler) as checkpointer:
+        checkpointer.save(self.directory, self.pytree)
+        self.wait_if_async(checkpointer)
+        restored = checkpointer.restore(
+            self.directory, restore_args=self.pytree_restore_args
+        )
+        test_utils.assert_tree_equal(self, self.pytree, restored)
+        checkpointer.save(self.directory, self.doubled_pytree, force=True)
+        self.wait_if_async(checkpointer)
+        restored = checkpointer.restore(
+            self.directory, restore_args=self.pytree_restore_args
+        )
+        test_utils.assert_tree_equal(self, self.doubled_pytree, restored)
+
     def test_flax_train_state(self):
       """Test using flax model."""
 
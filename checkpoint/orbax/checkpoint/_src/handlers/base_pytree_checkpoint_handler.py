@@ -23,11 +23,10 @@ from __future__ import annotations
 
 import asyncio
 import dataclasses
-import functools
 import json
 import sys
 import time
-from typing import Any, List, Optional, Sequence, Tuple, Union
+from typing import Any, Awaitable, List, Optional, Sequence, Tuple, Union
 import uuid
 
 from absl import logging
@@ -40,12 +39,14 @@ from orbax.checkpoint import utils
 from orbax.checkpoint._src import asyncio_utils
 from orbax.checkpoint._src.futures import future
 from orbax.checkpoint._src.handlers import async_checkpoint_handler
+from orbax.checkpoint._src.logging import tracing
 from orbax.checkpoint._src.metadata import array_metadata_store as array_metadata_store_lib
 from orbax.checkpoint._src.metadata import empty_values
 from orbax.checkpoint._src.metadata import tree as tree_metadata
 from orbax.checkpoint._src.multihost import multihost
 from orbax.checkpoint._src.path import format_utils
 from orbax.checkpoint._src.serialization import serialization
+from orbax.checkpoint._src.serialization import tensorstore_tuning
 from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 from orbax.checkpoint._src.serialization import type_handlers
 from orbax.checkpoint._src.serialization import types
@@ -159,7 +160,21 @@ def batched_serialization_requests(
     args: PyTree,
     registry: TypeHandlerRegistry,
 ) -> List[_BatchRequest]:
-  """Gets a list of batched serialization or deserialization requests."""
+  """Gets a list of batched serialization or deserialization requests.
+
+  Runs in time linear in the number of leaves: `tree` and `args` are flattened
+  up to the structure of `param_infos` once, and each leaf is appended to the
+  request of its handler.
+
+  Args:
+    tree: Tree of values to save, or of `ValueMetadataEntry` to restore.
+    param_infos: Tree of `ParamInfo`, matching `tree`.
+    args: Tree of `SaveArgs` or `RestoreArgs`, matching `tree`.
+    registry: Registry used to look up the handler of each leaf.
+
+  Returns:
+    One request per handler, with leaves in tree order.
+  """
   grouped = {}
 
   def _group_value(
@@ -168,7 +183,6 @@ def batched_serialization_requests(
       value: Union[Any, tree_metadata.ValueMetadataEntry],
       arg: Union[SaveArgs, RestoreArgs],
   ):
-    nonlocal grouped
     tuple_key = tree_utils.tuple_path_from_keypath(keypath)
     if info.skip_deserialize:
       return
@@ -204,21 +218,22 @@ def batched_serialization_requests(
 
     if handler not in grouped:
       grouped[handler] = _BatchRequest(handler, [], [], [], [])
+    # Appending in place keeps grouping linear in the number of leaves.
     request = grouped[handler]
-    grouped[handler] = dataclasses.replace(
-        request,
-        keys=request.keys + [tuple_key],
-        values=request.values + [value],
-        infos=request.infos + [info],
-        args=request.args + [arg],
-    )
+    request.keys.append(tuple_key)
+    request.values.append(value)
+    request.infos.append(info)
+    request.args.append(arg)
 
-  jax.tree_util.tree_map_with_path(
-      _group_value,
-      param_infos,
-      tree,
-      args,
+  flat_infos_with_keys, treedef = jax.tree_util.tree_flatten_with_path(
+      param_infos
   )
+  flat_values = treedef.flatten_up_to(tree)
+  flat_args = treedef.flatten_up_to(args)
+  for (keypath, info), value, arg in zip(
+      flat_infos_with_keys, flat_values, flat_args
+  ):
+    _group_value(keypath, info, value, arg)
   return list(grouped.values())
 
 
@@ -288,6 +303,9 @@ class BasePyTreeCheckpointHandler(
       array_metadata_validator: array_metadata_store_lib.Validator = (
           array_metadata_store_lib.Validator()
       ),
+      cache_tensorstore_handles: bool = False,
+      ts_autotuner: Optional[tensorstore_tuning.TensorStoreAutoTuner] = None,
+      chunk_cache_bytes: Optional[int] = None,
   ):
     """Creates BasePyTreeCheckpointHandler.
 
@@ -307,6 +325,22 @@ class BasePyTreeCheckpointHandler(
         parameters after the finalize step.
       pytree_metadata_options: `PyTreeMetadataOptions` to manage metadata.
       array_metadata_validator: Validator for ArrayMetadata.
+      cache_tensorstore_handles: If True, opened TensorStores (and their
+        metadata) are cached across saves and restores, which speeds up
+        repeatedly restoring the same checkpoint. Cached handles of a
+        checkpoint are invalidated when it is finalized. See
+        `ts_utils.OpenHandleCache`.
+      ts_autotuner: If provided, the TensorStore file I/O concurrency limit,
+        OCDBT read coalescing threshold and data file size are picked by this
+        tuner, which is informed of the throughput of every save and restore.
+        See
+        `tensorstore_tuning.TensorStoreAutoTuner`.
+      chunk_cache_bytes: If provided, array chunks read when restoring are
+        cached in host memory, up to this many bytes, and `prefetch` can be
+        used to read a checkpoint into this cache ahead of `restore`. Cached
+        chunks of a checkpoint are dropped when it is finalized or deleted in
+        this process, but are not revalidated against writes by other
+        processes.
     """
     self._save_concurrent_bytes = save_concurrent_bytes
     self._restore_concurrent_bytes = restore_concurrent_bytes
@@ -326,6 +360,9 @@ class BasePyTreeCheckpointHandler(
     if self._array_metadata_store:
       self._array_metadata_store.set_primary_host(self._primary_host)
     self._array_metadata_validator = array_metadata_validator
+    self._chunk_cache_bytes = chunk_cache_bytes
+    self._cache_tensorstore_handles = cache_tensorstore_handles
+    self._ts_autotuner = ts_autotuner
 
 
     jax.monitoring.record_event(
@@ -355,6 +392,9 @@ class BasePyTreeCheckpointHandler(
       enable_pinned_host_transfer: bool = False,
       byte_limiter: Optional[serialization.ByteLimiter] = None,
       raise_array_data_missing_error: bool = True,
+      operation: tensorstore_tuning.Operation = (
+          tensorstore_tuning.Operation.SAVE
+      ),
   ) -> PyTree:
     """Returns parameter information for elements in `item`.
 
@@ -371,6 +411,8 @@ class BasePyTreeCheckpointHandler(
       enable_pinned_host_transfer: See ParamInfo docs.
       byte_limiter: ByteLimiter object.
       raise_array_data_missing_error: See documentation in ParamInfo.
+      operation: Whether the parameters are saved or restored, to choose tuned
+        TensorStore settings.
 
     Returns:
       A PyTree matching `item` of ParamInfo.
@@ -378,7 +420,25 @@ class BasePyTreeCheckpointHandler(
     if use_zarr3 is None:
       use_zarr3 = self._use_zarr3
     names = self.get_param_names(item)
-    ts_context = ts_utils.get_ts_context(use_ocdbt=use_ocdbt)
+    file_io_concurrency_limit = None
+    data_copy_concurrency_limit = None
+    read_coalescing_options = None
+    if self._ts_autotuner is not None:
+      ts_settings = self._ts_autotuner.settings(
+          directory, operation=operation
+      )
+      file_io_concurrency_limit = ts_settings.file_io_concurrency_limit
+      data_copy_concurrency_limit = ts_settings.data_copy_concurrency_limit
+      read_coalescing_options = ts_settings.read_coalescing_options()
+      if ocdbt_target_data_file_size is None:
+        ocdbt_target_data_file_size = ts_settings.target_data_file_size
+    ts_context = ts_utils.get_ts_context(
+        use_ocdbt=use_ocdbt,
+        file_io_concurrency_limit=file_io_concurrency_limit,
+        data_copy_concurrency_limit=data_copy_concurrency_limit,
+        cache_open_handles=self._cache_tensorstore_handles,
+        chunk_cache_bytes=self._chunk_cache_bytes,
+    )
 
     def _param_info(name, value):
       if isinstance(value, tree_metadata.ValueMetadataEntry):
@@ -402,6 +462,7 @@ class BasePyTreeCheckpointHandler(
               value, self._type_handler_registry, self._pytree_metadata_options
           ),
           raise_array_data_missing_error=raise_array_data_missing_error,
+          ocdbt_read_coalescing_options=read_coalescing_options,
       )
 
     return jax.tree.map(
@@ -517,18 +578,36 @@ class BasePyTreeCheckpointHandler(
         start_time,
         '/jax/checkpoint/write/blocking_bytes_per_sec',
     )
-    return [
-        future.ChainedFuture(
-            save_futures,
-            functools.partial(
-                _log_io_metrics,
-                tree_memory_size,
-                start_time,
-                '/jax/checkpoint/write/bytes_per_sec',
-                '/jax/checkpoint/write/bytes',
-            ),
-        )
-    ]
+    blocking_end_time = time.time()
+    tracing.record(
+        'BasePyTreeCheckpointHandler.async_save',
+        start_time,
+        blocking_end_time,
+        bytes=tree_memory_size,
+    )
+
+    def _on_commit():
+      tracing.record(
+          'BasePyTreeCheckpointHandler.commit',
+          blocking_end_time,
+          time.time(),
+          bytes=tree_memory_size,
+      )
+      _log_io_metrics(
+          tree_memory_size,
+          start_time,
+          '/jax/checkpoint/write/bytes_per_sec',
+          '/jax/checkpoint/write/bytes',
+      )
+      self._record_io_for_tuning(
+          directory,
+          tree_memory_size,
+          start_time,
+          param_infos,
+          operation=tensorstore_tuning.Operation.SAVE,
+      )
+
+    return [future.ChainedFuture(save_futures, _on_commit)]
 
   def save(self, directory: epath.Path, *args, **kwargs):
     """Saves the provided item.
@@ -606,6 +685,77 @@ class BasePyTreeCheckpointHandler(
         flat_restored, target=item
     )
 
+  def _prepare_restore(
+      self,
+      directory: epath.Path,
+      args: Optional[BasePyTreeRestoreArgs],
+  ) -> Tuple[PyTree, PyTree, PyTree, PyTree]:
+    """Returns item, value metadata, ParamInfos and RestoreArgs for restore."""
+    args = args or BasePyTreeRestoreArgs()
+    item = args.item
+    restore_args = args.restore_args
+
+    logging.vlog(1, 'directory=%s, restore_args=%s', directory, restore_args)
+    if not directory.exists():
+      raise FileNotFoundError(
+          f'Requested directory for restore does not exist at {directory}'
+      )
+    # Get value metadata tree and use_zarr3 from serialized pytree metadata.
+    internal_tree_metadata = self._read_metadata_file(directory)
+    value_metadata_tree = internal_tree_metadata.as_nested_tree()
+    if not value_metadata_tree:
+      raise ValueError(
+          f'Found empty checkpoint PyTree metadata in directory={directory}.'
+      )
+    use_zarr3 = (
+        internal_tree_metadata.use_zarr3
+        if internal_tree_metadata.use_zarr3 is not None
+        else self._use_zarr3
+    )
+    raise_array_data_missing_error = (
+        internal_tree_metadata.store_array_data_equal_to_fill_value
+    )
+    del internal_tree_metadata
+    # Prep for restore.
+    if item is None:
+      item = value_metadata_tree
+    else:
+      # is_empty_or_leaf is necessary here to treat empty nodes (e.g. empty
+      # dicts, lists, custom nodes) as leaves, as they do not contain any
+      # actual data to be restored, but are needed to maintain the structure.
+      serialized_item = tree_utils.serialize_tree(item, keep_empty_nodes=True)
+      diff = tree_utils.tree_difference(
+          serialized_item,
+          value_metadata_tree,
+          is_leaf=tree_utils.is_empty_or_leaf,
+          leaves_equal=lambda a, b: True,
+      )
+      if diff is not None:
+        raise ValueError(
+            'User-provided restore item and on-disk value metadata tree'
+            f' structures do not match: {diff}'
+        )
+      value_metadata_tree = jax.tree.map(
+          lambda v, i: PLACEHOLDER if type_handlers.is_placeholder(i) else v,
+          value_metadata_tree,
+          serialized_item,
+      )
+    restore_args = _fill_missing_save_or_restore_args(
+        item, restore_args, mode='restore'
+    )
+    restore_args = tree_metadata.serialize_tree(
+        restore_args, self._pytree_metadata_options
+    )
+    param_infos = self._get_param_infos(
+        item=value_metadata_tree,
+        directory=directory,
+        use_ocdbt=type_handlers.is_ocdbt_checkpoint(directory),
+        use_zarr3=use_zarr3,
+        raise_array_data_missing_error=raise_array_data_missing_error,
+        operation=tensorstore_tuning.Operation.RESTORE,
+    )
+    return item, value_metadata_tree, param_infos, restore_args
+
   def restore(
       self,
       directory: epath.Path,
@@ -694,73 +844,66 @@ class BasePyTreeCheckpointHandler(
       ValueError: `transforms` contains elements with `multi_value_fn`.
     """
     start_time = time.time()
-    args = args or BasePyTreeRestoreArgs()
-    item = args.item
-    restore_args = args.restore_args
-
-    logging.vlog(1, 'directory=%s, restore_args=%s', directory, restore_args)
-    if not directory.exists():
-      raise FileNotFoundError(
-          f'Requested directory for restore does not exist at {directory}'
-      )
-    # Get value metadata tree and use_zarr3 from serialized pytree metadata.
-    internal_tree_metadata = self._read_metadata_file(directory)
-    value_metadata_tree = internal_tree_metadata.as_nested_tree()
-    if not value_metadata_tree:
-      raise ValueError(
-          f'Found empty checkpoint PyTree metadata in directory={directory}.'
-      )
-    use_zarr3 = (
-        internal_tree_metadata.use_zarr3
-        if internal_tree_metadata.use_zarr3 is not None
-        else self._use_zarr3
+    item, value_metadata_tree, param_infos, restore_args = (
+        self._prepare_restore(directory, args)
     )
-    raise_array_data_missing_error = (
-        internal_tree_metadata.store_array_data_equal_to_fill_value
-    )
-    del internal_tree_metadata
-    # Prep for restore.
-    if item is None:
-      item = value_metadata_tree
-    else:
-      # is_empty_or_leaf is necessary here to treat empty nodes (e.g. empty
-      # dicts, lists, custom nodes) as leaves, as they do not contain any
-      # actual data to be restored, but are needed to maintain the structure.
-      serialized_item = tree_utils.serialize_tree(item, keep_empty_nodes=True)
-      diff = tree_utils.tree_difference(
-          serialized_item,
-          value_metadata_tree,
-          is_leaf=tree_utils.is_empty_or_leaf,
-          leaves_equal=lambda a, b: True,
-      )
-      if diff is not None:
-        raise ValueError(
-            'User-provided restore item and on-disk value metadata tree'
-            f' structures do not match: {diff}'
+    # Begin restore.
+    return asyncio_utils.run_sync(
+        self._restore_prepared(
+            directory,
+            item,
+            value_metadata_tree,
+            param_infos,
+            restore_args,
+            start_time=start_time,
         )
-      value_metadata_tree = jax.tree.map(
-          lambda v, i: PLACEHOLDER if type_handlers.is_placeholder(i) else v,
-          value_metadata_tree,
-          serialized_item,
-      )
-    restore_args = _fill_missing_save_or_restore_args(
-        item, restore_args, mode='restore'
     )
-    restore_args = tree_metadata.serialize_tree(
-        restore_args, self._pytree_metadata_options
+
+  async def async_restore(
+      self,
+      directory: epath.Path,
+      args: Optional[BasePyTreeRestoreArgs] = None,
+  ) -> Awaitable[PyTree]:
+    """Restores a PyTree asynchronously.
+
+    Reads the checkpoint metadata and validates `args` before returning, so
+    that errors are raised to the caller. Reading and deserializing the values,
+    including transfers to device, only happens once the returned awaitable is
+    awaited, which may be done from another thread or event loop.
+
+    Args:
+      directory: saved checkpoint location directory.
+      args: `BasePyTreeRestoreArgs`, as passed to `restore`.
+
+    Returns:
+      An awaitable resolving to the restored PyTree.
+    """
+    start_time = time.time()
+    item, value_metadata_tree, param_infos, restore_args = (
+        self._prepare_restore(directory, args)
     )
-    param_infos = self._get_param_infos(
-        item=value_metadata_tree,
-        directory=directory,
-        use_ocdbt=type_handlers.is_ocdbt_checkpoint(directory),
-        use_zarr3=use_zarr3,
-        raise_array_data_missing_error=raise_array_data_missing_error,
+    return self._restore_prepared(
+        directory,
+        item,
+        value_metadata_tree,
+        param_infos,
+        restore_args,
+        start_time=start_time,
     )
-    # Begin restore.
-    tree_memory_size, restored_item = asyncio_utils.run_sync(
-        self._maybe_deserialize(
-            item, value_metadata_tree, param_infos, restore_args
-        )
+
+  async def _restore_prepared(
+      self,
+      directory: epath.Path,
+      item: PyTree,
+      value_metadata_tree: PyTree,
+      param_infos: PyTree,
+      restore_args: PyTree,
+      *,
+      start_time: float,
+  ) -> PyTree:
+    """Deserializes the values prepared by `_prepare_restore`."""
+    tree_memory_size, restored_item = await self._maybe_deserialize(
+        item, value_metadata_tree, param_infos, restore_args
     )
 
     if logging.vlog_is_on(1):
@@ -779,8 +922,104 @@ class BasePyTreeCheckpointHandler(
         '/jax/checkpoint/read/bytes_per_sec',
         '/jax/checkpoint/read/bytes',
     )
+    tracing.record(
+        'BasePyTreeCheckpointHandler.restore',
+        start_time,
+        time.time(),
+        bytes=tree_memory_size,
+    )
+    self._record_io_for_tuning(
+        directory,
+        tree_memory_size,
+        start_time,
+        param_infos,
+        operation=tensorstore_tuning.Operation.RESTORE,
+    )
     return restored_item
 
+  def prefetch(
+      self,
+      directory: epath.Path,
+      args: Optional[BasePyTreeRestoreArgs] = None,
+  ) -> int:
+    """Reads the arrays that `restore` would read into the chunk cache.
+
+    A later `restore` with the same `args` then reads the prefetched arrays
+    from host memory. Arrays are prefetched in order, skipping those that would
+    exceed `chunk_cache_bytes` in total. Values of types that do not support
+    prefetching are skipped.
+
+    Args:
+      directory: saved checkpoint location directory.
+      args: `BasePyTreeRestoreArgs`, as passed to `restore`.
+
+    Returns:
+      The number of bytes prefetched on this host.
+
+    Raises:
+      ValueError: if the handler was created without `chunk_cache_bytes`.
+    """
+    if self._chunk_cache_bytes is None:
+      raise ValueError(
+          'Prefetching requires a handler created with `chunk_cache_bytes`.'
+      )
+    start_time = time.time()
+    _, value_metadata_tree, param_infos, restore_args = self._prepare_restore(
+        directory, args
+    )
+
+    async def _prefetch() -> int:
+      byte_limiter = serialization.get_byte_limiter(
+          self._restore_concurrent_bytes
+      )
+      infos = jax.tree.map(
+          lambda info: dataclasses.replace(info, byte_limiter=byte_limiter),
+          param_infos,
+      )
+      prefetched_bytes = 0
+      for request in batched_serialization_requests(
+          value_metadata_tree,
+          infos,
+          restore_args,
+          self._type_handler_registry,
+      ):
+        if not hasattr(request.handler, 'prefetch'):
+          continue
+        prefetched_bytes += await request.handler.prefetch(
+            request.infos,
+            request.args,
+            max_bytes=self._chunk_cache_bytes - prefetched_bytes,
+        )
+      return prefetched_bytes
+
+    prefetched_bytes = asyncio_utils.run_sync(_prefetch())
+    _log_io_metrics(
+        prefetched_bytes,
+        start_time,
+        '/jax/checkpoint/read/prefetch_bytes_per_sec',
+        '/jax/checkpoint/read/prefetch_bytes',
+    )
+    return prefetched_bytes
+
+  def _record_io_for_tuning(
+      self,
+      directory: epath.Path,
+      size: int,
+      start_time: float,
+      param_infos: PyTree,
+      *,
+      operation: tensorstore_tuning.Operation,
+  ):
+    if self._ts_autotuner is None:
+      return
+    self._ts_autotuner.record(
+        directory,
+        size,
+        time.time() - start_time,
+        operation=operation,
+        num_requests=len(jax.tree.leaves(param_infos)),
+    )
+
   async def _get_param_infos_with_write_shape(
       self,
       param_infos: PyTree,
@@ -861,7 +1100,7 @@ class BasePyTreeCheckpointHandler(
             path,
             self._pytree_metadata_options,
         )
-        path.write_text(json.dumps(metadata_content.to_json()))
+        path.write_bytes(metadata_content.serialize())
         jax.monitoring.record_event_duration_secs(
             '/jax/checkpoint/write/async/metadata_write_duration_secs',
             time.time() - metadata_write_start_time,
@@ -933,8 +1172,8 @@ class BasePyTreeCheckpointHandler(
         path,
         self._pytree_metadata_options,
     )
-    return tree_metadata.InternalTreeMetadata.from_json(
-        json.loads(path.read_text()),
+    return tree_metadata.InternalTreeMetadata.deserialize(
+        path.read_bytes(),
         pytree_metadata_options=self._pytree_metadata_options,
     )
 
@@ -976,6 +1215,32 @@ class BasePyTreeCheckpointHandler(
         custom_metadata=internal_tree_metadata.custom_metadata,
     )
 
+  def lazy_metadata(
+      self, directory: epath.Path
+  ) -> tree_metadata.LazyTreeMetadata:
+    """Returns tree metadata whose leaves are loaded on access.
+
+    Like `metadata`, but only reads the PyTree metadata file upfront. The
+    metadata of each leaf is read from the checkpoint when the leaf, or a
+    subtree containing it, is accessed. Useful to inspect parts of checkpoints
+    with many leaves::
+
+      metadata = handler.lazy_metadata(directory)
+      metadata['params']['encoder'].tree
+
+    Args:
+      directory: checkpoint location.
+
+    Returns:
+      `LazyTreeMetadata` matching the structure of the saved checkpoint.
+    """
+    is_ocdbt_checkpoint = type_handlers.is_ocdbt_checkpoint(directory)
+    return self._read_metadata_file(directory).as_lazy_custom_metadata(
+        directory,
+        self._type_handler_registry,
+        use_ocdbt=is_ocdbt_checkpoint,
+    )
+
   async def _finalize_async(self, directory: epath.Path) -> None:
     finalize_coros = []
     if self._array_metadata_store is not None:
@@ -999,12 +1264,13 @@ class BasePyTreeCheckpointHandler(
     async def merge_ocdbt_per_process_files():
       merge_start_time = time.time()
       ts_context = ts_utils.get_ts_context(use_ocdbt=True)
-      await type_handlers.merge_ocdbt_per_process_files(
-          directory,
-          ts_context=ts_context,
-          use_zarr3=self._use_zarr3,
-          enable_validation=self._enable_post_merge_validation,
-      )
+      with tracing.span('merge_ocdbt_per_process_files'):
+        await type_handlers.merge_ocdbt_per_process_files(
+            directory,
+            ts_context=ts_context,
+            use_zarr3=self._use_zarr3,
+            enable_validation=self._enable_post_merge_validation,
+        )
       jax.monitoring.record_event_duration_secs(
           '/jax/checkpoint/write/async/ocdbt_merge_duration_secs',
           time.time() - merge_start_time,
@@ -1013,6 +1279,9 @@ class BasePyTreeCheckpointHandler(
     finalize_coros.append(merge_ocdbt_per_process_files())
 
     await asyncio.gather(*finalize_coros)
+    # Handles and chunks read before the checkpoint was finalized are stale.
+    if self._cache_tensorstore_handles or self._chunk_cache_bytes is not None:
+      ts_utils.invalidate_open_handle_caches(directory)
 
   def finalize(self, directory: epath.Path) -> None:
     """Finalization step.
@@ -1024,7 +1293,8 @@ class BasePyTreeCheckpointHandler(
     Args:
       directory: Path where the checkpoint is located.
     """
-    asyncio_utils.run_sync(self._finalize_async(directory))
+    with tracing.span('BasePyTreeCheckpointHandler.finalize'):
+      asyncio_utils.run_sync(self._finalize_async(directory))
 
 
 @register_with_handler(BasePyTreeCheckpointHandler, for_save=True)
@@ -366,7 +366,12 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
     restored.other_param ... # None.
   """
 
-  _current_temporary_paths: Dict[str, atomicity_types.TemporaryPath] = {}
+  # Temporary paths of the items of each save that was not finalized yet, by
+  # save directory. Multiple saves may be in flight, see
+  # `AsyncOptions.max_in_flight_saves`.
+  _temporary_paths: Dict[
+      epath.Path, Dict[str, atomicity_types.TemporaryPath]
+  ]
   # Items that do not have a registered handler. This is set to `None` if the
   # user provided a `handler_registry` at initialization. If the user provided
   # `item_names` and `items_and_handlers` at initialization, this is set to a
@@ -409,6 +414,7 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
           'Both `handler_registry` and `items_and_handlers` were provided. '
           'Please specify only one of the two.'
       )
+    self._temporary_paths = {}
     if handler_registry is not None and item_names:
       raise ValueError(
           'Both `handler_registry` and `item_names` were provided. '
@@ -667,14 +673,13 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
       self, directory: epath.Path, args: CompositeArgs
   ) -> Optional[List[Future]]:
     """Saves multiple items to individual subdirectories."""
-    self._current_temporary_paths = self._get_item_temporary_paths(
-        directory, args
-    )
+    temporary_paths = self._get_item_temporary_paths(directory, args)
+    self._temporary_paths[directory] = temporary_paths
     commit_futures = []
     if self._async_options.create_directories_asynchronously:
       commit_futures.append(
           atomicity.create_all_async(
-              list(self._current_temporary_paths.values()),
+              list(temporary_paths.values()),
               completion_signals=_DIRECTORY_CREATION_SIGNALS,
               multiprocessing_options=self._multiprocessing_options,
           )
@@ -682,12 +687,12 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
     else:
       future.CommitFutureAwaitingContractedSignals(
           atomicity.create_all(
-              list(self._current_temporary_paths.values()),
+              list(temporary_paths.values()),
               multiprocessing_options=self._multiprocessing_options,
           )
       ).result()
     save_ops = []
-    for item_name, item_directory in self._current_temporary_paths.items():
+    for item_name, item_directory in temporary_paths.items():
       arg = args[item_name]
       _maybe_raise_reserved_item_error(item_name)
       handler = self._get_or_set_handler(item_name, arg)
@@ -839,6 +844,31 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
       )
     return CompositeResults(**restored)
 
+  def prefetch(self, directory: epath.Path, args: CompositeArgs) -> int:
+    """Prefetches the items in `args` whose handlers support prefetching.
+
+    Items that are not in the checkpoint are skipped.
+
+    Args:
+      directory: Path to prefetch from.
+      args: CompositeArgs object, as would be passed to `restore`.
+
+    Returns:
+      The total number of bytes prefetched.
+    """
+    existing_items = self._existing_items(directory)
+    prefetched = 0
+    for item_name in sorted(args.keys()):
+      if item_name not in existing_items:
+        continue
+      arg = args[item_name]
+      handler = self._get_or_set_handler(item_name, arg)
+      if hasattr(handler, 'prefetch'):
+        prefetched += handler.prefetch(
+            self._get_item_directory(directory, item_name), args=arg
+        )
+    return prefetched
+
   def _get_item_handlers(
       self,
       saved_metadata: checkpoint.StepMetadata,
@@ -957,7 +987,7 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
 
     return self._get_metadata_base(
         directory=directory,
-        item_names=list(self._current_temporary_paths.keys()),
+        item_names=list(self._temporary_paths.get(directory, {}).keys()),
         get_item_metadata=False,
     )
 
@@ -991,7 +1021,7 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
           directory,
       )
 
-    for item_tmp_dir in self._current_temporary_paths.values():
+    for item_tmp_dir in self._temporary_paths.get(directory, {}).values():
       tmp_dir_name = item_tmp_dir.get().name
       if tmp_dir_name in existing_items:
         raise ValueError(
@@ -1005,12 +1035,15 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
     )
 
   def finalize(self, directory: epath.Path):
-    if not self._current_temporary_paths:
-      raise ValueError('finalize() called before any items were saved.')
+    temporary_paths = self._temporary_paths.get(directory)
+    if not temporary_paths:
+      raise ValueError(
+          f'finalize() called before any items were saved to {directory}.'
+      )
     for item_name, handler in _get_unique_registered_items_and_handlers(
         self._handler_registry
     ):
-      tmp_dir = self._current_temporary_paths.get(item_name, None)
+      tmp_dir = temporary_paths.get(item_name, None)
       if tmp_dir is None or handler is None:
         # Not an error, as some items may not have been saved.
         continue
@@ -1019,7 +1052,8 @@ class CompositeCheckpointHandler(AsyncCheckpointHandler):
       )
 
       # Remove the temporary path once it has been finalized.
-      self._current_temporary_paths.pop(item_name)
+      temporary_paths.pop(item_name)
+    self._temporary_paths.pop(directory, None)
 
   def close(self):
     for _, handler in _get_unique_registered_items_and_handlers(
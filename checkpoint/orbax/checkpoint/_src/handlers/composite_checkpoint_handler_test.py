@@ -1027,6 +1027,31 @@ class CompositeCheckpointHandlerTest(parameterized.TestCase):
           (self.directory / 'state' / step._COMMIT_SUCCESS_FILE).exists()
       )
 
+  def test_finalize_concurrent_saves(self):
+    handler = CompositeCheckpointHandler()
+    directories = [self.directory / 'first', self.directory / 'second']
+    for i, directory in enumerate(directories):
+      directory.mkdir()
+      synchronization.HandlerAwaitableSignalOperationIdGenerator.next_operation_id()
+      handler.save(
+          directory,
+          CompositeArgs(state=args_lib.StandardSave({'a': i})),
+      )
+    # Saves may be finalized after a later save started.
+    if multihost.process_index() == 0:
+      for directory in directories:
+        handler.finalize(directory)
+    test_utils.sync_global_processes('CCHTest:finalize_concurrent_saves')
+
+    for i, directory in enumerate(directories):
+      self.assertTrue((directory / 'state').exists())
+      restored = handler.restore(
+          directory, CompositeArgs(state=args_lib.StandardRestore())
+      )
+      self.assertEqual(restored.state, {'a': i})
+    with self.assertRaisesRegex(ValueError, 'finalize'):
+      handler.finalize(directories[0])
+
   def test_close(self):
     state_handler = mock.create_autospec(StandardCheckpointHandler)
     metadata_handler = mock.create_autospec(JsonCheckpointHandler)
@@ -1079,7 +1104,7 @@ class CompositeCheckpointHandlerTest(parameterized.TestCase):
             ['state', 'metadata', 'blob'],
         ),
     )
-    tmp_dirs = handler._current_temporary_paths
+    tmp_dirs = handler._temporary_paths[self.directory]
     self.assertIn('state', tmp_dirs.keys())
     self.assertIn('metadata', tmp_dirs.keys())
     self.assertIn(
@@ -45,6 +45,7 @@ from orbax.checkpoint._src.metadata import array_metadata_store as array_metadat
 from orbax.checkpoint._src.metadata import empty_values
 from orbax.checkpoint._src.metadata import tree as tree_metadata
 from orbax.checkpoint._src.serialization import serialization
+from orbax.checkpoint._src.serialization import tensorstore_tuning
 from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 from orbax.checkpoint._src.serialization import type_handlers
 from orbax.checkpoint._src.tree import types as tree_types
@@ -481,6 +482,9 @@ class PyTreeCheckpointHandler(async_checkpoint_handler.AsyncCheckpointHandler):
       array_metadata_validator: array_metadata_store_lib.Validator = (
           array_metadata_store_lib.Validator()
       ),
+      cache_tensorstore_handles: bool = False,
+      ts_autotuner: Optional[tensorstore_tuning.TensorStoreAutoTuner] = None,
+      chunk_cache_bytes: Optional[int] = None,
   ):
     """Creates PyTreeCheckpointHandler.
 
@@ -503,6 +507,13 @@ class PyTreeCheckpointHandler(async_checkpoint_handler.AsyncCheckpointHandler):
       handler_impl: Allows overriding the internal implementation.
       pytree_metadata_options: `PyTreeMetadataOptions` to manage metadata.
       array_metadata_validator: Validator for ArrayMetadata.
+      cache_tensorstore_handles: If True, opened TensorStores are cached across
+        saves and restores. See `BasePyTreeCheckpointHandler`.
+      ts_autotuner: If provided, tunes TensorStore settings from the observed
+        throughput. See `BasePyTreeCheckpointHandler`.
+      chunk_cache_bytes: If provided, array chunks read when restoring are
+        cached in host memory, up to this many bytes, enabling `prefetch`. See
+        `BasePyTreeCheckpointHandler`.
     """
     self._aggregate_handler = MsgpackHandler(
         primary_host=multiprocessing_options.primary_host,
@@ -526,6 +537,9 @@ class PyTreeCheckpointHandler(async_checkpoint_handler.AsyncCheckpointHandler):
         type_handler_registry=type_handler_registry,
         pytree_metadata_options=pytree_metadata_options,
         array_metadata_validator=array_metadata_validator,
+        cache_tensorstore_handles=cache_tensorstore_handles,
+        ts_autotuner=ts_autotuner,
+        chunk_cache_bytes=chunk_cache_bytes,
     )
     self._pytree_metadata_options = pytree_metadata_options
 
@@ -1024,6 +1038,46 @@ class PyTreeCheckpointHandler(async_checkpoint_handler.AsyncCheckpointHandler):
     """
     return self._handler_impl.metadata(directory)
 
+  def lazy_metadata(
+      self, directory: epath.Path
+  ) -> tree_metadata.LazyTreeMetadata:
+    """Returns tree metadata whose leaves are loaded on access.
+
+    See `BasePyTreeCheckpointHandler.lazy_metadata`.
+
+    Args:
+      directory: checkpoint location.
+
+    Returns:
+      `LazyTreeMetadata` matching the structure of the saved checkpoint.
+    """
+    return self._handler_impl.lazy_metadata(directory)
+
+  def prefetch(
+      self,
+      directory: epath.Path,
+      args: Optional[PyTreeRestoreArgs] = None,
+  ) -> int:
+    """Reads the arrays that `restore` would read into the chunk cache.
+
+    See `BasePyTreeCheckpointHandler.prefetch`. Nothing is prefetched when
+    restoring with transformations.
+
+    Args:
+      directory: saved checkpoint location directory.
+      args: `PyTreeRestoreArgs`, as passed to `restore`.
+
+    Returns:
+      The number of bytes prefetched on this host.
+    """
+    args = args or PyTreeRestoreArgs()
+    if args.transforms is not None or args.legacy_transform_fn is not None:
+      return 0
+    return self._handler_impl.prefetch(
+        directory,
+        args=BasePyTreeRestoreArgs(args.item, restore_args=args.restore_args),
+    )
+
   def finalize(self, directory: epath.Path) -> None:
     """Finalization step.
 
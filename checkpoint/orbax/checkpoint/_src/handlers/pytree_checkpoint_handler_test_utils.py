@@ -57,10 +57,12 @@ from orbax.checkpoint._src.metadata import array_metadata_store as array_metadat
 from orbax.checkpoint._src.metadata import empty_values
 from orbax.checkpoint._src.metadata import sharding as sharding_metadata
 from orbax.checkpoint._src.metadata import tree as tree_metadata
+from orbax.checkpoint._src.metadata import tree_compact
 from orbax.checkpoint._src.metadata import value as value_metadata
 from orbax.checkpoint._src.multihost import multihost
 from orbax.checkpoint._src.serialization import replica_slices
 from orbax.checkpoint._src.serialization import serialization
+from orbax.checkpoint._src.serialization import tensorstore_tuning
 from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 from orbax.checkpoint._src.serialization import type_handlers
 from orbax.checkpoint._src.tree import utils as tree_utils
@@ -454,6 +456,216 @@ class PyTreeCheckpointHandlerTestBase:
           )
       self.assertFalse((self.directory / _SHARDING).exists())
 
+    @parameterized.product(use_ocdbt=(True, False))
+    def test_streaming_host_transfer(self, use_ocdbt: bool):
+      """Test case."""
+      array_handler = type_handlers.ArrayHandler(
+          enable_streaming_host_transfer=True,
+      )
+      ty = jax.Array
+      fn = lambda ty: issubclass(ty, jax.Array)
+      with test_utils.register_type_handler(ty, array_handler, fn):
+        pytree, save_args, restore_args = self.create_mixed_format_pytree()
+        with self.ocdbt_checkpoint_handler(
+            use_ocdbt=use_ocdbt
+        ) as checkpoint_handler:
+          checkpoint_handler.save(
+              self.directory, args=PyTreeSaveArgs(pytree, save_args)
+          )
+          self.validate_save(
+              self.directory,
+              pytree,
+              checkpoint_handler,
+              save_args=save_args,
+              restore_args=restore_args,
+          )
+
+    @parameterized.product(use_ocdbt=(True, False))
+    def test_batch_small_array_writes(self, use_ocdbt: bool):
+      """Test case."""
+      array_handler = type_handlers.ArrayHandler(
+          batch_small_array_writes=True,
+      )
+      ty = jax.Array
+      fn = lambda ty: issubclass(ty, jax.Array)
+      with test_utils.register_type_handler(ty, array_handler, fn):
+        pytree, save_args, restore_args = self.create_mixed_format_pytree()
+        with self.ocdbt_checkpoint_handler(
+            use_ocdbt=use_ocdbt
+        ) as checkpoint_handler:
+          checkpoint_handler.save(
+              self.directory, args=PyTreeSaveArgs(pytree, save_args)
+          )
+          self.validate_save(
+              self.directory,
+              pytree,
+              checkpoint_handler,
+              save_args=save_args,
+              restore_args=restore_args,
+          )
+
+    def test_batch_small_array_writes_reduces_data_files(self):
+      """Test case."""
+      mesh = jax.sharding.Mesh(jax.devices(), ('x',))
+      mesh_axes = jax.sharding.PartitionSpec()
+      pytree = {
+          f'a{i}': test_utils.create_sharded_array(
+              np.arange(16) + i, mesh, mesh_axes
+          )
+          for i in range(32)
+      }
+      restore_args = jax.tree.map(
+          lambda arr: ArrayRestoreArgs(
+              restore_type=type(arr), mesh=mesh, mesh_axes=mesh_axes
+          ),
+          pytree,
+      )
+
+      def _num_data_files(batch_small_array_writes: bool) -> int:
+        directory = self.directory / str(batch_small_array_writes)
+        array_handler = type_handlers.ArrayHandler(
+            batch_small_array_writes=batch_small_array_writes,
+        )
+        fn = lambda ty: issubclass(ty, jax.Array)
+        with test_utils.register_type_handler(jax.Array, array_handler, fn):
+          # Without a byte limiter, all arrays share a single transaction.
+          handler = PyTreeCheckpointHandler(
+              use_ocdbt=True, save_concurrent_gb=1
+          )
+          handler.save(directory, args=PyTreeSaveArgs(pytree))
+          restored = handler.restore(
+              directory, args=PyTreeRestoreArgs(restore_args=restore_args)
+          )
+          handler.close()
+        test_utils.assert_tree_equal(self, pytree, restored)
+        return len(list(directory.glob('ocdbt.process_*/d/*')))
+
+      self.assertLess(_num_data_files(True), _num_data_files(False))
+
+    @parameterized.product(use_ocdbt=(True, False))
+    def test_compact_metadata_format(self, use_ocdbt: bool):
+      """Test case."""
+      with self.ocdbt_checkpoint_handler(
+          use_ocdbt,
+          pytree_metadata_options=tree_metadata.PyTreeMetadataOptions(
+              use_compact_format=True
+          ),
+      ) as checkpoint_handler:
+        checkpoint_handler.save(
+            self.directory, args=PyTreeSaveArgs(self.pytree)
+        )
+      self.assertTrue(
+          tree_compact.is_compact(
+              (self.directory / PYTREE_METADATA_FILE).read_bytes()
+          )
+      )
+      # The format is detected when reading, regardless of options.
+      with self.ocdbt_checkpoint_handler(use_ocdbt) as checkpoint_handler:
+        restored = checkpoint_handler.restore(
+            self.directory,
+            args=PyTreeRestoreArgs(restore_args=self.restore_args),
+        )
+        self.validate_restore(self.pytree, restored)
+        self.validate_metadata(
+            expected_reference_metadata_tree=self.pytree,
+            actual_metadata=checkpoint_handler.metadata(self.directory),
+            pytree_metadata_options=self.pytree_metadata_options,
+            array_metadata_store=ARRAY_METADATA_STORE,
+        )
+
+    @parameterized.product(use_ocdbt=(True, False))
+    def test_lazy_metadata(self, use_ocdbt: bool):
+      """Test case."""
+      with self.ocdbt_checkpoint_handler(use_ocdbt) as checkpoint_handler:
+        checkpoint_handler.save(
+            self.directory, args=PyTreeSaveArgs(self.pytree)
+        )
+        expected = checkpoint_handler.metadata(self.directory)
+        with mock.patch.object(
+            type_handlers.ArrayHandler,
+            'metadata',
+            autospec=True,
+            side_effect=type_handlers.ArrayHandler.metadata,
+        ) as array_metadata:
+          metadata = checkpoint_handler.lazy_metadata(self.directory)
+          self.assertIsInstance(metadata, tree_metadata.LazyTreeMetadata)
+          self.assertEqual(array_metadata.call_count, 0)
+
+          # Only the requested subtree is loaded, in a single batch.
+          subtree = metadata['c']
+          self.assertEqual(array_metadata.call_count, 0)
+          self.assertEqual(subtree.tree, expected['c'])
+          self.assertEqual(array_metadata.call_count, 1)
+          self.assertLen(array_metadata.call_args.args[1], 2)
+
+          # Loaded leaves are cached.
+          self.assertEqual(metadata.subtree(['c', 'a']), expected['c']['a'])
+          self.assertEqual(array_metadata.call_count, 1)
+          self.assertEqual(metadata['a'], expected['a'])
+          self.assertEqual(array_metadata.call_count, 2)
+          self.assertEqual(metadata.tree, expected.tree)
+          self.assertEqual(array_metadata.call_count, 3)
+          self.assertLen(array_metadata.call_args.args[1], 1)
+
+        self.assertEqual(
+            jax.tree.leaves(jax.tree.map(lambda m: m.shape, metadata)),
+            jax.tree.leaves(jax.tree.map(lambda m: m.shape, expected)),
+        )
+        with self.assertRaises(KeyError):
+          metadata.subtree(['c', 'missing'])
+        with self.assertRaises(KeyError):
+          metadata.subtree(['a', 'b'])
+
+    @parameterized.product(use_ocdbt=(True, False))
+    def test_cache_tensorstore_handles(self, use_ocdbt: bool):
+      """Test case."""
+      handler = PyTreeCheckpointHandler(
+          use_ocdbt=use_ocdbt, cache_tensorstore_handles=True
+      )
+      cache = ts_utils.get_open_handle_cache(
+          ts_utils.get_ts_context(use_ocdbt=use_ocdbt, cache_open_handles=True)
+      )
+      handler.save(self.directory, args=PyTreeSaveArgs(self.pytree))
+      handler.finalize(self.directory)
+      num_hits = cache.metrics.num_hits
+      for _ in range(2):
+        restored = handler.restore(
+            self.directory,
+            args=PyTreeRestoreArgs(restore_args=self.restore_args),
+        )
+        self.validate_restore(self.pytree, restored)
+      self.assertGreater(cache.metrics.num_hits, num_hits)
+      handler.close()
+
+    @parameterized.product(use_ocdbt=(True, False))
+    def test_ts_autotuner(self, use_ocdbt: bool):
+      """Test case."""
+      tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=None)
+      handler = PyTreeCheckpointHandler(
+          use_ocdbt=use_ocdbt, ts_autotuner=tuner
+      )
+      save, restore = (
+          tensorstore_tuning.Operation.SAVE,
+          tensorstore_tuning.Operation.RESTORE,
+      )
+      initial_settings = tuner.settings(self.directory, operation=save)
+      handler.save(self.directory, args=PyTreeSaveArgs(self.pytree))
+      self.assertNotEqual(
+          tuner.settings(self.directory, operation=save), initial_settings
+      )
+      self.assertEqual(
+          tuner.settings(self.directory, operation=restore), initial_settings
+      )
+      restored = handler.restore(
+          self.directory,
+          args=PyTreeRestoreArgs(restore_args=self.restore_args),
+      )
+      self.validate_restore(self.pytree, restored)
+      self.assertNotEqual(
+          tuner.settings(self.directory, operation=restore), initial_settings
+      )
+      handler.close()
+
     def test_sharding_variable_devices(self):
       if utils.is_pathways_backend():
         self.skipTest('Sharding metadata not present on Pathways.')
@@ -1900,6 +2112,43 @@ class PyTreeCheckpointHandlerTestBase:
       self.assertEqual(restored, expected)
 
 
+    def test_registry_lookup_after_override(self):
+      registry = type_handlers.create_type_handler_registry(
+          (int, type_handlers.ScalarHandler()),
+      )
+      self.assertIsInstance(registry.get(int), type_handlers.ScalarHandler)
+      handler = type_handlers.NumpyHandler()
+      registry.add(int, handler, override=True)
+      self.assertIs(registry.get(int), handler)
+
+    def test_batched_serialization_requests(self):
+      tree = {'a': 1, 'b': np.zeros(2), 'c': [2, np.ones(3), 3], 'd': {}}
+      save_args = (
+          base_pytree_checkpoint_handler._fill_missing_save_or_restore_args(
+              tree, None, mode='save'
+          )
+      )
+      param_infos = self.handler._handler_impl._get_param_infos(
+          tree, self.directory
+      )
+      requests = base_pytree_checkpoint_handler.batched_serialization_requests(
+          tree,
+          param_infos,
+          save_args,
+          type_handlers.GLOBAL_TYPE_HANDLER_REGISTRY,
+      )
+      # One request per handler, leaves in tree order, empty nodes skipped.
+      self.assertEqual(
+          [request.keys for request in requests],
+          [[('a',), ('c', '0'), ('c', '2')], [('b',), ('c', '1')]],
+      )
+      for request in requests:
+        self.assertEqual(
+            [info.name for info in request.infos],
+            ['.'.join(key) for key in request.keys],
+        )
+
+
     def test_empty_custom_node(self):
 
       class PyTreeDict(dict):
@@ -2210,6 +2459,10 @@ class PyTreeCheckpointHandlerTestBase:
         )
 
       self.assertTrue((self.directory / 'array_metadatas').exists())
+      # Consolidated by the primary host after validation.
+      self.assertTrue(
+          (self.directory / 'array_metadatas' / 'consolidated').exists()
+      )
       if multihost.process_index() == 0:
         array_metadatas = await ARRAY_METADATA_STORE.read(self.directory)
         expected_array_metadatas = {
@@ -78,6 +78,7 @@ class StandardCheckpointHandler(
       pytree_metadata_options: PyTreeMetadataOptions = (
           pytree_metadata_options_lib.PYTREE_METADATA_OPTIONS
       ),
+      chunk_cache_bytes: Optional[int] = None,
   ):
     """Creates StandardCheckpointHandler.
 
@@ -91,6 +92,9 @@ class StandardCheckpointHandler(
       multiprocessing_options: See orbax.checkpoint.options.
       pytree_metadata_options: Options to control types like tuple and
         namedtuple in pytree metadata.
+      chunk_cache_bytes: If provided, array chunks read when restoring are
+        cached in host memory, up to this many bytes, enabling `prefetch`. See
+        `BasePyTreeCheckpointHandler`.
     """
     self._supported_types = checkpoint_utils.STANDARD_ARRAY_TYPES
     self._impl = pytree_checkpoint_handler.PyTreeCheckpointHandler(
@@ -98,6 +102,7 @@ class StandardCheckpointHandler(
         restore_concurrent_gb=restore_concurrent_gb,
         multiprocessing_options=multiprocessing_options,
         pytree_metadata_options=pytree_metadata_options,
+        chunk_cache_bytes=chunk_cache_bytes,
     )
 
   def _validate_save_state(
@@ -217,6 +222,37 @@ class StandardCheckpointHandler(
       )
     if not args:
       args = StandardRestoreArgs(item=item)
+    return self._impl.restore(
+        directory, args=self._get_pytree_restore_args(directory, args)
+    )
+
+  def prefetch(
+      self,
+      directory: epath.Path,
+      args: Optional[StandardRestoreArgs] = None,
+  ) -> int:
+    """Reads the arrays that `restore` would read into the chunk cache.
+
+    See `BasePyTreeCheckpointHandler.prefetch`.
+
+    Args:
+      directory: path from which to restore.
+      args: `StandardRestoreArgs`, as passed to `restore`.
+
+    Returns:
+      The number of bytes prefetched on this host.
+    """
+    return self._impl.prefetch(
+        directory,
+        args=self._get_pytree_restore_args(
+            directory, args or StandardRestoreArgs()
+        ),
+    )
+
+  def _get_pytree_restore_args(
+      self, directory: epath.Path, args: StandardRestoreArgs
+  ) -> pytree_checkpoint_handler.PyTreeRestoreArgs:
+    """Converts `args` to arguments of `PyTreeCheckpointHandler.restore`."""
     if args.item is not None:
       self._validate_restore_state(args.item)
       restore_args = checkpoint_utils.construct_restore_args(
@@ -243,11 +279,8 @@ class StandardCheckpointHandler(
 
     if not args.strict:
       restore_args = jax.tree.map(_replace_strict, restore_args)
-    return self._impl.restore(
-        directory,
-        args=pytree_checkpoint_handler.PyTreeRestoreArgs(
-            item=args.item, restore_args=restore_args
-        ),
+    return pytree_checkpoint_handler.PyTreeRestoreArgs(
+        item=args.item, restore_args=restore_args
     )
 
   def metadata(self, directory: epath.Path) -> tree_metadata.TreeMetadata:
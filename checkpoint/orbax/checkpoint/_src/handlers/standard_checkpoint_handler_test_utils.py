@@ -407,6 +407,31 @@ class StandardCheckpointHandlerTestBase:
       metadata = self.handler.metadata(self.directory)
       self.assertEqual(metadata.custom_metadata, custom_metadata)
 
+    def test_prefetch(self):
+      self.handler.save(self.directory, args=self.save_args_cls(self.pytree))
+      handler = StandardCheckpointHandler(chunk_cache_bytes=1 << 30)
+      restore_args = self.restore_args_cls(
+          jax.tree.map(utils.to_shape_dtype_struct, self.pytree)
+      )
+      self.assertGreater(
+          handler.prefetch(self.directory, args=restore_args), 0
+      )
+      test_utils.sync_global_processes('test_prefetch:prefetched')
+      # Restoring reads from the chunk cache rather than the data files.
+      if multihost.process_index() == 0:
+        for path in self.directory.iterdir():
+          if path.name.startswith('ocdbt.process_') or path.name == 'd':
+            path.rmtree()
+      test_utils.sync_global_processes('test_prefetch:deleted')
+      restored = handler.restore(self.directory, args=restore_args)
+      test_utils.assert_tree_equal(self, self.pytree, restored)
+      handler.close()
+
+    def test_prefetch_without_chunk_cache(self):
+      self.handler.save(self.directory, args=self.save_args_cls(self.pytree))
+      with self.assertRaisesRegex(ValueError, 'chunk_cache_bytes'):
+        self.handler.prefetch(self.directory)
+
     def test_construct_restore_args_with_fallback_sharding(self):
       invalid_sharding_metadata = sharding_metadata.NamedShardingMetadata(
           shape=np.array([2, 4]),
@@ -0,0 +1,277 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tracing of the phases of checkpoint saves and restores.
+
+Spans are recorded for the phases of `CheckpointManager.save`, the blocking and
+background parts of `AsyncCheckpointer.save`, `BasePyTreeCheckpointHandler`
+saves, restores and finalization (including the OCDBT merge), device-to-host
+transfers, TensorStore reads and writes, and the time spent waiting for a
+`ByteLimiter`. Spans carry byte counts where applicable.
+
+Tracing is disabled by default, in which case recording a span only checks a
+global. When enabled, spans are kept in a bounded buffer, so that tracing can
+be left on in long-running jobs. The recorded spans can be exported as a
+Chrome trace, viewable in Perfetto (https://ui.perfetto.dev) or
+chrome://tracing::
+
+  from orbax.checkpoint.logging import tracing
+
+  tracing.enable()
+  mngr.save(step, args=...)
+  mngr.wait_until_finished()
+  tracing.export_chrome_trace(f'/tmp/trace_{jax.process_index()}.json')
+
+Spans are recorded per thread, and per asyncio task, using wall clock time so
+that the traces of different hosts can be aligned.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import collections
+import dataclasses
+import functools
+import inspect
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TypeVar
+
+from etils import epath
+from orbax.checkpoint._src.multihost import multihost
+
+
+_DEFAULT_MAX_SPANS = 100_000
+
+_F = TypeVar('_F', bound=Callable[..., Any])
+
+
+@dataclasses.dataclass(frozen=True)
+class Span:
+  """A completed span.
+
+  Attributes:
+    name: Name of the traced phase.
+    start_time: Wall clock start time, in seconds since the epoch.
+    duration_secs: Duration of the phase.
+    lane: Thread, and asyncio task if any, in which the span was recorded.
+    args: Additional values, e.g. `bytes`.
+  """
+
+  name: str
+  start_time: float
+  duration_secs: float
+  lane: str
+  args: Dict[str, Any]
+
+
+class _Recorder:
+
+  def __init__(self, max_spans: int):
+    # Appending to a bounded deque is thread-safe, and drops the oldest span.
+    self.spans: collections.deque[Span] = collections.deque(maxlen=max_spans)
+
+
+_recorder: Optional[_Recorder] = None
+
+
+def enable(max_spans: int = _DEFAULT_MAX_SPANS) -> None:
+  """Starts recording spans, keeping the `max_spans` latest ones."""
+  global _recorder
+  _recorder = _Recorder(max_spans)
+
+
+def disable() -> None:
+  """Stops recording spans and discards recorded spans."""
+  global _recorder
+  _recorder = None
+
+
+def is_enabled() -> bool:
+  return _recorder is not None
+
+
+def _current_lane() -> str:
+  lane = threading.current_thread().name
+  try:
+    task = asyncio.current_task()
+  except RuntimeError:
+    task = None
+  if task is not None:
+    lane = f'{lane}/{task.get_name()}'
+  return lane
+
+
+def record(name: str, start_time: float, end_time: float, **args) -> None:
+  """Records a span of a phase timed by the caller.
+
+  Args:
+    name: Name of the traced phase.
+    start_time: Wall clock start time, as returned by `time.time()`.
+    end_time: Wall clock end time, as returned by `time.time()`.
+    **args: Additional values to attach to the span.
+  """
+  recorder = _recorder
+  if recorder is None:
+    return
+  recorder.spans.append(
+      Span(
+          name=name,
+          start_time=start_time,
+          duration_secs=end_time - start_time,
+          lane=_current_lane(),
+          args=args,
+      )
+  )
+
+
+class _ActiveSpan:
+  """Context manager recording a span on exit."""
+
+  __slots__ = ('_name', '_args', '_start_time')
+
+  def __init__(self, name: str, args: Dict[str, Any]):
+    self._name = name
+    self._args = args
+    self._start_time = 0.0
+
+  def set(self, **args) -> None:
+    """Attaches values to the span, e.g. once they are known."""
+    self._args.update(args)
+
+  def __enter__(self) -> _ActiveSpan:
+    self._start_time = time.time()
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    if exc_type is not None:
+      self._args['error'] = exc_type.__name__
+    record(self._name, self._start_time, time.time(), **self._args)
+
+
+class _NoopSpan:
+  """Context manager used when tracing is disabled."""
+
+  __slots__ = ()
+
+  def set(self, **args) -> None:
+    del args
+
+  def __enter__(self) -> _NoopSpan:
+    return self
+
+  def __exit__(self, exc_type, exc_value, traceback):
+    pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name: str, **args) -> _ActiveSpan | _NoopSpan:
+  """Returns a context manager tracing the phase it encloses.
+
+  May enclose `await` expressions, in which case the span covers the time
+  during which the asyncio task was suspended.
+
+  Args:
+    name: Name of the traced phase.
+    **args: Values to attach to the span, e.g. `bytes`.
+  """
+  if _recorder is None:
+    return _NOOP_SPAN
+  return _ActiveSpan(name, args)
+
+
+def traced(name: str) -> Callable[[_F], _F]:
+  """Decorates a function or coroutine function to trace its calls."""
+
+  def decorator(fn: _F) -> _F:
+    if inspect.iscoroutinefunction(fn):
+
+      @functools.wraps(fn)
+      async def async_wrapper(*args, **kwargs):
+        with span(name):
+          return await fn(*args, **kwargs)
+
+      return async_wrapper  # pytype: disable=bad-return-type
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+      with span(name):
+        return fn(*args, **kwargs)
+
+    return wrapper  # pytype: disable=bad-return-type
+
+  return decorator
+
+
+def spans() -> List[Span]:
+  """Returns the recorded spans, in order of completion."""
+  recorder = _recorder
+  return [] if recorder is None else list(recorder.spans)
+
+
+def clear() -> None:
+  """Discards recorded spans."""
+  recorder = _recorder
+  if recorder is not None:
+    recorder.spans.clear()
+
+
+def to_chrome_trace(spans_to_export: List[Span]) -> Dict[str, Any]:
+  """Returns `spans_to_export` in Chrome trace event format.
+
+  Each lane is a thread of the current process, which is identified by its
+  process index.
+
+  Args:
+    spans_to_export: Spans, e.g. as returned by `spans`.
+  """
+  pid = multihost.process_index()
+  events = [{
+      'name': 'process_name',
+      'ph': 'M',
+      'pid': pid,
+      'args': {'name': f'process {pid}'},
+  }]
+  tids = {}
+  for s in spans_to_export:
+    if s.lane not in tids:
+      tids[s.lane] = len(tids)
+      events.append({
+          'name': 'thread_name',
+          'ph': 'M',
+          'pid': pid,
+          'tid': tids[s.lane],
+          'args': {'name': s.lane},
+      })
+    events.append({
+        'name': s.name,
+        'cat': 'orbax',
+        'ph': 'X',
+        'pid': pid,
+        'tid': tids[s.lane],
+        'ts': s.start_time * 1e6,
+        'dur': s.duration_secs * 1e6,
+        'args': s.args,
+    })
+  return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+
+def export_chrome_trace(path: epath.PathLike) -> None:
+  """Writes the spans recorded on this host to `path` as a Chrome trace."""
+  path = epath.Path(path)
+  path.parent.mkdir(parents=True, exist_ok=True)
+  path.write_text(json.dumps(to_chrome_trace(spans()), default=str))
@@ -0,0 +1,111 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for tracing module."""
+
+import asyncio
+import json
+
+from absl.testing import absltest
+from etils import epath
+import jax
+from orbax.checkpoint import args as args_lib
+from orbax.checkpoint import checkpoint_manager
+from orbax.checkpoint._src.logging import tracing
+
+
+class TracingTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    tracing.enable()
+    self.addCleanup(tracing.disable)
+
+  def test_disabled(self):
+    tracing.disable()
+    with tracing.span('phase') as span:
+      span.set(bytes=1)
+    tracing.record('phase', 0.0, 1.0)
+    self.assertEqual(tracing.spans(), [])
+
+  def test_span(self):
+    with tracing.span('phase', step=1) as span:
+      span.set(bytes=8)
+    with self.assertRaises(ValueError):
+      with tracing.span('failing'):
+        raise ValueError()
+
+    spans = tracing.spans()
+    self.assertEqual([s.name for s in spans], ['phase', 'failing'])
+    self.assertEqual(spans[0].args, {'step': 1, 'bytes': 8})
+    self.assertEqual(spans[1].args, {'error': 'ValueError'})
+    self.assertGreaterEqual(spans[0].duration_secs, 0)
+
+  def test_max_spans(self):
+    tracing.enable(max_spans=2)
+    for i in range(3):
+      tracing.record(f'phase{i}', 0.0, 1.0)
+    self.assertEqual([s.name for s in tracing.spans()], ['phase1', 'phase2'])
+
+  def test_traced_coroutine_lanes(self):
+    @tracing.traced('coroutine')
+    async def coroutine():
+      await asyncio.sleep(0)
+
+    async def main():
+      await asyncio.gather(
+          asyncio.create_task(coroutine(), name='a'),
+          asyncio.create_task(coroutine(), name='b'),
+      )
+
+    asyncio.run(main())
+    self.assertEqual(
+        sorted(s.lane.split('/')[-1] for s in tracing.spans()), ['a', 'b']
+    )
+
+  def test_export_chrome_trace(self):
+    tracing.record('phase', 1.0, 1.5, bytes=4)
+    path = epath.Path(self.create_tempdir().full_path) / 'trace.json'
+    tracing.export_chrome_trace(path)
+
+    trace = json.loads(path.read_text())
+    events = [e for e in trace['traceEvents'] if e['ph'] == 'X']
+    self.assertLen(events, 1)
+    self.assertEqual(events[0]['name'], 'phase')
+    self.assertEqual(events[0]['ts'], 1e6)
+    self.assertEqual(events[0]['dur'], 0.5e6)
+    self.assertEqual(events[0]['args'], {'bytes': 4})
+
+  def test_checkpoint_manager_save(self):
+    directory = epath.Path(self.create_tempdir().full_path)
+    with checkpoint_manager.CheckpointManager(directory) as mngr:
+      mngr.save(0, args=args_lib.StandardSave({'a': jax.numpy.ones(8)}))
+      mngr.wait_until_finished()
+
+    names = {s.name for s in tracing.spans()}
+    for name in (
+        'CheckpointManager.save',
+        'CheckpointManager.finalize',
+        'AsyncCheckpointer.save',
+        'AsyncCheckpointer.background_commit',
+        'BasePyTreeCheckpointHandler.async_save',
+        'BasePyTreeCheckpointHandler.commit',
+        'merge_ocdbt_per_process_files',
+        'tensorstore_write',
+    ):
+      self.assertIn(name, names)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -31,10 +31,19 @@ class PathResolver:
   """Resolves paths for the ArrayMetadata store read and write."""
 
   _metadata_subdir = 'array_metadatas'
+  _consolidated_file_name = 'consolidated'
 
   def _file_name(self, process_index: int | str) -> str:
     return f'process_{process_index}'
 
+  def get_consolidated_file_path(
+      self, checkpoint_dir: epath.Path
+  ) -> epath.Path:
+    """Returns the path of the metadata consolidated across all processes."""
+    return (
+        checkpoint_dir / self._metadata_subdir / self._consolidated_file_name
+    )
+
   def get_process_index(self, file_path: epath.Path) -> int:
     """Returns the process index from the file path."""
     process_index = file_path.name.removeprefix('process_')
@@ -125,6 +134,27 @@ class SerDeserializer:
     obj = json.loads(serialized, object_hook=self._from_dict)
     return obj['array_metadatas']
 
+  def serialize_consolidated(
+      self,
+      process_indices: Sequence[int],
+      array_metadatas: Sequence[array_metadata_lib.ArrayMetadata],
+  ) -> str:
+    """Serializes metadata shared by all `process_indices` to string."""
+    obj = {
+        'process_indices': list(process_indices),
+        'array_metadatas': [
+            self._to_dict(array_metadata) for array_metadata in array_metadatas
+        ],
+    }
+    return json.dumps(obj)
+
+  def deserialize_consolidated(
+      self, serialized: str
+  ) -> Tuple[List[int], List[array_metadata_lib.SerializedArrayMetadata]]:
+    """Deserializes `serialized` to process indices and shared metadata."""
+    obj = json.loads(serialized, object_hook=self._from_dict)
+    return obj['process_indices'], obj['array_metadatas']
+
 
 class Store:
   """Storage for `array_metadata.ArrayMetadata` (not value.ArrayMetadata)."""
@@ -203,6 +233,59 @@ class Store:
         file_path,
     )
 
+  async def write_consolidated(
+      self,
+      checkpoint_dir: epath.Path,
+      array_metadatas: dict[
+          int, List[array_metadata_lib.SerializedArrayMetadata]
+      ],
+  ) -> None:
+    """Writes metadata of all processes to a single file.
+
+    Must only be called with `array_metadatas` validated to be the same for all
+    processes, see `Validator.validate_all_array_metadatas`. Subsequent calls
+    to `read(checkpoint_dir)` then read this single file, instead of one file
+    per process.
+
+    Args:
+      checkpoint_dir: The base path containing metadata for each process.
+      array_metadatas: A dictionary of process index to list of metadata, as
+        returned by `read(checkpoint_dir)`.
+    """
+    file_path = self._path_resolver.get_consolidated_file_path(checkpoint_dir)
+    ref_array_metadatas = next(iter(array_metadatas.values()))
+    await asyncio.to_thread(
+        file_path.write_text,
+        self._ser_deser.serialize_consolidated(
+            sorted(array_metadatas), ref_array_metadatas
+        ),
+    )
+    logging.info(
+        '[process=%s][thread=%s] Wrote %d array_metadata.ArrayMetadata of %d'
+        ' processes to %s',
+        multihost.process_index(),
+        threading.current_thread().name,
+        len(ref_array_metadatas),
+        len(array_metadatas),
+        file_path,
+    )
+
+  async def _read_consolidated(
+      self, checkpoint_dir: epath.Path
+  ) -> dict[int, List[array_metadata_lib.SerializedArrayMetadata]] | None:
+    """Reads the consolidated metadata, or returns None if not written."""
+    file_path = self._path_resolver.get_consolidated_file_path(checkpoint_dir)
+    if not await asyncio.to_thread(file_path.exists):
+      return None
+    serialized = await asyncio.to_thread(file_path.read_text)
+    process_indices, array_metadatas = (
+        self._ser_deser.deserialize_consolidated(serialized)
+    )
+    # All processes share the same list, which lets validation skip them.
+    return {
+        process_index: array_metadatas for process_index in process_indices
+    }
+
   async def _get_array_metadatas(
       self,
       array_metadatas_file_path: epath.Path,
@@ -221,6 +304,10 @@ class Store:
   ):
     """Reads `SerializedArrayMetadata` from storage under `checkpoint_dir`.
 
+    If `process_index` is None and the metadata was consolidated by
+    `write_consolidated`, only the consolidated file is read. Otherwise, one
+    file per process is read.
+
     Args:
       checkpoint_dir: The base path containing metadata for each process.
       process_index: The process index to read. If None, then read all processes
@@ -236,6 +323,20 @@ class Store:
           f'Checkpoint directory does not exist: {checkpoint_dir}.'
       )
     start_time = time.time()
+    if process_index is None:
+      result = await self._read_consolidated(checkpoint_dir)
+      if result is not None:
+        logging.vlog(
+            1,
+            '[process=%s][thread=%s] Read consolidated metadata of %s'
+            ' processes from checkpoint_dir=%s in %s seconds.',
+            multihost.process_index(),
+            threading.current_thread().name,
+            len(result),
+            checkpoint_dir,
+            time.time() - start_time,
+        )
+        return result
     file_paths = self._path_resolver.get_read_file_paths(
         checkpoint_dir, process_index
     )
@@ -375,6 +476,9 @@ class Validator:
     for process_index, process_array_metadatas in array_metadatas.items():
       if process_index == ref_process_index:
         continue
+      if process_array_metadatas is ref_process_array_metadatas:
+        # Already validated when consolidated, see `Store.write_consolidated`.
+        continue
       process_cache = {
           array_metadata.param_name: array_metadata
           for array_metadata in process_array_metadatas
@@ -558,6 +662,9 @@ async def validate_all_array_metadatas(
 ) -> None:
   """Validates that all processes have the same array metadatas.
 
+  Once validated, the metadata is consolidated into a single file, so that
+  restoring reads one file per host instead of one file per process.
+
   Args:
     validator: The `Validator` instance for validation.
     array_metadata_store: The `Store` instance for reading metadata from
@@ -568,3 +675,4 @@ async def validate_all_array_metadatas(
   if array_metadatas is not None:
     assert isinstance(array_metadatas, dict)  # read all processes.
     validator.validate_all_array_metadatas(array_metadatas)
+    await array_metadata_store.write_consolidated(directory, array_metadatas)
@@ -134,6 +134,48 @@ class StoreTest(parameterized.TestCase, unittest.IsolatedAsyncioTestCase):
         },
     )
 
+  async def test_write_consolidated_and_read(self):
+    for process_index in [0, 1, 2]:
+      await self.store.write(
+          self.checkpoint_dir,
+          [
+              array_metadata_lib.ArrayMetadata(
+                  param_name='a',
+                  shape=(10, 20, 30),
+                  dtype=np.dtype(int),
+                  write_shape=(10, 20, 30),
+                  chunk_shape=(1, 2, 3),
+                  use_ocdbt=False,
+                  use_zarr3=False,
+              ),
+          ],
+          process_index=process_index,
+      )
+    expected = [
+        array_metadata_lib.SerializedArrayMetadata(
+            param_name='a',
+            write_shape=(10, 20, 30),
+            chunk_shape=(1, 2, 3),
+        )
+    ]
+
+    await array_metadata_store_lib.validate_all_array_metadatas(
+        array_metadata_store_lib.Validator(),
+        self.store,
+        self.checkpoint_dir,
+    )
+    # Only the consolidated file is read from now on.
+    for file_path in (self.checkpoint_dir / 'array_metadatas').glob(
+        'process_*'
+    ):
+      file_path.unlink()
+
+    array_metadatas = await self.store.read(self.checkpoint_dir)
+    self.assertEqual(array_metadatas, {0: expected, 1: expected, 2: expected})
+    self.assertIs(array_metadatas[0], array_metadatas[2])
+    # Reading a single process still reads the file of that process.
+    self.assertIsNone(await self.store.read(self.checkpoint_dir, 1))
+
 
 class ResolveArrayMetadataStoreTest(parameterized.TestCase):
 
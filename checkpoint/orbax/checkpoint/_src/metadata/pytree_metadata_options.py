@@ -26,11 +26,17 @@ class PyTreeMetadataOptions:
       notice.] If True, supports NamedTuple and Tuple node types in the
       metadata. Otherwise, a NamedTuple node is converted to dict and Tuple node
       to list.
+    use_compact_format: If True, the metadata file is written in a compact
+      binary format (see `tree_compact`) rather than JSON, which is smaller
+      and faster to parse for trees with many leaves. Older versions of Orbax
+      cannot read checkpoints saved with this option. Reading detects the
+      format, so this option does not affect restoring.
   """
 
   # TODO: b/365169723 - Support different namedtuple ser/deser strategies.
 
   support_rich_types: bool = False
+  use_compact_format: bool = False
 
 
 # Global default options.
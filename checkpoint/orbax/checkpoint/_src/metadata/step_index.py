@@ -0,0 +1,151 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Persistent index of the steps of a checkpoint root directory.
+
+Loading the `CheckpointInfo` of every step otherwise requires listing the root
+directory, checking that each step is committed, and reading the commit
+timestamp and metrics of each step. The index records this information in a
+single file, so that it can be loaded with O(1) reads.
+
+The index is an append-only log of JSON lines, each of which either adds or
+deletes a step. It is replayed on read, and rewritten from scratch when it is
+rebuilt or has accumulated too many deleted steps.
+"""
+
+from __future__ import annotations
+
+import datetime
+import json
+import threading
+from typing import Any, Iterable, List, Optional, Sequence
+
+from absl import logging
+from etils import epath
+from orbax.checkpoint._src.metadata import checkpoint_info
+from orbax.checkpoint._src.path import step as step_lib
+
+
+CheckpointInfo = checkpoint_info.CheckpointInfo
+
+STEP_INDEX_FILENAME = '_STEP_INDEX'
+
+_ADD = 'add'
+_DELETE = 'delete'
+_TIME = 'time'
+_METRICS = 'metrics'
+
+# The index is compacted when it holds more than this many records per step.
+_MAX_RECORDS_PER_STEP = 2
+_MIN_RECORDS_TO_COMPACT = 64
+
+
+def step_index_file_path(metadata_dir: epath.PathLike) -> epath.Path:
+  """Returns the path of the step index in root metadata dir."""
+  return epath.Path(metadata_dir) / STEP_INDEX_FILENAME
+
+
+def _add_record(info: CheckpointInfo) -> dict[str, Any]:
+  return {
+      _ADD: info.step,
+      _TIME: info.time.timestamp(),
+      _METRICS: info.metrics,
+  }
+
+
+class StepIndex:
+  """Append-only log of the committed and deleted steps of a directory.
+
+  Writes are expected from a single process, e.g. the primary host.
+  """
+
+  def __init__(self, path: epath.PathLike):
+    self._path = epath.Path(path)
+    self._num_records = 0
+    self._lock = threading.Lock()
+
+  @property
+  def path(self) -> epath.Path:
+    return self._path
+
+  def read(self) -> Optional[List[CheckpointInfo]]:
+    """Returns the indexed steps sorted by step, or None if not usable.
+
+    Returns None if the index does not exist or cannot be parsed, e.g. if a
+    write was interrupted.
+    """
+    try:
+      lines = self._path.read_text().splitlines()
+    except FileNotFoundError:
+      return None
+    infos = {}
+    try:
+      for line in lines:
+        record = json.loads(line)
+        if _ADD in record:
+          step = int(record[_ADD])
+          infos[step] = CheckpointInfo(
+              step=step,
+              time=datetime.datetime.fromtimestamp(
+                  record[_TIME], tz=datetime.timezone.utc
+              ),
+              metrics=record.get(_METRICS),
+          )
+        else:
+          for step in record[_DELETE]:
+            infos.pop(int(step), None)
+    except (ValueError, KeyError, TypeError) as e:
+      logging.warning('Ignoring invalid step index %s: %s', self._path, e)
+      return None
+    self._num_records = len(lines)
+    return sorted(infos.values(), key=lambda info: info.step)
+
+  def _append(self, records: Sequence[dict[str, Any]]) -> None:
+    data = ''.join(json.dumps(record) + '\n' for record in records)
+    with self._lock:
+      self._path.parent.mkdir(parents=True, exist_ok=True)
+      if step_lib.is_gcs_path(self._path):
+        # Objects cannot be appended to.
+        existing = self._path.read_text() if self._path.exists() else ''
+        self._path.write_text(existing + data)
+      else:
+        with self._path.open('a') as f:
+          f.write(data)
+      self._num_records += len(records)
+
+  def add(self, info: CheckpointInfo) -> None:
+    """Records that `info.step` was committed."""
+    self._append([_add_record(info)])
+
+  def delete(self, steps: Iterable[int]) -> None:
+    """Records that `steps` were deleted."""
+    steps = [int(step) for step in steps]
+    if steps:
+      self._append([{_DELETE: steps}])
+
+  def write(self, infos: Sequence[CheckpointInfo]) -> None:
+    """Replaces the index with `infos`."""
+    data = ''.join(json.dumps(_add_record(info)) + '\n' for info in infos)
+    with self._lock:
+      self._path.parent.mkdir(parents=True, exist_ok=True)
+      tmp_path = self._path.parent / f'{self._path.name}.tmp'
+      tmp_path.write_text(data)
+      tmp_path.replace(self._path)
+      self._num_records = len(infos)
+
+  def should_compact(self, num_steps: int) -> bool:
+    """Returns whether the index holds many records of deleted steps."""
+    return self._num_records > max(
+        _MIN_RECORDS_TO_COMPACT, _MAX_RECORDS_PER_STEP * num_steps
+    )
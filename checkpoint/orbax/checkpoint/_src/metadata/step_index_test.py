@@ -0,0 +1,86 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for step_index module."""
+
+import datetime
+from absl.testing import absltest
+from etils import epath
+from orbax.checkpoint._src.metadata import checkpoint_info
+from orbax.checkpoint._src.metadata import step_index as step_index_lib
+
+CheckpointInfo = checkpoint_info.CheckpointInfo
+
+
+def build_info(step: int, metrics=None) -> CheckpointInfo:
+  return CheckpointInfo(
+      step=step,
+      time=datetime.datetime.fromtimestamp(
+          1_700_000_000 + step, tz=datetime.timezone.utc
+      ),
+      metrics=metrics,
+  )
+
+
+class StepIndexTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.path = step_index_lib.step_index_file_path(
+        epath.Path(self.create_tempdir().full_path) / 'metadata'
+    )
+    self.index = step_index_lib.StepIndex(self.path)
+
+  def test_read_missing(self):
+    self.assertIsNone(self.index.read())
+
+  def test_add_and_delete(self):
+    self.index.add(build_info(2, {'loss': 0.5}))
+    self.index.add(build_info(1))
+    self.index.add(build_info(3))
+    self.index.delete([1, 4])
+
+    self.assertEqual(
+        step_index_lib.StepIndex(self.path).read(),
+        [build_info(2, {'loss': 0.5}), build_info(3)],
+    )
+
+  def test_write_replaces_index(self):
+    self.index.add(build_info(1))
+    self.index.write([build_info(5), build_info(6)])
+
+    self.assertEqual(self.index.read(), [build_info(5), build_info(6)])
+
+  def test_read_invalid(self):
+    self.index.add(build_info(1))
+    with self.path.open('a') as f:
+      f.write('{"add": 2, ')
+
+    self.assertIsNone(self.index.read())
+
+  def test_should_compact(self):
+    self.index.write([build_info(0)])
+    for step in range(1, 100):
+      self.index.add(build_info(step))
+      self.index.delete([step - 1])
+
+    index = step_index_lib.StepIndex(self.path)
+    self.assertEqual(index.read(), [build_info(99)])
+    self.assertTrue(index.should_compact(1))
+    index.write(index.read())
+    self.assertFalse(index.should_compact(1))
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -25,7 +25,7 @@ import inspect
 import json
 import operator
 import typing
-from typing import Any, Dict, Hashable, List, Optional, Protocol, Tuple, TypeAlias, TypeVar, Union
+from typing import Any, Dict, Hashable, List, Optional, Protocol, Sequence, Tuple, TypeAlias, TypeVar, Union
 
 from absl import logging
 from etils import epath
@@ -33,6 +33,7 @@ import jax
 from orbax.checkpoint._src import asyncio_utils
 from orbax.checkpoint._src.metadata import empty_values
 from orbax.checkpoint._src.metadata import pytree_metadata_options as pytree_metadata_options_lib
+from orbax.checkpoint._src.metadata import tree_compact
 from orbax.checkpoint._src.metadata import tree_rich_types
 from orbax.checkpoint._src.metadata import value as value_metadata
 from orbax.checkpoint._src.metadata import value_metadata_entry
@@ -188,9 +189,15 @@ class InternalTreeMetadataEntry:
       save_arg: types.SaveArgs,
   ) -> InternalTreeMetadataEntry:
     """Builds a InternalTreeMetadataEntry."""
+    key_metadata = KeyMetadataEntry.build(keypath)
     return InternalTreeMetadataEntry(
-        keypath=str(tuple([str(tree_utils.get_key_name(k)) for k in keypath])),
-        key_metadata=KeyMetadataEntry.build(keypath),
+        keypath=str(
+            tuple([
+                entry.nested_key_name
+                for entry in key_metadata.nested_key_metadata_entries
+            ])
+        ),
+        key_metadata=key_metadata,
         value_metadata=ValueMetadataEntry.build(info, save_arg),
     )
 
@@ -436,6 +443,136 @@ class InternalTreeMetadata:
         store_array_data_equal_to_fill_value=store_array_data_equal_to_fill_value,
     )
 
+  def to_compact_bytes(self) -> bytes:
+    """Returns the metadata in the compact binary format.
+
+    See `tree_compact` for the layout. Holds the same information as
+    `to_json`.
+    """
+    header = {
+        _USE_ZARR3: self.use_zarr3,
+        _STORE_ARRAY_DATA_EQUAL_TO_FILL_VALUE: (
+            self.store_array_data_equal_to_fill_value
+        ),
+        # Kept as JSON, which accepts values (e.g. large ints) that msgpack
+        # does not.
+        _CUSTOM_METADATA: json.dumps(self.custom_metadata),
+    }
+    if (
+        self.pytree_metadata_options.support_rich_types
+        and self.value_metadata_tree is not None
+    ):
+      header[_VALUE_METADATA_TREE] = (
+          tree_rich_types.value_metadata_tree_to_json_str(
+              self.value_metadata_tree
+          )
+      )
+    entries = self.tree_metadata_entries
+    return tree_compact.encode(
+        keypaths=[
+            [
+                (key.nested_key_name, key.key_type.to_json())
+                for key in entry.key_metadata.nested_key_metadata_entries
+            ]
+            for entry in entries
+        ],
+        value_types=[entry.value_metadata.value_type for entry in entries],
+        skip_deserialize=[
+            entry.value_metadata.skip_deserialize for entry in entries
+        ],
+        write_shapes=[entry.value_metadata.write_shape for entry in entries],
+        header=header,
+    )
+
+  @classmethod
+  def from_compact_bytes(
+      cls,
+      data: bytes,
+      pytree_metadata_options: PyTreeMetadataOptions = (
+          PYTREE_METADATA_OPTIONS
+      ),
+  ) -> InternalTreeMetadata:
+    """Returns an InternalTreeMetadata instance from `to_compact_bytes`."""
+    compact = tree_compact.CompactTreeMetadata(data)
+    header = compact.header
+    # Keys are shared by the leaves below them.
+    nested_keys = {}
+
+    def _nested_key(key: tree_compact.Key) -> NestedKeyMetadataEntry:
+      if (nested_key := nested_keys.get(key)) is None:
+        nested_key = nested_keys[key] = NestedKeyMetadataEntry(
+            nested_key_name=key[0], key_type=KeyType.from_json(key[1])
+        )
+      return nested_key
+
+    legacy_options = PyTreeMetadataOptions(support_rich_types=False)
+    tree_metadata_entries = []
+    for i in range(len(compact)):
+      keypath = compact.keypath(i)
+      tree_metadata_entries.append(
+          InternalTreeMetadataEntry(
+              keypath=str(tuple([name for name, _ in keypath])),
+              key_metadata=KeyMetadataEntry(
+                  [_nested_key(key) for key in keypath]
+              ),
+              value_metadata=ValueMetadataEntry(
+                  value_type=empty_values.override_empty_value_typestr(
+                      compact.value_type(i), legacy_options
+                  ),
+                  skip_deserialize=compact.skip_deserialize(i),
+                  write_shape=compact.write_shape(i),
+              ),
+          )
+      )
+    value_metadata_tree = None
+    if (
+        pytree_metadata_options.support_rich_types
+        and _VALUE_METADATA_TREE in header
+    ):
+      value_metadata_tree = tree_rich_types.value_metadata_tree_from_json_str(
+          header[_VALUE_METADATA_TREE]
+      )
+    return InternalTreeMetadata(
+        tree_metadata_entries=tree_metadata_entries,
+        use_zarr3=header.get(_USE_ZARR3, False),
+        custom_metadata=json.loads(header.get(_CUSTOM_METADATA, 'null')),
+        pytree_metadata_options=pytree_metadata_options,
+        value_metadata_tree=value_metadata_tree,
+        store_array_data_equal_to_fill_value=header.get(
+            _STORE_ARRAY_DATA_EQUAL_TO_FILL_VALUE, False
+        ),
+    )
+
+  def serialize(self) -> bytes:
+    """Returns the contents of the metadata file.
+
+    Uses the compact format if `pytree_metadata_options.use_compact_format`,
+    and JSON otherwise.
+    """
+    if self.pytree_metadata_options.use_compact_format:
+      return self.to_compact_bytes()
+    return json.dumps(self.to_json()).encode()
+
+  @classmethod
+  def deserialize(
+      cls,
+      data: bytes,
+      pytree_metadata_options: PyTreeMetadataOptions = (
+          PYTREE_METADATA_OPTIONS
+      ),
+  ) -> InternalTreeMetadata:
+    """Returns an InternalTreeMetadata from metadata file contents.
+
+    Detects whether `data` is in the compact or the JSON format.
+
+    Args:
+      data: Contents of the metadata file, as written by `serialize`.
+      pytree_metadata_options: Options for reading the metadata.
+    """
+    if tree_compact.is_compact(data):
+      return cls.from_compact_bytes(data, pytree_metadata_options)
+    return cls.from_json(json.loads(data), pytree_metadata_options)
+
   def as_nested_tree(self) -> Dict[str, Any]:
     """Converts to a nested tree, with leaves of ValueMetadataEntry."""
     # TODO: b/365169723 - Support versioned evolution of metadata storage.
@@ -473,62 +610,108 @@ class InternalTreeMetadata:
         leaves. See `TypeHandler.metadata()`.
       use_ocdbt: Whether to use OCDBT for reading the metadata from tensorstore.
     """
-    flat_param_infos = {}
-    flat_restore_types = {}
     reference_metadata_tree = self.as_nested_tree()
-    ts_context = ts_utils.get_ts_context(use_ocdbt=use_ocdbt)
-    for keypath, value_meta in tree_utils.to_flat_dict(
-        reference_metadata_tree
-    ).items():
-      param_name = '.'.join(keypath)
-      flat_param_infos[keypath] = types.ParamInfo(
-          name=param_name,
-          path=directory / param_name,
-          parent_dir=directory,
-          skip_deserialize=value_meta.skip_deserialize,
-          is_ocdbt_checkpoint=use_ocdbt,
-          use_zarr3=self.use_zarr3,
-          ts_context=ts_context,
-          write_shape=value_meta.write_shape,
-      )
-      flat_restore_types[keypath] = value_meta.value_type
+    flat_metadatas = asyncio_utils.run_sync(
+        self._load_value_metadata(
+            tree_utils.to_flat_dict(reference_metadata_tree),
+            directory,
+            type_handler_registry,
+            use_ocdbt=use_ocdbt,
+        )
+    )
+    return tree_utils.from_flat_dict(
+        flat_metadatas, target=reference_metadata_tree
+    )
+
+  def as_lazy_custom_metadata(
+      self,
+      directory: epath.Path,
+      type_handler_registry: types.TypeHandlerRegistry,
+      *,
+      use_ocdbt: bool = True,
+  ) -> LazyTreeMetadata:
+    """Returns a `LazyTreeMetadata` that loads leaves on access.
+
+    Equivalent to `as_custom_metadata`, but the metadata of each leaf is only
+    read from the checkpoint when the leaf, or a subtree containing it, is
+    accessed.
+
+    Args:
+      directory: The directory to read the checkpoint from.
+      type_handler_registry: `TypeHandlerRegistry` whose registered
+        TypeHandlers' metadata are used to build the `ValueMetadataEntry`
+        leaves. See `TypeHandler.metadata()`.
+      use_ocdbt: Whether to use OCDBT for reading the metadata from tensorstore.
+    """
+    return LazyTreeMetadata(
+        reference_tree=self.as_nested_tree(),
+        loader=_LeafMetadataLoader(
+            self, directory, type_handler_registry, use_ocdbt=use_ocdbt
+        ),
+        custom_metadata=self.custom_metadata,
+    )
+
+  async def _load_value_metadata(
+      self,
+      flat_value_metadata: Dict[Tuple[str, ...], ValueMetadataEntry],
+      directory: epath.Path,
+      type_handler_registry: types.TypeHandlerRegistry,
+      *,
+      use_ocdbt: bool,
+  ) -> Dict[Tuple[str, ...], Any]:
+    """Returns user-facing metadata for the given leaves, keyed by keypath.
+
+    Leaves are batched by value type, so that each `TypeHandler.metadata()` is
+    called at most once.
 
+    Args:
+      flat_value_metadata: `ValueMetadataEntry` of each leaf to load, keyed by
+        the tuple keypath of the leaf, as returned by `tree_utils.to_flat_dict`.
+      directory: The directory to read the checkpoint from.
+      type_handler_registry: `TypeHandlerRegistry` used to load the metadata.
+      use_ocdbt: Whether to use OCDBT for reading the metadata from tensorstore.
+    """
+    ts_context = ts_utils.get_ts_context(use_ocdbt=use_ocdbt)
     flat_metadatas = {}
     batched_param_infos = collections.defaultdict(list)
     batched_keypaths = collections.defaultdict(list)
-    for keypath in flat_param_infos:
-      param_info = flat_param_infos[keypath]
-      restore_type = flat_restore_types[keypath]
-      if param_info.skip_deserialize:
+    for keypath, value_meta in flat_value_metadata.items():
+      param_name = '.'.join(keypath)
+      restore_type = value_meta.value_type
+      if value_meta.skip_deserialize:
         if empty_values.is_empty_typestr(restore_type):
           flat_metadatas[keypath] = empty_values.get_empty_value_from_typestr(
               restore_type, self.pytree_metadata_options
           )
         else:
           flat_metadatas[keypath] = value_metadata.Metadata(
-              name=param_info.name, directory=param_info.parent_dir
+              name=param_name, directory=directory
           )
-      else:
-        batched_keypaths[restore_type].append(keypath)
-        batched_param_infos[restore_type].append(param_info)
-
-    metadata_ops = []
-    for restore_type, param_infos in batched_param_infos.items():
-      handler = type_handler_registry.get(restore_type)
-      metadata_ops.append(handler.metadata(param_infos))
-
-    async def _get_metadata():
-      return await asyncio.gather(*metadata_ops)
+        continue
+      batched_keypaths[restore_type].append(keypath)
+      batched_param_infos[restore_type].append(
+          types.ParamInfo(
+              name=param_name,
+              path=directory / param_name,
+              parent_dir=directory,
+              skip_deserialize=value_meta.skip_deserialize,
+              is_ocdbt_checkpoint=use_ocdbt,
+              use_zarr3=self.use_zarr3,
+              ts_context=ts_context,
+              write_shape=value_meta.write_shape,
+          )
+      )
 
-    batched_metadatas = asyncio_utils.run_sync(_get_metadata())
+    batched_metadatas = await asyncio.gather(*[
+        type_handler_registry.get(restore_type).metadata(param_infos)
+        for restore_type, param_infos in batched_param_infos.items()
+    ])
     for keypath_batch, metadata_batch in zip(
         batched_keypaths.values(), batched_metadatas
     ):
       for keypath, value in zip(keypath_batch, metadata_batch):
         flat_metadatas[keypath] = value
-    return tree_utils.from_flat_dict(
-        flat_metadatas, target=reference_metadata_tree
-    )
+    return flat_metadatas
 
 
 def serialize_tree(
@@ -918,3 +1101,280 @@ def build_default_tree_metadata(
       tree,
       custom_metadata=custom_metadata,
   )
+
+
+class _LeafMetadataLoader:
+  """Loads and caches the user-facing metadata of leaves of a checkpoint."""
+
+  def __init__(
+      self,
+      internal_tree_metadata: InternalTreeMetadata,
+      directory: epath.Path,
+      type_handler_registry: types.TypeHandlerRegistry,
+      *,
+      use_ocdbt: bool,
+  ):
+    self._internal_tree_metadata = internal_tree_metadata
+    self._directory = directory
+    self._type_handler_registry = type_handler_registry
+    self._use_ocdbt = use_ocdbt
+    self._cache: Dict[Tuple[str, ...], Any] = {}
+
+  @property
+  def num_loaded(self) -> int:
+    return len(self._cache)
+
+  def load(
+      self, flat_value_metadata: Dict[Tuple[str, ...], ValueMetadataEntry]
+  ) -> Dict[Tuple[str, ...], Any]:
+    """Returns metadata of the given leaves, loading missing ones together."""
+    missing = {
+        k: v for k, v in flat_value_metadata.items() if k not in self._cache
+    }
+    if missing:
+      self._cache.update(
+          asyncio_utils.run_sync(
+              self._internal_tree_metadata._load_value_metadata(  # pylint: disable=protected-access
+                  missing,
+                  self._directory,
+                  self._type_handler_registry,
+                  use_ocdbt=self._use_ocdbt,
+              )
+          )
+      )
+    return {k: self._cache[k] for k in flat_value_metadata}
+
+
+class _InMemoryLeafMetadataLoader:
+  """Leaf loader for trees whose leaves already hold the user-facing metadata."""
+
+  def __init__(self):
+    self._loaded: set[Tuple[str, ...]] = set()
+
+  @property
+  def num_loaded(self) -> int:
+    return len(self._loaded)
+
+  def load(
+      self, flat_value_metadata: Dict[Tuple[str, ...], Any]
+  ) -> Dict[Tuple[str, ...], Any]:
+    self._loaded.update(flat_value_metadata)
+    return dict(flat_value_metadata)
+
+
+def _is_container(node: Any) -> bool:
+  return isinstance(node, (dict, list, tuple))
+
+
+def _child_name(node: PyTree, key: str | int) -> str:
+  """Returns the name of `node[key]` in tuple keypaths, or raises KeyError."""
+  if isinstance(node, dict):
+    if key not in node:
+      raise KeyError(key)
+    return str(key)
+  if tree_utils.isinstance_of_namedtuple(node) and isinstance(key, str):
+    if key not in node._fields:
+      raise KeyError(key)
+    return key
+  if not isinstance(key, int):
+    raise KeyError(key)
+  if not -len(node) <= key < len(node):
+    raise IndexError(key)
+  if tree_utils.isinstance_of_namedtuple(node):
+    return node._fields[key]
+  return str(key % len(node))
+
+
+def _get_child(node: PyTree, key: str | int) -> PyTree:
+  if tree_utils.isinstance_of_namedtuple(node) and isinstance(key, str):
+    return getattr(node, key)
+  return node[key]
+
+
+@jax.tree_util.register_pytree_with_keys_class
+class LazyTreeMetadata(TreeMetadata):
+  """`TreeMetadata` whose leaves are only loaded from the checkpoint on access.
+
+  The structure of the tree is known upfront, from the PyTree metadata file,
+  but the user-facing metadata of each leaf (e.g. array shape, dtype and
+  chunking) is only read when needed. Indexing returns a `LazyTreeMetadata`
+  view for inner nodes, and the loaded metadata for leaves::
+
+    metadata = handler.lazy_metadata(directory)
+    encoder = metadata['params']['encoder']  # Nothing is loaded yet.
+    encoder['kernel'].shape  # Loads a single leaf.
+    encoder.tree  # Loads all leaves under 'encoder' in one batch.
+    metadata.subtree(['params', 'decoder']).tree
+
+  Leaves requested together are loaded with a single `TypeHandler.metadata()`
+  call per value type, and loaded leaves are cached across views.
+
+  Flattening with `jax.tree_util` loads all leaves of the view, and
+  unflattening returns a regular `TreeMetadata`.
+  """
+
+  def __init__(
+      self,
+      *,
+      reference_tree: PyTree,
+      loader: _LeafMetadataLoader,
+      custom_metadata: PyTree | None = None,
+      prefix: Tuple[str, ...] = (),
+  ):
+    if not _is_container(reference_tree):
+      raise ValueError(f'Unsupported tree type: {type(reference_tree)}')
+    self._reference_tree = reference_tree
+    self._loader = loader
+    self._custom_metadata = custom_metadata
+    self._prefix = prefix
+    self._tree = None
+
+  def __repr__(self):
+    return (
+        f'LazyTreeMetadata(prefix={self._prefix},'
+        f' loaded_leaves={self._loader.num_loaded})'
+    )
+
+  @property
+  def prefix(self) -> Tuple[str, ...]:
+    """Tuple keypath of this view, relative to the root of the checkpoint."""
+    return self._prefix
+
+  @property
+  def tree(self) -> PyTree:
+    """Loads all leaves of this view, returning them as a regular PyTree."""
+    if self._tree is None:
+      flat_value_metadata = tree_utils.to_flat_dict(self._reference_tree)
+      loaded = self._loader.load({
+          self._prefix + keypath: value_meta
+          for keypath, value_meta in flat_value_metadata.items()
+      })
+      self._tree = tree_utils.from_flat_dict(
+          {k: loaded[self._prefix + k] for k in flat_value_metadata},
+          target=self._reference_tree,
+      )
+    return self._tree
+
+  @property
+  def custom_metadata(self) -> PyTree | None:
+    return self._custom_metadata
+
+  def _view(self, key: str | int) -> Any:
+    """Returns a view of the child node at `key`, or the loaded leaf."""
+    name = _child_name(self._reference_tree, key)
+    child = _get_child(self._reference_tree, key)
+    if _is_container(child):
+      return LazyTreeMetadata(
+          reference_tree=child,
+          loader=self._loader,
+          custom_metadata=self._custom_metadata,
+          prefix=self._prefix + (name,),
+      )
+    keypath = self._prefix + (name,)
+    return self._loader.load({keypath: child})[keypath]
+
+  def _prefetch_leaf_children(self):
+    """Loads all direct leaf children of this view in a single batch."""
+    if isinstance(self._reference_tree, dict):
+      children = self._reference_tree.items()
+    elif tree_utils.isinstance_of_namedtuple(self._reference_tree):
+      children = self._reference_tree._asdict().items()
+    else:
+      children = enumerate(self._reference_tree)
+    self._loader.load({
+        self._prefix + (str(k),): child
+        for k, child in children
+        if not _is_container(child)
+    })
+
+  def subtree(self, path: Sequence[str | int]) -> Any:
+    """Returns the node at `path`, relative to this view.
+
+    Args:
+      path: Keys to follow from this view, e.g. `['params', 'encoder']`.
+
+    Returns:
+      A `LazyTreeMetadata` view if `path` leads to an inner node, and the
+      loaded metadata if it leads to a leaf.
+
+    Raises:
+      KeyError: if `path` does not exist in the tree.
+    """
+    node = self
+    for i, key in enumerate(path):
+      if not isinstance(node, LazyTreeMetadata):
+        raise KeyError(f'Path {list(path[:i])} leads to a leaf.')
+      node = node[key]
+    return node
+
+  def tree_flatten(self):
+    return build_default_tree_metadata(
+        self.tree, custom_metadata=self._custom_metadata
+    ).tree_flatten()
+
+  def tree_flatten_with_keys(self):
+    return build_default_tree_metadata(
+        self.tree, custom_metadata=self._custom_metadata
+    ).tree_flatten_with_keys()
+
+  @classmethod
+  def tree_unflatten(cls, aux_data, flat_tree):
+    return _TreeMetadataImpl.tree_unflatten(aux_data, flat_tree)
+
+  def __getitem__(self, key: str | int) -> Any:
+    """Returns a view of the inner node at `key`, or the loaded leaf."""
+    return self._view(key)
+
+  def __contains__(self, key: str | int) -> bool:
+    return key in self._reference_tree
+
+  def __len__(self) -> int:
+    return len(self._reference_tree)
+
+  def __iter__(self):
+    return iter(self._reference_tree)
+
+  def get(self, key: str, default=None):
+    try:
+      return self.__getitem__(key)
+    except KeyError:
+      return default
+    except IndexError:
+      return default
+
+  def keys(self):
+    return self._reference_tree.keys()
+
+  def values(self):
+    self._prefetch_leaf_children()
+    return [self._view(k) for k in self._reference_tree.keys()]
+
+  def items(self):
+    self._prefetch_leaf_children()
+    return [(k, self._view(k)) for k in self._reference_tree.keys()]
+
+  @classmethod
+  def build(
+      cls,
+      tree: PyTree,
+      *,
+      custom_metadata: PyTree | None = None,
+  ) -> TreeMetadata:
+    """Builds a `LazyTreeMetadata` over an already loaded `tree`.
+
+    Checkpoint-backed instances are created with
+    `InternalTreeMetadata.as_lazy_custom_metadata` instead; here the leaves
+    of `tree` are already the user-facing metadata, so nothing is loaded.
+
+    Args:
+      tree: The PyTree of user-facing leaf metadata.
+      custom_metadata: User-provided custom metadata.
+
+    Returns:
+      A `LazyTreeMetadata` view of the root of `tree`.
+    """
+    return cls(
+        reference_tree=tree,
+        loader=_InMemoryLeafMetadataLoader(),
+        custom_metadata=custom_metadata,
+    )
@@ -0,0 +1,199 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Compact binary storage format for PyTree metadata.
+
+The JSON format written by `InternalTreeMetadata.to_json` repeats every key of
+every keypath, along with verbose per-key dicts. For trees with many leaves
+this makes the metadata file large and slow to parse. This module implements
+an alternative columnar format, serialized with msgpack:
+
+* Key names and value types are interned in a single string table.
+* Keypaths are stored as a prefix-shared table of nodes, each referring to its
+  parent node, so that a key shared by many leaves is stored once.
+* Per-leaf value metadata is stored as columns.
+
+The data starts with `MAGIC` and a format version, followed by two msgpack
+objects: a small header with checkpoint-level fields, and the columns. The
+header can be read without decoding the columns, see `read_header`.
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import msgpack
+
+
+# The first byte is not valid in a JSON document, so compact metadata cannot
+# be confused with the JSON format.
+MAGIC = b'\x89OTM'
+FORMAT_VERSION = 1
+_VERSION_FORMAT = '<H'
+_PREFIX_SIZE = len(MAGIC) + struct.calcsize(_VERSION_FORMAT)
+
+# A key of a keypath, as (key name, key type).
+Key = Tuple[str, int]
+
+_NO_PARENT = -1
+
+_STRINGS = 'strings'
+_NODE_PARENT = 'node_parent'
+_NODE_NAME = 'node_name'
+_NODE_KEY_TYPE = 'node_key_type'
+_LEAF_NODE = 'leaf_node'
+_LEAF_VALUE_TYPE = 'leaf_value_type'
+_LEAF_SKIP_DESERIALIZE = 'leaf_skip_deserialize'
+_LEAF_WRITE_SHAPE = 'leaf_write_shape'
+
+
+def is_compact(data: bytes) -> bool:
+  """Returns whether `data` holds metadata in the compact format."""
+  return data.startswith(MAGIC)
+
+
+def _check_prefix(data: bytes) -> int:
+  """Validates the magic and version of `data`, returning the version."""
+  if not is_compact(data):
+    raise ValueError('Data is not in the compact PyTree metadata format.')
+  (version,) = struct.unpack_from(_VERSION_FORMAT, data, len(MAGIC))
+  if version > FORMAT_VERSION:
+    raise ValueError(
+        f'Compact PyTree metadata has format version {version}, but only'
+        f' versions up to {FORMAT_VERSION} are supported. Please upgrade'
+        ' Orbax to read this checkpoint.'
+    )
+  return version
+
+
+def encode(
+    keypaths: Sequence[Sequence[Key]],
+    value_types: Sequence[str],
+    skip_deserialize: Sequence[bool],
+    write_shapes: Sequence[Optional[Sequence[int]]],
+    header: Dict[str, Any],
+) -> bytes:
+  """Encodes PyTree metadata in the compact format.
+
+  Args:
+    keypaths: The keypath of each leaf.
+    value_types: The value type of each leaf.
+    skip_deserialize: Whether each leaf is skipped when restoring.
+    write_shapes: The write shape of each leaf, or None.
+    header: Checkpoint-level fields. Must be serializable by msgpack.
+
+  Returns:
+    The encoded metadata.
+  """
+  strings: List[str] = []
+  string_ids: Dict[str, int] = {}
+
+  def intern(s: str) -> int:
+    if (i := string_ids.get(s)) is None:
+      i = string_ids[s] = len(strings)
+      strings.append(s)
+    return i
+
+  node_parent, node_name, node_key_type = [], [], []
+  node_ids: Dict[Tuple[int, int, int], int] = {}
+  leaf_node = []
+  for keypath in keypaths:
+    node = _NO_PARENT
+    for name, key_type in keypath:
+      node_key = (node, intern(name), key_type)
+      if (child := node_ids.get(node_key)) is None:
+        child = node_ids[node_key] = len(node_parent)
+        node_parent.append(node)
+        node_name.append(node_key[1])
+        node_key_type.append(key_type)
+      node = child
+    leaf_node.append(node)
+
+  columns = {
+      _NODE_PARENT: node_parent,
+      _NODE_NAME: node_name,
+      _NODE_KEY_TYPE: node_key_type,
+      _LEAF_NODE: leaf_node,
+      _LEAF_VALUE_TYPE: [intern(t) for t in value_types],
+      _LEAF_SKIP_DESERIALIZE: [bool(s) for s in skip_deserialize],
+      _LEAF_WRITE_SHAPE: [
+          None if shape is None else list(shape) for shape in write_shapes
+      ],
+      _STRINGS: strings,
+  }
+  return b''.join([
+      MAGIC,
+      struct.pack(_VERSION_FORMAT, FORMAT_VERSION),
+      msgpack.packb(header, use_bin_type=True),
+      msgpack.packb(columns, use_bin_type=True),
+  ])
+
+
+def read_header(data: bytes) -> Dict[str, Any]:
+  """Returns the header of compact metadata, without decoding the leaves."""
+  _check_prefix(data)
+  unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+  unpacker.feed(memoryview(data)[_PREFIX_SIZE:])
+  return unpacker.unpack()
+
+
+class CompactTreeMetadata:
+  """Decoded compact metadata, giving access to each leaf by index.
+
+  Keypaths are expanded from the prefix-shared node table on access.
+  """
+
+  def __init__(self, data: bytes):
+    self.version = _check_prefix(data)
+    unpacker = msgpack.Unpacker(raw=False, strict_map_key=False)
+    unpacker.feed(memoryview(data)[_PREFIX_SIZE:])
+    self.header: Dict[str, Any] = unpacker.unpack()
+    self._columns: Dict[str, Any] = unpacker.unpack()
+    self._strings = self._columns[_STRINGS]
+    self._node_keypaths: Dict[int, Tuple[Key, ...]] = {}
+
+  def __len__(self) -> int:
+    return len(self._columns[_LEAF_NODE])
+
+  def _node_keypath(self, node: int) -> Tuple[Key, ...]:
+    """Returns the keypath ending at `node`, memoizing it and its prefixes."""
+    parents = self._columns[_NODE_PARENT]
+    # Iterative, so that deep trees do not exceed the recursion limit.
+    uncached = []
+    while node != _NO_PARENT and node not in self._node_keypaths:
+      uncached.append(node)
+      node = parents[node]
+    keypath = self._node_keypaths.get(node, ())
+    for node in reversed(uncached):
+      keypath += ((
+          self._strings[self._columns[_NODE_NAME][node]],
+          self._columns[_NODE_KEY_TYPE][node],
+      ),)
+      self._node_keypaths[node] = keypath
+    return keypath
+
+  def keypath(self, i: int) -> Tuple[Key, ...]:
+    """Returns the keypath of leaf `i`."""
+    return self._node_keypath(self._columns[_LEAF_NODE][i])
+
+  def value_type(self, i: int) -> str:
+    return self._strings[self._columns[_LEAF_VALUE_TYPE][i]]
+
+  def skip_deserialize(self, i: int) -> bool:
+    return self._columns[_LEAF_SKIP_DESERIALIZE][i]
+
+  def write_shape(self, i: int) -> Optional[Tuple[int, ...]]:
+    shape = self._columns[_LEAF_WRITE_SHAPE][i]
+    return None if shape is None else tuple(shape)
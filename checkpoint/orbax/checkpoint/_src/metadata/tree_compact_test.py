@@ -0,0 +1,103 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import struct
+
+from absl.testing import absltest
+from orbax.checkpoint._src.metadata import tree_compact
+
+
+_KEYPATHS = [
+    (('params', 2), ('layer_0', 2), ('kernel', 2)),
+    (('params', 2), ('layer_0', 2), ('bias', 2)),
+    (('params', 2), ('layer_1', 2), ('kernel', 2)),
+    (('opt_state', 2), ('0', 1)),
+    (('step', 2),),
+]
+
+
+def _encode(header=None):
+  return tree_compact.encode(
+      keypaths=_KEYPATHS,
+      value_types=['jax.Array'] * 3 + ['None', 'scalar'],
+      skip_deserialize=[False] * 3 + [True, False],
+      write_shapes=[(8, 4), (4,), (8, 4), None, None],
+      header=header or {'use_zarr3': True},
+  )
+
+
+class TreeCompactTest(absltest.TestCase):
+
+  def test_round_trip(self):
+    data = _encode()
+    self.assertTrue(tree_compact.is_compact(data))
+    compact = tree_compact.CompactTreeMetadata(data)
+    self.assertEqual(compact.version, tree_compact.FORMAT_VERSION)
+    self.assertEqual(compact.header, {'use_zarr3': True})
+    self.assertLen(compact, len(_KEYPATHS))
+    self.assertEqual(
+        [compact.keypath(i) for i in range(len(compact))], _KEYPATHS
+    )
+    self.assertEqual(compact.value_type(0), 'jax.Array')
+    self.assertEqual(compact.value_type(4), 'scalar')
+    self.assertTrue(compact.skip_deserialize(3))
+    self.assertEqual(compact.write_shape(0), (8, 4))
+    self.assertIsNone(compact.write_shape(3))
+
+  def test_read_header(self):
+    header = {'use_zarr3': False, 'custom_metadata': '{"a": 1}'}
+    self.assertEqual(tree_compact.read_header(_encode(header)), header)
+
+  def test_smaller_than_json(self):
+    keypaths = [
+        (('params', 2), (f'layer_{i // 8}', 2), (f'expert_{i % 8}', 2))
+        for i in range(1024)
+    ]
+    data = tree_compact.encode(
+        keypaths=keypaths,
+        value_types=['jax.Array'] * len(keypaths),
+        skip_deserialize=[False] * len(keypaths),
+        write_shapes=[None] * len(keypaths),
+        header={},
+    )
+    json_data = json.dumps({
+        str(tuple(name for name, _ in keypath)): {
+            'key_metadata': [
+                {'key': name, 'key_type': key_type}
+                for name, key_type in keypath
+            ],
+            'value_metadata': {
+                'value_type': 'jax.Array',
+                'skip_deserialize': False,
+            },
+        }
+        for keypath in keypaths
+    })
+    self.assertLess(len(data) * 5, len(json_data))
+
+  def test_not_compact(self):
+    self.assertFalse(tree_compact.is_compact(b'{"tree_metadata": {}}'))
+    with self.assertRaisesRegex(ValueError, 'not in the compact'):
+      tree_compact.CompactTreeMetadata(b'{"tree_metadata": {}}')
+
+  def test_newer_version(self):
+    data = bytearray(_encode())
+    struct.pack_into('<H', data, len(tree_compact.MAGIC), 1000)
+    with self.assertRaisesRegex(ValueError, 'upgrade Orbax'):
+      tree_compact.CompactTreeMetadata(bytes(data))
+
+
+if __name__ == '__main__':
+  absltest.main()
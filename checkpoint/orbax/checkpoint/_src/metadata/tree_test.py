@@ -19,6 +19,7 @@ from absl.testing import parameterized
 import chex
 import jax
 from orbax.checkpoint._src.metadata import tree as tree_metadata_lib
+from orbax.checkpoint._src.metadata import tree_compact
 from orbax.checkpoint._src.serialization import type_handlers
 from orbax.checkpoint._src.serialization import types
 from orbax.checkpoint._src.testing import test_tree_utils
@@ -161,6 +162,64 @@ class InternalTreeMetadataEntryTest(parameterized.TestCase):
     self.assertEqual(internal_tree_metadata.custom_metadata, custom_metadata)
 
 
+  @parameterized.product(
+      test_pytree=test_tree_utils.TEST_PYTREES,
+      support_rich_types=[False, True],
+      use_compact_format=[False, True],
+  )
+  def test_serialize(
+      self,
+      test_pytree: test_tree_utils.TestPyTree,
+      support_rich_types: bool,
+      use_compact_format: bool,
+  ):
+    pytree_metadata_options = tree_metadata_lib.PyTreeMetadataOptions(
+        support_rich_types=support_rich_types,
+        use_compact_format=use_compact_format,
+    )
+    tree = test_pytree.provide_tree()
+    custom_metadata = {'a': 1, 'b': [{'c': 2}, 1]}
+    original_internal_tree_metadata = (
+        tree_metadata_lib.InternalTreeMetadata.build(
+            param_infos=_to_param_infos(tree, pytree_metadata_options),
+            custom_metadata=custom_metadata,
+            pytree_metadata_options=pytree_metadata_options,
+        )
+    )
+    data = original_internal_tree_metadata.serialize()
+    self.assertEqual(tree_compact.is_compact(data), use_compact_format)
+    # Reading detects the format.
+    restored_internal_tree_metadata = (
+        tree_metadata_lib.InternalTreeMetadata.deserialize(
+            data,
+            tree_metadata_lib.PyTreeMetadataOptions(
+                support_rich_types=support_rich_types
+            ),
+        )
+    )
+
+    from_json = tree_metadata_lib.InternalTreeMetadata.from_json(
+        original_internal_tree_metadata.to_json(), pytree_metadata_options
+    )
+    self.assertEqual(
+        restored_internal_tree_metadata.tree_metadata_entries,
+        from_json.tree_metadata_entries,
+    )
+    self.assertEqual(
+        restored_internal_tree_metadata.custom_metadata, custom_metadata
+    )
+    if support_rich_types:
+      expected_tree_metadata = (
+          test_pytree.expected_nested_tree_metadata_with_rich_types
+      )
+    else:
+      expected_tree_metadata = test_pytree.expected_nested_tree_metadata
+    chex.assert_trees_all_equal(
+        restored_internal_tree_metadata.as_nested_tree(),
+        expected_tree_metadata,
+    )
+
+
 class NestedNamedTuple(NamedTuple):
   a: int
   b: int
@@ -348,5 +407,126 @@ class TreeMetadataTest(parameterized.TestCase):
     self.assertEmpty(flat_with_keys)
 
 
+class _FakeLeafMetadataLoader:
+  """Loads a leaf as its reference value plus one, recording each batch."""
+
+  def __init__(self):
+    self.batches = []
+    self._cache = {}
+
+  @property
+  def num_loaded(self) -> int:
+    return len(self._cache)
+
+  def load(self, flat_value_metadata):
+    missing = {
+        k: v + 1 for k, v in flat_value_metadata.items() if k not in self._cache
+    }
+    if missing:
+      self.batches.append(sorted(missing))
+    self._cache.update(missing)
+    return {k: self._cache[k] for k in flat_value_metadata}
+
+
+class LazyTreeMetadataTest(parameterized.TestCase):
+
+  def _lazy(self, tree, custom_metadata=None):
+    loader = _FakeLeafMetadataLoader()
+    return (
+        tree_metadata_lib.LazyTreeMetadata(
+            reference_tree=tree,
+            loader=loader,
+            custom_metadata=custom_metadata,
+        ),
+        loader,
+    )
+
+  def test_dict_accessors(self):
+    metadata, loader = self._lazy(
+        {'a': 1, 'b': {'c': 2, 'd': {'e': 3}}}, custom_metadata={'foo': 1}
+    )
+    self.assertLen(metadata, 2)
+    self.assertIn('b', metadata)
+    self.assertNotIn('c', metadata)
+    b = metadata['b']
+    self.assertIsInstance(b, tree_metadata_lib.LazyTreeMetadata)
+    self.assertEqual(b.prefix, ('b',))
+    self.assertEqual(b.custom_metadata, {'foo': 1})
+    self.assertEmpty(loader.batches)
+    self.assertEqual(b['c'], 3)
+    self.assertEqual(metadata.subtree(['b', 'd', 'e']), 4)
+    self.assertEqual(loader.batches, [[('b', 'c')], [('b', 'd', 'e')]])
+    self.assertIsNone(metadata.get('c'))
+    with self.assertRaises(KeyError):
+      _ = metadata['c']
+    with self.assertRaises(KeyError):
+      metadata.subtree(['a', 'b'])
+
+  def test_subtree_is_loaded_in_one_batch(self):
+    metadata, loader = self._lazy({'a': 1, 'b': {'c': 2, 'd': [3, 4]}})
+    self.assertEqual(metadata['b'].tree, {'c': 3, 'd': [4, 5]})
+    self.assertEqual(
+        loader.batches, [[('b', 'c'), ('b', 'd', '0'), ('b', 'd', '1')]]
+    )
+    # Only leaves that were not loaded yet are requested.
+    self.assertEqual(metadata.tree, {'a': 2, 'b': {'c': 3, 'd': [4, 5]}})
+    self.assertEqual(loader.batches[1:], [[('a',)]])
+
+  def test_items_loads_leaf_children_in_one_batch(self):
+    metadata, loader = self._lazy({'a': 1, 'b': 2, 'c': {'d': 3}})
+    items = dict(metadata.items())
+    self.assertEqual(items['a'], 2)
+    self.assertEqual(items['b'], 3)
+    self.assertIsInstance(items['c'], tree_metadata_lib.LazyTreeMetadata)
+    self.assertEqual(loader.batches, [[('a',), ('b',)]])
+
+  @parameterized.parameters(([1, 2, [3]],), ((1, 2, (3,)),))
+  def test_sequence_accessors(self, tree):
+    metadata, _ = self._lazy(tree)
+    self.assertLen(metadata, 3)
+    self.assertEqual(metadata[0], 2)
+    self.assertEqual(metadata[-2], 3)
+    self.assertEqual(metadata[2][0], 4)
+    self.assertEqual(metadata[2].prefix, ('2',))
+    self.assertIsNone(metadata.get(3))
+    with self.assertRaises(IndexError):
+      _ = metadata[3]
+
+  def test_namedtuple(self):
+    metadata, loader = self._lazy(NestedNamedTuple(a=1, b=2, c={'d': 3}))
+    self.assertEqual(metadata['a'], 2)
+    self.assertEqual(metadata[1], 3)
+    self.assertEqual(metadata['c']['d'], 4)
+    self.assertEqual(loader.batches, [[('a',)], [('b',)], [('c', 'd')]])
+
+  def test_tree_map(self):
+    metadata, _ = self._lazy(
+        {'a': 1, 'b': {'c': [2, 3]}}, custom_metadata={'foo': 1}
+    )
+    metadata = jax.tree.map(lambda x: x * 10, metadata)
+    self.assertIsInstance(metadata, tree_metadata_lib.TreeMetadata)
+    self.assertEqual(metadata.tree, {'a': 20, 'b': {'c': [30, 40]}})
+    self.assertEqual(metadata.custom_metadata, {'foo': 1})
+
+  def test_invalid_tree_type(self):
+    with self.assertRaises(ValueError):
+      self._lazy(1)
+
+  def test_build(self):
+    metadata = tree_metadata_lib.LazyTreeMetadata.build(
+        {'a': 1, 'b': {'c': [2, 3]}}, custom_metadata={'foo': 1}
+    )
+    self.assertIsInstance(metadata, tree_metadata_lib.LazyTreeMetadata)
+    self.assertEqual(metadata['a'], 1)
+    self.assertEqual(metadata['b']['c'].prefix, ('b', 'c'))
+    self.assertEqual(metadata.subtree(['b', 'c', 1]), 3)
+    self.assertEqual(metadata.tree, {'a': 1, 'b': {'c': [2, 3]}})
+    self.assertEqual(metadata.custom_metadata, {'foo': 1})
+    self.assertEqual(
+        jax.tree.map(lambda x: x * 10, metadata).tree,
+        {'a': 10, 'b': {'c': [20, 30]}},
+    )
+
+
 if __name__ == '__main__':
   absltest.main()
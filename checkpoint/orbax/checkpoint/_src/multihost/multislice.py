@@ -15,11 +15,13 @@
 """Multislice utilities."""
 
 import functools
-from typing import Any, Optional, Set, Tuple, Union
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple, Union
 
 from absl import logging
 import jax
 from jax import numpy as jnp
+from jax.experimental import multihost_utils
+from jax.experimental import shard_map
 import numpy as np
 from orbax.checkpoint._src.multihost import multihost
 
@@ -145,8 +147,23 @@ def fake_zero_data(sharding, x):
   return jax.lax.with_sharding_constraint(x, sharding)
 
 
+def _local_memory_stats() -> Optional[List[Dict[str, int]]]:
+  """Returns the runtime memory stats of local devices, if all report them."""
+  stats = [device.memory_stats() for device in jax.local_devices()]
+  if any(s is None or 'bytes_limit' not in s for s in stats):
+    return None
+  return stats
+
+
 def get_device_memory() -> int:
-  """Returns HBM capacity of the device on which the code is running(in bytes)."""
+  """Returns HBM capacity of the device on which the code is running(in bytes).
+
+  Uses the memory limit reported by the runtime if available, and a table of
+  known devices otherwise.
+  """
+  stats = _local_memory_stats()
+  if stats is not None:
+    return min(s['bytes_limit'] for s in stats)
   device = jax.devices()[0]
   if device.platform not in ('tpu', 'gpu'):
     raise ValueError('Only select TPU and GPU devices are supported.')
@@ -186,9 +203,11 @@ def get_available_memory(
 ) -> int:
   """Returns estimated available memory for broadcasting (in bytes).
 
-  After computing the available memory, we scale it by a factor of 0.75 to
-  account for the fact that the actual memory usage could be different than the
-  estimated memory usage. This will help us to avoid OOM errors for edge cases.
+  The memory in use is reported by the runtime if available, and otherwise
+  estimated as the memory occupied by `in_tree`. After computing the available
+  memory, we scale it by `scaling_factor` to account for the fact that the
+  actual memory usage could be different than the estimated memory usage. This
+  will help us to avoid OOM errors for edge cases.
 
   Args:
     in_tree: pytree that occupies the memory.
@@ -197,12 +216,102 @@ def get_available_memory(
   """
   if scaling_factor > 1:
     raise ValueError('scaling_factorshould be less than 1.')
-  total_device_memory = get_device_memory()
-  used_device_memory = tree_memory_per_device(in_tree)
-  available_memory = total_device_memory - used_device_memory
+  stats = _local_memory_stats()
+  if stats is None:
+    total_device_memory = get_device_memory()
+    used_device_memory = tree_memory_per_device(in_tree)
+    available_memory = total_device_memory - used_device_memory
+  else:
+    available_memory = min(
+        s['bytes_limit'] - s.get('bytes_in_use', 0) for s in stats
+    )
   return int(available_memory * scaling_factor / MEMORY_FACTOR)
 
 
+def _mesh_replica_index(
+    global_mesh: jax.sharding.Mesh, replica_id: int, replica_axis_index: int
+) -> int:
+  """Returns the index along the replica axis of the mesh of `replica_id`."""
+  device = slice_devices(
+      global_mesh, replica_id=replica_id, replica_axis_index=replica_axis_index
+  ).flat[0]
+  for index in range(global_mesh.devices.shape[replica_axis_index]):
+    if device in np.take(global_mesh.devices, index, axis=replica_axis_index):
+      return index
+  raise ValueError(f'Replica {replica_id} does not exist in `global_mesh`.')
+
+
+def _broadcast_from_replica(
+    x: jax.Array, *, source: int, num_replicas: int, replica_axis_name: str
+) -> jax.Array:
+  """Broadcasts the per-device blocks of replica `source` to other replicas.
+
+  Replicas which already hold the data forward it to as many other replicas in
+  each round, so that the broadcast takes log2(num_replicas) rounds of
+  collective permutes, and each replica receives the data exactly once.
+
+  Args:
+    x: per-device block. Its contents are ignored on other replicas.
+    source: index along the replica axis of the replica holding the data.
+    num_replicas: number of replicas.
+    replica_axis_name: name of the replica axis.
+
+  Returns:
+    The corresponding block of replica `source`.
+  """
+  offset = (jax.lax.axis_index(replica_axis_name) - source) % num_replicas
+  step = 1
+  while step < num_replicas:
+    perm = [
+        ((source + i) % num_replicas, (source + i + step) % num_replicas)
+        for i in range(min(step, num_replicas - step))
+    ]
+    received = jax.lax.ppermute(x, replica_axis_name, perm)
+    x = jnp.where((offset >= step) & (offset < 2 * step), received, x)
+    step *= 2
+  return x
+
+
+def _plan_broadcasts(
+    sizes: Sequence[int], memory_limit_bytes: int
+) -> List[List[int]]:
+  """Groups leaves into broadcasts of at most `memory_limit_bytes` per device.
+
+  Leaves are packed first-fit in decreasing order of size, which needs fewer
+  broadcasts than packing them in tree order. A leaf larger than the limit is
+  broadcast on its own.
+
+  Args:
+    sizes: memory per device of each leaf.
+    memory_limit_bytes: memory limit for each broadcast.
+
+  Returns:
+    The indices of the leaves of each broadcast, in increasing order.
+  """
+  groups = []
+  remaining_bytes = []
+  for i in sorted(range(len(sizes)), key=lambda i: -sizes[i]):
+    if sizes[i] > memory_limit_bytes:
+      logging.warning(
+          'in_tree leaf size exceeds memory limit for broadcasting. '
+          'Leaf size: %d bytes. Allowed memory limit: %d bytes. Proceeding.',
+          sizes[i],
+          memory_limit_bytes,
+      )
+      groups.append([i])
+      remaining_bytes.append(0)
+      continue
+    for group_index, remaining in enumerate(remaining_bytes):
+      if sizes[i] <= remaining:
+        groups[group_index].append(i)
+        remaining_bytes[group_index] -= sizes[i]
+        break
+    else:
+      groups.append([i])
+      remaining_bytes.append(memory_limit_bytes - sizes[i])
+  return [sorted(group) for group in groups]
+
+
 def broadcast_one_replica_to_all(
     in_tree: Tuple[PyTree, ...],
     global_mesh: jax.sharding.Mesh,
@@ -210,9 +319,17 @@ def broadcast_one_replica_to_all(
     is_source: bool,
     memory_limit_bytes: Optional[Union[int, None]] = None,
     memory_scaling_factor: Optional[float] = 0.75,
+    *,
+    source_replica_id: Optional[int] = None,
 ) -> Tuple[Tuple[PyTree, ...], int]:
   """One replica reads the data and broadcasts to others.
 
+  If `source_replica_id` is provided, the data is copied from the origin
+  replica to the others with collective permutes, into the buffers of
+  `in_tree`, whose contents are ignored on the other replicas. Otherwise, the
+  other replicas contribute zeros, and the data is broadcast by summing over
+  replicas, which requires zero-filled buffers and moves reduction traffic.
+
   Args:
     in_tree: pytree to be broadcast. Shardings should correspond to the origin
       replica.
@@ -222,6 +339,7 @@ def broadcast_one_replica_to_all(
     memory_limit_bytes: memory limit for broadcasting in bytes.
     memory_scaling_factor: indicates the fraction of the estimated available
       memory to be used when broadcasting data.
+    source_replica_id: id of the origin replica, as for `slice_devices`.
 
   Returns:
      Tuple containing:
@@ -233,6 +351,17 @@ def broadcast_one_replica_to_all(
 
   if memory_limit_bytes is None:
     memory_limit_bytes = get_available_memory(in_tree, memory_scaling_factor)
+    if multihost.process_count() > 1:
+      # Memory in use may differ across processes, which must nonetheless plan
+      # the same broadcasts. Agree on the smallest limit, in MiB to fit in
+      # int32.
+      memory_limit_bytes = 2**20 * int(
+          np.min(
+              multihost_utils.process_allgather(
+                  np.int32(memory_limit_bytes // 2**20)
+              )
+          )
+      )
     logging.info('Using available memory of %d bytes.', memory_limit_bytes)
 
   # Set replica_axis to be 0, regardless of its actual value.
@@ -256,50 +385,95 @@ def broadcast_one_replica_to_all(
         global_shape, global_sharding, [s.data for s in inp.addressable_shards]
     )
 
-  tree_len = len(in_tree)
-  start = 0
-  out_tree = []
-  num_broadcasts = 0
-  while start < tree_len:
-    subtree = []
-    current_memory = 0
-    end = start
-    if tree_memory_per_device(in_tree[start]) > memory_limit_bytes:
-      logging.warning(
-          'in_tree leaf size exceeds memory limit for broadcasting. '
-          'Leaf size: %d bytes. Allowed memory limit: %d bytes. Proceeding.',
-          tree_memory_per_device(in_tree[start]),
-          memory_limit_bytes,
+  # Each replica holds its own block of the array, which is nonetheless
+  # described as replicated across replicas. Only the blocks of the origin
+  # replica are read, and the buffers are overwritten by the broadcast.
+  def globalize_replica_arrays(inp):
+    sharding = inp.sharding
+    if not isinstance(sharding, jax.sharding.NamedSharding):
+      raise ValueError(
+          'Must provide input arrays with NamedSharding. '
+          f'Got {type(sharding)} instead.'
       )
-      subtree.append(in_tree[end])
-      end += 1
-    else:
-      while end < tree_len and (
-          current_memory + tree_memory_per_device(in_tree[end])
-          <= memory_limit_bytes
-      ):
-        subtree.append(in_tree[end])
-        current_memory += tree_memory_per_device(in_tree[end])
-        end += 1
-    subtree = tuple(subtree)
-    num_broadcasts += 1
-    out_sharding = jax.tree.map(
-        lambda x: jax.sharding.NamedSharding(
-            global_mesh, jax.sharding.PartitionSpec(*x.sharding.spec)
+    return jax.make_array_from_single_device_arrays(
+        inp.shape,
+        jax.sharding.NamedSharding(global_mesh, sharding.spec),
+        [s.data for s in inp.addressable_shards],
+    )
+
+  if source_replica_id is not None:
+    broadcast_from_source = functools.partial(
+        _broadcast_from_replica,
+        source=_mesh_replica_index(
+            global_mesh, source_replica_id, replica_axis_index
         ),
-        subtree,
+        num_replicas=num_replicas,
+        replica_axis_name=replica_axis_name,
     )
+
+  def broadcast_leaf(x, sharding):
+    return shard_map.shard_map(
+        broadcast_from_source,
+        mesh=global_mesh,
+        in_specs=sharding.spec,
+        out_specs=sharding.spec,
+        check_rep=False,
+    )(x)
+
+  out_shardings = [
+      jax.tree.map(
+          lambda x: jax.sharding.NamedSharding(
+              global_mesh, jax.sharding.PartitionSpec(*x.sharding.spec)
+          ),
+          leaf,
+      )
+      for leaf in in_tree
+  ]
+  groups = _plan_broadcasts(
+      [tree_memory_per_device(leaf) for leaf in in_tree], memory_limit_bytes
+  )
+
+  def globalize(group):
+    subtree = tuple(in_tree[i] for i in group)
+    if source_replica_id is not None:
+      return jax.tree.map(globalize_replica_arrays, subtree)
     in_tree_sharded = jax.tree.map(globalize_single_replica_arrays, subtree)
     # Delete immediately to conserve memory.
     jax.tree.map(lambda x: x.delete(), subtree)
-
+    return in_tree_sharded
+
+  def broadcast(group, in_tree_sharded):
+    out_sharding = tuple(out_shardings[i] for i in group)
+    if source_replica_id is None:
+      return jax.jit(
+          lambda tree: jax.tree.map(functools.partial(jnp.sum, axis=0), tree),
+          out_shardings=out_sharding,
+      )(in_tree_sharded)
     out_subtree = jax.jit(
-        lambda tree: jax.tree.map(functools.partial(jnp.sum, axis=0), tree),
+        lambda tree: jax.tree.map(broadcast_leaf, tree, out_sharding),
         out_shardings=out_sharding,
+        donate_argnums=0,
     )(in_tree_sharded)
-    out_tree.extend(out_subtree)
+    jax.tree.map(lambda x: x.delete(), tuple(in_tree[i] for i in group))
+    return out_subtree
+
+  # Globalizing only aliases buffers when broadcasting from the source replica,
+  # so the next group can be prepared while a broadcast is in flight. When
+  # summing over replicas, it allocates zero-filled inputs, which
+  # `memory_limit_bytes` only budgets for one group at a time.
+  pipeline = source_replica_id is not None
+  out_tree = [None] * len(in_tree)
+  in_tree_sharded = globalize(groups[0]) if groups else ()
+  for n, group in enumerate(groups):
+    out_subtree = broadcast(group, in_tree_sharded)
+    if pipeline and n + 1 < len(groups):
+      in_tree_sharded = globalize(groups[n + 1])
     jax.block_until_ready(out_subtree)
-    start = end
+    if not pipeline and n + 1 < len(groups):
+      in_tree_sharded = globalize(groups[n + 1])
+    for i, out in zip(group, out_subtree):
+      out_tree[i] = out
+  num_broadcasts = len(groups)
 
   if is_source:
     logging.info('Total number of broadcasts: %d', num_broadcasts)
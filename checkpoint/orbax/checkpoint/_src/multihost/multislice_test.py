@@ -0,0 +1,223 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for multislice module."""
+
+from unittest import mock
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import jax
+import numpy as np
+from orbax.checkpoint._src.multihost import multislice
+
+
+def _mesh(num_replicas: int, replica_axis_index: int) -> jax.sharding.Mesh:
+  num_devices = jax.device_count() // num_replicas * num_replicas
+  devices = np.asarray(jax.devices()[:num_devices]).reshape(num_replicas, -1)
+  axis_names = ('replica', 'model')
+  if replica_axis_index == 1:
+    devices = devices.T
+    axis_names = axis_names[::-1]
+  return jax.sharding.Mesh(devices, axis_names)
+
+
+def _replica_arrays(
+    mesh: jax.sharding.Mesh,
+    replica_axis_index: int,
+    data: np.ndarray,
+    source: int,
+    fill_value: float,
+) -> jax.Array:
+  """Returns an array holding `data` on `source`, and `fill_value` elsewhere.
+
+  All replicas are addressable in a single process, so the array is sharded
+  over the whole mesh, each replica holding its own copy, as each slice would.
+
+  Args:
+    mesh: global mesh.
+    replica_axis_index: axis of the mesh along which data is replicated.
+    data: data of the source replica.
+    source: index of the source replica along the replica axis.
+    fill_value: value held by the other replicas.
+  """
+  sharding = jax.sharding.NamedSharding(
+      mesh, jax.sharding.PartitionSpec('model')
+  )
+  shards = []
+  for device, index in sharding.addressable_devices_indices_map(
+      data.shape
+  ).items():
+    replica = np.argwhere(mesh.devices == device)[0][replica_axis_index]
+    shard = data[index] if replica == source else np.full_like(
+        data[index], fill_value
+    )
+    shards.append(jax.device_put(shard, device))
+  return jax.make_array_from_single_device_arrays(data.shape, sharding, shards)
+
+
+class _FakeDevice:
+
+  def __init__(self, memory_stats):
+    self._memory_stats = memory_stats
+
+  def memory_stats(self):
+    return self._memory_stats
+
+
+class MemoryTest(absltest.TestCase):
+
+  def test_plan_broadcasts(self):
+    self.assertEqual(
+        multislice._plan_broadcasts([4, 7, 3, 6, 1, 12], 10),
+        [[5], [1, 2], [0, 3], [4]],
+    )
+    self.assertEqual(multislice._plan_broadcasts([], 10), [])
+
+  def test_runtime_memory_stats(self):
+    devices = [
+        _FakeDevice({'bytes_limit': 1000, 'bytes_in_use': 100}),
+        _FakeDevice({'bytes_limit': 900, 'bytes_in_use': 400}),
+    ]
+    with mock.patch.object(jax, 'local_devices', return_value=devices):
+      self.assertEqual(multislice.get_device_memory(), 900)
+      self.assertEqual(multislice.get_available_memory((), 0.6), 100)
+
+  def test_no_runtime_memory_stats(self):
+    devices = [_FakeDevice({'bytes_limit': 1000}), _FakeDevice(None)]
+    with mock.patch.object(jax, 'local_devices', return_value=devices):
+      self.assertIsNone(multislice._local_memory_stats())
+
+
+class BroadcastTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    if jax.device_count() < 4:
+      self.skipTest('Requires at least 4 devices.')
+
+  @parameterized.product(
+      num_replicas=(2, 3, 4),
+      source=(0, 1),
+      replica_axis_index=(0, 1),
+  )
+  def test_broadcast_from_source_replica(
+      self, num_replicas, source, replica_axis_index
+  ):
+    mesh = _mesh(num_replicas, replica_axis_index)
+    data = [
+        np.arange(16 * mesh.shape['model'], dtype=np.float32),
+        np.ones((mesh.shape['model'], 2), dtype=np.int32),
+    ]
+    in_tree = tuple(
+        _replica_arrays(mesh, replica_axis_index, d, source, fill_value=-1)
+        for d in data
+    )
+    out_tree, num_broadcasts = multislice.broadcast_one_replica_to_all(
+        in_tree,
+        mesh,
+        replica_axis_index,
+        is_source=True,
+        memory_limit_bytes=multislice.tree_memory_per_device(in_tree[0]),
+        source_replica_id=source,
+    )
+
+    self.assertEqual(num_broadcasts, 2)
+    self.assertLen(out_tree, len(data))
+    for expected, out in zip(data, out_tree):
+      self.assertEqual(out.dtype, expected.dtype)
+      self.assertEqual(out.sharding.spec, jax.sharding.PartitionSpec('model'))
+      for shard in out.addressable_shards:
+        np.testing.assert_array_equal(shard.data, expected[shard.index])
+    for x in in_tree:
+      self.assertTrue(x.is_deleted())
+
+  @parameterized.parameters(None, 1)
+  def test_broadcast_groups_keep_order(self, source_replica_id):
+    mesh = _mesh(2, 0)
+    source = 0 if source_replica_id is None else source_replica_id
+    data = [
+        np.full((n * mesh.shape['model'],), n, dtype=np.float32)
+        for n in (1, 4, 2, 3)
+    ]
+    in_tree = tuple(
+        _replica_arrays(mesh, 0, d, source, fill_value=0) for d in data
+    )
+    out_tree, num_broadcasts = multislice.broadcast_one_replica_to_all(
+        in_tree,
+        mesh,
+        0,
+        is_source=True,
+        memory_limit_bytes=4 * 4,
+        source_replica_id=source_replica_id,
+    )
+
+    # Packed as [4], [3, 1] and [2].
+    self.assertEqual(num_broadcasts, 3)
+    self.assertLen(out_tree, len(data))
+    for expected, out in zip(data, out_tree):
+      np.testing.assert_array_equal(out, expected)
+
+  @parameterized.parameters((None, False), (1, True))
+  def test_pipelines_only_broadcasts_from_source(
+      self, source_replica_id, pipelined
+  ):
+    mesh = _mesh(2, 0)
+    source = 0 if source_replica_id is None else source_replica_id
+    data = [
+        np.full((mesh.shape['model'],), n, dtype=np.float32) for n in range(3)
+    ]
+    in_tree = tuple(
+        _replica_arrays(mesh, 0, d, source, fill_value=0) for d in data
+    )
+    events = []
+    make_array = jax.make_array_from_single_device_arrays
+    block_until_ready = jax.block_until_ready
+
+    def _make_array(*args, **kwargs):
+      events.append('globalize')
+      return make_array(*args, **kwargs)
+
+    def _block_until_ready(x):
+      events.append('wait')
+      return block_until_ready(x)
+
+    with mock.patch.object(
+        jax, 'make_array_from_single_device_arrays', side_effect=_make_array
+    ), mock.patch.object(
+        jax, 'block_until_ready', side_effect=_block_until_ready
+    ):
+      out_tree, num_broadcasts = multislice.broadcast_one_replica_to_all(
+          in_tree,
+          mesh,
+          0,
+          is_source=True,
+          memory_limit_bytes=multislice.tree_memory_per_device(in_tree[0]),
+          source_replica_id=source_replica_id,
+      )
+
+    self.assertEqual(num_broadcasts, 3)
+    if pipelined:
+      # The next group is globalized before waiting for the previous one.
+      expected = ['globalize'] * 2 + ['wait', 'globalize', 'wait', 'wait']
+    else:
+      # Summing allocates inputs, so at most one group is globalized at once.
+      expected = ['globalize', 'wait'] * 3
+    self.assertEqual(events, expected)
+    for expected, out in zip(data, out_tree):
+      np.testing.assert_array_equal(out, expected)
+
+
+if __name__ == '__main__':
+  absltest.main()
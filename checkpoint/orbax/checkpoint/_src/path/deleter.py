@@ -14,15 +14,19 @@
 
 """Checkpoint deleter."""
 
+from concurrent import futures
+import hashlib
 import queue
 import threading
 import time
-from typing import Optional, Protocol, Sequence
+from typing import Callable, Dict, List, Optional, Protocol, Sequence
 from absl import logging
 from etils import epath
 import jax
 from orbax.checkpoint import utils
+from orbax.checkpoint._src.multihost import multihost
 from orbax.checkpoint._src.path import step as step_lib
+from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 
 _THREADED_DELETE_DURATION = (
     '/jax/orbax/checkpoint_manager/threaded_checkpoint_deleter/duration'
@@ -32,6 +36,16 @@ _STANDARD_DELETE_DURATION = (
     '/jax/orbax/checkpoint_manager/standard_checkpoint_deleter/duration'
 )
 
+_DELETED_FILES_PER_SEC = (
+    '/jax/orbax/checkpoint_manager/checkpoint_deleter/files_per_sec'
+)
+_DELETED_FILES = '/jax/orbax/checkpoint_manager/checkpoint_deleter/files'
+
+# Maximum number of steps waiting to be deleted by `ThreadedCheckpointDeleter`.
+# Callers block when the queue is full, instead of accumulating steps faster
+# than they can be deleted.
+_MAX_QUEUED_STEPS = 64
+
 
 class CheckpointDeleter(Protocol):
   """A protocol defined a CheckpointDeleter."""
@@ -59,6 +73,10 @@ class StandardCheckpointDeleter:
       todelete_subdir: Optional[str],
       name_format: step_lib.NameFormat[step_lib.Metadata],
       duration_metric: Optional[str] = _STANDARD_DELETE_DURATION,
+      *,
+      max_workers: int = 1,
+      barrier_sync_fn: Optional[Callable[[str], None]] = None,
+      barrier_sync_key_prefix: Optional[str] = None,
   ):
     """StandardCheckpointDeleter constructor.
 
@@ -68,12 +86,143 @@ class StandardCheckpointDeleter:
       todelete_subdir: refer to CheckpointManagerOptions.todelete_subdir
       name_format: refer to CheckpointManager._name_format
       duration_metric: the name of the total delete duration metric
+      max_workers: refer to CheckpointManagerOptions.delete_max_workers
+      barrier_sync_fn: If set, the files of deleted steps are partitioned
+        across all processes, which then must all call `delete_steps` with the
+        same steps. Used to sync processes before the primary host removes the
+        remaining directories. Ignored if steps are renamed instead of deleted.
+      barrier_sync_key_prefix: Prefix of the keys passed to `barrier_sync_fn`.
     """
+    if max_workers < 1:
+      raise ValueError(f'max_workers must be positive, got {max_workers}.')
     self._primary_host = primary_host
     self._directory = directory
     self._todelete_subdir = todelete_subdir
     self._name_format = name_format
     self._duration_metric = duration_metric
+    self._max_workers = max_workers
+    self._barrier_sync_fn = barrier_sync_fn
+    self._barrier_sync_key_prefix = barrier_sync_key_prefix
+
+  def _find_delete_targets(self, steps: Sequence[int]) -> Dict[int, epath.Path]:
+    """Returns the paths of `steps`, skipping steps that cannot be found."""
+    targets = {}
+    for step in steps:
+      try:
+        targets[step] = step_lib.find_step_path(
+            self._directory,
+            self._name_format,
+            step=step,
+            include_uncommitted=True,
+        )
+      except ValueError as e:
+        logging.warning(
+            'Unable to find the step %d for deletion or renaming, err=%s',
+            step,
+            e,
+        )
+    return targets
+
+  def _rename(self, step: int, delete_target: epath.Path) -> None:
+    """Renames `delete_target` into `todelete_subdir`."""
+    rename_dir = self._directory / self._todelete_subdir
+    rename_dir.mkdir(parents=True, exist_ok=True)
+
+    dst = step_lib.build_step_path(rename_dir, self._name_format, step)
+
+    delete_target.replace(dst)
+    logging.info('Renamed step %d to %s', step, dst)
+
+  def _delete_files(
+      self,
+      executor: futures.ThreadPoolExecutor,
+      delete_targets: Sequence[epath.Path],
+      partition: Optional[tuple[int, int]] = None,
+  ) -> int:
+    """Deletes the files under `delete_targets` concurrently.
+
+    Directories are left in place, to be removed afterwards.
+
+    Args:
+      executor: Executor to list directories and delete files with.
+      delete_targets: Directories whose files are deleted.
+      partition: If set, (index, count) of the partition of the sorted file
+        listing to delete, so that the files are spread across `count` callers.
+
+    Returns:
+      The number of deleted files.
+    """
+
+    def _list_files(delete_target: epath.Path) -> List[epath.Path]:
+      return [
+          dirpath / filename
+          for dirpath, _, filenames in delete_target.walk()
+          for filename in filenames
+      ]
+
+    files = sorted(
+        f for files in executor.map(_list_files, delete_targets) for f in files
+    )
+    if partition is not None:
+      index, count = partition
+      files = files[index::count]
+    # Consume the iterator to propagate errors.
+    for _ in executor.map(lambda f: f.unlink(missing_ok=True), files):
+      pass
+    return len(files)
+
+  def _log_throughput(self, num_files: int, start: float) -> None:
+    time_elapsed = time.time() - start
+    files_per_sec = (
+        float('nan') if time_elapsed == 0 else num_files / time_elapsed
+    )
+    logging.info(
+        '[process=%d] Deleted %d files in %.3f seconds (%.1f files/s).',
+        multihost.process_index(),
+        num_files,
+        time_elapsed,
+        files_per_sec,
+    )
+    jax.monitoring.record_event_duration_secs(
+        _DELETED_FILES_PER_SEC, files_per_sec
+    )
+    jax.monitoring.record_event(_DELETED_FILES, files=num_files)
+
+  def _delete_distributed(self, steps: Sequence[int]) -> None:
+    """Deletes `steps` with files partitioned across all processes."""
+    start = time.time()
+    try:
+      delete_targets = self._find_delete_targets(steps)
+      with futures.ThreadPoolExecutor(
+          max_workers=self._max_workers, thread_name_prefix='DeleterWorker'
+      ) as executor:
+        num_files = self._delete_files(
+            executor,
+            list(delete_targets.values()),
+            partition=(multihost.process_index(), multihost.process_count()),
+        )
+      self._log_throughput(num_files, start)
+    except Exception:
+      # Raised once all processes reached the barrier below. The primary host
+      # deletes any remaining files if it succeeded itself.
+      logging.exception('Failed to delete files of steps %s.', steps)
+      raise
+    finally:
+      # Fixed-length key, identical on all processes.
+      steps_digest = hashlib.sha256(
+          ','.join(str(step) for step in steps).encode()
+      ).hexdigest()[:16]
+      self._barrier_sync_fn(
+          multihost.unique_barrier_key(
+              'CheckpointDeleter:deleted_files',
+              prefix=self._barrier_sync_key_prefix,
+              suffix=steps_digest,
+          )
+      )
+    if utils.is_primary_host(self._primary_host):
+      for step, delete_target in delete_targets.items():
+        delete_target.rmtree()
+        logging.info('Deleted step %d.', step)
 
   def delete(self, step: int) -> None:
     """Deletes step dir or renames it if _todelete_subdir is set.
@@ -83,55 +232,74 @@ class StandardCheckpointDeleter:
     Args:
       step: checkpointing step number.
     """
+    self.delete_steps([step])
+
+  def delete_steps(self, steps: Sequence[int]) -> None:
+    """Deletes step dirs or renames them if _todelete_subdir is set.
+
+    With `max_workers > 1`, the files of all `steps` are deleted concurrently.
+
+    Args:
+      steps: checkpointing step numbers.
+    """
+    if not steps:
+      return
     start = time.time()
+    # Handles cached for deleted steps must not be reused if a step is saved
+    # again to the same path.
+    for step in steps:
+      ts_utils.invalidate_open_handle_caches(
+          step_lib.build_step_path(self._directory, self._name_format, step)
+      )
     try:
+      # Delete if storage is on gcs or todelete_subdir is not set.
+      rename = self._todelete_subdir is not None and not step_lib.is_gcs_path(
+          self._directory
+      )
+      if self._barrier_sync_fn is not None and not rename:
+        self._delete_distributed(steps)
+        return
+
       if not utils.is_primary_host(self._primary_host):
         logging.info(
-            'Not primary host(%s), skipping deletion of step %d.',
+            'Not primary host(%s), skipping deletion of steps %s.',
             self._primary_host,
-            step,
+            steps,
         )
         return
 
-      # Delete if storage is on gcs or todelete_subdir is not set.
-      try:
-        delete_target = step_lib.find_step_path(
-            self._directory,
-            self._name_format,
-            step=step,
-            include_uncommitted=True,
-        )
-      except ValueError as e:
-        logging.warning(
-            'Unable to find the step %d for deletion or renaming, err=%s',
-            step,
-            e,
-        )
+      delete_targets = self._find_delete_targets(steps)
+      if rename:
+        for step, delete_target in delete_targets.items():
+          self._rename(step, delete_target)
         return
 
-      if self._todelete_subdir is None or step_lib.is_gcs_path(self._directory):
-        delete_target.rmtree()
-        logging.info('Deleted step %d.', step)
+      if self._max_workers == 1:
+        for step, delete_target in delete_targets.items():
+          delete_target.rmtree()
+          logging.info('Deleted step %d.', step)
         return
 
-      # Rename step dir.
-      rename_dir = self._directory / self._todelete_subdir
-      rename_dir.mkdir(parents=True, exist_ok=True)
-
-      dst = step_lib.build_step_path(rename_dir, self._name_format, step)
-
-      delete_target.replace(dst)
-      logging.info('Renamed step %d to %s', step, dst)
+      with futures.ThreadPoolExecutor(
+          max_workers=self._max_workers, thread_name_prefix='DeleterWorker'
+      ) as executor:
+        num_files = self._delete_files(
+            executor, list(delete_targets.values())
+        )
+        # Removes the remaining, now empty, directories.
+        for _ in executor.map(
+            lambda delete_target: delete_target.rmtree(),
+            delete_targets.values(),
+        ):
+          pass
+      logging.info('Deleted steps %s.', list(delete_targets))
+      self._log_throughput(num_files, start)
     finally:
       jax.monitoring.record_event_duration_secs(
           self._duration_metric,
           time.time() - start,
       )
 
-  def delete_steps(self, steps: Sequence[int]) -> None:
-    for step in steps:
-      self.delete(step)
-
   def close(self) -> None:
     pass
 
@@ -145,6 +313,8 @@ class ThreadedCheckpointDeleter:
       directory: epath.Path,
       todelete_subdir: Optional[str],
       name_format: step_lib.NameFormat[step_lib.Metadata],
+      *,
+      max_workers: int = 1,
   ):
     """ThreadedCheckpointDeleter deletes checkpoints in a background thread."""
     self._standard_deleter = StandardCheckpointDeleter(
@@ -153,8 +323,9 @@ class ThreadedCheckpointDeleter:
         todelete_subdir=todelete_subdir,
         name_format=name_format,
         duration_metric=_THREADED_DELETE_DURATION,
+        max_workers=max_workers,
     )
-    self._delete_queue = queue.Queue()
+    self._delete_queue = queue.Queue(maxsize=_MAX_QUEUED_STEPS)
     # Turn on daemon=True so the thread won't block the main thread and die
     # when the program exits.
     self._delete_thread = threading.Thread(
@@ -168,11 +339,17 @@ class ThreadedCheckpointDeleter:
 
   def _delete_thread_run(self) -> None:
     logging.info('Delete thread has started.')
-    while True:
-      step = self._delete_queue.get(block=True)
-      if step < 0:
-        break
-      self._standard_deleter.delete(step)
+    exiting = False
+    while not exiting:
+      steps = [self._delete_queue.get(block=True)]
+      # Deletes all queued steps together, so that they are deleted
+      # concurrently.
+      while not self._delete_queue.empty():
+        steps.append(self._delete_queue.get_nowait())
+      if any(step < 0 for step in steps):
+        exiting = True
+        steps = [step for step in steps if step >= 0]
+      self._standard_deleter.delete_steps(steps)
     logging.info('Delete thread exited.')
 
   def delete(self, step: int) -> None:
@@ -197,15 +374,40 @@ def create_checkpoint_deleter(
     todelete_subdir: Optional[str],
     name_format: step_lib.NameFormat[step_lib.Metadata],
     enable_background_delete: bool,
+    *,
+    max_workers: int = 1,
+    barrier_sync_fn: Optional[Callable[[str], None]] = None,
+    barrier_sync_key_prefix: Optional[str] = None,
 ) -> CheckpointDeleter:
-  """Creates a CheckpointDeleter."""
+  """Creates a CheckpointDeleter.
+
+  Args:
+    primary_host: refer to CheckpointManager.primary_host
+    directory: refer to CheckpointManager.directory
+    todelete_subdir: refer to CheckpointManagerOptions.todelete_subdir
+    name_format: refer to CheckpointManager._name_format
+    enable_background_delete: refer to
+      CheckpointManagerOptions.enable_background_delete
+    max_workers: refer to CheckpointManagerOptions.delete_max_workers
+    barrier_sync_fn: If set, file deletions are spread across all processes,
+      see `StandardCheckpointDeleter`. Not supported with
+      `enable_background_delete`, as processes would sync from the background
+      thread.
+    barrier_sync_key_prefix: Prefix of the keys passed to `barrier_sync_fn`.
+  """
 
   if enable_background_delete:
+    if barrier_sync_fn is not None:
+      raise ValueError(
+          'Spreading deletions across processes is not supported with'
+          ' background deletion.'
+      )
     return ThreadedCheckpointDeleter(
         primary_host,
         directory,
         todelete_subdir,
         name_format,
+        max_workers=max_workers,
     )
   else:
     return StandardCheckpointDeleter(
@@ -213,4 +415,7 @@ def create_checkpoint_deleter(
         directory,
         todelete_subdir,
         name_format,
+        max_workers=max_workers,
+        barrier_sync_fn=barrier_sync_fn,
+        barrier_sync_key_prefix=barrier_sync_key_prefix,
     )
@@ -14,6 +14,8 @@
 
 """To test Orbax in single-host setup."""
 
+from unittest import mock
+
 from absl.testing import absltest
 from absl.testing import parameterized
 from etils import epath
@@ -60,6 +62,98 @@ class CheckpointDeleterTest(parameterized.TestCase):
 
     deleter.close()
 
+  def _create_step(self, step: int, num_files: int = 3) -> epath.Path:
+    step_dir = self._get_save_diretory(step, self.ckpt_dir)
+    for i in range(num_files):
+      (step_dir / 'item' / f'd{i % 2}').mkdir(parents=True, exist_ok=True)
+      (step_dir / 'item' / f'd{i % 2}' / f'f{i}').write_text('data')
+    (step_dir / 'empty').mkdir()
+    return step_dir
+
+  @parameterized.product(
+      threaded=(False, True),
+      max_workers=(1, 4),
+  )
+  def test_delete_steps(self, threaded, max_workers):
+    deleter = deleter_lib.create_checkpoint_deleter(
+        primary_host=None,
+        directory=self.ckpt_dir,
+        todelete_subdir=None,
+        name_format=step_lib.standard_name_format(),
+        enable_background_delete=threaded,
+        max_workers=max_workers,
+    )
+    step_dirs = [self._create_step(step) for step in range(4)]
+    deleter.delete_steps([0, 1, 3, 5])
+    deleter.close()
+
+    self.assertFalse(step_dirs[0].exists())
+    self.assertFalse(step_dirs[1].exists())
+    self.assertTrue(step_dirs[2].exists())
+    self.assertFalse(step_dirs[3].exists())
+
+  def test_delete_steps_distributed(self):
+    barrier_keys = []
+    deleter = deleter_lib.create_checkpoint_deleter(
+        primary_host=0,
+        directory=self.ckpt_dir,
+        todelete_subdir=None,
+        name_format=step_lib.standard_name_format(),
+        enable_background_delete=False,
+        max_workers=4,
+        barrier_sync_fn=barrier_keys.append,
+        barrier_sync_key_prefix='prefix',
+    )
+    step_dirs = [self._create_step(step) for step in range(3)]
+    deleter.delete_steps([0, 2])
+    deleter.close()
+
+    self.assertFalse(step_dirs[0].exists())
+    self.assertTrue(step_dirs[1].exists())
+    self.assertFalse(step_dirs[2].exists())
+    self.assertLen(barrier_keys, 1)
+    self.assertStartsWith(
+        barrier_keys[0], 'prefix_CheckpointDeleter:deleted_files.'
+    )
+
+    # Keys are unique per set of steps, with a length independent of it.
+    deleter.delete_steps(list(range(3, 100)))
+    self.assertLen(barrier_keys, 2)
+    self.assertNotEqual(barrier_keys[0], barrier_keys[1])
+    self.assertLen(barrier_keys[1], len(barrier_keys[0]))
+
+  def test_delete_steps_distributed_syncs_on_failure(self):
+    barrier_keys = []
+    deleter = deleter_lib.create_checkpoint_deleter(
+        primary_host=0,
+        directory=self.ckpt_dir,
+        todelete_subdir=None,
+        name_format=step_lib.standard_name_format(),
+        enable_background_delete=False,
+        barrier_sync_fn=barrier_keys.append,
+    )
+    step_dir = self._create_step(0)
+    with mock.patch.object(
+        deleter, '_find_delete_targets', side_effect=RuntimeError('failed')
+    ):
+      with self.assertRaisesRegex(RuntimeError, 'failed'):
+        deleter.delete_steps([0])
+    deleter.close()
+
+    self.assertLen(barrier_keys, 1)
+    self.assertTrue(step_dir.exists())
+
+  def test_distributed_background_delete_not_supported(self):
+    with self.assertRaises(ValueError):
+      deleter_lib.create_checkpoint_deleter(
+          primary_host=0,
+          directory=self.ckpt_dir,
+          todelete_subdir=None,
+          name_format=step_lib.standard_name_format(),
+          enable_background_delete=True,
+          barrier_sync_fn=lambda key: None,
+      )
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,208 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Pool of reusable host staging buffers for reading/writing checkpoints."""
+
+import collections
+import dataclasses
+import mmap
+import threading
+from typing import Sequence
+
+from absl import logging
+import humanize
+import jax.numpy as jnp
+import numpy as np
+
+
+PAGE_SIZE = mmap.PAGESIZE
+# Number of buckets per power of two. Bounds the memory wasted by rounding a
+# request up to its bucket size to 1 / _BUCKETS_PER_POWER_OF_TWO.
+_BUCKETS_PER_POWER_OF_TWO = 8
+
+
+def _bucket_size(nbytes: int) -> int:
+  """Rounds `nbytes` up to its bucket size (a multiple of the page size)."""
+  nbytes = max(nbytes, PAGE_SIZE)
+  power_of_two = 1 << (nbytes - 1).bit_length()
+  step = max(power_of_two // _BUCKETS_PER_POWER_OF_TWO, PAGE_SIZE)
+  return -(-nbytes // step) * step
+
+
+def _allocate_aligned(nbytes: int, alignment: int) -> np.ndarray:
+  """Allocates a uint8 buffer of `nbytes` starting at an aligned address."""
+  raw = np.empty(nbytes + alignment, dtype=np.uint8)
+  offset = -raw.ctypes.data % alignment
+  return raw[offset : offset + nbytes]
+
+
+@dataclasses.dataclass
+class HostBufferPoolMetrics:
+  """Counters collected by `HostBufferPool`.
+
+  Attributes:
+    num_hits: Number of `acquire` calls served by an idle pooled buffer.
+    num_misses: Number of `acquire` calls that allocated a new buffer.
+    num_evictions: Number of idle buffers dropped to respect the memory cap.
+    idle_bytes: Bytes currently held by idle pooled buffers.
+    in_use_bytes: Bytes currently handed out by `acquire`.
+  """
+
+  num_hits: int = 0
+  num_misses: int = 0
+  num_evictions: int = 0
+  idle_bytes: int = 0
+  in_use_bytes: int = 0
+
+
+class HostBufferPool:
+  """Size-bucketed pool of reusable, page-aligned host staging buffers.
+
+  Restoring a checkpoint allocates one host buffer per shard. When the same
+  model is restored repeatedly (e.g. by evaluation jobs), reusing those
+  buffers avoids allocator churn and the cost of faulting in fresh pages.
+
+  Requests are rounded up to a bucket size, and a released buffer may be
+  reused by any later request of the same bucket. Idle buffers are kept up to
+  `max_bytes`, evicting the least recently released ones first. Buffers
+  handed out by `acquire` do not count towards the cap.
+
+  Buffers are aligned to the host page size. This class is thread-safe, so a
+  single pool can be shared by concurrent operations running in different
+  threads (e.g. background restores).
+  """
+
+  def __init__(self, max_bytes: int, *, alignment: int = PAGE_SIZE):
+    if max_bytes < 0:
+      raise ValueError(f'Must provide non-negative `max_bytes`: {max_bytes}')
+    if alignment <= 0 or alignment & (alignment - 1):
+      raise ValueError(f'`alignment` must be a power of two: {alignment}')
+    self._max_bytes = max_bytes
+    self._alignment = alignment
+    self._lock = threading.Lock()
+    # Idle buffers per bucket size.
+    self._idle: dict[int, list[np.ndarray]] = collections.defaultdict(list)
+    # Idle buffers, in order of release, keyed by id.
+    self._lru: collections.OrderedDict[int, tuple[int, np.ndarray]] = (
+        collections.OrderedDict()
+    )
+    # Handed out arrays, keyed by id, with their bucket and underlying buffer.
+    # The array itself is retained so that its id cannot be reused.
+    self._in_use: dict[int, tuple[int, np.ndarray, np.ndarray]] = {}
+    self._metrics = HostBufferPoolMetrics()
+
+  @property
+  def metrics(self) -> HostBufferPoolMetrics:
+    """Returns a snapshot of the pool counters."""
+    with self._lock:
+      return dataclasses.replace(self._metrics)
+
+  def acquire(
+      self,
+      shape: Sequence[int],
+      dtype: np.dtype | jnp.dtype,
+      *,
+      zero: bool = False,
+  ) -> np.ndarray:
+    """Returns an uninitialized (or zero-filled) array from the pool.
+
+    The array must be handed back with `release` once it is no longer
+    referenced, including by any pending asynchronous transfer.
+
+    Args:
+      shape: Shape of the array.
+      dtype: Dtype of the array.
+      zero: Whether to zero-fill the array.
+
+    Returns:
+      A page-aligned array backed by a pooled buffer.
+    """
+    dtype = np.dtype(dtype)
+    nbytes = int(np.prod(shape, dtype=np.int64)) * dtype.itemsize
+    bucket = _bucket_size(nbytes)
+    with self._lock:
+      if self._idle[bucket]:
+        buffer = self._idle[bucket].pop()
+        del self._lru[id(buffer)]
+        self._metrics.idle_bytes -= bucket
+        self._metrics.num_hits += 1
+      else:
+        buffer = None
+        self._metrics.num_misses += 1
+      self._metrics.in_use_bytes += bucket
+    if buffer is None:
+      buffer = _allocate_aligned(bucket, self._alignment)
+    arr = buffer[:nbytes].view(dtype).reshape(shape)
+    if zero:
+      arr.fill(0)
+    with self._lock:
+      self._in_use[id(arr)] = (bucket, buffer, arr)
+    return arr
+
+  def release(self, arr: np.ndarray):
+    """Returns an array obtained from `acquire` to the pool."""
+    with self._lock:
+      try:
+        bucket, buffer, _ = self._in_use.pop(id(arr))
+      except KeyError as e:
+        raise ValueError(
+            'Array was not acquired from this pool, or was already released.'
+        ) from e
+      self._metrics.in_use_bytes -= bucket
+      if bucket > self._max_bytes:
+        self._metrics.num_evictions += 1
+        return
+      self._idle[bucket].append(buffer)
+      self._lru[id(buffer)] = (bucket, buffer)
+      self._metrics.idle_bytes += bucket
+      self._evict(self._max_bytes)
+
+  def discard(self, arr: np.ndarray):
+    """Forgets an array obtained from `acquire` without reusing its buffer.
+
+    Used when the buffer is still referenced elsewhere, e.g. when it ended up
+    backing a device buffer.
+
+    Args:
+      arr: The array obtained from `acquire`.
+    """
+    with self._lock:
+      try:
+        bucket, _, _ = self._in_use.pop(id(arr))
+      except KeyError as e:
+        raise ValueError(
+            'Array was not acquired from this pool, or was already released.'
+        ) from e
+      self._metrics.in_use_bytes -= bucket
+
+  def clear(self):
+    """Drops all idle buffers."""
+    with self._lock:
+      self._evict(0)
+
+  def _evict(self, max_idle_bytes: int):
+    while self._metrics.idle_bytes > max_idle_bytes:
+      buffer_id, (bucket, _) = self._lru.popitem(last=False)
+      self._idle[bucket] = [
+          b for b in self._idle[bucket] if id(b) != buffer_id
+      ]
+      self._metrics.idle_bytes -= bucket
+      self._metrics.num_evictions += 1
+      logging.vlog(
+          1,
+          'Evicted host buffer: %s | Idle bytes: %s',
+          humanize.naturalsize(bucket, binary=True),
+          humanize.naturalsize(self._metrics.idle_bytes, binary=True),
+      )
+
@@ -0,0 +1,111 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from absl.testing import absltest
+from absl.testing import parameterized
+import jax.numpy as jnp
+import numpy as np
+from orbax.checkpoint._src.serialization import host_buffer_pool
+
+
+PAGE_SIZE = host_buffer_pool.PAGE_SIZE
+
+
+class HostBufferPoolTest(parameterized.TestCase):
+
+  @parameterized.parameters(np.float32, jnp.bfloat16, np.int8)
+  def test_acquire(self, dtype):
+    pool = host_buffer_pool.HostBufferPool(1 << 20)
+    arr = pool.acquire((3, 5), dtype)
+    self.assertEqual(arr.shape, (3, 5))
+    self.assertEqual(arr.dtype, np.dtype(dtype))
+    self.assertEqual(arr.ctypes.data % PAGE_SIZE, 0)
+    arr[...] = 1
+    pool.release(arr)
+
+  def test_zero(self):
+    pool = host_buffer_pool.HostBufferPool(1 << 20)
+    arr = pool.acquire((16,), np.int32)
+    arr[...] = 7
+    pool.release(arr)
+    arr = pool.acquire((16,), np.int32, zero=True)
+    np.testing.assert_array_equal(arr, np.zeros((16,), np.int32))
+
+  def test_reuse_within_bucket(self):
+    pool = host_buffer_pool.HostBufferPool(1 << 20)
+    arr = pool.acquire((100,), np.float32)
+    address = arr.ctypes.data
+    pool.release(arr)
+    # Different shape and dtype, same bucket.
+    arr = pool.acquire((10, 10), np.int32)
+    self.assertEqual(arr.ctypes.data, address)
+    self.assertEqual(pool.metrics.num_hits, 1)
+    self.assertEqual(pool.metrics.num_misses, 1)
+    self.assertEqual(pool.metrics.in_use_bytes, PAGE_SIZE)
+    self.assertEqual(pool.metrics.idle_bytes, 0)
+
+  def test_lru_eviction(self):
+    pool = host_buffer_pool.HostBufferPool(2 * PAGE_SIZE)
+    arrays = [pool.acquire((PAGE_SIZE,), np.uint8) for _ in range(3)]
+    addresses = [a.ctypes.data for a in arrays]
+    for a in arrays:
+      pool.release(a)
+    self.assertEqual(pool.metrics.num_evictions, 1)
+    self.assertEqual(pool.metrics.idle_bytes, 2 * PAGE_SIZE)
+    reused = {pool.acquire((PAGE_SIZE,), np.uint8).ctypes.data for _ in range(2)}
+    # The least recently released buffer was evicted.
+    self.assertEqual(reused, set(addresses[1:]))
+
+  def test_oversized_buffer_is_not_pooled(self):
+    pool = host_buffer_pool.HostBufferPool(PAGE_SIZE)
+    pool.release(pool.acquire((4 * PAGE_SIZE,), np.uint8))
+    self.assertEqual(pool.metrics.idle_bytes, 0)
+    self.assertEqual(pool.metrics.num_evictions, 1)
+
+  def test_release_unknown_array(self):
+    pool = host_buffer_pool.HostBufferPool(PAGE_SIZE)
+    with self.assertRaises(ValueError):
+      pool.release(np.zeros(4))
+    arr = pool.acquire((4,), np.float32)
+    pool.release(arr)
+    with self.assertRaises(ValueError):
+      pool.release(arr)
+
+  def test_discard(self):
+    pool = host_buffer_pool.HostBufferPool(1 << 20)
+    arr = pool.acquire((4,), np.float32)
+    pool.discard(arr)
+    self.assertEqual(pool.metrics.in_use_bytes, 0)
+    self.assertEqual(pool.metrics.idle_bytes, 0)
+    with self.assertRaises(ValueError):
+      pool.release(arr)
+
+  def test_clear(self):
+    pool = host_buffer_pool.HostBufferPool(1 << 20)
+    pool.release(pool.acquire((4,), np.float32))
+    pool.clear()
+    self.assertEqual(pool.metrics.idle_bytes, 0)
+
+  @parameterized.parameters(
+      (1, PAGE_SIZE),
+      (PAGE_SIZE, PAGE_SIZE),
+      (PAGE_SIZE + 1, 2 * PAGE_SIZE),
+      (100 * PAGE_SIZE, 112 * PAGE_SIZE),
+  )
+  def test_bucket_size(self, nbytes, expected):
+    self.assertEqual(host_buffer_pool._bucket_size(nbytes), expected)
+
+
+if __name__ == '__main__':
+  absltest.main()
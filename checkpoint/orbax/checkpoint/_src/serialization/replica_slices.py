@@ -14,6 +14,7 @@
 
 """Handles replica slices of jax.Arrays and host transfers."""
 
+import asyncio
 import collections
 import dataclasses
 import functools
@@ -32,6 +33,7 @@ from orbax.checkpoint._src.multihost import multihost
 Shape = types.Shape
 Index = types.Index
 OptionalAxisAndShape = tuple[int | None, Shape| None]
+OptionalAxesAndShape = tuple[tuple[int, ...] | None, Shape | None]
 
 HashableIndex = types.HashableIndex
 HashableSlice = types.HashableSlice
@@ -59,16 +61,20 @@ class ReplicaSlice:
 
   With single-replica checkpointing the entirety of each jax.Shard is owned by
   exactly one replica. With replica-parallel checkpointing ownership of each
-  jax.Shard is split evenly across replicas, hence each of the R replicas will
-  be responsible for saving 1/R of each shard.
+  jax.Shard is split across replicas, hence each of the R replicas will be
+  responsible for saving roughly 1/R of each shard. When the shard cannot be
+  split evenly, the last slices may be smaller (ragged), and the shard may be
+  split along several axes at once.
 
   `unsliced_data` refers to the corresponding jax.Shard's single-device array.
-  The part of `unsliced_data` actually owned is given by `slice_args`.
+  The part of `unsliced_data` actually owned is given by `slice_args`, which is
+  either a single `SliceArgs` or, when slicing along several axes, a tuple of
+  `SliceArgs` with distinct axes.
   """
 
   index: Index
   unsliced_data: jax.Array | np.ndarray
-  slice_args: Optional[SliceArgs]
+  slice_args: Optional[SliceArgs | tuple[SliceArgs, ...]]
 
   def __post_init__(self):
     if self.is_on_host:
@@ -78,16 +84,34 @@ class ReplicaSlice:
   def is_on_host(self):
     return isinstance(self.unsliced_data, np.ndarray)
 
-  def data(self):
+  def _slice_args_seq(self) -> tuple[SliceArgs, ...]:
     if self.slice_args is None:
-      return self.unsliced_data
-    else:
-      return jax.lax.slice_in_dim(
-          self.unsliced_data,
-          start_index=self.slice_args.start_index,
-          limit_index=self.slice_args.limit_index,
-          axis=self.slice_args.axis,
+      return ()
+    if isinstance(self.slice_args, SliceArgs):
+      return (self.slice_args,)
+    return self.slice_args
+
+  @property
+  def shape(self) -> Shape:
+    shape = list(self.unsliced_data.shape)
+    for slice_args in self._slice_args_seq():
+      shape[slice_args.axis] = slice_args.limit_index - slice_args.start_index
+    return tuple(shape)
+
+  @property
+  def nbytes(self) -> int:
+    return math.prod(self.shape) * self.unsliced_data.dtype.itemsize
+
+  def data(self):
+    data = self.unsliced_data
+    for slice_args in self._slice_args_seq():
+      data = jax.lax.slice_in_dim(
+          data,
+          start_index=slice_args.start_index,
+          limit_index=slice_args.limit_index,
+          axis=slice_args.axis,
       )
+    return data
 
 
 @dataclasses.dataclass(frozen=True)
@@ -113,8 +137,7 @@ class ReplicaSlices:
 
   @property
   def nbytes(self) -> int:
-    slice_nbytes = math.prod(self.local_shape) * self.dtype.itemsize
-    return slice_nbytes * len(self.replica_slices)
+    return sum(rslice.nbytes for rslice in self.replica_slices)
 
   def to_fragments(self) -> fragments.Fragments:
     """Converts replica slices to fragments."""
@@ -132,10 +155,13 @@ class ReplicaSlices:
             for rslice in self.replica_slices
         ],
     )
-    if result.fragments:
-      fragments.validate_fragments_can_be_stacked(result)
-    if not result.is_degenerate():
-      assert self.local_shape == result.fragments[0].shape
+    # Ragged replica-parallel slices may be smaller than `local_shape`, which
+    # is the largest slice shape (and the chunk shape used for writing).
+    for fragment in result.fragments:
+      assert all(
+          dim <= local_dim
+          for dim, local_dim in zip(fragment.shape, self.local_shape)
+      ), (fragment, self.local_shape)
     return result
 
 
@@ -177,27 +203,126 @@ def _sharding_num_replicas(
   return num_replicas
 
 
-def calculate_replica_parallel_axis_and_local_shape(
+@functools.lru_cache(maxsize=4096)
+def _plan_replica_parallel(
+    shard_shape: Shape, global_shape: Shape, replica_count: int
+) -> tuple[tuple[int, ...], Shape] | None:
+  """Plans how to split a shard across `replica_count` replicas.
+
+  The shard is cut into a grid of slices of shape `local_shape` (the last slice
+  along each split axis may be ragged). Slice `i` of the grid (in C order) is
+  written by replica `i`; replicas beyond the number of slices write nothing.
+
+  Slice boundaries must fall on the chunk grid implied by `local_shape`, since
+  `local_shape` is also used as the chunk shape for writing. Otherwise two
+  replicas of neighboring shards could write to the same chunk. Along a split
+  axis this holds if the slice size divides the shard size, or if the shard
+  spans the entire axis (so that a ragged slice ends at the array boundary).
+
+  Among all valid plans, the one with the smallest slice (i.e. the most even
+  distribution of the write load) is chosen. Ties are broken in favor of fewer
+  split axes and then lower axis indices, so evenly divisible shards are split
+  along their first evenly divisible axis.
+
+  Args:
+    shard_shape: Shape of the shard to split.
+    global_shape: Global shape of the array.
+    replica_count: Number of replicas of each shard.
+
+  Returns:
+    The tuple of split axes and the (maximal) slice shape, or None if the shard
+    cannot be split.
+  """
+  rank = len(shard_shape)
+
+  def candidate_sizes(axis: int) -> list[tuple[int, int]]:
+    """Returns (num_slices, slice_size) candidates along `axis`."""
+    size = shard_shape[axis]
+    candidates = {}
+    for num_slices in range(1, min(size, replica_count) + 1):
+      slice_size = -(-size // num_slices)
+      if size % slice_size and size != global_shape[axis]:
+        continue
+      # Different `num_slices` may round to the same slice size; only the
+      # smallest number of slices is needed to cover the shard.
+      actual_num_slices = -(-size // slice_size)
+      candidates[slice_size] = actual_num_slices
+    return sorted(
+        ((n, slice_size) for slice_size, n in candidates.items()),
+        key=lambda c: c[0],
+    )
+
+  per_axis_candidates = [candidate_sizes(axis) for axis in range(rank)]
+  best_key = None
+  best_plan = None
+
+  def search(axis: int, num_slices: int, slice_shape: list[int]):
+    nonlocal best_key, best_plan
+    if axis == rank:
+      if num_slices <= 1:
+        return
+      split_axes = tuple(
+          i for i in range(rank) if slice_shape[i] != shard_shape[i]
+      )
+      key = (math.prod(slice_shape), len(split_axes), split_axes)
+      if best_key is None or key < best_key:
+        best_key = key
+        best_plan = (split_axes, tuple(slice_shape))
+      return
+    for n, slice_size in per_axis_candidates[axis]:
+      if num_slices * n > replica_count:
+        break
+      slice_shape[axis] = slice_size
+      search(axis + 1, num_slices * n, slice_shape)
+    slice_shape[axis] = shard_shape[axis]
+
+  search(0, 1, list(shard_shape))
+  return best_plan
+
+
+def calculate_replica_parallel_axes_and_local_shape(
     arr: jax.Array,
-) -> OptionalAxisAndShape:
-  """Calculates a local shape for replica-parallel serialization."""
+) -> OptionalAxesAndShape:
+  """Calculates split axes and local shape for replica-parallel serialization.
+
+  Args:
+    arr: The array to be serialized.
+
+  Returns:
+    The axes along which shards are split across replicas, and the largest
+    slice shape that any replica writes. Both are None if replica-parallel
+    serialization does not apply.
+  """
   shard0 = arr.addressable_shards[0]
   replica_count = _sharding_num_replicas(arr.sharding, arr.shape)
   if shard0.data.size == 0 or replica_count <= 1:
     return None, None
-  try:
-    axis = next(
-        axis_index
-        for axis_index, axis_size in enumerate(shard0.data.shape)
-        if axis_size % replica_count == 0
-    )
-  except StopIteration:
-    return None, None
-  local_shape = tuple(
-      axis_size // (replica_count if axis_index == axis else 1)
-      for axis_index, axis_size in enumerate(shard0.data.shape)
+  plan = _plan_replica_parallel(
+      tuple(shard0.data.shape), tuple(arr.shape), replica_count
   )
-  return axis, local_shape
+  if plan is None:
+    return None, None
+  return plan
+
+
+def calculate_replica_parallel_axis_and_local_shape(
+    arr: jax.Array,
+) -> OptionalAxisAndShape:
+  """Calculates a local shape for replica-parallel serialization.
+
+  Prefer `calculate_replica_parallel_axes_and_local_shape`, since shards may be
+  split along several axes. This returns the first split axis.
+
+  Args:
+    arr: The array to be serialized.
+
+  Returns:
+    The first split axis and the local shape, or None, None.
+  """
+  axes, local_shape = calculate_replica_parallel_axes_and_local_shape(arr)
+  if axes is None:
+    return None, None
+  return axes[0], local_shape
 
 
 def get_replica_slices(
@@ -243,8 +368,6 @@ def get_replica_slices(
   # replica-parallel: every replica saves part of a shard.
   # Logic based on axlearn:
   # https://github.com/apple/axlearn/blob/226d27ab7569668f2c38a35cf32d5dc5190ebdbb/axlearn/common/array_serialization.py#L75
-  # TODO(gspschmid): Support replica-parallel in arrays without any evenly-
-  # divisible dimension. The last replica would transfer a smaller slice.
   def maybe_pick_replica_parallel() -> Optional[Result]:
     if replica_id is None:
       raise ValueError(
@@ -252,32 +375,48 @@ def get_replica_slices(
       )
 
     # Check whether replica-parallel applies: we are dealing with non-empty
-    # shards, we have more than one replica, and some dimension of the shards
-    # is evenly divisible across replicas.
-    axis, local_shape = calculate_replica_parallel_axis_and_local_shape(arr)
-    if axis is None or local_shape is None:
+    # shards, we have more than one replica, and the shards can be split
+    # across replicas along some axes.
+    axes, local_shape = calculate_replica_parallel_axes_and_local_shape(arr)
+    if axes is None or local_shape is None:
       return None
 
+    shard_shape = shard0.data.shape
+    grid_shape = tuple(
+        -(-shard_shape[axis] // local_shape[axis]) for axis in axes
+    )
+    num_slices = math.prod(grid_shape)
+
     rslices: list[ReplicaSlice] = []
     for shard in arr.addressable_shards:
       # Sanity check that all shards have the same shape.
-      assert shard.data.shape == shard0.data.shape
-
-      size = local_shape[axis]
-      slize = shard.index[axis]
-      start = slize.start or 0
-      assert slize.step is None
-      assert slize.stop is None or slize.stop == start + shard.data.shape[axis]
-
-      start_offset = shard.replica_id * size
-      end_offset = start_offset + size
-      new_slice = slice(start + start_offset, start + end_offset)
+      assert shard.data.shape == shard_shape
+      if shard.replica_id >= num_slices:
+        # More replicas than slices: this replica has nothing to write.
+        continue
+
+      index = list(shard.index)
+      slice_args = []
+      grid_index = np.unravel_index(shard.replica_id, grid_shape)
+      for axis, i in zip(axes, grid_index):
+        size = local_shape[axis]
+        slize = shard.index[axis]
+        start = slize.start or 0
+        assert slize.step is None
+        assert slize.stop is None or slize.stop == start + shard_shape[axis]
+
+        start_offset = int(i) * size
+        end_offset = min(start_offset + size, shard_shape[axis])
+        index[axis] = slice(start + start_offset, start + end_offset)
+        slice_args.append(SliceArgs(start_offset, end_offset, axis))
 
       rslices.append(
           ReplicaSlice(
-              index=shard.index[:axis] + (new_slice,) + shard.index[axis + 1 :],
+              index=tuple(index),
               unsliced_data=shard.data,
-              slice_args=SliceArgs(start_offset, end_offset, axis),
+              slice_args=(
+                  slice_args[0] if len(slice_args) == 1 else tuple(slice_args)
+              ),
           )
       )
 
@@ -313,6 +452,44 @@ def get_replica_slices(
   )
 
 
+def _use_pinned_host_transfer(
+    device: jax.Device, enable_pinned_host_transfer: bool
+) -> bool:
+  has_pinned_host = any(
+      m.kind == 'pinned_host' for m in device.addressable_memories()
+  )
+  return enable_pinned_host_transfer and has_pinned_host
+
+
+def _async_transfer_slice(
+    rslice: ReplicaSlice, enable_pinned_host_transfer: bool
+) -> jax.Array:
+  """Starts the asynchronous D2H copy of a replica slice."""
+  assert not rslice.is_on_host
+  data = rslice.data()
+  assert isinstance(data, jax.Array)
+  device = data.device
+  # Start the asynchronous device-to-host copy
+  if _use_pinned_host_transfer(device, enable_pinned_host_transfer):
+    # If available, transfer to pinned host memory
+    data = jax.device_put(
+        data,
+        jax.sharding.SingleDeviceSharding(device, memory_kind='pinned_host'),
+    )
+  else:
+    data.copy_to_host_async()
+  return data
+
+
+def _on_host(rslice: ReplicaSlice, data: jax.Array) -> ReplicaSlice:
+  return dataclasses.replace(
+      rslice,
+      # Conversion to numpy arrays forces block_until_ready.
+      unsliced_data=np.asarray(data),
+      slice_args=None,
+  )
+
+
 def transfer_arrays_to_host(
     arrays: Sequence[jax.Array],
     replica_id: Optional[int],
@@ -345,33 +522,6 @@ def transfer_arrays_to_host(
       enable_pinned_host_transfer,
   )
 
-  def use_pinned_host_transfer(device: jax.Device):
-    has_pinned_host = any(
-        m.kind == 'pinned_host' for m in device.addressable_memories()
-    )
-    return (
-        enable_pinned_host_transfer
-        and has_pinned_host
-    )
-
-  def async_transfer_slice(
-      rslice: ReplicaSlice,
-  ) -> tuple[ReplicaSlice, jax.Array]:
-    assert not rslice.is_on_host
-    data = rslice.data()
-    assert isinstance(data, jax.Array)
-    device = data.device
-    # Start the asynchronous device-to-host copy
-    if use_pinned_host_transfer(device):
-      # If available, transfer to pinned host memory
-      data = jax.device_put(
-          data,
-          jax.sharding.SingleDeviceSharding(device, memory_kind='pinned_host'),
-      )
-    else:
-      data.copy_to_host_async()
-    return rslice, data
-
   # Gather the replica slices to be saved for each array.
   rslices_per_array = [
       get_replica_slices(arr, replica_id, use_replica_parallel)
@@ -379,7 +529,10 @@ def transfer_arrays_to_host(
   ]
   # Kick off transfers for all replica slices to be saved.
   transfers_per_array = [
-      [async_transfer_slice(rslice) for rslice in rslices.replica_slices]
+      [
+          (rslice, _async_transfer_slice(rslice, enable_pinned_host_transfer))
+          for rslice in rslices.replica_slices
+      ]
       for rslices in rslices_per_array
   ]
   # Wait for all the transferred data to be ready.
@@ -388,14 +541,33 @@ def transfer_arrays_to_host(
           rslices,
           is_on_host=True,
           replica_slices=[
-              dataclasses.replace(
-                  rslice_on_device,
-                  # Conversion to numpy arrays forces block_until_ready.
-                  unsliced_data=np.asarray(data),
-                  slice_args=None,
-              )
+              _on_host(rslice_on_device, data)
               for rslice_on_device, data in transfers
           ],
       )
       for rslices, transfers in zip(rslices_per_array, transfers_per_array)
   ]
+
+
+async def transfer_replica_slice_to_host(
+    rslice: ReplicaSlice,
+    *,
+    enable_pinned_host_transfer: bool = False,
+) -> ReplicaSlice:
+  """Transfers a single on-device replica slice to host memory.
+
+  Unlike `transfer_arrays_to_host`, this does not block the event loop while
+  waiting for the transfer, so that many slices can be streamed to host
+  concurrently (e.g. under a `ByteLimiter`) and written out as soon as each
+  one lands.
+
+  Args:
+    rslice: The on-device replica slice.
+    enable_pinned_host_transfer: Whether to allow transfer to pinned host
+      memory.
+
+  Returns:
+    The replica slice, in host memory.
+  """
+  data = _async_transfer_slice(rslice, enable_pinned_host_transfer)
+  return await asyncio.to_thread(_on_host, rslice, data)
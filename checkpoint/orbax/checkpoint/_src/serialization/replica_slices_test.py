@@ -90,40 +90,67 @@ class ReplicaSlicesTest(parameterized.TestCase):
     self.assertEmpty(rslices)
 
   @parameterized.parameters([
-      ((64, 64), 0),
-      ((13, 64), 1),
+      ((64, 64), (0,)),
+      ((13, 64), (1,)),
       ((13, 11), None),
   ])
-  def test_get_replica_slices_replica_parallel(self, shape, expected_axis):
+  def test_get_replica_slices_replica_parallel(self, shape, expected_axes):
     if len(jax.devices()) < 4:
       self.skipTest('Test requires multiple devices.')
     arr, _, num_replicas = make_multi_device_array(shape, partitioned=False)
 
     rslices = replica_slices.get_replica_slices(
         arr, replica_id=0, use_replica_parallel=True
-    ).replica_slices
-    if expected_axis is None:
-      # Replica-parallel expected to fail. Fall back to a single replica owning
-      # the entire shard.
-      self.assertLen(rslices, 1)
-      self.assertIsNone(rslices[0].slice_args)
-    else:
-      # Replica-parallel expected to succeed. Every replica owns some data.
-      # We're running on a single host, so all replicas' shards are addressable.
-      self.assertLen(rslices, num_replicas)
-      for rslice in rslices:
-        self.assertTrue(rslice.slice_args)
-        self.assertEqual(rslice.slice_args.axis, expected_axis)
+    )
+    axes, local_shape = (
+        replica_slices.calculate_replica_parallel_axes_and_local_shape(arr)
+    )
+    self.assertEqual(rslices.local_shape, local_shape)
+    if expected_axes is not None:
+      self.assertEqual(axes, expected_axes)
+    # Replica-parallel is expected to succeed, even if no dimension is evenly
+    # divisible. We're running on a single host, so all replicas' shards are
+    # addressable, and (almost) every replica owns some data.
+    self.assertGreater(len(rslices.replica_slices), 1)
+    self.assertLessEqual(len(rslices.replica_slices), num_replicas)
+    for rslice in rslices.replica_slices:
+      self.assertTrue(rslice.slice_args)
+      for dim, local_dim in zip(rslice.shape, local_shape):
+        self.assertLessEqual(dim, local_dim)
+
+  @parameterized.parameters([
+      # Evenly divisible.
+      ((8, 6), (8, 6), 4, ((0,), (2, 6))),
+      # Ragged last slice: 4, 4, 4, 1.
+      ((13,), (13,), 4, ((0,), (4,))),
+      # Partially replicated: ragged slices would straddle chunks of
+      # neighboring shards, so only sizes dividing the shard are allowed.
+      ((10,), (20,), 4, ((0,), (5,))),
+      # No single axis can be split across enough replicas.
+      ((3, 3), (3, 3), 8, ((0, 1), (2, 1))),
+      # Cannot be split at all.
+      ((1, 1), (1, 1), 4, None),
+  ])
+  def test_plan_replica_parallel(
+      self, shard_shape, global_shape, replica_count, expected
+  ):
+    self.assertEqual(
+        replica_slices._plan_replica_parallel(
+            shard_shape, global_shape, replica_count
+        ),
+        expected,
+    )
 
   @parameterized.product(
       partitioned=[False, True],
       use_replica_parallel=[False, True],
+      shape=[(64, 64), (14, 11)],
   )
-  def test_transfer(self, partitioned, use_replica_parallel):
+  def test_transfer(self, partitioned, use_replica_parallel, shape):
     if jax.device_count() < 4:
       self.skipTest('Not enough devices to test.')
     arr, num_partitions, num_replicas = make_multi_device_array(
-        (64, 64),
+        shape,
         partitioned=partitioned,
     )
 
@@ -144,10 +171,13 @@ class ReplicaSlicesTest(parameterized.TestCase):
     self.assertFalse(np.any(np.isnan(combined_rslices)))
     np.testing.assert_array_equal(combined_rslices, arr)
 
-    if use_replica_parallel:
+    if use_replica_parallel and shape == (64, 64):
       # With replica-parallel we transfer each of the `num_partitions` shards
       # as `num_replicas` slices.
       self.assertLen(rslices.replica_slices, num_partitions * num_replicas)
+    elif use_replica_parallel:
+      # Uneven shards are still split across several replicas.
+      self.assertGreater(len(rslices.replica_slices), num_partitions)
     else:
       # With single-replica we transfer a single slice for each shard.
       self.assertLen(rslices.replica_slices, num_partitions)
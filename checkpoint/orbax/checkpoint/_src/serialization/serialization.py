@@ -18,8 +18,13 @@ import asyncio
 import collections
 from collections.abc import Mapping
 import contextlib
+import dataclasses
+import heapq
+import itertools
+import math
 import os
 import re
+import time
 from typing import Any, AsyncIterator, Dict, Optional, Protocol, Sequence, Union
 
 from absl import logging
@@ -31,7 +36,9 @@ import numpy as np
 from orbax.checkpoint._src.arrays import fragments
 from orbax.checkpoint._src.arrays import numpy_utils as np_utils
 from orbax.checkpoint._src.arrays import types
+from orbax.checkpoint._src.logging import tracing
 from orbax.checkpoint._src.multihost import multihost
+from orbax.checkpoint._src.serialization import host_buffer_pool as host_buffer_pool_lib
 from orbax.checkpoint._src.serialization import replica_slices
 from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 import tensorstore as ts
@@ -40,6 +47,8 @@ import tensorstore as ts
 TS_CONTEXT = ts.Context({'file_io_concurrency': {'limit': 128}})
 _REMOVED_VALUE = 'Value removed'
 _CHECKPOINT_SUCCESS = 'checkpoint_write_success'
+# Stored chunks read at once when scattering them into several shards.
+_MAX_CONCURRENT_CHUNK_READS = 8
 
 Index = types.Index
 Layout = layout.Layout
@@ -113,50 +122,173 @@ class ByteLimiter(Protocol):
     ...
 
 
-# Lifted from T5X.
+@dataclasses.dataclass
+class ByteLimiterMetrics:
+  """Counters collected by `LimitInFlightBytes`.
+
+  Attributes:
+    num_requests: Total number of reservations requested.
+    num_waits: Number of reservations that could not be granted immediately.
+    num_oversized_requests: Number of reservations that requested more bytes
+      than the limiter capacity, and were therefore clamped to the full
+      capacity.
+    total_wait_time_secs: Total time spent by all requests waiting for bytes.
+    max_wait_time_secs: Longest time a single request waited for bytes.
+    reserved_bytes: Bytes currently reserved.
+    peak_reserved_bytes: Maximum number of bytes reserved at any point.
+    queue_depth: Number of requests currently waiting for bytes.
+    peak_queue_depth: Maximum number of requests waiting at any point.
+  """
+
+  num_requests: int = 0
+  num_waits: int = 0
+  num_oversized_requests: int = 0
+  total_wait_time_secs: float = 0.0
+  max_wait_time_secs: float = 0.0
+  reserved_bytes: int = 0
+  peak_reserved_bytes: int = 0
+  queue_depth: int = 0
+  peak_queue_depth: int = 0
+
+
+# Originally lifted from T5X.
 class LimitInFlightBytes(ByteLimiter):
-  """Limits in-flight bytes when reading/writing checkpoints per process."""
+  """Limits in-flight bytes when reading/writing checkpoints per process.
+
+  Reservations are granted in order of `priority` (higher first) and, within
+  the same priority, in FIFO order. A request that does not fit blocks all
+  requests queued behind it, so large shards cannot be starved by a stream of
+  small ones. Releasing bytes only wakes the requests that can now proceed.
+
+  A request for more bytes than the limiter capacity is clamped to the full
+  capacity: it waits until all bytes are available and then holds them
+  exclusively. The matching `release_bytes` call must pass the same
+  `requested_bytes`.
+  """
 
   def __init__(self, num_bytes: int):
     if num_bytes <= 0:
       raise ValueError(f'Must provide positive `num_bytes`. Found: {num_bytes}')
     self._max_bytes = num_bytes
     self._available_bytes = num_bytes
-    self._cv = asyncio.Condition(lock=asyncio.Lock())
+    # Heap of (-priority, sequence number, reserved bytes, future).
+    self._waiters: list[tuple[int, int, int, asyncio.Future[None]]] = []
+    self._sequence = itertools.count()
+    self._metrics = ByteLimiterMetrics()
+
+  @property
+  def max_bytes(self) -> int:
+    return self._max_bytes
+
+  @property
+  def metrics(self) -> ByteLimiterMetrics:
+    """Returns a snapshot of the limiter counters."""
+    return dataclasses.replace(self._metrics)
+
+  def _clamp(self, requested_bytes: int) -> int:
+    return min(requested_bytes, self._max_bytes)
+
+  def _reserve(self, nbytes: int):
+    self._available_bytes -= nbytes
+    assert self._available_bytes >= 0
+    self._metrics.reserved_bytes = self._max_bytes - self._available_bytes
+    self._metrics.peak_reserved_bytes = max(
+        self._metrics.peak_reserved_bytes, self._metrics.reserved_bytes
+    )
+    logging.vlog(
+        1,
+        'Reserved bytes: %s | Remaining bytes: %s',
+        humanize.naturalsize(nbytes, binary=True),
+        humanize.naturalsize(self._available_bytes, binary=True),
+    )
 
-  async def wait_for_bytes(self, requested_bytes: int):
-    """Reserve bytes."""
-    if requested_bytes >= self._max_bytes:
-      raise ValueError('Requested more bytes than we reserved space for: '
-                       f'{requested_bytes} > {self._max_bytes}')
-    async with self._cv:
-      await self._cv.wait_for(lambda: self._available_bytes > requested_bytes)
-      self._available_bytes -= requested_bytes
+  def _grant_waiters(self):
+    """Grants bytes to queued requests, in order, while they fit."""
+    while self._waiters:
+      _, _, nbytes, waiter = self._waiters[0]
+      if waiter.done():
+        heapq.heappop(self._waiters)
+        continue
+      if nbytes > self._available_bytes:
+        break
+      heapq.heappop(self._waiters)
+      self._reserve(nbytes)
+      waiter.set_result(None)
+    self._metrics.queue_depth = len(self._waiters)
+
+  async def wait_for_bytes(self, requested_bytes: int, *, priority: int = 0):
+    """Reserve bytes.
+
+    Args:
+      requested_bytes: Number of bytes to reserve.
+      priority: Requests with a higher priority are granted before requests
+        with a lower priority that are still waiting.
+    """
+    if requested_bytes < 0:
+      raise ValueError(
+          f'Must request a non-negative number of bytes: {requested_bytes}'
+      )
+    nbytes = self._clamp(requested_bytes)
+    self._metrics.num_requests += 1
+    if requested_bytes > self._max_bytes:
+      self._metrics.num_oversized_requests += 1
       logging.vlog(
           1,
-          'Reserved bytes: %s | Remaining bytes: %s',
+          'Requested bytes: %s exceed the limit: %s; waiting for exclusive'
+          ' access.',
           humanize.naturalsize(requested_bytes, binary=True),
-          humanize.naturalsize(self._available_bytes, binary=True),
+          humanize.naturalsize(self._max_bytes, binary=True),
+      )
+    if not self._waiters and nbytes <= self._available_bytes:
+      self._reserve(nbytes)
+      return
+
+    waiter = asyncio.get_running_loop().create_future()
+    entry = (-priority, next(self._sequence), nbytes, waiter)
+    heapq.heappush(self._waiters, entry)
+    self._metrics.num_waits += 1
+    self._metrics.queue_depth = len(self._waiters)
+    self._metrics.peak_queue_depth = max(
+        self._metrics.peak_queue_depth, self._metrics.queue_depth
+    )
+    start = time.time()
+    try:
+      await waiter
+    except asyncio.CancelledError:
+      if waiter.done() and not waiter.cancelled():
+        # Bytes were granted just before cancellation; hand them back.
+        await self.release_bytes(requested_bytes)
+      else:
+        self._waiters.remove(entry)
+        heapq.heapify(self._waiters)
+        # The cancelled request may have been blocking the head of the queue.
+        self._grant_waiters()
+      raise
+    finally:
+      wait_time = time.time() - start
+      self._metrics.total_wait_time_secs += wait_time
+      self._metrics.max_wait_time_secs = max(
+          self._metrics.max_wait_time_secs, wait_time
       )
-      assert self._available_bytes >= 0
 
   async def release_bytes(self, requested_bytes: int):
-    async with self._cv:
-      self._available_bytes += requested_bytes
-      logging.vlog(
-          1,
-          'Releasing bytes: %s | Available bytes: %s',
-          humanize.naturalsize(requested_bytes, binary=True),
-          humanize.naturalsize(self._available_bytes, binary=True),
-      )
-      assert self._available_bytes <= self._max_bytes
-      self._cv.notify_all()
+    nbytes = self._clamp(requested_bytes)
+    self._available_bytes += nbytes
+    self._metrics.reserved_bytes = self._max_bytes - self._available_bytes
+    logging.vlog(
+        1,
+        'Releasing bytes: %s | Available bytes: %s',
+        humanize.naturalsize(nbytes, binary=True),
+        humanize.naturalsize(self._available_bytes, binary=True),
+    )
+    assert self._available_bytes <= self._max_bytes
+    self._grant_waiters()
 
 
 class UnlimitedInFlightBytes(ByteLimiter):
 
-  async def wait_for_bytes(self, requested_bytes: int):
-    del requested_bytes
+  async def wait_for_bytes(self, requested_bytes: int, *, priority: int = 0):
+    del requested_bytes, priority
     return
 
   async def release_bytes(self, requested_bytes: int):
@@ -178,9 +310,26 @@ def get_byte_limiter(concurrent_bytes: Optional[int] = None) -> ByteLimiter:
 async def reserved_bytes(
     byte_limiter: ByteLimiter,
     nbytes: int,
+    *,
+    priority: Optional[int] = None,
 ) -> AsyncIterator[None]:
-  """Reserves some bytes for the duration of the context."""
-  await byte_limiter.wait_for_bytes(nbytes)
+  """Reserves some bytes for the duration of the context.
+
+  Args:
+    byte_limiter: The limiter to reserve bytes from.
+    nbytes: Number of bytes to reserve.
+    priority: Optional reservation priority. Only forwarded to the limiter if
+      provided, so that custom `ByteLimiter` implementations without priority
+      support keep working.
+
+  Yields:
+    None, once the bytes have been reserved.
+  """
+  with tracing.span('byte_limiter_wait', bytes=nbytes):
+    if priority is None:
+      await byte_limiter.wait_for_bytes(nbytes)
+    else:
+      await byte_limiter.wait_for_bytes(nbytes, priority=priority)
   try:
     yield
   finally:
@@ -196,6 +345,7 @@ async def async_serialize(
     use_replica_parallel: bool = True,
     transaction: Optional[ts.Transaction] = None,
     byte_limiter: Optional[ByteLimiter] = None,
+    priority: Optional[int] = None,
 ):
   """Serialize an array using TensorStore.
 
@@ -221,6 +371,8 @@ async def async_serialize(
     byte_limiter: A ByteLimiter instance that will be used to limit the number
       of bytes in flight when writing to TensorStore. If None, no limitation
       will be applied.
+    priority: Priority of the byte reservations made for this array. See
+      `LimitInFlightBytes`.
   """
   # Start D2H transfer in parallel for each array.
   rslices = replica_slices.transfer_arrays_to_host(
@@ -244,6 +396,7 @@ async def async_serialize(
       primary_host=primary_host,
       transaction=transaction,
       byte_limiter=byte_limiter,
+      priority=priority,
   )
 
 
@@ -255,6 +408,7 @@ async def async_serialize_from_host(
     primary_host: Optional[int] = 0,
     transaction: Optional[ts.Transaction] = None,
     byte_limiter: Optional[ByteLimiter] = None,
+    priority: Optional[int] = None,
 ):
   """Serialize replica slices using TensorStore.
 
@@ -270,6 +424,8 @@ async def async_serialize_from_host(
     byte_limiter: A ByteLimiter instance that will be used to limit the number
       of bytes in flight when writing to TensorStore. If None, no limitation
       will be applied.
+    priority: Priority of the byte reservations made for this array. See
+      `LimitInFlightBytes`.
 
   Raises:
     KeyError: If `metadata` or `dtype` is not found in the tensorstore spec.
@@ -283,11 +439,296 @@ async def async_serialize_from_host(
   if 'dtype' not in tensorstore_spec:
     raise KeyError('`dtype` not found in tensorstore spec.')
   context = context or ts_utils.get_ts_context(use_ocdbt=False)
+  t = await _open_for_write(
+      tensorstore_spec,
+      context=context,
+      primary_host=primary_host,
+      transaction=transaction,
+  )
+
+  async def write_fragment(fragment: fragments.Fragment):
+    requested_bytes = estimate_write_memory_footprint(fragment.value)
+    async with reserved_bytes(byte_limiter, requested_bytes, priority=priority):
+      await _write_fragment(t, fragment)
+
+  write_coros = [
+      write_fragment(fragment)
+      for fragment in rslices_on_host.to_fragments().fragments
+  ]
+  await asyncio.gather(*write_coros)
+
+
+async def async_serialize_from_device(
+    rslices_on_device: replica_slices.ReplicaSlices,
+    tensorstore_spec: Dict[str, Any],
+    *,
+    context: Optional[ts.Context] = None,
+    primary_host: Optional[int] = 0,
+    transaction: Optional[ts.Transaction] = None,
+    byte_limiter: Optional[ByteLimiter] = None,
+    priority: Optional[int] = None,
+    enable_pinned_host_transfer: bool = False,
+):
+  """Streams replica slices to host and serializes them using TensorStore.
+
+  Each replica slice reserves its bytes from `byte_limiter` before its D2H
+  transfer starts, is written as soon as it lands in host memory, and releases
+  its bytes once the TensorStore write finishes. Host memory used by this
+  function is therefore bounded by the limiter capacity rather than by the
+  size of the array.
+
+  The on-device data backing `rslices_on_device` must remain valid (e.g. not
+  be donated or deleted) until this function completes.
+
+  Args:
+    rslices_on_device: Replica slices obtained via `get_replica_slices`.
+    tensorstore_spec: The tensorstore spec to use.
+    context: ts.Context instance.
+    primary_host: Primary host, which indicates the host that will be treated as
+      the "leader". If None, all hosts are treated as the primary. DO NOT USE
+      unless you are sure you know what you are doing.
+    transaction: TensorStore transaction to use for opening and writing the
+      array. Note that memory used by a transactional write is only released
+      once the transaction is committed, so host memory is not bounded when a
+      transaction is provided.
+    byte_limiter: A ByteLimiter instance bounding the bytes that are in flight
+      between the start of a D2H transfer and the end of the corresponding
+      TensorStore write. If None, no limitation will be applied.
+    priority: Priority of the byte reservations made for this array. See
+      `LimitInFlightBytes`.
+    enable_pinned_host_transfer: Whether to allow transfer to pinned host
+      memory.
+
+  Raises:
+    KeyError: If `metadata` or `dtype` is not found in the tensorstore spec.
+  """
+  if rslices_on_device.is_on_host:
+    raise ValueError('Replica slices have already been transferred to host.')
+  byte_limiter = byte_limiter or get_byte_limiter()
+  if not _spec_has_metadata(tensorstore_spec):
+    raise KeyError('`metadata` not found in tensorstore spec.')
+  if 'dtype' not in tensorstore_spec:
+    raise KeyError('`dtype` not found in tensorstore spec.')
+  context = context or ts_utils.get_ts_context(use_ocdbt=False)
+  t = await _open_for_write(
+      tensorstore_spec,
+      context=context,
+      primary_host=primary_host,
+      transaction=transaction,
+  )
+  global_shape = rslices_on_device.global_shape
+
+  async def transfer_and_write(rslice: replica_slices.ReplicaSlice):
+    async with reserved_bytes(byte_limiter, rslice.nbytes, priority=priority):
+      with tracing.span('device_to_host', bytes=rslice.nbytes):
+        rslice = await replica_slices.transfer_replica_slice_to_host(
+            rslice, enable_pinned_host_transfer=enable_pinned_host_transfer
+        )
+      await _write_fragment(
+          t,
+          fragments.Fragment(
+              index=np_utils.resolve_slice(rslice.index, global_shape),
+              value=rslice.data(),
+          ),
+      )
+
+  await asyncio.gather(
+      *[transfer_and_write(r) for r in rslices_on_device.replica_slices]
+  )
+
+
+# Arrays up to this size are written in shared batches by
+# `async_serialize_batch_from_host`.
+DEFAULT_SMALL_ARRAY_BYTES = 1024**2  # 1 MiB
+# Maximum total size of the arrays written in one batch.
+DEFAULT_MAX_BATCH_BYTES = 64 * 1024**2  # 64 MiB
+
+
+@dataclasses.dataclass(frozen=True)
+class WriteBatchMetrics:
+  """Throughput of a batch written by `async_serialize_batch_from_host`.
+
+  Attributes:
+    num_arrays: Number of arrays in the batch.
+    nbytes: Number of bytes written by this host.
+    duration_secs: Time from opening the arrays until the batch was committed.
+  """
 
+  num_arrays: int
+  nbytes: int
+  duration_secs: float
+
+  @property
+  def bytes_per_sec(self) -> float:
+    if self.duration_secs == 0:
+      return float('nan')
+    return self.nbytes / self.duration_secs
+
+
+def _plan_write_batches(
+    nbytes: Sequence[int],
+    *,
+    small_array_bytes: int,
+    max_batch_bytes: int,
+) -> list[list[int]]:
+  """Groups array indices into batches; large arrays get their own batch."""
+  batches = []
+  current, current_bytes = [], 0
+  for i, n in enumerate(nbytes):
+    if n > small_array_bytes:
+      batches.append([i])
+      continue
+    if current and current_bytes + n > max_batch_bytes:
+      batches.append(current)
+      current, current_bytes = [], 0
+    current.append(i)
+    current_bytes += n
+  if current:
+    batches.append(current)
+  return batches
+
+
+async def async_serialize_batch_from_host(
+    rslices_on_host: Sequence[replica_slices.ReplicaSlices],
+    tensorstore_specs: Sequence[Dict[str, Any]],
+    *,
+    context: Optional[ts.Context] = None,
+    primary_host: Optional[int] = 0,
+    transaction: Optional[ts.Transaction] = None,
+    byte_limiter: Optional[ByteLimiter] = None,
+    priority: Optional[int] = None,
+    small_array_bytes: int = DEFAULT_SMALL_ARRAY_BYTES,
+    max_batch_bytes: int = DEFAULT_MAX_BATCH_BYTES,
+) -> list[WriteBatchMetrics]:
+  """Serializes many arrays, writing small arrays in shared transactions.
+
+  Writing each array separately costs at least one round trip to storage per
+  array, which dominates the save time of models with many small parameters
+  (e.g. biases and norms). Instead, arrays of at most `small_array_bytes` are
+  grouped into batches of at most `max_batch_bytes`, and each batch is opened,
+  written and committed as a single TensorStore transaction. With OCDBT, a
+  committed transaction is packed into a single data file. Larger arrays are
+  written separately, like `async_serialize_from_host`.
+
+  Since memory written in a transaction is only released once the transaction
+  is committed, each batch reserves its total size from `byte_limiter` until
+  its commit completes.
+
+  Args:
+    rslices_on_host: Replica slices of each array, obtained via
+      `transfer_arrays_to_host`.
+    tensorstore_specs: The tensorstore spec of each array.
+    context: ts.Context instance.
+    primary_host: Primary host, which indicates the host that will be treated as
+      the "leader". If None, all hosts are treated as the primary.
+    transaction: If provided, all arrays are written in this transaction, which
+      is left for the caller to commit; batches are then only used for
+      reporting. `byte_limiter` must not be used in this case.
+    byte_limiter: A ByteLimiter instance that will be used to limit the number
+      of bytes in flight when writing to TensorStore. If None, no limitation
+      will be applied.
+    priority: Priority of the byte reservations. See `LimitInFlightBytes`.
+    small_array_bytes: Arrays with at most this many bytes on this host are
+      batched.
+    max_batch_bytes: Maximum number of bytes written in one batch.
+
+  Returns:
+    Metrics for each batch, in the order the batches were planned.
+
+  Raises:
+    KeyError: If `metadata` or `dtype` is not found in a tensorstore spec.
+  """
+  if len(rslices_on_host) != len(tensorstore_specs):
+    raise ValueError(
+        'Expected one tensorstore spec per array, got'
+        f' {len(tensorstore_specs)} specs for {len(rslices_on_host)} arrays.'
+    )
+  for rslices, tensorstore_spec in zip(rslices_on_host, tensorstore_specs):
+    if not rslices.is_on_host:
+      raise ValueError('Replica slices have not been transferred to host.')
+    if not _spec_has_metadata(tensorstore_spec):
+      raise KeyError('`metadata` not found in tensorstore spec.')
+    if 'dtype' not in tensorstore_spec:
+      raise KeyError('`dtype` not found in tensorstore spec.')
+  byte_limiter = byte_limiter or get_byte_limiter()
+  context = context or ts_utils.get_ts_context(use_ocdbt=False)
+  nbytes = [rslices.nbytes for rslices in rslices_on_host]
+  batches = _plan_write_batches(
+      nbytes,
+      small_array_bytes=small_array_bytes,
+      max_batch_bytes=max_batch_bytes,
+  )
+
+  async def write_batch(batch: list[int]) -> WriteBatchMetrics:
+    batch_bytes = sum(nbytes[i] for i in batch)
+    start_time = time.time()
+    if len(batch) == 1 and batch_bytes > small_array_bytes:
+      await async_serialize_from_host(
+          rslices_on_host[batch[0]],
+          tensorstore_specs[batch[0]],
+          context=context,
+          primary_host=primary_host,
+          transaction=transaction,
+          byte_limiter=byte_limiter,
+          priority=priority,
+      )
+    else:
+      async with reserved_bytes(byte_limiter, batch_bytes, priority=priority):
+        txn = transaction or ts.Transaction()
+        tensorstores = await asyncio.gather(*[
+            _open_for_write(
+                tensorstore_specs[i],
+                context=context,
+                primary_host=primary_host,
+                transaction=txn,
+            )
+            for i in batch
+        ])
+        await asyncio.gather(*[
+            _write_fragment(t, fragment)
+            for t, i in zip(tensorstores, batch)
+            for fragment in rslices_on_host[i].to_fragments().fragments
+        ])
+        if transaction is None:
+          with tracing.span('tensorstore_commit', bytes=batch_bytes):
+            await txn.commit_async()
+    metrics = WriteBatchMetrics(
+        num_arrays=len(batch),
+        nbytes=batch_bytes,
+        duration_secs=time.time() - start_time,
+    )
+    logging.vlog(
+        1,
+        '[process=%d] Wrote batch of %d arrays: %s/s (total bytes: %s)',
+        multihost.process_index(),
+        metrics.num_arrays,
+        humanize.naturalsize(metrics.bytes_per_sec, binary=True),
+        humanize.naturalsize(metrics.nbytes, binary=True),
+    )
+    return metrics
+
+  batch_metrics = await asyncio.gather(*[write_batch(b) for b in batches])
+  for metrics in batch_metrics:
+    jax.monitoring.record_event_duration_secs(
+        '/jax/checkpoint/write/batch_bytes_per_sec', metrics.bytes_per_sec
+    )
+  return list(batch_metrics)
+
+
+async def _open_for_write(
+    tensorstore_spec: Dict[str, Any],
+    *,
+    context: ts.Context,
+    primary_host: Optional[int],
+    transaction: Optional[ts.Transaction],
+) -> ts.TensorStore:
+  """Creates (on the primary host) and opens a TensorStore for writing."""
   # If primary_host is None, all hosts will checkpoint. This is used
   # for checkpointing to local filesystem.
   if primary_host is None or multihost.process_index() == primary_host:
-    await ts.open(
+    # The created TensorStore can be written to directly, no need to open it
+    # again.
+    return await ts.open(
         ts.Spec(tensorstore_spec),
         create=True,
         open=True,
@@ -295,49 +736,56 @@ async def async_serialize_from_host(
         transaction=transaction,
     )
 
-  # `ts.open` runs twice for process `primary_host` because for the first time,
-  # we just get the future to be awaited upon in the background thread. The
-  # second one runs with `assume_metadata=True` which does no I/O operation and
-  # returns the tensorstore object.
   # For every process other than `primary_host`, we open with
-  # `assume_metadata=True`.
-  t = await ts.open(
-      ts.Spec(tensorstore_spec),
-      open=True,
-      assume_metadata=True,
+  # `assume_metadata=True`, which does no I/O operation and returns the
+  # tensorstore object.
+  return await ts_utils.open_tensorstore(
+      tensorstore_spec,
       context=context,
       transaction=transaction,
+      assume_metadata=True,
   )
 
-  async def write_fragment(fragment: fragments.Fragment):
-    """Writes a single fragment using TensorStore. No copy is performed."""
-    assert isinstance(fragment.value, np.ndarray)
-    requested_bytes = estimate_write_memory_footprint(fragment.value)
-    async with reserved_bytes(byte_limiter, requested_bytes):
-      await t[fragment.index].write(
-          fragment.value,
-          # Avoid additional copy of input array into the TensorStore chunk
-          # cache. The data array of a shard is guaranteed to be immutable and
-          # therefore it is safe to retain a reference indefinitely.
-          can_reference_source_data_indefinitely=True,
-      )
 
-  write_coros = [
-      write_fragment(fragment)
-      for fragment in rslices_on_host.to_fragments().fragments
-  ]
-  await asyncio.gather(*write_coros)
+async def _write_fragment(t: ts.TensorStore, fragment: fragments.Fragment):
+  """Writes a single fragment using TensorStore. No copy is performed."""
+  assert isinstance(fragment.value, np.ndarray)
+  with tracing.span('tensorstore_write', bytes=fragment.value.nbytes):
+    await t[fragment.index].write(
+        fragment.value,
+        # Avoid additional copy of input array into the TensorStore chunk
+        # cache. The data array of a shard is guaranteed to be immutable and
+        # therefore it is safe to retain a reference indefinitely.
+        can_reference_source_data_indefinitely=True,
+    )
 
 
 def estimate_write_memory_footprint(arr: np.ndarray) -> int:
   return arr.size * arr.dtype.itemsize
 
 
-def estimate_read_memory_footprint(t: ts.TensorStore,
-                                   domain: ts.IndexDomain) -> int:
-  """Estimates memory required to read a given domain."""
+def estimate_read_memory_footprint(
+    t: ts.TensorStore,
+    domain: ts.IndexDomain,
+    dtype: Optional[jnp.dtype] = None,
+) -> int:
+  """Estimates memory required to read a given domain.
+
+  Args:
+    t: The TensorStore to read from.
+    domain: The domain to read. Defaults to the domain of `t`.
+    dtype: The dtype the data is read as. Since the cast is performed within
+      TensorStore while reading, only a single buffer of this dtype is held,
+      rather than a copy in the stored dtype plus a cast copy. Defaults to the
+      stored dtype.
+
+  Returns:
+    The estimated number of bytes.
+  """
   rank = t.rank
-  num_bytes = t.dtype.numpy_dtype.itemsize
+  num_bytes = (
+      t.dtype.numpy_dtype.itemsize if dtype is None else np.dtype(dtype).itemsize
+  )
   chunk_template = t.chunk_layout.read_chunk_template
   if domain is None:
     domain = t.domain
@@ -367,6 +815,71 @@ def estimate_read_memory_footprint(t: ts.TensorStore,
   return num_bytes
 
 
+def _covers(outer: ts.IndexDomain, inner: ts.IndexDomain) -> bool:
+  """Whether `inner` covers all of `outer` (ignoring implicit bounds)."""
+  return (
+      outer.inclusive_min == inner.inclusive_min
+      and outer.exclusive_max == inner.exclusive_max
+  )
+
+
+def _allocate_shard(
+    new_shard_shape: Sequence[int],
+    dtype: np.dtype,
+    *,
+    requested_domain: ts.IndexDomain,
+    restricted_domain: ts.IndexDomain,
+    host_buffer_pool: Optional[host_buffer_pool_lib.HostBufferPool] = None,
+) -> np.ndarray:
+  """Allocates a host buffer for a shard, zero-filled only if needed."""
+  # If the domain is not covered, the shape the array was saved with is smaller
+  # than the requested shape of the array in which it will be reloaded. So the
+  # extra values will be filled with 0s. Otherwise, every element will be
+  # overwritten by the read.
+  zero = not _covers(requested_domain, restricted_domain)
+  if host_buffer_pool is not None:
+    return host_buffer_pool.acquire(new_shard_shape, dtype, zero=zero)
+  if zero:
+    return np.zeros(new_shard_shape, dtype=dtype)
+  return np.empty(new_shard_shape, dtype=dtype)
+
+
+def _cast_on_read(
+    t: ts.TensorStore, dtype: Optional[jnp.dtype]
+) -> Optional[ts.TensorStore]:
+  """Returns a view of `t` read as `dtype`, or None if unsupported.
+
+  Reading through a `cast` view converts the data chunk by chunk inside
+  TensorStore, so no full-size copy in the stored dtype is materialized.
+
+  Args:
+    t: The TensorStore to read from.
+    dtype: The requested dtype. If None or equal to the stored dtype, `t` is
+      returned.
+  """
+  if dtype is None or np.dtype(dtype) == t.dtype.numpy_dtype:
+    return t
+  try:
+    return ts.cast(t, np.dtype(dtype))
+  except ValueError:
+    logging.vlog(
+        1,
+        'TensorStore cannot cast %s to %s; casting on host after the read.',
+        t.dtype,
+        dtype,
+    )
+    return None
+
+
+def _relative_slices(
+    domain: ts.IndexDomain, origin: Sequence[int]
+) -> tuple[slice, ...]:
+  return tuple(
+      slice(lo - o, hi - o)
+      for lo, hi, o in zip(domain.inclusive_min, domain.exclusive_max, origin)
+  )
+
+
 async def _read_shard(
     t: ts.TensorStore,
     *,
@@ -374,36 +887,70 @@ async def _read_shard(
     dtype: jnp.dtype,
     requested_domain: ts.IndexDomain,
     restricted_domain: ts.IndexDomain,
+    host_buffer_pool: Optional[host_buffer_pool_lib.HostBufferPool] = None,
 ) -> np.ndarray:
-  """Reads a single shard from TensorStore into host memory."""
-  # This maybe needed because the shape the array was saved with is smaller
-  # than the requested shape of the array in which it will be reloaded. So
-  # the extra values will be filled with 0s.
-  out = np.zeros(new_shard_shape, dtype=t.dtype.numpy_dtype)
-  await ts.array(out)[ts.d[:].translate_to[requested_domain.origin]][
-      restricted_domain
-  ].write(t[restricted_domain])
-  if dtype is not None:
-    # Cast while reloading on process to avoid 2 copies on device if the
-    # casting is done on device.
-    out = out.astype(dtype)
+  """Reads a single shard from TensorStore into host memory.
+
+  Args:
+    t: The TensorStore to read from.
+    new_shard_shape: Shape of the restored shard.
+    dtype: If provided, the shard is cast to this dtype.
+    requested_domain: Domain of the restored shard.
+    restricted_domain: Part of `requested_domain` that is stored.
+    host_buffer_pool: If provided, the returned shard is acquired from this
+      pool, and must be released to it by the caller.
+
+  Returns:
+    The shard, in host memory.
+  """
+  # Cast while reloading on process to avoid 2 copies on device if the
+  # casting is done on device. Where possible, the cast is performed by
+  # TensorStore while reading, to also avoid 2 full copies on host.
+  source = _cast_on_read(t, dtype)
+  cast_on_host = source is None
+  if cast_on_host:
+    source = t
+  out = _allocate_shard(
+      new_shard_shape,
+      source.dtype.numpy_dtype,
+      requested_domain=requested_domain,
+      restricted_domain=restricted_domain,
+      host_buffer_pool=host_buffer_pool,
+  )
+  try:
+    with tracing.span('tensorstore_read', bytes=out.nbytes):
+      await ts.array(out)[ts.d[:].translate_to[requested_domain.origin]][
+          restricted_domain
+      ].write(source[restricted_domain])
+    if cast_on_host:
+      if host_buffer_pool is None:
+        out = out.astype(dtype)
+      else:
+        cast_out = host_buffer_pool.acquire(new_shard_shape, dtype)
+        try:
+          np.copyto(cast_out, out, casting='unsafe')
+        except BaseException:
+          host_buffer_pool.discard(cast_out)
+          raise
+        host_buffer_pool.release(out)
+        out = cast_out
+  except BaseException:
+    # A failed or cancelled read may still reference the buffer, so it is not
+    # reused.
+    if host_buffer_pool is not None:
+      host_buffer_pool.discard(out)
+    raise
   return out
 
 
-async def _read_array_index_and_device_put(
-    devices: list[jax.Device],
-    index: Index,
+def _get_read_domains(
     t: ts.TensorStore,
+    index: Index,
     *,
     global_shape: Shape,
-    new_shard_shape: Shape,
-    dtype: jnp.dtype,
-    byte_limiter: ByteLimiter,
     strict: bool,
-    dll: Optional[layout.DeviceLocalLayout],
-    memory_kind: Optional[str],
-) -> list[jax.Array]:
-  """Callback that reads an array index and places on the devices."""
+) -> tuple[ts.IndexDomain, ts.IndexDomain]:
+  """Returns the requested domain of `index`, and its part that is stored."""
   for sl in index:
     if sl.step is not None and sl.step != 1:
       raise ValueError(
@@ -414,8 +961,7 @@ async def _read_array_index_and_device_put(
   if strict:
     if t.shape == global_shape:
       domain = ts.IndexDomain(shape=global_shape)[ts.d[:][index]]
-      requested_domain = domain
-      restricted_domain = domain
+      return domain, domain
     else:
       raise ValueError(
           f'Requested shape: {global_shape} is not compatible with the stored'
@@ -424,19 +970,205 @@ async def _read_array_index_and_device_put(
           ' be modified by specifying `strict=False` in `ArrayRestoreArgs` for'
           ' any array in which padding/truncation is desired.'
       )
-  else:
-    requested_domain = ts.IndexTransform(input_shape=global_shape)[index].domain
-    restricted_domain = t.domain.intersect(requested_domain)
+  requested_domain = ts.IndexTransform(input_shape=global_shape)[index].domain
+  return requested_domain, t.domain.intersect(requested_domain)
+
+
+def _chunk_aligned_domain(
+    t: ts.TensorStore, domain: ts.IndexDomain
+) -> Optional[ts.IndexDomain]:
+  """Expands `domain` to the stored read chunk grid.
+
+  Args:
+    t: The TensorStore being read.
+    domain: A domain of `t`.
+
+  Returns:
+    The smallest domain made of whole stored chunks (clipped to the domain of
+    `t`) containing `domain`, or None if `t` is not chunked.
+  """
+  chunk_template = t.chunk_layout.read_chunk_template
+  lower = []
+  upper = []
+  for i in range(t.rank):
+    if not chunk_template[i].finite:
+      return None
+    chunk_origin = chunk_template.origin[i]
+    chunk_size = chunk_template.shape[i]
+    start = domain.inclusive_min[i] - chunk_origin
+    stop = domain.exclusive_max[i] - chunk_origin
+    lower.append(start // chunk_size * chunk_size + chunk_origin)
+    upper.append(-(-stop // chunk_size) * chunk_size + chunk_origin)
+  return ts.IndexDomain(inclusive_min=lower, exclusive_max=upper).intersect(
+      t.domain
+  )
+
+
+def _group_domains_by_stored_chunks(
+    t: ts.TensorStore, domains: Sequence[ts.IndexDomain]
+) -> list[list[int]]:
+  """Groups domains that need to read at least one common stored chunk.
+
+  Reading the stored chunks of each group once, and scattering them into the
+  individual shards, ensures that each stored chunk is read and decoded at most
+  once, even if the restore sharding differs from the saved one.
+
+  Args:
+    t: The TensorStore being read.
+    domains: Domains of `t` to be read.
+
+  Returns:
+    Groups of indices into `domains`, in order of first appearance.
+  """
+  aligned = [
+      _chunk_aligned_domain(t, domain) if domain.size else None
+      for domain in domains
+  ]
+  parents = list(range(len(domains)))
+
+  def find(i: int) -> int:
+    while parents[i] != i:
+      parents[i] = parents[parents[i]]
+      i = parents[i]
+    return i
+
+  for i, a in enumerate(aligned):
+    if a is None:
+      continue
+    for j in range(i + 1, len(domains)):
+      b = aligned[j]
+      if b is not None and a.intersect(b).size:
+        parents[find(j)] = find(i)
+
+  groups: dict[int, list[int]] = {}
+  for i in range(len(domains)):
+    groups.setdefault(find(i), []).append(i)
+  return list(groups.values())
+
+
+def _stored_chunks(
+    t: ts.TensorStore, domains: Sequence[ts.IndexDomain]
+) -> list[ts.IndexDomain]:
+  """Returns the stored chunks of `t` intersecting any of `domains`.
+
+  Args:
+    t: The TensorStore being read. Must be chunked.
+    domains: Domains of `t` to be read.
+
+  Returns:
+    The distinct stored chunks, clipped to the domain of `t`, in C order.
+  """
+  chunk_template = t.chunk_layout.read_chunk_template
+  origin = np.asarray(chunk_template.origin)
+  chunk_shape = np.asarray(chunk_template.shape)
+  grid_positions = set()
+  for domain in domains:
+    if not domain.size:
+      continue
+    lower = (np.asarray(domain.inclusive_min) - origin) // chunk_shape
+    upper = -(-(np.asarray(domain.exclusive_max) - origin) // chunk_shape)
+    grid_positions.update(
+        itertools.product(*(range(lo, hi) for lo, hi in zip(lower, upper)))
+    )
+  return [
+      ts.IndexDomain(
+          inclusive_min=origin + np.asarray(position) * chunk_shape,
+          exclusive_max=origin + (np.asarray(position) + 1) * chunk_shape,
+      ).intersect(t.domain)
+      for position in sorted(grid_positions)
+  ]
+
+
+def _split_group(group: list[int], max_group_size: int) -> list[list[int]]:
+  """Splits a group of indices into consecutive groups of bounded size."""
+  return [
+      group[i : i + max_group_size]
+      for i in range(0, len(group), max_group_size)
+  ]
+
+
+async def _device_put_shard(
+    shard: np.ndarray,
+    devices: Sequence[jax.Device],
+    *,
+    dll: Optional[layout.DeviceLocalLayout],
+    memory_kind: Optional[str],
+    host_buffer_pool: Optional[host_buffer_pool_lib.HostBufferPool] = None,
+) -> list[jax.Array]:
+  """Places a host shard on all `devices`.
 
-  requested_bytes = estimate_read_memory_footprint(t, restricted_domain)
+  Args:
+    shard: The shard, in host memory.
+    devices: Devices to place the shard on.
+    dll: Device local layout of the restored shards.
+    memory_kind: Memory kind of the restored shards.
+    host_buffer_pool: If provided, `shard` was acquired from this pool and is
+      released to it once all transfers have completed.
+
+  Returns:
+    The single-device arrays.
+  """
   result = []
+  try:
+    for device in devices:
+      sharding = jax.sharding.SingleDeviceSharding(
+          device, memory_kind=memory_kind
+      )
+      if host_buffer_pool is None:
+        result.append(jax.device_put(shard, Layout(dll, sharding)))
+      else:
+        # The pooled buffer will be reused, so it must not back a device
+        # buffer.
+        result.append(
+            jax.device_put(shard, Layout(dll, sharding), may_alias=False)
+        )
+    if host_buffer_pool is not None:
+      await asyncio.to_thread(jax.block_until_ready, result)
+  except BaseException:
+    # Transfers may still be reading the buffer, so it is not reused.
+    if host_buffer_pool is not None:
+      host_buffer_pool.discard(shard)
+    raise
+  if host_buffer_pool is not None:
+    if any(_aliases(arr, shard) for arr in result):
+      # Some backends (e.g. CPU) may still alias suitably aligned host memory.
+      host_buffer_pool.discard(shard)
+    else:
+      host_buffer_pool.release(shard)
+  return result
+
+
+def _aliases(arr: jax.Array, host_buffer: np.ndarray) -> bool:
+  try:
+    return arr.unsafe_buffer_pointer() == host_buffer.ctypes.data
+  except Exception:  # pylint: disable=broad-exception-caught
+    # Conservatively assume that the buffer may be aliased.
+    return True
+
+
+async def _read_array_index_and_device_put(
+    devices: list[jax.Device],
+    index: Index,
+    t: ts.TensorStore,
+    *,
+    read_domains: tuple[ts.IndexDomain, ts.IndexDomain],
+    new_shard_shape: Shape,
+    dtype: jnp.dtype,
+    byte_limiter: ByteLimiter,
+    dll: Optional[layout.DeviceLocalLayout],
+    memory_kind: Optional[str],
+    priority: Optional[int] = None,
+    host_buffer_pool: Optional[host_buffer_pool_lib.HostBufferPool] = None,
+) -> list[jax.Array]:
+  """Callback that reads an array index and places on the devices."""
+  requested_domain, restricted_domain = read_domains
+  requested_bytes = estimate_read_memory_footprint(
+      t, restricted_domain, dtype=dtype
+  )
   # Limit the bytes read for every shard.
   # Perform read for index once, and place it on all relevant devices within
   # the `reserved_bytes` context.
-  # TODO(b/381111280) This de-duplication of reads does not fully solve the
-  # problem of read amplification, since we can still run into problems if
-  # we are resharding. See b/381111280 for details.
-  async with reserved_bytes(byte_limiter, requested_bytes):
+  async with reserved_bytes(byte_limiter, requested_bytes, priority=priority):
     try:
       shard = await _read_shard(
           t=t,
@@ -444,26 +1176,244 @@ async def _read_array_index_and_device_put(
           dtype=dtype,
           requested_domain=requested_domain,
           restricted_domain=restricted_domain,
+          host_buffer_pool=host_buffer_pool,
       )
     except BaseException as e:
       raise Exception(  # pylint: disable=broad-exception-raised
           f'Encountered error while reading array index: {index}. See full'
           f' TensorStore details: {t.spec}.'
       ) from e
-    for device in devices:
-      sharding = jax.sharding.SingleDeviceSharding(
-          device, memory_kind=memory_kind
-      )
-      result.append(jax.device_put(shard, Layout(dll, sharding)))
+    return await _device_put_shard(
+        shard,
+        devices,
+        dll=dll,
+        memory_kind=memory_kind,
+        host_buffer_pool=host_buffer_pool,
+    )
+
+
+async def _read_array_indices_and_device_put(
+    devices_per_index: Sequence[list[jax.Device]],
+    indices: Sequence[Index],
+    t: ts.TensorStore,
+    *,
+    read_domains: Sequence[tuple[ts.IndexDomain, ts.IndexDomain]],
+    new_shard_shape: Shape,
+    dtype: jnp.dtype,
+    byte_limiter: ByteLimiter,
+    dll: Optional[layout.DeviceLocalLayout],
+    memory_kind: Optional[str],
+    priority: Optional[int] = None,
+    host_buffer_pool: Optional[host_buffer_pool_lib.HostBufferPool] = None,
+) -> list[jax.Array]:
+  """Reads indices sharing stored chunks at once and scatters them to shards.
+
+  Each stored chunk needed by any of `indices` is read once, and is copied
+  into the host buffer of every index that needs it. At most
+  `_MAX_CONCURRENT_CHUNK_READS` chunks are held at a time, in addition to the
+  host buffers of all indices.
+
+  Args:
+    devices_per_index: Devices on which to place each index.
+    indices: Indices of the array to read.
+    t: The TensorStore to read from. Must be chunked.
+    read_domains: The requested and stored domains of each index, as returned
+      by `_get_read_domains`.
+    new_shard_shape: Shape of each restored shard.
+    dtype: If provided, shards are cast to this dtype.
+    byte_limiter: Limits the bytes read at once.
+    dll: Device local layout of the restored shards.
+    memory_kind: Memory kind of the restored shards.
+    priority: Priority of the byte reservation.
+    host_buffer_pool: If provided, shard host buffers are acquired from this
+      pool.
+
+  Returns:
+    Single-device arrays for all devices of all indices.
+  """
+  out_dtype = np.dtype(dtype) if dtype is not None else t.dtype.numpy_dtype
+  source = _cast_on_read(t, dtype)
+  if source is None:
+    source = t
+  chunks = _stored_chunks(
+      t, [restricted_domain for _, restricted_domain in read_domains]
+  )
+  requested_bytes = len(indices) * math.prod(
+      new_shard_shape
+  ) * out_dtype.itemsize + _chunk_staging_bytes(
+      t, source.dtype.numpy_dtype, num_chunks=len(chunks)
+  )
+
+  result = []
+  async with reserved_bytes(byte_limiter, requested_bytes, priority=priority):
+    shards = []
+    try:
+      for requested_domain, restricted_domain in read_domains:
+        # If TensorStore could not cast while reading, casting happens as part
+        # of the copy, so that no additional full-size copy is made.
+        shards.append(
+            _allocate_shard(
+                new_shard_shape,
+                out_dtype,
+                requested_domain=requested_domain,
+                restricted_domain=restricted_domain,
+                host_buffer_pool=host_buffer_pool,
+            )
+        )
+      semaphore = asyncio.Semaphore(_MAX_CONCURRENT_CHUNK_READS)
+
+      async def _read_and_scatter_chunk(chunk: ts.IndexDomain):
+        async with semaphore:
+          if host_buffer_pool is None:
+            stored = await source[chunk].read()
+          else:
+            stored = host_buffer_pool.acquire(
+                chunk.shape, source.dtype.numpy_dtype
+            )
+            try:
+              await ts.array(stored)[ts.d[:].translate_to[chunk.origin]].write(
+                  source[chunk]
+              )
+            except BaseException:
+              # A failed or cancelled read may still reference the buffer.
+              host_buffer_pool.discard(stored)
+              raise
+          for shard, (requested_domain, restricted_domain) in zip(
+              shards, read_domains
+          ):
+            overlap = chunk.intersect(restricted_domain)
+            if overlap.size:
+              shard[_relative_slices(overlap, requested_domain.origin)] = (
+                  stored[_relative_slices(overlap, chunk.origin)]
+              )
+          if host_buffer_pool is not None:
+            host_buffer_pool.release(stored)
+
+      try:
+        await asyncio.gather(*(_read_and_scatter_chunk(c) for c in chunks))
+      except BaseException as e:
+        raise Exception(  # pylint: disable=broad-exception-raised
+            f'Encountered error while reading array indices: {indices}. See'
+            f' full TensorStore details: {t.spec}.'
+        ) from e
+      for i, devices in enumerate(devices_per_index):
+        # `_device_put_shard` takes ownership of the pooled shard buffer.
+        shard, shards[i] = shards[i], None
+        result.extend(
+            await _device_put_shard(
+                shard,
+                devices,
+                dll=dll,
+                memory_kind=memory_kind,
+                host_buffer_pool=host_buffer_pool,
+            )
+        )
+    except BaseException:
+      # A failed or cancelled read may still reference the buffers, so they
+      # are not reused.
+      if host_buffer_pool is not None:
+        for shard in shards:
+          if shard is not None:
+            host_buffer_pool.discard(shard)
+      raise
   return result
 
 
+def _chunk_staging_bytes(
+    t: ts.TensorStore, dtype: np.dtype, *, num_chunks: int
+) -> int:
+  """Returns the bytes of stored chunks held at once while scattering them."""
+  chunk_shape = t.chunk_layout.read_chunk_template.shape
+  return (
+      min(num_chunks, _MAX_CONCURRENT_CHUNK_READS)
+      * math.prod(chunk_shape)
+      * dtype.itemsize
+  )
+
+
 def _get_device_to_index_map(
     global_shape: Shape, sharding: jax.sharding.Sharding
 ) -> Mapping[jax.Device, Index]:
   return sharding.devices_indices_map(global_shape)
 
 
+def _get_local_indices_and_devices(
+    global_shape: Shape, sharding: jax.sharding.Sharding
+) -> tuple[list[Index], list[list[jax.Device]]]:
+  """Returns the distinct local indices of `sharding`, and their devices."""
+  local_indices_devices_map: dict[types.HashableIndex, list[jax.Device]] = (
+      collections.defaultdict(list)
+  )
+  for d, idx in _get_device_to_index_map(global_shape, sharding).items():
+    if d in sharding._addressable_device_assignment:  # pylint: disable=protected-access
+      local_indices_devices_map[
+          np_utils.to_hashable_index(idx, shape=global_shape)
+      ].append(d)
+  indices = [
+      np_utils.from_hashable_index(idx) for idx in local_indices_devices_map
+  ]
+  return indices, list(local_indices_devices_map.values())
+
+
+def local_read_domains(
+    t: ts.TensorStore,
+    *,
+    global_shape: Shape,
+    sharding: jax.sharding.Sharding,
+    strict: bool = True,
+) -> list[ts.IndexDomain]:
+  """Returns the stored domains of `t` read to restore the local shards.
+
+  Args:
+    t: The TensorStore to read from.
+    global_shape: Global shape of the restored array.
+    sharding: Sharding of the restored array.
+    strict: Whether to disallow padding/truncation.
+
+  Returns:
+    The non-empty domains of `t` read by `read_and_create_array` on this host.
+  """
+  indices, _ = _get_local_indices_and_devices(global_shape, sharding)
+  domains = [
+      _get_read_domains(t, index, global_shape=global_shape, strict=strict)[1]
+      for index in indices
+  ]
+  return [domain for domain in domains if domain.size]
+
+
+async def async_prefetch_domains(
+    t: ts.TensorStore,
+    domains: Sequence[ts.IndexDomain],
+    *,
+    byte_limiter: Optional[ByteLimiter] = None,
+    priority: Optional[int] = None,
+) -> int:
+  """Reads `domains` of `t`, discarding the data.
+
+  Only useful if `t` was opened with a context that caches chunks, see
+  `ts_utils.get_ts_context(chunk_cache_bytes=...)`. Later reads of the domains
+  through the same context are then served from host memory.
+
+  Args:
+    t: The TensorStore to read from.
+    domains: Domains of `t` to read.
+    byte_limiter: Limits the bytes read at once.
+    priority: Priority of the byte reservations.
+
+  Returns:
+    The number of bytes read.
+  """
+  byte_limiter = byte_limiter or get_byte_limiter()
+
+  async def _prefetch(domain: ts.IndexDomain) -> int:
+    requested_bytes = estimate_read_memory_footprint(t, domain)
+    async with reserved_bytes(byte_limiter, requested_bytes, priority=priority):
+      await t[domain].read()
+    return requested_bytes
+
+  return sum(await asyncio.gather(*(_prefetch(d) for d in domains)))
+
+
 async def read_and_create_array(
     t: ts.TensorStore,
     *,
@@ -474,32 +1424,102 @@ async def read_and_create_array(
     byte_limiter: ByteLimiter,
     strict: bool,
     dll: Optional[layout.DeviceLocalLayout],
+    priority: Optional[int] = None,
+    host_buffer_pool: Optional[host_buffer_pool_lib.HostBufferPool] = None,
 ) -> jax.Array:
-  """Read shards from TensorStore and create a jax.Array."""
-  local_indices_devices_map: dict[types.HashableIndex, list[jax.Device]] = (
-      collections.defaultdict(list)
-  )
-  for d, idx in _get_device_to_index_map(global_shape, sharding).items():
-    if d in sharding._addressable_device_assignment:  # pylint: disable=protected-access
-      local_indices_devices_map[
-          np_utils.to_hashable_index(idx, shape=global_shape)
-      ].append(d)
+  """Read shards from TensorStore and create a jax.Array.
 
-  read_array_coros = [
-      _read_array_index_and_device_put(
-          devices,
-          np_utils.from_hashable_index(idx),
-          t,
-          global_shape=global_shape,
-          new_shard_shape=new_shard_shape,
-          dtype=dtype,
-          byte_limiter=byte_limiter,
-          strict=strict,
-          dll=dll,
-          memory_kind=sharding.memory_kind,
-      )
-      for idx, devices in local_indices_devices_map.items()
+  Each distinct local index is read once and placed on all devices that need
+  it. Indices that need a common stored chunk (e.g. when restoring with a
+  sharding that differs from the saved one) are read together, so that every
+  stored chunk is read at most once per host. Indices read together are held
+  in host memory at once, so they are split into groups that fit within the
+  capacity of `byte_limiter`, if it has one. A stored chunk needed by several
+  such groups is read once per group.
+
+  Args:
+    t: The TensorStore to read from.
+    global_shape: Global shape of the restored array.
+    new_shard_shape: Shape of each restored shard.
+    sharding: Sharding of the restored array.
+    dtype: If provided, shards are cast to this dtype on the host.
+    byte_limiter: Limits the bytes read at once.
+    strict: Whether to disallow padding/truncation.
+    dll: Device local layout of the restored shards.
+    priority: Priority of the byte reservations.
+    host_buffer_pool: If provided, host staging buffers are acquired from (and
+      released to) this pool.
+
+  Returns:
+    The restored jax.Array.
+  """
+  indices, devices_per_index = _get_local_indices_and_devices(
+      global_shape, sharding
+  )
+  read_domains = [
+      _get_read_domains(t, index, global_shape=global_shape, strict=strict)
+      for index in indices
   ]
+  groups = _group_domains_by_stored_chunks(
+      t, [restricted_domain for _, restricted_domain in read_domains]
+  )
+  if isinstance(byte_limiter, LimitInFlightBytes):
+    out_dtype = np.dtype(dtype) if dtype is not None else t.dtype.numpy_dtype
+    source_dtype = (_cast_on_read(t, dtype) or t).dtype.numpy_dtype
+    shard_bytes = max(math.prod(new_shard_shape) * out_dtype.itemsize, 1)
+    split_groups = []
+    for group in groups:
+      if len(group) > 1:
+        staging_bytes = _chunk_staging_bytes(
+            t,
+            source_dtype,
+            num_chunks=len(
+                _stored_chunks(t, [read_domains[i][1] for i in group])
+            ),
+        )
+        split_groups.extend(
+            _split_group(
+                group,
+                max(
+                    (byte_limiter.max_bytes - staging_bytes) // shard_bytes, 1
+                ),
+            )
+        )
+      else:
+        split_groups.append(group)
+    groups = split_groups
+  read_kwargs = dict(
+      new_shard_shape=new_shard_shape,
+      dtype=dtype,
+      byte_limiter=byte_limiter,
+      dll=dll,
+      memory_kind=sharding.memory_kind,
+      priority=priority,
+      host_buffer_pool=host_buffer_pool,
+  )
+  read_array_coros = []
+  for group in groups:
+    if len(group) == 1:
+      (i,) = group
+      read_array_coros.append(
+          _read_array_index_and_device_put(
+              devices_per_index[i],
+              indices[i],
+              t,
+              read_domains=read_domains[i],
+              **read_kwargs,
+          )
+      )
+    else:
+      read_array_coros.append(
+          _read_array_indices_and_device_put(
+              [devices_per_index[i] for i in group],
+              [indices[i] for i in group],
+              t,
+              read_domains=[read_domains[i] for i in group],
+              **read_kwargs,
+          )
+      )
   dbs = sum(await asyncio.gather(*read_array_coros), [])
   return jax.make_array_from_single_device_arrays(global_shape, sharding, dbs)
 
@@ -514,8 +1534,34 @@ async def async_deserialize(
     context: Optional[ts.Context] = None,
     assume_metadata: bool = False,
     strict: bool = True,
+    priority: Optional[int] = None,
+    host_buffer_pool: Optional[host_buffer_pool_lib.HostBufferPool] = None,
 ) -> jax.Array:
-  """Reads an array using TensorStore."""
+  """Reads an array using TensorStore.
+
+  Args:
+    user_sharding: Sharding or layout of the restored array.
+    tensorstore_spec: The tensorstore spec to read from.
+    global_shape: Global shape of the restored array. Defaults to the stored
+      shape.
+    dtype: If provided, the array is cast to this dtype on the host.
+    byte_limiter: A ByteLimiter instance that will be used to limit the number
+      of bytes in flight when reading from TensorStore. If None, no limitation
+      will be applied.
+    context: ts.Context instance. Opened TensorStores are reused if it was
+      obtained with `ts_utils.get_ts_context(cache_open_handles=True)`.
+    assume_metadata: Whether to open the TensorStore without reading metadata.
+    strict: Whether to disallow padding/truncation to `global_shape`.
+    priority: Priority of the byte reservations made for this array. Arrays
+      with a higher priority are read first when `byte_limiter` is saturated.
+      See `LimitInFlightBytes`.
+    host_buffer_pool: If provided, host staging buffers are acquired from (and
+      released to) this pool, so that they can be reused across calls. Note that
+      each buffer is then only released once its device transfers complete.
+
+  Returns:
+    The restored jax.Array.
+  """
   byte_limiter = byte_limiter or get_byte_limiter()
   context = context or ts_utils.get_ts_context(use_ocdbt=False)
   sharding = (
@@ -533,11 +1579,8 @@ async def async_deserialize(
       if isinstance(user_sharding, Layout)
       else None
   )
-  t = await ts.open(
-      tensorstore_spec,
-      open=True,
-      assume_metadata=assume_metadata,
-      context=context,
+  t = await ts_utils.open_tensorstore(
+      tensorstore_spec, context=context, assume_metadata=assume_metadata
   )
   global_shape = tuple(t.shape if global_shape is None else global_shape)
   new_shard_shape = sharding.shard_shape(global_shape)
@@ -550,4 +1593,6 @@ async def async_deserialize(
       byte_limiter=byte_limiter,
       strict=strict,
       dll=dll,
+      priority=priority,
+      host_buffer_pool=host_buffer_pool,
   )
@@ -19,6 +19,7 @@ import pathlib
 import tracemalloc as tm
 from typing import Any
 import unittest
+from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -30,6 +31,8 @@ import numpy as np
 from orbax.checkpoint import test_utils
 from orbax.checkpoint._src import asyncio_utils
 from orbax.checkpoint._src.futures import future
+from orbax.checkpoint._src.serialization import host_buffer_pool
+from orbax.checkpoint._src.serialization import replica_slices
 from orbax.checkpoint._src.serialization import serialization
 from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
 import tensorstore as ts
@@ -665,5 +668,475 @@ class CheckpointTest(parameterized.TestCase):
     self.assertLess(peak_memory_usage - start_memory_usage, 32_000_000 + delta)
 
 
+  @parameterized.parameters(
+      (np.float32, jnp.bfloat16),
+      (jnp.bfloat16, np.float32),
+      (np.int32, np.float16),
+  )
+  def test_cast_on_read(self, save_dtype, restore_dtype):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    sharding = NamedSharding(global_mesh, P('x', 'y'))
+    data = np.arange(16 * 16).reshape(16, 16).astype(save_dtype)
+    arr = jax.make_array_from_callback(
+        data.shape, sharding, lambda idx: data[idx]
+    )
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+    serialize([arr], [tspec])
+
+    (restored,) = deserialize([sharding], [tspec], dtypes=[restore_dtype])
+    self.assertEqual(restored.dtype, restore_dtype)
+    self.assertArraysEqual(restored, data.astype(restore_dtype))
+
+  def test_estimate_read_memory_footprint_with_cast(self):
+    t = ts.open(
+        {
+            'driver': 'zarr',
+            'kvstore': {'driver': 'memory'},
+            'metadata': {'shape': [8, 8], 'chunks': [4, 8], 'dtype': '<f4'},
+        },
+        create=True,
+    ).result()
+    domain = ts.IndexDomain(inclusive_min=[0, 0], exclusive_max=[2, 8])
+    # Reads whole chunks: 4 * 8 elements.
+    self.assertEqual(
+        serialization.estimate_read_memory_footprint(t, domain), 4 * 8 * 4
+    )
+    self.assertEqual(
+        serialization.estimate_read_memory_footprint(
+            t, domain, dtype=jnp.bfloat16
+        ),
+        4 * 8 * 2,
+    )
+    self.assertIsNotNone(serialization._cast_on_read(t, jnp.bfloat16))
+    self.assertIs(serialization._cast_on_read(t, np.float32), t)
+    self.assertIsNone(serialization._cast_on_read(t, np.dtype('O')))
+
+  @parameterized.named_parameters(
+      dict(testcase_name='same_sharding', restore_pspec=('x', 'y')),
+      dict(testcase_name='resharding', restore_pspec=('y', 'x')),
+  )
+  def test_deserialize_with_host_buffer_pool(self, restore_pspec):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    data = np.arange(16 * 16, dtype=np.float32).reshape(16, 16)
+    arr = jax.make_array_from_callback(
+        data.shape,
+        NamedSharding(global_mesh, P('x', 'y')),
+        lambda idx: data[idx],
+    )
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+    serialize([arr], [tspec])
+    pool = host_buffer_pool.HostBufferPool(1 << 20)
+    sharding = NamedSharding(global_mesh, P(*restore_pspec))
+
+    for _ in range(2):
+      restored = asyncio_utils.run_sync(
+          serialization.async_deserialize(
+              sharding, tspec, host_buffer_pool=pool
+          )
+      )
+      self.assertArraysEqual(restored, data)
+
+    if restore_pspec != ('x', 'y') or jax.devices()[0].platform != 'cpu':
+      # On CPU, shard buffers end up backing the restored arrays and are not
+      # reused; temporary buffers used for resharding still are.
+      self.assertGreater(pool.metrics.num_hits, 0)
+    self.assertEqual(pool.metrics.in_use_bytes, 0)
+    # Buffers are reused, but restored arrays must not alias them.
+    for _ in range(2):
+      buffer = pool.acquire((4, 8), np.float32)
+      buffer[...] = -1
+      pool.release(buffer)
+    self.assertArraysEqual(restored, data)
+
+  @parameterized.named_parameters(
+      dict(testcase_name='read', fail='read', restore_pspec=('x', 'y')),
+      dict(
+          testcase_name='read_resharding', fail='read', restore_pspec=('y', 'x')
+      ),
+      dict(
+          testcase_name='device_put', fail='device_put', restore_pspec=('x', 'y')
+      ),
+      dict(
+          testcase_name='device_put_resharding',
+          fail='device_put',
+          restore_pspec=('y', 'x'),
+      ),
+  )
+  def test_failed_deserialize_releases_host_buffers(self, fail, restore_pspec):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    data = np.arange(16 * 16, dtype=np.float32).reshape(16, 16)
+    arr = jax.make_array_from_callback(
+        data.shape,
+        NamedSharding(global_mesh, P('x', 'y')),
+        lambda idx: data[idx],
+    )
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+    serialize([arr], [tspec])
+    pool = host_buffer_pool.HostBufferPool(1 << 20)
+    if fail == 'read':
+      # Remove the stored chunks, so that reads fail on missing data.
+      for path in self.ckpt_dir.iterdir():
+        if not path.name.startswith('.'):
+          path.unlink()
+      tspec = {**tspec, 'fill_missing_data_reads': False}
+    else:
+      self.enter_context(
+          mock.patch.object(
+              jax, 'device_put', side_effect=RuntimeError('device_put failed')
+          )
+      )
+
+    with self.assertRaises(Exception):
+      asyncio_utils.run_sync(
+          serialization.async_deserialize(
+              NamedSharding(global_mesh, P(*restore_pspec)),
+              tspec,
+              host_buffer_pool=pool,
+          )
+      )
+    self.assertEqual(pool.metrics.in_use_bytes, 0)
+
+  def test_group_domains_by_stored_chunks(self):
+    t = ts.open(
+        {
+            'driver': 'zarr',
+            'kvstore': {'driver': 'memory'},
+            'metadata': {'shape': [8, 8], 'chunks': [4, 8], 'dtype': '<f4'},
+        },
+        create=True,
+    ).result()
+    domains = [
+        # Column stripes: both need both stored chunks.
+        ts.IndexDomain(inclusive_min=[0, 0], exclusive_max=[8, 4]),
+        ts.IndexDomain(inclusive_min=[0, 4], exclusive_max=[8, 8]),
+        # Aligned with the stored chunks.
+        ts.IndexDomain(inclusive_min=[0, 0], exclusive_max=[4, 8]),
+        # Empty, e.g. fully truncated.
+        ts.IndexDomain(inclusive_min=[8, 0], exclusive_max=[8, 8]),
+    ]
+    self.assertEqual(
+        serialization._group_domains_by_stored_chunks(t, domains),
+        [[0, 1, 2], [3]],
+    )
+    self.assertEqual(
+        serialization._group_domains_by_stored_chunks(t, domains[2:]),
+        [[0], [1]],
+    )
+
+  def test_stored_chunks(self):
+    t = ts.open(
+        {
+            'driver': 'zarr',
+            'kvstore': {'driver': 'memory'},
+            'metadata': {'shape': [8, 6], 'chunks': [4, 4], 'dtype': '<f4'},
+        },
+        create=True,
+    ).result()
+    domains = [
+        ts.IndexDomain(inclusive_min=[0, 0], exclusive_max=[2, 6]),
+        ts.IndexDomain(inclusive_min=[0, 1], exclusive_max=[8, 3]),
+        ts.IndexDomain(inclusive_min=[8, 0], exclusive_max=[8, 6]),
+    ]
+    # The chunk at [4:8, 4:6] is in the hull of the domains, but not needed.
+    self.assertEqual(
+        [
+            (chunk.inclusive_min, chunk.exclusive_max)
+            for chunk in serialization._stored_chunks(t, domains)
+        ],
+        [((0, 0), (4, 4)), ((0, 4), (4, 6)), ((4, 0), (8, 4))],
+    )
+
+  def test_resharding_restore_fits_byte_limiter(self):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    data = np.arange(16 * 16, dtype=np.float32).reshape(16, 16)
+    arr = jax.make_array_from_callback(
+        data.shape,
+        NamedSharding(global_mesh, P(('x', 'y'))),
+        lambda idx: data[idx],
+    )
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+    serialize([arr], [tspec])
+    # Each column shard needs all 8 stored row chunks, which are read at most
+    # 8 at a time.
+    chunk_bytes = 2 * 16 * 4
+    shard_bytes = 16 * 2 * 4
+    byte_limiter = serialization.LimitInFlightBytes(
+        8 * chunk_bytes + 2 * shard_bytes
+    )
+
+    restored = asyncio_utils.run_sync(
+        serialization.async_deserialize(
+            NamedSharding(global_mesh, P(None, ('x', 'y'))),
+            tspec,
+            byte_limiter=byte_limiter,
+        )
+    )
+
+    self.assertArraysEqual(restored, data)
+    self.assertEqual(byte_limiter.metrics.num_oversized_requests, 0)
+    # Read in 4 groups of 2 shards instead of a single group of 8.
+    self.assertEqual(byte_limiter.metrics.num_requests, 4)
+    self.assertEqual(byte_limiter.metrics.reserved_bytes, 0)
+
+  @parameterized.parameters(None, np.float16)
+  def test_resharding_restore(self, dtype):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    data = np.arange(16 * 16, dtype=np.float32).reshape(16, 16)
+    save_sharding = NamedSharding(global_mesh, P('x'))
+    arr = jax.make_array_from_callback(
+        data.shape, save_sharding, lambda idx: data[idx]
+    )
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+    serialize([arr], [tspec])
+
+    restore_sharding = NamedSharding(global_mesh, P('y', 'x'))
+    (restored,) = deserialize(
+        [restore_sharding], [tspec], dtypes=[dtype], strict=False
+    )
+    expected = data if dtype is None else data.astype(dtype)
+    self.assertArraysEqual(restored, expected)
+    for shard in restored.addressable_shards:
+      self.assertArraysEqual(shard.data, expected[shard.index])
+
+  def test_resharding_restore_reads_stored_chunks_once(self):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    data = np.arange(16 * 16, dtype=np.float32).reshape(16, 16)
+    arr = jax.make_array_from_callback(
+        data.shape, NamedSharding(global_mesh, P('x')), lambda idx: data[idx]
+    )
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+    serialize([arr], [tspec])
+    t = ts.open(tspec).result()
+    num_stored_chunks = math.prod(
+        -(-dim // chunk)
+        for dim, chunk in zip(t.shape, t.chunk_layout.read_chunk_template.shape)
+    )
+
+    def chunk_reads() -> int:
+      metrics = ts.experimental_collect_matching_metrics(
+          '/tensorstore/cache/chunk_cache/reads'
+      )
+      return sum(v['value'] for m in metrics for v in m['values'])
+
+    # Every restored shard needs stored chunks that other shards need too.
+    restore_sharding = NamedSharding(global_mesh, P('y', 'x'))
+    start = chunk_reads()
+    (restored,) = deserialize([restore_sharding], [tspec], strict=False)
+    self.assertArraysEqual(restored, data)
+    self.assertEqual(chunk_reads() - start, num_stored_chunks)
+
+    # Reading every index on its own reads shared chunks once per shard.
+    self.enter_context(
+        mock.patch.object(
+            serialization,
+            '_group_domains_by_stored_chunks',
+            lambda t, domains: [[i] for i in range(len(domains))],
+        )
+    )
+    start = chunk_reads()
+    deserialize([restore_sharding], [tspec], strict=False)
+    self.assertGreater(chunk_reads() - start, num_stored_chunks)
+
+  @parameterized.named_parameters(
+      dict(testcase_name='fully_replicated', shape=(13, 11), pspec=(None,)),
+      dict(testcase_name='partially_replicated', shape=(14, 7), pspec=('x',)),
+  )
+  def test_replica_parallel_uneven(self, shape, pspec):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    sharding = NamedSharding(global_mesh, P(*pspec))
+    data = np.arange(math.prod(shape), dtype=np.float32).reshape(shape)
+    arr = jax.make_array_from_callback(shape, sharding, lambda idx: data[idx])
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+
+    serialize([arr], [tspec])
+
+    (restored,) = deserialize([sharding], [tspec])
+    self.assertArraysEqual(restored, data)
+
+  @parameterized.parameters(True, False)
+  def test_serialize_from_device_streaming(self, use_replica_parallel):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    sharding = NamedSharding(global_mesh, P('x'))
+    data = np.arange(64 * 32, dtype=np.float32).reshape(64, 32)
+    arr = jax.make_array_from_callback(
+        data.shape, sharding, lambda idx: data[idx]
+    )
+    rslices = replica_slices.get_replica_slices(
+        arr, replica_id=0, use_replica_parallel=use_replica_parallel
+    )
+    self.assertFalse(rslices.is_on_host)
+    slice_nbytes = math.prod(rslices.local_shape) * data.dtype.itemsize
+    byte_limiter = serialization.LimitInFlightBytes(2 * slice_nbytes)
+    tspec = serialization.get_tensorstore_spec(str(self.ckpt_dir))
+    tspec['metadata'] = serialization._get_metadata(arr, rslices.local_shape)
+    tspec['dtype'] = jnp.dtype(arr.dtype).name
+
+    asyncio_utils.run_sync(
+        serialization.async_serialize_from_device(
+            rslices, tspec, byte_limiter=byte_limiter
+        )
+    )
+
+    self.assertLessEqual(
+        byte_limiter.metrics.peak_reserved_bytes, 2 * slice_nbytes
+    )
+    self.assertEqual(byte_limiter.metrics.reserved_bytes, 0)
+    (restored,) = deserialize([sharding], [tspec])
+    self.assertArraysEqual(restored, data)
+
+  @parameterized.parameters(True, False)
+  def test_serialize_batch_from_host(self, ocdbt):
+    global_mesh = create_global_mesh((2, 4), ('x', 'y'))
+    sharding = NamedSharding(global_mesh, P('x'))
+    shapes = [(8,), (16, 4), (64, 32), (8, 2), (4,)]
+    datas = [
+        np.arange(math.prod(shape), dtype=np.float32).reshape(shape) + i
+        for i, shape in enumerate(shapes)
+    ]
+    rslices, tspecs = [], []
+    for i, data in enumerate(datas):
+      arr = jax.make_array_from_callback(
+          data.shape, sharding, lambda idx, data=data: data[idx]
+      )
+      (r,) = replica_slices.transfer_arrays_to_host(
+          [arr], replica_id=0, use_replica_parallel=False
+      )
+      tspec = serialization.get_tensorstore_spec(
+          str(self.ckpt_dir / f'a{i}'), ocdbt=ocdbt
+      )
+      tspec['metadata'] = serialization._get_metadata(arr, r.local_shape)
+      tspec['dtype'] = jnp.dtype(arr.dtype).name
+      rslices.append(r)
+      tspecs.append(tspec)
+
+    byte_limiter = serialization.LimitInFlightBytes(1024**2)
+    batch_metrics = asyncio_utils.run_sync(
+        serialization.async_serialize_batch_from_host(
+            rslices,
+            tspecs,
+            byte_limiter=byte_limiter,
+            small_array_bytes=1024,
+            max_batch_bytes=256,
+        )
+    )
+
+    # (64, 32) is written separately; the other arrays are split in two
+    # batches to respect `max_batch_bytes`.
+    self.assertSameElements(
+        [m.num_arrays for m in batch_metrics], [1, 2, 2]
+    )
+    self.assertEqual(
+        sum(m.nbytes for m in batch_metrics), sum(r.nbytes for r in rslices)
+    )
+    self.assertEqual(byte_limiter.metrics.reserved_bytes, 0)
+    restored = deserialize([sharding] * len(tspecs), tspecs)
+    for r, data in zip(restored, datas):
+      self.assertArraysEqual(r, data)
+
+  def test_plan_write_batches(self):
+    self.assertEqual(
+        serialization._plan_write_batches(
+            [10, 100, 20, 30, 40, 5],
+            small_array_bytes=50,
+            max_batch_bytes=60,
+        ),
+        [[1], [0, 2, 3], [4, 5]],
+    )
+
+
+class LimitInFlightBytesTest(absltest.TestCase):
+
+  def test_invalid_num_bytes(self):
+    with self.assertRaises(ValueError):
+      serialization.LimitInFlightBytes(0)
+
+  def test_fifo_order(self):
+    limiter = serialization.LimitInFlightBytes(10)
+    granted = []
+
+    async def request(name, nbytes):
+      await limiter.wait_for_bytes(nbytes)
+      granted.append(name)
+
+    async def _run():
+      await limiter.wait_for_bytes(8)
+      large = asyncio.create_task(request('large', 10))
+      await asyncio.sleep(0)
+      # Would fit right away, but must not overtake the queued large request.
+      small = asyncio.create_task(request('small', 1))
+      await asyncio.sleep(0)
+      self.assertEmpty(granted)
+      await limiter.release_bytes(8)
+      await large
+      self.assertEqual(granted, ['large'])
+      await limiter.release_bytes(10)
+      await small
+
+    asyncio_utils.run_sync(_run())
+    self.assertEqual(granted, ['large', 'small'])
+    self.assertEqual(limiter.metrics.num_waits, 2)
+    self.assertEqual(limiter.metrics.peak_queue_depth, 2)
+    self.assertEqual(limiter.metrics.peak_reserved_bytes, 10)
+    self.assertEqual(limiter.metrics.reserved_bytes, 1)
+
+  def test_priority_order(self):
+    limiter = serialization.LimitInFlightBytes(4)
+    granted = []
+
+    async def request(name, priority):
+      await limiter.wait_for_bytes(4, priority=priority)
+      granted.append(name)
+      await limiter.release_bytes(4)
+
+    async def _run():
+      await limiter.wait_for_bytes(4)
+      tasks = [
+          asyncio.create_task(request('low', 0)),
+          asyncio.create_task(request('high', 1)),
+          asyncio.create_task(request('other_low', 0)),
+      ]
+      await asyncio.sleep(0)
+      await limiter.release_bytes(4)
+      await asyncio.gather(*tasks)
+
+    asyncio_utils.run_sync(_run())
+    self.assertEqual(granted, ['high', 'low', 'other_low'])
+
+  def test_oversized_request(self):
+    limiter = serialization.LimitInFlightBytes(10)
+
+    async def _run():
+      await limiter.wait_for_bytes(3)
+      oversized = asyncio.create_task(limiter.wait_for_bytes(100))
+      await asyncio.sleep(0)
+      self.assertFalse(oversized.done())
+      await limiter.release_bytes(3)
+      await oversized
+      self.assertEqual(limiter.metrics.reserved_bytes, 10)
+      await limiter.release_bytes(100)
+
+    asyncio_utils.run_sync(_run())
+    self.assertEqual(limiter.metrics.num_oversized_requests, 1)
+    self.assertEqual(limiter.metrics.reserved_bytes, 0)
+
+  def test_cancelled_waiter_unblocks_queue(self):
+    limiter = serialization.LimitInFlightBytes(10)
+
+    async def _run():
+      await limiter.wait_for_bytes(5)
+      large = asyncio.create_task(limiter.wait_for_bytes(10))
+      await asyncio.sleep(0)
+      small = asyncio.create_task(limiter.wait_for_bytes(5))
+      await asyncio.sleep(0)
+      large.cancel()
+      with self.assertRaises(asyncio.CancelledError):
+        await large
+      await small
+      self.assertEqual(limiter.metrics.reserved_bytes, 10)
+      self.assertEqual(limiter.metrics.queue_depth, 0)
+
+    asyncio_utils.run_sync(_run())
+
+
 if __name__ == '__main__':
   absltest.main()
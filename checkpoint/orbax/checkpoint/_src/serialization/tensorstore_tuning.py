@@ -0,0 +1,429 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tunes TensorStore settings from the I/O throughput observed at runtime."""
+
+import dataclasses
+import enum
+import json
+import os
+import threading
+from typing import Any, Optional
+
+from absl import logging
+from etils import epath
+import humanize
+from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
+
+
+_MIN_FILE_IO_CONCURRENCY = 8
+_MAX_FILE_IO_CONCURRENCY = 1024
+_MIN_READ_COALESCING_THRESHOLD_BYTES = 64 * 1024
+_MAX_READ_COALESCING_THRESHOLD_BYTES = 64 * 1024**2
+_MIN_TARGET_DATA_FILE_SIZE = 64 * 1024**2
+_MAX_TARGET_DATA_FILE_SIZE = 2**31
+# Relative throughput change considered noise rather than an improvement.
+_THROUGHPUT_TOLERANCE = 0.05
+
+_NETWORK_FILESYSTEMS = frozenset(
+    {'nfs', 'nfs4', 'cifs', 'smb3', 'lustre', 'gpfs', 'ceph', 'fuse.sshfs'}
+)
+_OBJECT_STORE_FILESYSTEMS = frozenset({'fuse.gcsfuse', 'fuse.s3fs'})
+
+# Expanded when a `TensorStoreAutoTuner` is created.
+DEFAULT_CACHE_FILE = os.path.join(
+    '~', '.cache', 'orbax', 'tensorstore_tuning.json'
+)
+
+
+class StorageBackend(enum.Enum):
+  """Kind of storage holding a checkpoint."""
+
+  LOCAL = 'local'
+  NFS = 'nfs'
+  OBJECT_STORE = 'object_store'
+
+
+class Operation(enum.Enum):
+  """Kind of checkpoint I/O, tuned separately."""
+
+  SAVE = 'save'
+  RESTORE = 'restore'
+
+
+def _get_mount_fs_type(path: str, mounts_file: str = '/proc/mounts') -> str:
+  """Returns the filesystem type of the mount containing `path`, or ''."""
+  try:
+    with open(mounts_file) as f:
+      lines = f.readlines()
+  except OSError:
+    return ''
+  path = os.path.realpath(path)
+  best_mount_point, best_fs_type = '', ''
+  for line in lines:
+    parts = line.split()
+    if len(parts) < 3:
+      continue
+    mount_point, fs_type = parts[1], parts[2]
+    if (
+        path == mount_point
+        or path.startswith(mount_point.rstrip('/') + '/')
+    ) and len(mount_point) > len(best_mount_point):
+      best_mount_point, best_fs_type = mount_point, fs_type
+  return best_fs_type
+
+
+def detect_storage_backend(
+    directory: str | os.PathLike[str],
+    *,
+    mounts_file: str = '/proc/mounts',
+) -> StorageBackend:
+  """Detects the kind of storage `directory` is located on.
+
+  Args:
+    directory: Checkpoint directory. Need not exist.
+    mounts_file: File listing mounted filesystems, in /proc/mounts format.
+
+  Returns:
+    The detected `StorageBackend`. Defaults to `StorageBackend.LOCAL` if the
+    storage cannot be identified.
+  """
+  directory = os.fspath(directory)
+  if ts_utils.is_remote_storage(directory):
+    return StorageBackend.OBJECT_STORE
+  fs_type = _get_mount_fs_type(directory, mounts_file)
+  if fs_type in _OBJECT_STORE_FILESYSTEMS:
+    return StorageBackend.OBJECT_STORE
+  if fs_type in _NETWORK_FILESYSTEMS:
+    return StorageBackend.NFS
+  return StorageBackend.LOCAL
+
+
+@dataclasses.dataclass(frozen=True)
+class TensorStoreSettings:
+  """TensorStore settings that affect I/O performance.
+
+  Attributes:
+    file_io_concurrency_limit: Thread pool size for file I/O. See
+      `ts_utils.get_ts_context`.
+    data_copy_concurrency_limit: Thread pool size for compressing and copying
+      data. If None, the TensorStore default is used. Not tuned.
+    read_coalescing_threshold_bytes: OCDBT reads separated by less than this
+      many bytes are merged into one.
+    read_coalescing_merged_bytes: Maximum size of a merged OCDBT read.
+    read_coalescing_interval: How long OCDBT reads wait for other reads to be
+      merged with.
+    target_data_file_size: Target size of OCDBT data files. If None, the Orbax
+      default is used.
+  """
+
+  file_io_concurrency_limit: int = 128
+  data_copy_concurrency_limit: Optional[int] = None
+  read_coalescing_threshold_bytes: int = 1000000
+  read_coalescing_merged_bytes: int = 500000000000
+  read_coalescing_interval: str = '1ms'
+  target_data_file_size: Optional[int] = None
+
+  def read_coalescing_options(self) -> ts_utils.JsonSpec:
+    """Returns the options to add to an OCDBT KvStore spec."""
+    return {
+        'experimental_read_coalescing_threshold_bytes': (
+            self.read_coalescing_threshold_bytes
+        ),
+        'experimental_read_coalescing_merged_bytes': (
+            self.read_coalescing_merged_bytes
+        ),
+        'experimental_read_coalescing_interval': self.read_coalescing_interval,
+    }
+
+  def to_json(self) -> dict[str, Any]:
+    return dataclasses.asdict(self)
+
+  @classmethod
+  def from_json(cls, json_dict: dict[str, Any]) -> 'TensorStoreSettings':
+    fields = {f.name for f in dataclasses.fields(cls)}
+    return cls(**{k: v for k, v in json_dict.items() if k in fields})
+
+
+DEFAULT_SETTINGS = {
+    # Local disks have low latency, so merging reads only helps when they are
+    # nearly adjacent.
+    StorageBackend.LOCAL: TensorStoreSettings(
+        file_io_concurrency_limit=128,
+        read_coalescing_threshold_bytes=_MIN_READ_COALESCING_THRESHOLD_BYTES,
+    ),
+    StorageBackend.NFS: TensorStoreSettings(
+        file_io_concurrency_limit=128,
+        read_coalescing_threshold_bytes=1000000,
+    ),
+    # Object stores have high per-request latency but scale with the number of
+    # concurrent requests.
+    StorageBackend.OBJECT_STORE: TensorStoreSettings(
+        file_io_concurrency_limit=256,
+        read_coalescing_threshold_bytes=1000000,
+        target_data_file_size=2**31,
+    ),
+}
+
+
+@dataclasses.dataclass
+class _TuningState:
+  """Hill-climbing state of `file_io_concurrency_limit` for one backend."""
+
+  settings: TensorStoreSettings
+  best_concurrency: int
+  best_bytes_per_sec: float = 0.0
+  # Factor applied to `best_concurrency` to obtain the next limit to try.
+  direction: float = 2.0
+  # Whether a step in `direction` improved throughput.
+  has_improved: bool = False
+  converged: bool = False
+
+  def to_json(self) -> dict[str, Any]:
+    return {
+        'settings': self.settings.to_json(),
+        'best_concurrency': self.best_concurrency,
+        'best_bytes_per_sec': self.best_bytes_per_sec,
+        'direction': self.direction,
+        'has_improved': self.has_improved,
+        'converged': self.converged,
+    }
+
+  @classmethod
+  def from_json(cls, json_dict: dict[str, Any]) -> '_TuningState':
+    return cls(
+        settings=TensorStoreSettings.from_json(json_dict['settings']),
+        best_concurrency=json_dict['best_concurrency'],
+        best_bytes_per_sec=json_dict.get('best_bytes_per_sec', 0.0),
+        direction=json_dict.get('direction', 2.0),
+        has_improved=json_dict.get('has_improved', False),
+        converged=json_dict.get('converged', False),
+    )
+
+
+class TensorStoreAutoTuner:
+  """Picks TensorStore settings from the throughput of previous operations.
+
+  Settings are tracked per `StorageBackend` and `Operation`, starting from
+  `DEFAULT_SETTINGS`, since saves and restores may scale differently with
+  concurrency. After each save or restore, `record` is called with the number
+  of bytes transferred and the time it took:
+
+  - `file_io_concurrency_limit` is tuned by hill climbing: the limit is doubled
+    (or halved) as long as throughput keeps improving, and reverted to the best
+    limit seen otherwise. Tuning stops once neither direction helps.
+  - `read_coalescing_threshold_bytes` is set to the average number of bytes per
+    request, so that reads separated by less than a typical request are
+    merged.
+  - `target_data_file_size` is set after saves so that a checkpoint of the
+    observed size is spread over about `file_io_concurrency_limit` OCDBT data
+    files, which can then be written concurrently.
+
+  `data_copy_concurrency_limit` is not tuned and keeps its per-backend default.
+
+  Tuned settings are persisted to `cache_file`, so that later runs on the same
+  host start from them. The same instance may be shared by several handlers
+  and is thread-safe.
+
+  Usage::
+
+    tuner = TensorStoreAutoTuner()
+    handler = ocp.PyTreeCheckpointHandler(ts_autotuner=tuner)
+  """
+
+  def __init__(
+      self,
+      *,
+      cache_file: Optional[str | os.PathLike[str]] = DEFAULT_CACHE_FILE,
+      default_settings: Optional[
+          dict[StorageBackend, TensorStoreSettings]
+      ] = None,
+  ):
+    """Creates a TensorStoreAutoTuner.
+
+    Args:
+      cache_file: Per-host file where tuned settings are persisted. A leading
+        `~` is expanded to the home directory. If None, settings are not
+        persisted.
+      default_settings: Initial settings per backend. Defaults to
+        `DEFAULT_SETTINGS`.
+    """
+    self._cache_file = (
+        None if cache_file is None else epath.Path(cache_file).expanduser()
+    )
+    self._default_settings = default_settings or DEFAULT_SETTINGS
+    self._lock = threading.Lock()
+    self._states: dict[tuple[StorageBackend, Operation], _TuningState] = {}
+    self._load()
+
+  def _load(self):
+    if self._cache_file is None or not self._cache_file.exists():
+      return
+    try:
+      cached = json.loads(self._cache_file.read_text())
+      self._states = {
+          (StorageBackend(backend), Operation(operation)): (
+              _TuningState.from_json(state)
+          )
+          for backend, states in cached.items()
+          for operation, state in states.items()
+      }
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+      logging.warning(
+          'Ignoring invalid TensorStore tuning cache %s: %s',
+          self._cache_file,
+          e,
+      )
+      self._states = {}
+
+  def _save(self):
+    if self._cache_file is None:
+      return
+    cached = {}
+    for (backend, operation), state in self._states.items():
+      cached.setdefault(backend.value, {})[operation.value] = state.to_json()
+    # The file may be shared by several processes on the host, so it is
+    # replaced atomically to never expose a partially written file.
+    tmp_path = self._cache_file.parent / (
+        f'{self._cache_file.name}.tmp-{os.getpid()}'
+    )
+    try:
+      self._cache_file.parent.mkdir(parents=True, exist_ok=True)
+      tmp_path.write_text(json.dumps(cached))
+      tmp_path.replace(self._cache_file)
+    except OSError as e:
+      logging.warning(
+          'Failed to write TensorStore tuning cache %s: %s',
+          self._cache_file,
+          e,
+      )
+
+  def _get_state(
+      self, backend: StorageBackend, operation: Operation
+  ) -> _TuningState:
+    key = (backend, operation)
+    if key not in self._states:
+      settings = self._default_settings[backend]
+      self._states[key] = _TuningState(
+          settings=settings,
+          best_concurrency=settings.file_io_concurrency_limit,
+      )
+    return self._states[key]
+
+  def settings(
+      self, directory: str | os.PathLike[str], *, operation: Operation
+  ) -> TensorStoreSettings:
+    """Returns the settings to use to save or restore a checkpoint."""
+    backend = detect_storage_backend(directory)
+    with self._lock:
+      return self._get_state(backend, operation).settings
+
+  def record(
+      self,
+      directory: str | os.PathLike[str],
+      nbytes: int,
+      duration_secs: float,
+      *,
+      operation: Operation,
+      num_requests: int = 1,
+  ):
+    """Records a save or restore and updates the settings used for it.
+
+    Args:
+      directory: Checkpoint directory.
+      nbytes: Number of bytes written or read.
+      duration_secs: Time taken by the operation.
+      operation: Whether `nbytes` were saved or restored.
+      num_requests: Number of I/O requests issued, e.g. the number of arrays.
+        Used to estimate the request size.
+    """
+    if nbytes <= 0 or duration_secs <= 0:
+      return
+    backend = detect_storage_backend(directory)
+    bytes_per_sec = nbytes / duration_secs
+    with self._lock:
+      state = self._get_state(backend, operation)
+      settings = state.settings
+      concurrency = settings.file_io_concurrency_limit
+
+      num_requests = max(num_requests, 1)
+      threshold = int(
+          min(
+              max(
+                  nbytes / num_requests,
+                  _MIN_READ_COALESCING_THRESHOLD_BYTES,
+              ),
+              _MAX_READ_COALESCING_THRESHOLD_BYTES,
+          )
+      )
+
+      if not state.converged:
+        if bytes_per_sec > state.best_bytes_per_sec * (
+            1 + _THROUGHPUT_TOLERANCE
+        ):
+          state.has_improved |= concurrency != state.best_concurrency
+          state.best_bytes_per_sec = bytes_per_sec
+          state.best_concurrency = concurrency
+        elif concurrency != state.best_concurrency:
+          # The last step did not help. Try the other direction, unless this
+          # one already improved throughput or both have been tried.
+          if state.has_improved or state.direction < 1:
+            state.converged = True
+          else:
+            state.direction = 1 / state.direction
+        next_concurrency = int(
+            min(
+                max(
+                    state.best_concurrency * state.direction,
+                    _MIN_FILE_IO_CONCURRENCY,
+                ),
+                _MAX_FILE_IO_CONCURRENCY,
+            )
+        )
+        if state.converged or next_concurrency == state.best_concurrency:
+          state.converged = True
+          next_concurrency = state.best_concurrency
+      else:
+        next_concurrency = state.best_concurrency
+
+      target_data_file_size = settings.target_data_file_size
+      if operation == Operation.SAVE:
+        target_data_file_size = int(
+            min(
+                max(
+                    nbytes / next_concurrency,
+                    _MIN_TARGET_DATA_FILE_SIZE,
+                ),
+                _MAX_TARGET_DATA_FILE_SIZE,
+            )
+        )
+
+      state.settings = dataclasses.replace(
+          settings,
+          file_io_concurrency_limit=next_concurrency,
+          read_coalescing_threshold_bytes=threshold,
+          target_data_file_size=target_data_file_size,
+      )
+      logging.info(
+          'TensorStore %s tuning for %s: observed %s/s;'
+          ' file_io_concurrency_limit=%d, read_coalescing_threshold_bytes=%s,'
+          ' target_data_file_size=%s',
+          operation.value,
+          backend.value,
+          humanize.naturalsize(bytes_per_sec, binary=True),
+          next_concurrency,
+          humanize.naturalsize(threshold, binary=True),
+          target_data_file_size,
+      )
+      self._save()
@@ -0,0 +1,205 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import mock
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from orbax.checkpoint._src.serialization import tensorstore_tuning
+from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
+
+
+StorageBackend = tensorstore_tuning.StorageBackend
+Operation = tensorstore_tuning.Operation
+
+_MOUNTS = """\
+/dev/root / ext4 rw 0 0
+server:/export /mnt/nfs nfs4 rw 0 0
+bucket /mnt/gcs fuse.gcsfuse rw 0 0
+/dev/sdb /mnt/nfs/local ext4 rw 0 0
+"""
+
+
+class DetectStorageBackendTest(parameterized.TestCase):
+
+  @parameterized.parameters(
+      ('gs://bucket/ckpt', StorageBackend.OBJECT_STORE),
+      ('s3://bucket/ckpt', StorageBackend.OBJECT_STORE),
+      ('/tmp/ckpt', StorageBackend.LOCAL),
+      ('/mnt/nfs/ckpt', StorageBackend.NFS),
+      ('/mnt/nfs', StorageBackend.NFS),
+      ('/mnt/nfsx/ckpt', StorageBackend.LOCAL),
+      ('/mnt/nfs/local/ckpt', StorageBackend.LOCAL),
+      ('/mnt/gcs/ckpt', StorageBackend.OBJECT_STORE),
+  )
+  def test_detect(self, directory, expected):
+    mounts_file = self.create_tempfile(content=_MOUNTS).full_path
+    self.assertEqual(
+        tensorstore_tuning.detect_storage_backend(
+            directory, mounts_file=mounts_file
+        ),
+        expected,
+    )
+
+  def test_missing_mounts_file(self):
+    self.assertEqual(
+        tensorstore_tuning.detect_storage_backend(
+            '/tmp/ckpt', mounts_file='/does/not/exist'
+        ),
+        StorageBackend.LOCAL,
+    )
+
+
+class TensorStoreAutoTunerTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.directory = self.create_tempdir().full_path
+    self.cache_file = os.path.join(self.create_tempdir().full_path, 'c.json')
+
+  def _tune(self, tuner, throughput_fn, steps=10, operation=Operation.SAVE):
+    for _ in range(steps):
+      concurrency = tuner.settings(
+          self.directory, operation=operation
+      ).file_io_concurrency_limit
+      tuner.record(
+          self.directory,
+          int(throughput_fn(concurrency)),
+          1.0,
+          operation=operation,
+          num_requests=1,
+      )
+    return tuner.settings(
+        self.directory, operation=operation
+    ).file_io_concurrency_limit
+
+  @parameterized.parameters(
+      # Throughput peaks at 512.
+      (lambda c: 1000 * min(c, 512) / max(c, 512), 512),
+      # Throughput peaks at 32.
+      (lambda c: 1000 * min(c, 32) / max(c, 32), 32),
+      # Throughput does not depend on concurrency.
+      (lambda c: 1000, 128),
+  )
+  def test_tunes_concurrency(self, throughput_fn, expected):
+    tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=None)
+    self.assertEqual(self._tune(tuner, throughput_fn), expected)
+
+  def test_tunes_operations_separately(self):
+    tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=None)
+    self.assertEqual(
+        self._tune(tuner, lambda c: 1000 * min(c, 512) / max(c, 512)), 512
+    )
+    self.assertEqual(
+        self._tune(
+            tuner,
+            lambda c: 1000 * min(c, 32) / max(c, 32),
+            operation=Operation.RESTORE,
+        ),
+        32,
+    )
+    self.assertEqual(
+        tuner.settings(
+            self.directory, operation=Operation.SAVE
+        ).file_io_concurrency_limit,
+        512,
+    )
+
+  @parameterized.parameters(128, 1024)
+  def test_read_coalescing_threshold(self, num_requests):
+    tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=None)
+    # Requests of 10 MiB each, with a concurrency limit of 128.
+    tuner.record(
+        self.directory,
+        num_requests * 10 * 1024**2,
+        1.0,
+        operation=Operation.RESTORE,
+        num_requests=num_requests,
+    )
+    settings = tuner.settings(self.directory, operation=Operation.RESTORE)
+    self.assertEqual(settings.read_coalescing_threshold_bytes, 10 * 1024**2)
+    self.assertEqual(
+        ts_utils.build_kvstore_tspec(
+            self.directory,
+            read_coalescing_options=settings.read_coalescing_options(),
+        )['experimental_read_coalescing_threshold_bytes'],
+        10 * 1024**2,
+    )
+
+  @parameterized.parameters(
+      # 256 files of 256 MiB.
+      (256 * 256 * 1024**2, 256 * 1024**2),
+      # Small checkpoints are not split into tiny files.
+      (1024**2, 64 * 1024**2),
+      # Large checkpoints use files of at most 2 GiB.
+      (256 * 4 * 1024**3, 2**31),
+  )
+  def test_target_data_file_size(self, nbytes, expected):
+    tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=None)
+    tuner.record(
+        self.directory,
+        nbytes,
+        1.0,
+        operation=Operation.RESTORE,
+        num_requests=1,
+    )
+    self.assertIsNone(
+        tuner.settings(
+            self.directory, operation=Operation.RESTORE
+        ).target_data_file_size
+    )
+    tuner.record(
+        self.directory, nbytes, 1.0, operation=Operation.SAVE, num_requests=1
+    )
+    settings = tuner.settings(self.directory, operation=Operation.SAVE)
+    # Saves are spread over about `file_io_concurrency_limit` files.
+    self.assertEqual(settings.file_io_concurrency_limit, 256)
+    self.assertEqual(settings.target_data_file_size, expected)
+
+  def test_persists_settings(self):
+    tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=self.cache_file)
+    tuned = self._tune(tuner, lambda c: min(c, 512))
+    self.assertEqual(os.listdir(os.path.dirname(self.cache_file)), ['c.json'])
+    tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=self.cache_file)
+    self.assertEqual(
+        tuner.settings(
+            self.directory, operation=Operation.SAVE
+        ).file_io_concurrency_limit,
+        tuned,
+    )
+
+  def test_default_cache_file(self):
+    home = self.create_tempdir().full_path
+    with mock.patch.dict(os.environ, {'HOME': home}):
+      tuner = tensorstore_tuning.TensorStoreAutoTuner()
+      self._tune(tuner, lambda c: min(c, 512), steps=1)
+    self.assertTrue(
+        os.path.exists(
+            os.path.join(home, '.cache', 'orbax', 'tensorstore_tuning.json')
+        )
+    )
+
+  def test_invalid_cache_file(self):
+    with open(self.cache_file, 'w') as f:
+      f.write('not json')
+    tuner = tensorstore_tuning.TensorStoreAutoTuner(cache_file=self.cache_file)
+    self.assertEqual(
+        tuner.settings(self.directory, operation=Operation.SAVE),
+        tensorstore_tuning.DEFAULT_SETTINGS[StorageBackend.LOCAL],
+    )
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -14,11 +14,16 @@
 
 """TensorStore serialization helper functions."""
 
+import collections
 import copy
+import dataclasses
+import json
 import math
 import os
 import re
-from typing import Any, Dict, TypeAlias, Union
+import threading
+from typing import Any, Dict, Optional, TypeAlias, Union
+import weakref
 
 from absl import logging
 from jax import numpy as jnp
@@ -77,6 +82,8 @@ def get_ts_context(
     use_ocdbt: bool = True,
     file_io_concurrency_limit: int | None = None,
     data_copy_concurrency_limit: int | None = None,
+    cache_open_handles: bool = False,
+    chunk_cache_bytes: int | None = None,
 ) -> ts.Context:
   """Creates a TensorStore context object.
 
@@ -90,10 +97,60 @@ def get_ts_context(
       file I/O.
     data_copy_concurrency_limit: Optionally overrides the thread pool size for
       compressing and copying data.
+    cache_open_handles: If True, returns a context shared by all calls with the
+      same options, with an attached `OpenHandleCache`. Orbax serialization
+      APIs then reuse `TensorStore` objects opened with this context instead
+      of opening (and reading metadata) again, e.g. when the same checkpoint
+      is restored repeatedly. See `OpenHandleCache`.
+    chunk_cache_bytes: If provided, array chunks read through this context are
+      cached in host memory, up to this many bytes. Later reads of the same
+      chunks, e.g. by TensorStores opened with the same spec and context, are
+      served from the cache without accessing storage. The returned context is
+      shared by all calls with the same options, and is replaced by a new one
+      when a checkpoint read through it is invalidated, see
+      `invalidate_open_handle_caches`.
 
   Returns:
     A TensorStore context object.
   """
+  if cache_open_handles or chunk_cache_bytes is not None:
+    key = (
+        use_ocdbt,
+        file_io_concurrency_limit,
+        data_copy_concurrency_limit,
+        chunk_cache_bytes,
+        cache_open_handles,
+    )
+    with _OPEN_HANDLE_CACHES_LOCK:
+      if key not in _SHARED_TS_CONTEXTS:
+        context = _create_ts_context(
+            use_ocdbt=use_ocdbt,
+            file_io_concurrency_limit=file_io_concurrency_limit,
+            data_copy_concurrency_limit=data_copy_concurrency_limit,
+            chunk_cache_bytes=chunk_cache_bytes,
+        )
+        # Without `cache_open_handles`, the cache only tracks the opened paths,
+        # so that the context (and its chunks) is retired on invalidation.
+        _OPEN_HANDLE_CACHES[context] = OpenHandleCache(
+            max_size=_DEFAULT_MAX_OPEN_HANDLES if cache_open_handles else 0
+        )
+        _SHARED_TS_CONTEXTS[key] = context
+      return _SHARED_TS_CONTEXTS[key]
+  return _create_ts_context(
+      use_ocdbt=use_ocdbt,
+      file_io_concurrency_limit=file_io_concurrency_limit,
+      data_copy_concurrency_limit=data_copy_concurrency_limit,
+  )
+
+
+def _create_ts_context(
+    *,
+    use_ocdbt: bool,
+    file_io_concurrency_limit: int | None,
+    data_copy_concurrency_limit: int | None,
+    chunk_cache_bytes: int | None = None,
+) -> ts.Context:
+  """Creates a new, unshared, TensorStore context. See `get_ts_context`."""
   context = copy.deepcopy(
       _DEFAULT_OCDBT_TS_CONTEXT if use_ocdbt else _BASE_TS_CONTEXT
   )
@@ -105,9 +162,256 @@ def get_ts_context(
     context.setdefault('data_copy_concurrency', {})[
         'limit'
     ] = data_copy_concurrency_limit
+  if chunk_cache_bytes is not None:
+    context['cache_pool'] = {'total_bytes_limit': chunk_cache_bytes}
   return ts.Context(context)
 
 
+### Caching opened TensorStores.
+
+
+# Default maximum number of handles kept by an `OpenHandleCache`.
+_DEFAULT_MAX_OPEN_HANDLES = 4096
+
+
+@dataclasses.dataclass
+class OpenHandleCacheMetrics:
+  """Counters collected by `OpenHandleCache`.
+
+  Attributes:
+    num_hits: Number of opens served from the cache.
+    num_misses: Number of opens that called `ts.open`.
+    num_invalidations: Number of cached handles dropped by `invalidate`.
+    num_evictions: Number of least recently used handles dropped to respect
+      `max_size`.
+    size: Number of handles currently cached.
+  """
+
+  num_hits: int = 0
+  num_misses: int = 0
+  num_invalidations: int = 0
+  num_evictions: int = 0
+  size: int = 0
+
+
+def _get_kvstore_path(kvstore: JsonSpec | str) -> str:
+  """Returns the path (or URL, for remote storage) of a kvstore spec."""
+  if isinstance(kvstore, str):
+    return kvstore.removeprefix('file://')
+  path = kvstore.get('path', '')
+  if kvstore.get('base') is not None:
+    return os.path.join(_get_kvstore_path(kvstore['base']), path)
+  if 'bucket' in kvstore:
+    scheme = 'gs' if kvstore['driver'] == 'gcs' else kvstore['driver']
+    return f'{scheme}://{kvstore["bucket"]}/{path}'
+  return path
+
+
+def _get_spec_kvstore_path(spec: JsonSpec) -> str:
+  """Returns the kvstore path of `spec`, following adapters (e.g. `cast`)."""
+  while 'kvstore' not in spec and isinstance(spec.get('base'), dict):
+    spec = spec['base']
+  return _get_kvstore_path(spec.get('kvstore', ''))
+
+
+class OpenHandleCache:
+  """Caches `TensorStore` objects opened for reading or writing arrays.
+
+  Opening a `TensorStore` usually reads its metadata, so jobs that restore the
+  same checkpoint many times, or that read many small arrays, may spend most
+  of their time opening arrays. Handles are keyed by their spec (including the
+  kvstore spec) and whether metadata was assumed, and are only reused by opens
+  with the same key and context. Handles opened in a transaction are bound to
+  it, and are not cached.
+
+  At most `max_size` handles are kept, evicting the least recently used ones
+  first. With `max_size=0`, no handles are kept, but the paths of opened arrays
+  are still tracked for `invalidate`.
+
+  Cached handles do not observe changes to the metadata of the underlying
+  arrays, so entries for a checkpoint must be invalidated whenever it is
+  (re)written or deleted. Orbax checkpointers do this once a checkpoint is
+  finalized, and checkpoint deleters when deleting steps; see
+  `invalidate_open_handle_caches`.
+
+  Obtain an instance with `get_ts_context(cache_open_handles=True)` and
+  `get_open_handle_cache`.
+  """
+
+  def __init__(self, max_size: int = _DEFAULT_MAX_OPEN_HANDLES):
+    if max_size < 0:
+      raise ValueError(f'Must provide non-negative `max_size`: {max_size}')
+    self._max_size = max_size
+    self._lock = threading.Lock()
+    # Values are the kvstore path and the handle, in order of last use.
+    self._handles: collections.OrderedDict[
+        tuple[str, bool], tuple[str, ts.TensorStore]
+    ] = collections.OrderedDict()
+    # Paths of all handles cached since they were last invalidated, including
+    # evicted ones.
+    self._opened_paths: set[str] = set()
+    self._metrics = OpenHandleCacheMetrics()
+
+  @property
+  def metrics(self) -> OpenHandleCacheMetrics:
+    """Returns a snapshot of the cache counters."""
+    with self._lock:
+      return dataclasses.replace(self._metrics, size=len(self._handles))
+
+  def _key(self, spec: ts.Spec, assume_metadata: bool) -> tuple[str, bool]:
+    return json.dumps(spec.to_json(), sort_keys=True), assume_metadata
+
+  def get(
+      self, spec: ts.Spec, *, assume_metadata: bool = False
+  ) -> Optional[ts.TensorStore]:
+    """Returns the cached handle for `spec`, or None."""
+    key = self._key(spec, assume_metadata)
+    with self._lock:
+      entry = self._handles.get(key)
+      if entry is None:
+        self._metrics.num_misses += 1
+        return None
+      self._handles.move_to_end(key)
+      self._metrics.num_hits += 1
+      return entry[1]
+
+  def put(
+      self,
+      spec: ts.Spec,
+      t: ts.TensorStore,
+      *,
+      assume_metadata: bool = False,
+  ):
+    """Caches the handle `t`, opened from `spec`."""
+    key = self._key(spec, assume_metadata)
+    path = _get_spec_kvstore_path(spec.to_json())
+    with self._lock:
+      self._opened_paths.add(path)
+      if self._max_size == 0:
+        return
+      self._handles[key] = (path, t)
+      self._handles.move_to_end(key)
+      while len(self._handles) > self._max_size:
+        self._handles.popitem(last=False)
+        self._metrics.num_evictions += 1
+
+  def invalidate(
+      self, directory: Optional[str | os.PathLike[str]] = None
+  ) -> bool:
+    """Drops cached handles of arrays in `directory`, or all if None.
+
+    Args:
+      directory: The directory whose arrays were (re)written or deleted.
+
+    Returns:
+      Whether any array in `directory` was opened through this cache, in which
+      case data cached by its context (e.g. OCDBT manifests or chunks) may be
+      stale as well.
+    """
+    prefix = None if directory is None else os.fspath(directory).rstrip('/')
+
+    def _in_directory(path: str) -> bool:
+      return prefix is None or path == prefix or path.startswith(prefix + '/')
+
+    with self._lock:
+      stale = [
+          key
+          for key, (path, _) in self._handles.items()
+          if _in_directory(path)
+      ]
+      for key in stale:
+        del self._handles[key]
+      self._metrics.num_invalidations += len(stale)
+      opened = {path for path in self._opened_paths if _in_directory(path)}
+      self._opened_paths -= opened
+      return bool(opened)
+
+
+_OPEN_HANDLE_CACHES_LOCK = threading.Lock()
+_OPEN_HANDLE_CACHES: weakref.WeakKeyDictionary[ts.Context, OpenHandleCache] = (
+    weakref.WeakKeyDictionary()
+)
+# Shared contexts returned by `get_ts_context`, by options.
+_SHARED_TS_CONTEXTS: dict[
+    tuple[bool, int | None, int | None, int | None, bool], ts.Context
+] = {}
+
+
+def get_open_handle_cache(
+    context: Optional[ts.Context],
+) -> Optional[OpenHandleCache]:
+  """Returns the cache attached to `context`, if any."""
+  if context is None:
+    return None
+  with _OPEN_HANDLE_CACHES_LOCK:
+    return _OPEN_HANDLE_CACHES.get(context)
+
+
+async def open_tensorstore(
+    spec: ts.Spec | JsonSpec,
+    *,
+    context: Optional[ts.Context] = None,
+    transaction: Optional[ts.Transaction] = None,
+    assume_metadata: bool = False,
+) -> ts.TensorStore:
+  """Opens an existing TensorStore, reusing the handle cached for `context`.
+
+  Args:
+    spec: The TensorStore spec to open.
+    context: ts.Context instance. If it was obtained with
+      `get_ts_context(cache_open_handles=True)`, the opened handle is cached,
+      unless opened in a `transaction`.
+    transaction: Optional transaction to open the TensorStore in.
+    assume_metadata: Whether to open the TensorStore without reading metadata.
+
+  Returns:
+    The opened TensorStore.
+  """
+  spec = spec if isinstance(spec, ts.Spec) else ts.Spec(spec)
+  # Handles opened in a transaction can only be used within it.
+  cache = get_open_handle_cache(context) if transaction is None else None
+  if cache is not None:
+    t = cache.get(spec, assume_metadata=assume_metadata)
+    if t is not None:
+      return t
+  t = await ts.open(
+      spec,
+      open=True,
+      assume_metadata=assume_metadata,
+      context=context,
+      transaction=transaction,
+  )
+  if cache is not None:
+    cache.put(spec, t, assume_metadata=assume_metadata)
+  return t
+
+
+def invalidate_open_handle_caches(
+    directory: Optional[str | os.PathLike[str]] = None,
+):
+  """Drops cached handles of arrays in `directory` (or all) from all caches.
+
+  Shared contexts returned by `get_ts_context` (with `cache_open_handles` or
+  `chunk_cache_bytes`) that opened arrays in `directory` are also replaced by
+  new ones, since they may cache its OCDBT manifest and chunks.
+
+  Args:
+    directory: The directory whose arrays were (re)written or deleted. If None,
+      all handles are dropped.
+  """
+  with _OPEN_HANDLE_CACHES_LOCK:
+    caches = list(_OPEN_HANDLE_CACHES.items())
+  stale_contexts = [
+      context for context, cache in caches if cache.invalidate(directory)
+  ]
+  if not stale_contexts:
+    return
+  with _OPEN_HANDLE_CACHES_LOCK:
+    for key, context in list(_SHARED_TS_CONTEXTS.items()):
+      if any(context is stale for stale in stale_contexts):
+        del _SHARED_TS_CONTEXTS[key]
+
+
 ### Building KvStore specs.
 
 
@@ -129,6 +433,7 @@ def build_kvstore_tspec(
     *,
     use_ocdbt: bool = True,
     process_id: int | str | None = None,
+    read_coalescing_options: JsonSpec | None = None,
 ) -> JsonSpec:
   """Constructs a spec for a Tensorstore KvStore.
 
@@ -140,6 +445,10 @@ def build_kvstore_tspec(
     process_id: [only used with OCDBT driver] If provided,
       `{directory}/ocdbt.process_{process_id}` path is used as the base path. If
       a string, must conform to [A-Za-z0-9]+ pattern.
+    read_coalescing_options: [only used with OCDBT driver] If provided, the
+      `experimental_read_coalescing_*` options to use, regardless of the
+      storage. Otherwise, read coalescing is enabled with default options for
+      remote storage only. See `tensorstore_tuning.TensorStoreSettings`.
 
   Returns:
     A Tensorstore KvStore spec in dictionary form.
@@ -181,7 +490,9 @@ def build_kvstore_tspec(
         'cache_pool': 'cache_pool#ocdbt',
     })
 
-    if is_remote_storage(kv_spec):
+    if read_coalescing_options is not None:
+      kv_spec.update(read_coalescing_options)
+    elif is_remote_storage(kv_spec):
       kv_spec.update({  # pytype: disable=attribute-error
           # Enable read coalescing.  This feature merges adjacent read_ops into
           # one, which could reduce I/O ops by a factor of 10. This is
@@ -19,10 +19,12 @@ import os
 from absl.testing import absltest
 from absl.testing import parameterized
 import numpy as np
+from orbax.checkpoint._src import asyncio_utils
 from orbax.checkpoint._src.arrays import subchunking
 from orbax.checkpoint._src.arrays import types
 from orbax.checkpoint._src.serialization import serialization
 from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
+import tensorstore as ts
 
 
 GIB = 1024**3
@@ -651,6 +653,201 @@ class GetTsContextTest(parameterized.TestCase):
 
     self.assertDictEqual(expected_spec, context.spec.to_json())
 
+  def test_cache_open_handles(self):
+    context = ts_utils.get_ts_context(use_ocdbt=False, cache_open_handles=True)
+    self.assertIs(
+        context,
+        ts_utils.get_ts_context(use_ocdbt=False, cache_open_handles=True),
+    )
+    self.assertIsNotNone(ts_utils.get_open_handle_cache(context))
+    self.assertIsNone(
+        ts_utils.get_open_handle_cache(ts_utils.get_ts_context(use_ocdbt=False))
+    )
+
+  def test_chunk_cache_bytes(self):
+    context = ts_utils.get_ts_context(
+        use_ocdbt=False, chunk_cache_bytes=1024, cache_open_handles=True
+    )
+    self.assertEqual(
+        context.spec.to_json()['cache_pool'], {'total_bytes_limit': 1024}
+    )
+    self.assertIsNot(
+        context,
+        ts_utils.get_ts_context(use_ocdbt=False, cache_open_handles=True),
+    )
+
+  def test_chunk_cache_bytes_without_cache_open_handles(self):
+    context = ts_utils.get_ts_context(use_ocdbt=False, chunk_cache_bytes=1024)
+    self.assertEqual(
+        context.spec.to_json()['cache_pool'], {'total_bytes_limit': 1024}
+    )
+    # The chunk cache is shared, but opened handles are not.
+    self.assertIs(
+        context,
+        ts_utils.get_ts_context(use_ocdbt=False, chunk_cache_bytes=1024),
+    )
+    self.assertIsNot(
+        context,
+        ts_utils.get_ts_context(
+            use_ocdbt=False, chunk_cache_bytes=1024, cache_open_handles=True
+        ),
+    )
+    directory = self.create_tempdir().full_path
+    spec = {
+        'driver': 'zarr',
+        'kvstore': {'driver': 'file', 'path': os.path.join(directory, 'a')},
+        'metadata': {'shape': [4], 'chunks': [4], 'dtype': '<f4'},
+    }
+    ts.open(spec, create=True, context=context).result()
+    t = asyncio_utils.run_sync(ts_utils.open_tensorstore(spec, context=context))
+    self.assertIsNot(
+        t,
+        asyncio_utils.run_sync(
+            ts_utils.open_tensorstore(spec, context=context)
+        ),
+    )
+    self.assertEqual(ts_utils.get_open_handle_cache(context).metrics.size, 0)
+    # Chunks read from `directory` are dropped with it.
+    ts_utils.invalidate_open_handle_caches(directory)
+    self.assertIsNot(
+        context,
+        ts_utils.get_ts_context(use_ocdbt=False, chunk_cache_bytes=1024),
+    )
+
+
+class OpenHandleCacheTest(parameterized.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    self.directory = self.create_tempdir().full_path
+    self.context = ts_utils.get_ts_context(
+        use_ocdbt=False, cache_open_handles=True
+    )
+    self.cache = ts_utils.get_open_handle_cache(self.context)
+    self.cache.invalidate()
+
+  def _create(self, name: str) -> ts_utils.JsonSpec:
+    spec = {
+        'driver': 'zarr',
+        'kvstore': {
+            'driver': 'file',
+            'path': os.path.join(self.directory, name),
+        },
+        'metadata': {'shape': [4], 'chunks': [4], 'dtype': '<f4'},
+    }
+    ts.open(spec, create=True, context=self.context).result()
+    return spec
+
+  def _open(self, spec: ts_utils.JsonSpec, **kwargs) -> ts.TensorStore:
+    return asyncio_utils.run_sync(
+        ts_utils.open_tensorstore(spec, context=self.context, **kwargs)
+    )
+
+  def test_reuses_handles(self):
+    spec = self._create('a')
+    metrics = self.cache.metrics
+    t = self._open(spec)
+    self.assertIs(t, self._open(spec))
+    self.assertIsNot(t, self._open(spec, assume_metadata=True))
+    self.assertEqual(self.cache.metrics.num_hits - metrics.num_hits, 1)
+    self.assertEqual(self.cache.metrics.num_misses - metrics.num_misses, 2)
+    self.assertEqual(self.cache.metrics.size, 2)
+
+  def test_does_not_cache_transactions(self):
+    spec = self._create('a')
+    transaction = ts.Transaction()
+    t = self._open(spec, transaction=transaction)
+    self.assertIsNot(t, self._open(spec, transaction=transaction))
+    self.assertIsNot(t, self._open(spec))
+    self.assertEqual(self.cache.metrics.size, 1)
+
+  def test_evicts_least_recently_used(self):
+    cache = ts_utils.OpenHandleCache(max_size=2)
+    specs = [ts.Spec(self._create(name)) for name in 'abc']
+    handles = [self._open(spec) for spec in specs]
+    cache.put(specs[0], handles[0])
+    cache.put(specs[1], handles[1])
+    self.assertIs(cache.get(specs[0]), handles[0])
+    cache.put(specs[2], handles[2])
+    self.assertIsNone(cache.get(specs[1]))
+    self.assertIs(cache.get(specs[0]), handles[0])
+    self.assertIs(cache.get(specs[2]), handles[2])
+    self.assertEqual(cache.metrics.num_evictions, 1)
+    self.assertEqual(cache.metrics.size, 2)
+
+  def test_invalidate_directory(self):
+    spec_a = self._create('a')
+    spec_ab = self._create('ab')
+    t_a = self._open(spec_a)
+    t_ab = self._open(spec_ab)
+
+    num_invalidations = self.cache.metrics.num_invalidations
+    ts_utils.invalidate_open_handle_caches(
+        os.path.join(self.directory, 'a')
+    )
+    self.assertIsNot(t_a, self._open(spec_a))
+    self.assertIs(t_ab, self._open(spec_ab))
+    self.assertEqual(
+        self.cache.metrics.num_invalidations - num_invalidations, 1
+    )
+
+    ts_utils.invalidate_open_handle_caches(self.directory)
+    self.assertEqual(self.cache.metrics.size, 0)
+
+  def test_invalidate_replaces_shared_context(self):
+    self._open(self._create('a'))
+    ts_utils.invalidate_open_handle_caches(os.path.join(self.directory, 'b'))
+    self.assertIs(
+        self.context,
+        ts_utils.get_ts_context(use_ocdbt=False, cache_open_handles=True),
+    )
+    ts_utils.invalidate_open_handle_caches(os.path.join(self.directory, 'a'))
+    self.assertIsNot(
+        self.context,
+        ts_utils.get_ts_context(use_ocdbt=False, cache_open_handles=True),
+    )
+
+  def test_uncached_context(self):
+    spec = self._create('a')
+    context = ts_utils.get_ts_context(use_ocdbt=False)
+    t = asyncio_utils.run_sync(
+        ts_utils.open_tensorstore(spec, context=context)
+    )
+    self.assertIsNot(
+        t,
+        asyncio_utils.run_sync(
+            ts_utils.open_tensorstore(spec, context=context)
+        ),
+    )
+    self.assertEqual(self.cache.metrics.size, 0)
+
+  @parameterized.parameters(
+      ({'driver': 'file', 'path': '/a/b/'}, '/a/b/'),
+      ('file:///a/b/', '/a/b/'),
+      (
+          {
+              'driver': 'ocdbt',
+              'base': {'driver': 'file', 'path': '/a/'},
+              'path': 'b',
+          },
+          '/a/b',
+      ),
+      ({'driver': 'gcs', 'bucket': 'x', 'path': 'a/b'}, 'gs://x/a/b'),
+  )
+  def test_get_kvstore_path(self, kvstore, expected):
+    self.assertEqual(ts_utils._get_kvstore_path(kvstore), expected)
+
+  def test_invalidate_cast_spec(self):
+    spec = {
+        'driver': 'cast',
+        'dtype': 'float64',
+        'base': self._create('a'),
+    }
+    t = self._open(spec)
+    self.assertIs(t, self._open(spec))
+    ts_utils.invalidate_open_handle_caches(os.path.join(self.directory, 'a'))
+    self.assertIsNot(t, self._open(spec))
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -38,6 +38,7 @@ import numpy as np
 from orbax.checkpoint._src.arrays import subchunking
 from orbax.checkpoint._src.arrays import types as arrays_types
 from orbax.checkpoint._src.futures import future
+from orbax.checkpoint._src.logging import tracing
 from orbax.checkpoint._src.metadata import array_metadata as array_metadata_lib
 from orbax.checkpoint._src.metadata import array_metadata_store as array_metadata_store_lib
 from orbax.checkpoint._src.metadata import empty_values
@@ -47,6 +48,7 @@ from orbax.checkpoint._src.multihost import multihost
 from orbax.checkpoint._src.multihost import multislice
 from orbax.checkpoint._src.path import async_utils
 from orbax.checkpoint._src.path import format_utils
+from orbax.checkpoint._src.serialization import host_buffer_pool as host_buffer_pool_lib
 from orbax.checkpoint._src.serialization import replica_slices
 from orbax.checkpoint._src.serialization import serialization
 from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
@@ -123,6 +125,7 @@ def _get_json_tspec(
       name=info.name,
       use_ocdbt=use_ocdbt,
       process_id=process_index,
+      read_coalescing_options=info.ocdbt_read_coalescing_options,
   )
 
   tspec = {
@@ -883,6 +886,9 @@ class ArrayHandler(types.TypeHandler):
       use_replica_parallel: bool = True,
       enable_write_sharding_file: bool = True,
       array_metadata_store: array_metadata_store_lib.Store | None = None,
+      enable_streaming_host_transfer: bool = False,
+      host_buffer_pool: host_buffer_pool_lib.HostBufferPool | None = None,
+      batch_small_array_writes: bool = False,
   ):
     """Constructor.
 
@@ -899,6 +905,26 @@ class ArrayHandler(types.TypeHandler):
         True.
       array_metadata_store: Store to manage per host ArrayMetadata. To disable
         ArrayMetadata persistence, set it to None.
+      enable_streaming_host_transfer: If True, `serialize` does not wait for the
+        D2H transfer of all arrays. Instead, each replica slice is transferred
+        in the background, written as soon as it lands in host memory and
+        released after its write finishes, so that host memory is bounded by
+        `ParamInfo.byte_limiter` (i.e. `save_concurrent_bytes`) rather than by
+        the checkpoint size. Without a byte limiter, transfers are not bounded.
+        Arrays being saved must not be donated or deleted until the commit
+        future completes.
+      host_buffer_pool: If provided, host staging buffers used when restoring
+        are acquired from this pool and reused across `deserialize` calls. The
+        same pool may be passed to several handlers to share its buffers.
+      batch_small_array_writes: If True, small arrays are written in shared
+        TensorStore transactions rather than one by one, which reduces the
+        number of OCDBT commits and data files written for models with many
+        small parameters. See `serialization.async_serialize_batch_from_host`.
+        Only applies to OCDBT checkpoints saved with a byte limiter (e.g.
+        `save_concurrent_gb`): otherwise all arrays are already written in a
+        single transaction, and without OCDBT each array is stored in its own
+        files regardless. Does not apply to arrays written with
+        `enable_streaming_host_transfer`.
     """
     self._metadata_key = metadata_key
     self._primary_host = primary_host
@@ -906,17 +932,23 @@ class ArrayHandler(types.TypeHandler):
     self._enable_write_sharding_file = enable_write_sharding_file
     self._use_replica_parallel = use_replica_parallel
     self._array_metadata_store = array_metadata_store
+    self._enable_streaming_host_transfer = enable_streaming_host_transfer
+    self._host_buffer_pool = host_buffer_pool
+    self._batch_small_array_writes = batch_small_array_writes
     self._ext_metadata = dict()
 
     logging.vlog(
         1,
         'Created `%s` with primary_host=%s, replica_id=%s,'
-        ' use_replica_parallel=%s, array_metadata_store=%s',
+        ' use_replica_parallel=%s, array_metadata_store=%s,'
+        ' enable_streaming_host_transfer=%s, batch_small_array_writes=%s',
         self.__class__.__qualname__,
         self._primary_host,
         self._replica_id,
         self._use_replica_parallel,
         self._array_metadata_store,
+        self._enable_streaming_host_transfer,
+        self._batch_small_array_writes,
     )
 
     if self._primary_host is None and jax.__version_info__ <= (0, 4, 25):  # pylint:disable=unreachable
@@ -977,7 +1009,7 @@ class ArrayHandler(types.TypeHandler):
       use_ocdbt = info.is_ocdbt_checkpoint
       tspec = self._get_json_tspec_read(info, use_ocdbt=use_ocdbt)
       open_ops.append(
-          ts.open(ts.Spec(tspec), open=True, context=info.ts_context)
+          ts_utils.open_tensorstore(tspec, context=info.ts_context)
       )
 
       assert info.parent_dir is not None
@@ -1059,6 +1091,8 @@ class ArrayHandler(types.TypeHandler):
     sharding_metadata_txn = ts.Transaction()
     ocdbt_transaction: Optional[ts.Transaction] = None
     array_metadatas = []
+    # Values on host and their specs, written by a single batched call.
+    batched_values, batched_tspecs = [], []
     for value, info, arg in zip(values, infos, args):
       # The byte_limiter can't be used with a transaction, because awaiting the
       # `write` only waits until the in-memory transaction state reflects the
@@ -1076,16 +1110,39 @@ class ArrayHandler(types.TypeHandler):
       )
       tspec = array_write_spec.json
       ts_context = info.ts_context
-      write_coros.append(
-          serialization.async_serialize_from_host(
-              value,
-              tspec,
-              primary_host=self._primary_host,
-              context=ts_context,
-              transaction=ocdbt_transaction,
-              byte_limiter=info.byte_limiter,
-          )
-      )
+      if (
+          value.is_on_host
+          and self._batch_small_array_writes
+          and info.is_ocdbt_checkpoint
+          and ocdbt_transaction is None
+      ):
+        # Arrays written in `ocdbt_transaction` are already committed
+        # together.
+        batched_values.append(value)
+        batched_tspecs.append(tspec)
+      elif value.is_on_host:
+        write_coros.append(
+            serialization.async_serialize_from_host(
+                value,
+                tspec,
+                primary_host=self._primary_host,
+                context=ts_context,
+                transaction=ocdbt_transaction,
+                byte_limiter=info.byte_limiter,
+            )
+        )
+      else:
+        write_coros.append(
+            serialization.async_serialize_from_device(
+                value,
+                tspec,
+                primary_host=self._primary_host,
+                context=ts_context,
+                transaction=ocdbt_transaction,
+                byte_limiter=info.byte_limiter,
+                enable_pinned_host_transfer=info.enable_pinned_host_transfer,
+            )
+        )
       if self._enable_write_sharding_file and value.sharding is not None:
         write_coros.append(
             self._serialize_sharding(
@@ -1093,6 +1150,17 @@ class ArrayHandler(types.TypeHandler):
             )
         )
       array_metadatas.append(array_write_spec.metadata)
+    if batched_values:
+      write_coros.append(
+          serialization.async_serialize_batch_from_host(
+              batched_values,
+              batched_tspecs,
+              primary_host=self._primary_host,
+              context=infos[0].ts_context,
+              transaction=ocdbt_transaction,
+              byte_limiter=infos[0].byte_limiter,
+          )
+      )
     if self._array_metadata_store is not None:
       write_coros.append(
           self._array_metadata_store.write(
@@ -1105,7 +1173,8 @@ class ArrayHandler(types.TypeHandler):
     await asyncio.gather(*write_coros)
     await sharding_metadata_txn.commit_async()
     if ocdbt_transaction is not None:
-      await ocdbt_transaction.commit_async()
+      with tracing.span('tensorstore_commit'):
+        await ocdbt_transaction.commit_async()
 
   async def serialize(
       self,
@@ -1156,17 +1225,29 @@ class ArrayHandler(types.TypeHandler):
         [not info.enable_pinned_host_transfer for info in infos]
     )
 
-    # Complete D2H transfer in parallel for each array.
-    values_on_host = replica_slices.transfer_arrays_to_host(
-        arrays,
-        self._replica_id,
-        self._use_replica_parallel,
-        enable_pinned_host_transfer=infos[0].enable_pinned_host_transfer,
-    )
+    if self._enable_streaming_host_transfer:
+      # D2H transfers are streamed in the background, bounded by the byte
+      # limiter.
+      values = [
+          replica_slices.get_replica_slices(
+              arr, self._replica_id, self._use_replica_parallel
+          )
+          for arr in arrays
+      ]
+    else:
+      # Complete D2H transfer in parallel for each array.
+      with tracing.span('device_to_host') as span:
+        values = replica_slices.transfer_arrays_to_host(
+            arrays,
+            self._replica_id,
+            self._use_replica_parallel,
+            enable_pinned_host_transfer=infos[0].enable_pinned_host_transfer,
+        )
+        span.set(bytes=sum(v.nbytes for v in values))
 
     return [
         future.CommitFutureAwaitingContractedSignals(
-            self._background_serialize(values_on_host, infos, args),
+            self._background_serialize(values, infos, args),
             name='array_type_handler',
         )
     ]
@@ -1206,6 +1287,57 @@ class ArrayHandler(types.TypeHandler):
 
     return deserialized_arrays
 
+  async def _get_restore_sharding(
+      self,
+      info: types.ParamInfo,
+      arg: ArrayRestoreArgs,
+      sharding_file_exists: bool,
+  ) -> Union[jax.sharding.Sharding, Layout, None]:
+    """Returns the sharding (or layout) to restore an array with."""
+    sharding = None
+    if (
+        isinstance(arg, ArrayRestoreArgs)
+        and arg.mesh is not None
+        and arg.mesh_axes is not None
+    ):
+      sharding = NamedSharding(arg.mesh, arg.mesh_axes)
+    elif isinstance(arg, ArrayRestoreArgs) and arg.sharding is not None:
+      if isinstance(arg.sharding, ShardingMetadata):
+        sharding = arg.sharding.to_jax_sharding()
+      else:
+        sharding = arg.sharding
+    elif sharding_file_exists:
+      warnings.warn(
+          'Sharding info not provided when restoring. Populating sharding'
+          ' info from sharding file. Please note restoration time will be'
+          ' slightly increased due to reading from file. Note also that this'
+          ' option is unsafe when restoring on a different topology than the'
+          ' checkpoint was saved with.'
+      )
+      assert info.parent_dir is not None
+      if info.name:
+        tspec_sharding = get_sharding_tensorstore_spec(
+            info.parent_dir.as_posix(), info.name
+        )
+        t = await ts.open(
+            tspec_sharding,
+            # OCDBT is not used for sharding metadata.
+            context=info.ts_context,
+            open=True,
+            read=True,
+        )
+        serialized_string = await t.read()
+        if serialized_string:
+          sharding = sharding_metadata.get_sharding_or_none(serialized_string)
+      else:
+        raise ValueError('Unable to deserialize sharding.')
+    else:
+      raise ValueError(
+          'Sharding of jax.Array cannot be None. Provide `mesh`'
+          ' and `mesh_axes` OR `sharding`'
+      )
+    return sharding
+
   async def deserialize(
       self,
       infos: Sequence[types.ParamInfo],
@@ -1234,49 +1366,10 @@ class ArrayHandler(types.TypeHandler):
     sharding_file_path = infos[0].parent_dir / _SHARDING
     sharding_file_exists = await async_utils.async_exists(sharding_file_path)
     for info, arg in zip(infos, args):
-      sharding = None
       arg = cast(ArrayRestoreArgs, arg)
-      if (
-          isinstance(arg, ArrayRestoreArgs)
-          and arg.mesh is not None
-          and arg.mesh_axes is not None
-      ):
-        sharding = NamedSharding(arg.mesh, arg.mesh_axes)
-      elif isinstance(arg, ArrayRestoreArgs) and arg.sharding is not None:
-        if isinstance(arg.sharding, ShardingMetadata):
-          sharding = arg.sharding.to_jax_sharding()
-        else:
-          sharding = arg.sharding
-      elif sharding_file_exists:
-        warnings.warn(
-            'Sharding info not provided when restoring. Populating sharding'
-            ' info from sharding file. Please note restoration time will be'
-            ' slightly increased due to reading from file. Note also that this'
-            ' option is unsafe when restoring on a different topology than the'
-            ' checkpoint was saved with.'
-        )
-        assert info.parent_dir is not None
-        if info.name:
-          tspec_sharding = get_sharding_tensorstore_spec(
-              info.parent_dir.as_posix(), info.name
-          )
-          t = await ts.open(
-              tspec_sharding,
-              # OCDBT is not used for sharding metadata.
-              context=info.ts_context,
-              open=True,
-              read=True,
-          )
-          serialized_string = await t.read()
-          if serialized_string:
-            sharding = sharding_metadata.get_sharding_or_none(serialized_string)
-        else:
-          raise ValueError('Unable to deserialize sharding.')
-      else:
-        raise ValueError(
-            'Sharding of jax.Array cannot be None. Provide `mesh`'
-            ' and `mesh_axes` OR `sharding`'
-        )
+      sharding = await self._get_restore_sharding(
+          info, arg, sharding_file_exists
+      )
       if not info.is_ocdbt_checkpoint:
         await _assert_parameter_files_exist(
             info.path,
@@ -1302,6 +1395,7 @@ class ArrayHandler(types.TypeHandler):
               byte_limiter=info.byte_limiter,
               context=info.ts_context,
               strict=arg.strict if hasattr(arg, 'strict') else True,
+              host_buffer_pool=self._host_buffer_pool,
           )
       ]
 
@@ -1332,6 +1426,77 @@ class ArrayHandler(types.TypeHandler):
 
     return ret  # pytype: disable=bad-return-type
 
+  async def prefetch(
+      self,
+      infos: Sequence[types.ParamInfo],
+      args: Sequence[RestoreArgs],
+      *,
+      max_bytes: Optional[int] = None,
+  ) -> int:
+    """Reads the local shards of arrays, as `deserialize` would, and drops them.
+
+    Only useful if `infos` use a TensorStore context that caches chunks, see
+    `ts_utils.get_ts_context(chunk_cache_bytes=...)`. A later `deserialize`
+    with the same arguments and context then reads from host memory.
+
+    Args:
+      infos: ParamInfo.
+      args: must be of type `ArrayRestoreArgs`.
+      max_bytes: If provided, arrays are prefetched in order, skipping arrays
+        that would exceed this many bytes in total.
+
+    Returns:
+      The number of bytes prefetched.
+    """
+    check_input_arguments(infos, args)
+    if infos[0].parent_dir is None:
+      raise ValueError('parent_dir cannot be None')
+    sharding_file_exists = await async_utils.async_exists(
+        infos[0].parent_dir / _SHARDING
+    )
+
+    async def _open(info: types.ParamInfo, arg: ArrayRestoreArgs):
+      sharding = await self._get_restore_sharding(
+          info, arg, sharding_file_exists
+      )
+      if isinstance(sharding, Layout):
+        sharding = sharding.sharding
+      tspec = self._get_json_tspec_read(
+          info, use_ocdbt=info.is_ocdbt_checkpoint
+      )
+      tspec = get_cast_tspec_deserialize(tspec, arg)
+      t = await ts_utils.open_tensorstore(tspec, context=info.ts_context)
+      global_shape = getattr(arg, 'global_shape', None)
+      global_shape = tuple(t.shape if global_shape is None else global_shape)
+      return t, serialization.local_read_domains(
+          t,
+          global_shape=global_shape,
+          sharding=sharding,
+          strict=getattr(arg, 'strict', True),
+      )
+
+    opened = await asyncio.gather(*(
+        _open(info, cast(ArrayRestoreArgs, arg))
+        for info, arg in zip(infos, args)
+    ))
+    prefetch_ops = []
+    remaining_bytes = max_bytes
+    for info, (t, domains) in zip(infos, opened):
+      if remaining_bytes is not None:
+        num_bytes = sum(
+            serialization.estimate_read_memory_footprint(t, domain)
+            for domain in domains
+        )
+        if num_bytes > remaining_bytes:
+          continue
+        remaining_bytes -= num_bytes
+      prefetch_ops.append(
+          serialization.async_prefetch_domains(
+              t, domains, byte_limiter=info.byte_limiter
+          )
+      )
+    return sum(await asyncio.gather(*prefetch_ops))
+
   def memory_size(
       self, values: Sequence[jax.Array]
   ) -> Sequence[Tuple[int, int]]:
@@ -1525,6 +1690,7 @@ class SingleReplicaArrayHandler(ArrayHandler):
                 else None,
                 byte_limiter=info.byte_limiter,
                 context=info.ts_context,
+                host_buffer_pool=self._host_buffer_pool,
             )
         ]
 
@@ -1566,6 +1732,7 @@ class SingleReplicaArrayHandler(ArrayHandler):
         _is_host_for_primary_replica(primary_replica_pids),
         memory_limit_bytes=self.broadcast_memory_limit_bytes,
         memory_scaling_factor=self.broadcast_memory_scaling_factor,
+        source_replica_id=self.primary_replica_id,
     )
     broadcast_elapsed_s = time.time() - start_broadcast
     jax.monitoring.record_event_duration_secs(
@@ -1739,6 +1906,9 @@ class _TypeHandlerRegistryImpl(types.TypeHandlerRegistry):
         Tuple[Callable[[Any], bool], types.TypeHandler]
     ] = []
     self._typestr_registry: Dict[str, types.TypeHandler] = {}
+    # Results of `get` by type, since trees typically have many leaves of the
+    # same few types. Cleared whenever a handler is added.
+    self._type_lookup_cache: Dict[Any, types.TypeHandler] = {}
     if handlers:
       for ty, h in handlers:
         self.add(ty, h, override=True, ignore_warnings=True)
@@ -1753,6 +1923,7 @@ class _TypeHandlerRegistryImpl(types.TypeHandlerRegistry):
   ):
     if func is None:
       func = lambda t: issubclass(t, ty)
+    self._type_lookup_cache.clear()
 
     existing_handler_idx = None
     for i, (f, _) in enumerate(self._type_registry):
@@ -1795,8 +1966,16 @@ class _TypeHandlerRegistryImpl(types.TypeHandlerRegistry):
       if ty in self._typestr_registry:
         return self._typestr_registry[ty]
     else:
+      try:
+        return self._type_lookup_cache[ty]
+      except (KeyError, TypeError):  # TypeError: `ty` is not hashable.
+        pass
       for func, handler in self._type_registry:
         if func(ty):
+          try:
+            self._type_lookup_cache[ty] = handler
+          except TypeError:
+            pass
           return handler
     raise ValueError(f'Unknown type: "{ty}". Must register a TypeHandler.')
 
@@ -119,6 +119,9 @@ class ParamInfo:
     from tree metadata and should be the same across all parameters.
   write_shape:
     Shape of the array shard. Used in the subchunking context.
+  ocdbt_read_coalescing_options:
+    Read coalescing options added to the OCDBT KvStore spec, see
+    `tensorstore_utils.build_kvstore_tspec`. If None, the defaults are used.
   """
 
   name: Optional[str] = None
@@ -134,6 +137,7 @@ class ParamInfo:
   enable_pinned_host_transfer: bool = False
   raise_array_data_missing_error: bool = True
   write_shape: arrays_types.Shape | None = None
+  ocdbt_read_coalescing_options: dict[str, Any] | None = None
 
 
 @dataclasses.dataclass
@@ -0,0 +1,198 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks `multislice.broadcast_one_replica_to_all`.
+
+Compares broadcasting by summing over replicas, to which the other replicas
+contribute zeros, with broadcasting from the source replica by collective
+permutes. For each number of replicas, reports the duration of a broadcast,
+the bytes of the zero-filled inputs of the other replicas, the peak bytes per
+device of the compiled broadcast, and the bytes sent per device: a ring
+all-reduce sends 2(N-1)/N times the data, whereas each of the N-1 replicas
+receives the data from the source replica exactly once.
+
+Runs on CPU by simulating devices::
+
+  XLA_FLAGS=--xla_force_host_platform_device_count=8 \
+      python -m orbax.checkpoint._src.testing.benchmarks.broadcast_benchmark \
+      --num_replicas=2,4,8
+"""
+
+import functools
+import time
+from typing import Sequence
+
+from absl import app
+from absl import flags
+import jax
+from jax.experimental import shard_map
+import numpy as np
+from orbax.checkpoint._src.multihost import multislice
+
+
+_NUM_REPLICAS = flags.DEFINE_list(
+    'num_replicas',
+    ['2', '4', '8'],
+    'Numbers of replicas to benchmark, each dividing the number of devices.',
+)
+_NUM_ARRAYS = flags.DEFINE_integer(
+    'num_arrays', 8, 'Number of arrays to broadcast.'
+)
+_ARRAY_MB = flags.DEFINE_integer('array_mb', 16, 'Size of each array in MB.')
+_NUM_REPEATS = flags.DEFINE_integer(
+    'num_repeats', 5, 'Number of timed broadcasts.'
+)
+
+_SOURCE_REPLICA_ID = 0
+
+
+def _mesh(num_replicas: int) -> jax.sharding.Mesh:
+  devices = np.asarray(jax.devices()).reshape(num_replicas, -1)
+  return jax.sharding.Mesh(devices, ('replica', 'model'))
+
+
+def _in_tree(
+    mesh: jax.sharding.Mesh, zero_filled: bool
+) -> tuple[jax.Array, ...]:
+  """Returns arrays holding data on the source replica only.
+
+  All replicas are addressable in a single process, so the arrays are sharded
+  over the whole mesh, each replica holding its own copy, as each slice would.
+
+  Args:
+    mesh: global mesh.
+    zero_filled: whether the other replicas hold zeros, as is required when
+      broadcasting by summing over replicas.
+  """
+  sharding = jax.sharding.NamedSharding(
+      mesh, jax.sharding.PartitionSpec('model')
+  )
+  shape = (_ARRAY_MB.value * 2**18 // mesh.shape['model'] * mesh.shape['model'],)
+  data = np.ones(shape, np.float32)
+  zeros = np.zeros(shape, np.float32)
+  source_devices = set(mesh.devices[_SOURCE_REPLICA_ID].flat)
+
+  def _array():
+    shards = [
+        jax.device_put(
+            (data if device in source_devices or not zero_filled else zeros)[
+                index
+            ],
+            device,
+        )
+        for device, index in sharding.addressable_devices_indices_map(
+            shape
+        ).items()
+    ]
+    return jax.make_array_from_single_device_arrays(shape, sharding, shards)
+
+  return tuple(_array() for _ in range(_NUM_ARRAYS.value))
+
+
+def _peak_bytes(mesh: jax.sharding.Mesh, use_source_replica: bool) -> int:
+  """Returns the peak bytes per device to broadcast one array."""
+  size = _ARRAY_MB.value * 2**18
+  if use_source_replica:
+    spec = jax.sharding.PartitionSpec('model')
+    fn = shard_map.shard_map(
+        functools.partial(
+            multislice._broadcast_from_replica,  # pylint: disable=protected-access
+            source=_SOURCE_REPLICA_ID,
+            num_replicas=mesh.shape['replica'],
+            replica_axis_name='replica',
+        ),
+        mesh=mesh,
+        in_specs=spec,
+        out_specs=spec,
+        check_rep=False,
+    )
+    arg = jax.ShapeDtypeStruct(
+        (size,), np.float32, sharding=jax.sharding.NamedSharding(mesh, spec)
+    )
+    fn = jax.jit(fn, donate_argnums=0)
+  else:
+    arg = jax.ShapeDtypeStruct(
+        (mesh.shape['replica'], size),
+        np.float32,
+        sharding=jax.sharding.NamedSharding(
+            mesh, jax.sharding.PartitionSpec('replica', 'model')
+        ),
+    )
+    fn = jax.jit(functools.partial(jax.numpy.sum, axis=0))
+  memory = fn.lower(arg).compile().memory_analysis()
+  return (
+      memory.argument_size_in_bytes
+      + memory.output_size_in_bytes
+      + memory.temp_size_in_bytes
+      - memory.alias_size_in_bytes
+  )
+
+
+def benchmark(num_replicas: int, use_source_replica: bool) -> dict[str, float]:
+  """Returns statistics of broadcasts among `num_replicas` replicas."""
+  mesh = _mesh(num_replicas)
+  source_replica_id = _SOURCE_REPLICA_ID if use_source_replica else None
+  durations = []
+  for _ in range(_NUM_REPEATS.value + 1):
+    in_tree = _in_tree(mesh, zero_filled=not use_source_replica)
+    bytes_per_device = multislice.tree_memory_per_device(in_tree)
+    start = time.perf_counter()
+    out_tree, _ = multislice.broadcast_one_replica_to_all(
+        in_tree,
+        mesh,
+        replica_axis_index=0,
+        is_source=True,
+        memory_limit_bytes=bytes_per_device,
+        source_replica_id=source_replica_id,
+    )
+    durations.append(time.perf_counter() - start)
+    np.testing.assert_array_equal(np.asarray(out_tree[0]), 1)
+    jax.tree.map(lambda x: x.delete(), out_tree)
+  if use_source_replica:
+    zero_bytes = 0
+    sent_bytes = bytes_per_device * (num_replicas - 1) / num_replicas
+  else:
+    zero_bytes = bytes_per_device * (num_replicas - 1) * mesh.shape['model']
+    sent_bytes = bytes_per_device * 2 * (num_replicas - 1) / num_replicas
+  return {
+      # The first broadcast includes compilation.
+      'duration': float(np.median(durations[1:])),
+      'zero_bytes': zero_bytes,
+      'peak_bytes': (
+          _peak_bytes(mesh, use_source_replica) * _NUM_ARRAYS.value
+      ),
+      'sent_bytes': sent_bytes,
+  }
+
+
+def main(argv: Sequence[str]) -> None:
+  del argv
+  print(
+      f'{"replicas":>10}{"path":>10}{"duration":>14}{"zero MB":>10}'
+      f'{"peak MB/dev":>14}{"sent MB/dev":>14}'
+  )
+  for num_replicas in map(int, _NUM_REPLICAS.value):
+    for use_source_replica, path in ((False, 'sum'), (True, 'permute')):
+      stats = benchmark(num_replicas, use_source_replica)
+      print(
+          f'{num_replicas:>10}{path:>10}'
+          f'{1e3 * stats["duration"]:>12.1f}ms'
+          f'{stats["zero_bytes"] / 2**20:>10.0f}'
+          f'{stats["peak_bytes"] / 2**20:>14.1f}'
+          f'{stats["sent_bytes"] / 2**20:>14.1f}'
+      )
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -0,0 +1,105 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Benchmarks the retention decision made by CheckpointManager on each save.
+
+Simulates a long run that tracks many checkpoints: the steps of the run so far
+are preserved, e.g. by `keep_period`, and the `max_to_keep` best steps by a
+metric are kept among new steps. For each number of tracked steps, reports the
+time taken per save to decide which steps to remove, both incrementally and
+when recomputing from all tracked steps.
+
+Usage::
+
+  python -m orbax.checkpoint._src.testing.benchmarks.retention_benchmark \
+      --num_steps=10000,100000
+"""
+
+import datetime
+import random
+import time
+from typing import Sequence
+
+from absl import app
+from absl import flags
+from orbax.checkpoint._src.checkpoint_managers import retention_tracker
+from orbax.checkpoint._src.metadata import checkpoint_info
+
+
+_NUM_STEPS = flags.DEFINE_list(
+    'num_steps',
+    ['10000', '100000'],
+    'Number of tracked steps to benchmark.',
+)
+_MAX_TO_KEEP = flags.DEFINE_integer(
+    'max_to_keep', 5, 'Number of best steps to keep.'
+)
+_NUM_SAVES = flags.DEFINE_integer(
+    'num_saves',
+    100,
+    'Number of timed saves once the steps are tracked.',
+)
+
+_START_TIME = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _info(step: int, rng: random.Random) -> checkpoint_info.CheckpointInfo:
+  return checkpoint_info.CheckpointInfo(
+      step=step,
+      time=_START_TIME + datetime.timedelta(seconds=step),
+      metrics={'loss': rng.random()},
+  )
+
+
+def benchmark(num_steps: int) -> dict[str, float]:
+  """Returns the duration in seconds per save with `num_steps` tracked."""
+  rng = random.Random(0)
+  tracker = retention_tracker.RetentionTracker(
+      max_to_keep=_MAX_TO_KEEP.value,
+      should_keep_fn=lambda step: step < num_steps,
+      best_fn=lambda metrics: metrics['loss'],
+      best_mode='min',
+  )
+  tracker.reset(_info(step, rng) for step in range(num_steps))
+
+  start = time.perf_counter()
+  for step in range(num_steps, num_steps + _NUM_SAVES.value):
+    tracker.add(_info(step, rng))
+    tracker.remove(tracker.steps_to_remove())
+  incremental = (time.perf_counter() - start) / _NUM_SAVES.value
+
+  infos = list(tracker._infos.values())  # pylint: disable=protected-access
+  start = time.perf_counter()
+  num_rebuilds = max(1, _NUM_SAVES.value // 10)
+  for _ in range(num_rebuilds):
+    tracker.reset(infos)
+    tracker.steps_to_remove()
+  rebuild = (time.perf_counter() - start) / num_rebuilds
+  return {'incremental': incremental, 'rebuild': rebuild}
+
+
+def main(argv: Sequence[str]) -> None:
+  del argv
+  print(f'{"steps":>10}{"incremental":>16}{"rebuild":>16}')
+  for num_steps in map(int, _NUM_STEPS.value):
+    durations = benchmark(num_steps)
+    print(
+        f'{num_steps:>10}'
+        f'{1e3 * durations["incremental"]:>14.3f}ms'
+        f'{1e3 * durations["rebuild"]:>14.3f}ms'
+    )
+
+
+if __name__ == '__main__':
+  app.run(main)
@@ -36,10 +36,12 @@ from orbax.checkpoint import options as options_lib
 from orbax.checkpoint import utils
 from orbax.checkpoint._src import threading as threading_lib
 from orbax.checkpoint._src.checkpoint_managers import policy_checkpoint_info
+from orbax.checkpoint._src.checkpoint_managers import retention_tracker
 from orbax.checkpoint._src.checkpoint_managers import save_decision_policy as save_decision_policy_lib
 from orbax.checkpoint._src.checkpointers import abstract_checkpointer
 from orbax.checkpoint._src.checkpointers import async_checkpointer
 from orbax.checkpoint._src.checkpointers import checkpointer as checkpointer_lib
+from orbax.checkpoint._src.futures import future
 from orbax.checkpoint._src.handlers import checkpoint_handler
 from orbax.checkpoint._src.handlers import composite_checkpoint_handler
 from orbax.checkpoint._src.handlers import handler_registration
@@ -48,8 +50,10 @@ from orbax.checkpoint._src.handlers import proto_checkpoint_handler
 from orbax.checkpoint._src.logging import abstract_logger
 from orbax.checkpoint._src.logging import standard_logger
 from orbax.checkpoint._src.logging import step_statistics
+from orbax.checkpoint._src.logging import tracing
 from orbax.checkpoint._src.metadata import checkpoint
 from orbax.checkpoint._src.metadata import checkpoint_info
+from orbax.checkpoint._src.metadata import step_index as step_index_lib
 from orbax.checkpoint._src.metadata import root_metadata_serialization
 from orbax.checkpoint._src.metadata import step_metadata_serialization
 from orbax.checkpoint._src.multihost import multihost
@@ -142,6 +146,10 @@ class _FinalizeThread(threading.Thread):
   def step(self) -> int:
     return self._step
 
+  def wait(self):
+    """Waits for the thread to finish, without raising its exception."""
+    super().join()
+
   def run(self):
     try:
       super().run()
@@ -293,6 +301,22 @@ class CheckpointManagerOptions:
     background thread, otherwise, it will be done at the end of each save.  When
     it's enabled, make sure to call CheckpointManager.close() or use context to
     make sure all old steps are deleted before exit.
+  delete_max_workers: Number of threads used to delete checkpoints. If greater
+    than 1, the files of deleted checkpoints are deleted concurrently, which is
+    much faster on object stores and network file systems. Ignored if
+    checkpoints are renamed into `todelete_subdir`.
+  enable_distributed_delete: If True, the files of deleted checkpoints are
+    partitioned across all processes, each deleting its share with
+    `delete_max_workers` threads, instead of being deleted by the primary host
+    only. All processes list the deleted checkpoints. Not supported with
+    `enable_background_delete`.
+  enable_step_index: If True, the steps, commit timestamps and metrics of
+    checkpoints are recorded in an index file in the root metadata directory.
+    On creation and `reload()`, the index is trusted if it is consistent with
+    a listing of the root directory, avoiding reads from every step.
+    Otherwise, the steps are found as usual, reading only the steps that are
+    missing from the index, and the index is rebuilt. Not used with
+    `single_host_load_and_broadcast`.
   read_only: If True, then checkpoints save and delete are skipped. However,
     checkpoints restore works as usual.
   enable_async_checkpointing:
@@ -339,6 +363,9 @@ class CheckpointManagerOptions:
   single_host_load_and_broadcast: bool = False
   todelete_subdir: Optional[str] = None
   enable_background_delete: bool = False
+  delete_max_workers: int = 1
+  enable_distributed_delete: bool = False
+  enable_step_index: bool = False
   read_only: bool = False
   enable_async_checkpointing: bool = True
   async_options: Optional[AsyncOptions] = None
@@ -384,6 +411,13 @@ class CheckpointManagerOptions:
       raise ValueError(msg)
     if self.max_to_keep is not None and self.max_to_keep < 0:
       raise ValueError('Setting of `max_to_keep` must be None or non-negative.')
+    if self.delete_max_workers < 1:
+      raise ValueError('Setting of `delete_max_workers` must be positive.')
+    if self.enable_distributed_delete and self.enable_background_delete:
+      raise ValueError(
+          '`enable_distributed_delete` is not supported with'
+          ' `enable_background_delete`.'
+      )
     if self.read_only and self.save_interval_steps > 0:
       self.save_interval_steps = 0
       logging.warning(
@@ -768,11 +802,30 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
         )
     )
 
-    self._checkpoints = checkpoint_info.CheckpointInfos(
-        self._load_checkpoint_infos()
+    self._metadata_dir = self.directory / METADATA_ITEM_NAME
+    self._step_index = (
+        step_index_lib.StepIndex(
+            step_index_lib.step_index_file_path(self._metadata_dir)
+        )
+        if self._options.enable_step_index
+        and not self._options.single_host_load_and_broadcast
+        else None
+    )
+
+    self._retention_tracker = retention_tracker.RetentionTracker(
+        max_to_keep=self._options.max_to_keep,
+        keep_time_interval=self._options.keep_time_interval,
+        keep_period=self._options.keep_period,
+        should_keep_fn=self._options.should_keep_fn,
+        best_fn=self._options.best_fn,
+        best_mode=self._options.best_mode,
+        keep_checkpoints_without_metrics=(
+            self._options.keep_checkpoints_without_metrics
+        ),
     )
+    self._checkpoints = checkpoint_info.CheckpointInfos()
+    self._set_checkpoint_infos(self._load_checkpoint_infos())
 
-    self._metadata_dir = self.directory / METADATA_ITEM_NAME
     if self._options.read_only and not self._metadata_dir.exists():
       custom_metadata = {} if metadata is None else dict(metadata)
     else:
@@ -786,7 +839,11 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     self._maybe_save_root_metadata(metadata)
 
     # TODO: b/359854428 - Move Finalize biz logic to a separate class/module.
-    self._finalize_thread = threading_lib.OptionalRef[_FinalizeThread]()
+    # Save Finalize threads which have not been joined, in the order in which
+    # they were started. Only the last one may be alive, unless
+    # `AsyncOptions.max_in_flight_saves` is greater than 1.
+    self._finalize_threads: list[_FinalizeThread] = []
+    self._finalize_threads_lock = threading.Lock()
 
     self._checkpoint_deleter: deleter.CheckpointDeleter = (
         deleter.create_checkpoint_deleter(
@@ -795,6 +852,15 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
             self._options.todelete_subdir,
             self._step_name_format,
             self._options.enable_background_delete,
+            max_workers=self._options.delete_max_workers,
+            barrier_sync_fn=(
+                self._create_thread_safe_barrier_sync_fn()
+                if self._options.enable_distributed_delete
+                else None
+            ),
+            barrier_sync_key_prefix=(
+                self._multiprocessing_options.barrier_sync_key_prefix
+            ),
         )
     )
 
@@ -1043,7 +1109,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
       logging.warning(
           '`read` option is deprecated. Use `reload` to read from disk.'
       )
-      self._checkpoints.set(self._load_checkpoint_infos())
+      self._set_checkpoint_infos(self._load_checkpoint_infos())
     return [ckpt.step for ckpt in self._checkpoints]
 
   def latest_step(self) -> Optional[int]:
@@ -1067,12 +1133,8 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     """
     if not self._track_best:
       return self.latest_step()
-    if self._checkpoints.empty():
-      return None
-    _, sorted_checkpoints = self._sort_checkpoints_by_metrics(self._checkpoints)
-    if not sorted_checkpoints:
-      return None
-    return sorted_checkpoints[-1].step
+    self._maybe_reset_retention_tracker()
+    return self._retention_tracker.best_step()
 
   def reload(self):
     """Reloads internal properties.
@@ -1080,7 +1142,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     Resets internal cache of checkpoint steps, in case the directory managed
     by this object has been updated externally.
     """
-    self._checkpoints.set(self._load_checkpoint_infos())
+    self._set_checkpoint_infos(self._load_checkpoint_infos())
 
   def reached_preemption(self, step: int) -> bool:
     """Returns True if a preemption sync point has been reached."""
@@ -1164,6 +1226,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
           f'Requested deleting a non-existent step: {step}.'
       )
     self._checkpoint_deleter.delete(step)
+    self._update_step_index(deleted_steps=[step])
     multihost.sync_global_processes(
         multihost.unique_barrier_key(
             'CheckpointManager:deleted_step',
@@ -1173,7 +1236,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
         timeout=multihost.DIRECTORY_DELETION_TIMEOUT,
         processes=self._multiprocessing_options.active_processes,
     )
-    self._checkpoints.delete_if(lambda info: info.step == step)
+    self._remove_checkpoint_infos([step])
 
   def _validate_args(
       self,
@@ -1312,7 +1375,10 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     # checkpointers are AsyncCheckpointers.
     # Must happen after `should_save` to avoid blocking callers.
     step_stats.wait_for_prev_start_time = time.time()
-    self.wait_until_finished()
+    if self._overlaps_saves():
+      self._wait_for_save_capacity()
+    else:
+      self.wait_until_finished()
     step_stats.wait_for_prev_duration_secs = (
         time.time() - step_stats.wait_for_prev_start_time
     )
@@ -1321,6 +1387,12 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
         '/jax/checkpoint/write/wait_for_prev_duration_secs',
         step_stats.wait_for_prev_duration_secs,
     )
+    tracing.record(
+        'CheckpointManager.wait_for_previous_save',
+        step_stats.wait_for_prev_start_time,
+        time.time(),
+        step=step,
+    )
 
     if step in self.all_steps():
       raise StepAlreadyExistsError(
@@ -1396,6 +1468,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
             self._options.todelete_subdir,
             self._step_name_format,
             enable_background_delete=False,  # no background thread
+            max_workers=self._options.delete_max_workers,
         ).delete(step)
       multihost.sync_global_processes(
           multihost.unique_barrier_key(
@@ -1409,7 +1482,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
         '[process=%s] Saving checkpoint at step %d', process_index, step
     )
     step_stats.checkpointer_blocking_start_time = time.time()
-    self._checkpointer.save(
+    commit_future = self._checkpointer.save(
         save_directory, args=args, custom_metadata=custom_metadata
     )
     step_stats.checkpointer_blocking_duration_secs = (
@@ -1428,7 +1501,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
         step_stats.get_old_steps_duration_secs,
     )
 
-    self._checkpoints.delete_if(lambda info: info.step in steps_to_remove)
+    self._remove_checkpoint_infos(steps_to_remove)
     # Sync needed to ensure that old steps to remove are retrieved before
     # actually deleting them during finalize, since retrieval can involve
     # looking at the directory.
@@ -1444,10 +1517,14 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     current_thread = threading.current_thread()
     if is_async_checkpointer(self._checkpointer):
 
-      def launch_finalize_thread() -> _FinalizeThread:
-        assert not self.is_saving_in_progress(), (
+      overlaps_saves = self._overlaps_saves()
+      with self._finalize_threads_lock:
+        previous = (
+            self._finalize_threads[-1] if self._finalize_threads else None
+        )
+        assert overlaps_saves or previous is None or not previous.is_alive(), (
             'Save finalization already in progress for'
-            f' step={self._finalize_thread.get_not_none().step()}'
+            f' step={previous.step()}'
         )
         finalize_thread_name = 'save_finalize'
         logging.info(
@@ -1463,11 +1540,14 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
             name=finalize_thread_name,
             target=self._finalize,
             args=(step, steps_to_remove),
+            kwargs=(
+                dict(commit_future=commit_future, previous=previous)
+                if overlaps_saves
+                else None
+            ),
         )
         finalize_thread.start()
-        return finalize_thread
-
-      self._finalize_thread.set_from(launch_finalize_thread)
+        self._finalize_threads.append(finalize_thread)
 
     else:
       self._finalize(step, steps_to_remove)
@@ -1482,6 +1562,12 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     step_stats.checkpoint_manager_blocking_duration_secs = (
         time.time() - step_stats.checkpoint_manager_blocking_start_time
     )
+    tracing.record(
+        'CheckpointManager.save',
+        step_stats.checkpoint_manager_blocking_start_time,
+        time.time(),
+        step=step,
+    )
     self._logger.log_entry(dataclasses.asdict(step_stats))
     return True
 
@@ -1613,10 +1699,55 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     step_stats.checkpoint_manager_duration_secs = (
         time.time() - step_stats.checkpoint_manager_start_time
     )
+    tracing.record(
+        'CheckpointManager.restore',
+        step_stats.checkpoint_manager_start_time,
+        time.time(),
+        step=step,
+    )
     self._logger.log_entry(dataclasses.asdict(step_stats))
 
     return self._maybe_get_default_item(restored)
 
+  def prefetch(
+      self,
+      step: int,
+      args: Optional[args_lib.CheckpointArgs] = None,
+      directory: Optional[epath.PathLike] = None,
+  ) -> int:
+    """Reads the given step into host memory ahead of `restore`.
+
+    Only items whose handlers were created with a chunk cache (e.g.
+    `StandardCheckpointHandler(chunk_cache_bytes=...)`) are prefetched. A later
+    call to `restore` with the same `args` then reads from host memory.
+
+    Unlike `restore`, this method does not synchronize processes, and may be
+    called from a background thread. See `RestorePrefetcher`.
+
+    Args:
+      step: The step to prefetch.
+      args: `CheckpointArgs`, as passed to `restore`. When managing multiple
+        items, only the items in `args` are prefetched.
+      directory: if provided, uses the given directory rather than the
+        `directory` property of this class.
+
+    Returns:
+      The number of bytes prefetched on this host.
+    """
+    directory = epath.Path(directory or self.directory)
+    restore_directory = self._get_read_step_directory(step, directory)
+    self._default_item.set_if_none(
+        _determine_default_item_mode_from_directory(restore_directory)
+    )
+    self._validate_args(None, args)
+    if self._default_item.get():
+      args = args_lib.Composite(**{DEFAULT_ITEM_NAME: args})
+    elif args is None:
+      args = args_lib.Composite()
+    if not isinstance(self._checkpointer, checkpointer_lib.Checkpointer):
+      return 0
+    return self._checkpointer.prefetch(restore_directory, args=args)
+
   def item_metadata(
       self, step: int
   ) -> Union[Any, args_lib.Composite, ItemMetadata]:
@@ -1680,9 +1811,37 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
           f'Checkpoint root directory {self.directory} does not exist.'
       )
     start = time.time()
+    indexed_infos = self._step_index.read() if self._step_index else None
+    checkpoint_infos = (
+        None
+        if indexed_infos is None
+        else self._checkpoint_infos_from_step_index(indexed_infos)
+    )
+    if checkpoint_infos is not None:
+      logging.info(
+          'Found %d checkpoint steps in step index of %s',
+          len(checkpoint_infos),
+          self.directory,
+      )
+      removed_steps = {info.step for info in indexed_infos} - {
+          info.step for info in checkpoint_infos
+      }
+      if removed_steps or self._step_index.should_compact(
+          len(checkpoint_infos)
+      ):
+        self._write_step_index(checkpoint_infos)
+      jax.monitoring.record_event_duration_secs(
+          '/jax/checkpoint/read/load_all_step_metadata_duration_secs',
+          time.time() - start,
+      )
+      return checkpoint_infos
+
     step_metadatas = self._step_name_format.find_all(self.directory)
+    indexed_infos_by_step = {info.step: info for info in indexed_infos or []}
 
     def build_checkpoint_info(step_metadata):
+      if (info := indexed_infos_by_step.get(step_metadata.step)) is not None:
+        return info
       return CheckpointInfo(
           step=step_metadata.step,
           time=step_metadata.commit_timestamp,
@@ -1703,30 +1862,156 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
           len(checkpoint_infos),
           self.directory,
       )
-      return checkpoint_infos
+    if self._step_index is not None:
+      self._write_step_index(checkpoint_infos)
+    return checkpoint_infos
 
-  def _get_interval_preserved_checkpoints(
-      self, checkpoints: checkpoint_info.CheckpointInfos
-  ) -> List[CheckpointInfo]:
-    """Gets which checkpoints should be kept based on keep_time_interval."""
-    if checkpoints.empty():
-      return []
-    interval_preserved_checkpoints = [checkpoints[0]]
-    if self._options.keep_time_interval is not None:
-      for info in checkpoints[1:]:
-        if info.time >= (
-            interval_preserved_checkpoints[-1].time
-            + self._options.keep_time_interval
-        ):
-          interval_preserved_checkpoints.append(info)
-    return interval_preserved_checkpoints
+  def _checkpoint_infos_from_step_index(
+      self, indexed_infos: List[CheckpointInfo]
+  ) -> Optional[List[CheckpointInfo]]:
+    """Returns the indexed steps if consistent with the root directory.
 
-  def _add_checkpoint_info(self, step: int, metrics: Optional[PyTree]):
-    self._checkpoints.append(
-        CheckpointInfo(
-            step, datetime.datetime.now(tz=datetime.timezone.utc), metrics
+    The root directory is listed once. Indexed steps that are not listed were
+    deleted, and are dropped. Listed names that are neither indexed steps nor
+    known non-step entries make the index inconsistent.
+
+    Args:
+      indexed_infos: `CheckpointInfo` read from the step index.
+
+    Returns:
+      The indexed steps that exist, or None if the index is inconsistent.
+    """
+    infos_by_name = {
+        self._step_name_format.build_name(info.step): info
+        for info in indexed_infos
+    }
+    ignored_names = {METADATA_ITEM_NAME, self._options.todelete_subdir}
+    step_prefix = step_lib.step_prefix_with_underscore(
+        self._options.step_prefix
+    )
+    found_names = set()
+    for path in self.directory.iterdir():
+      name = path.name
+      if name in infos_by_name:
+        found_names.add(name)
+      elif name in ignored_names or step_lib.TMP_DIR_SUFFIX in name:
+        continue
+      elif self._options.step_name_format is None and not name.startswith(
+          step_prefix
+      ):
+        continue
+      else:
+        logging.info(
+            'Step index of %s does not contain %s, finding steps.',
+            self.directory,
+            name,
+        )
+        return None
+    return [
+        info for name, info in infos_by_name.items() if name in found_names
+    ]
+
+  def _write_step_index(self, checkpoint_infos: Sequence[CheckpointInfo]):
+    """Replaces the step index with `checkpoint_infos` on the primary host."""
+    if self._options.read_only or not utils.is_primary_host(
+        self._multiprocessing_options.primary_host
+    ):
+      return
+    try:
+      self._step_index.write(checkpoint_infos)
+    except (OSError, TypeError, ValueError):
+      logging.warning(
+          'Failed to write step index %s.', self._step_index.path, exc_info=True
+      )
+
+  def _update_step_index(
+      self,
+      *,
+      added_step: Optional[int] = None,
+      deleted_steps: Sequence[int] = (),
+  ):
+    """Records added and deleted steps in the step index on the primary host.
+
+    Failures are logged and leave the index inconsistent, so that it is rebuilt
+    when next loaded.
+
+    Args:
+      added_step: A newly committed step. Ignored if the step is not found,
+        e.g. because its finalization failed.
+      deleted_steps: Deleted steps.
+    """
+    if (
+        self._step_index is None
+        or self._options.read_only
+        or not utils.is_primary_host(self._multiprocessing_options.primary_host)
+    ):
+      return
+    try:
+      if added_step is not None:
+        step_metadata = step_lib.maybe_find_step_metadata(
+            self.directory, self._step_name_format, step=added_step
+        )
+        info = next(
+            (info for info in self._checkpoints if info.step == added_step),
+            None,
         )
+        if step_metadata is not None and info is not None:
+          self._step_index.add(
+              CheckpointInfo(
+                  step=added_step,
+                  time=step_metadata.commit_timestamp,
+                  metrics=info.metrics,
+              )
+          )
+      self._step_index.delete(deleted_steps)
+      if self._step_index.should_compact(self._checkpoints.size()):
+        # Steps still being saved are added once they are committed.
+        steps_in_progress = self._steps_in_progress()
+        self._step_index.write([
+            info
+            for info in self._checkpoints
+            if info.step not in steps_in_progress
+        ])
+    except (OSError, TypeError, ValueError):
+      logging.warning(
+          'Failed to update step index %s.',
+          self._step_index.path,
+          exc_info=True,
+      )
+
+  def _steps_in_progress(self) -> set[int]:
+    """Returns steps saved by other Save Finalize threads which are alive."""
+    current_thread = threading.current_thread()
+    with self._finalize_threads_lock:
+      return {
+          t.step()
+          for t in self._finalize_threads
+          if t.is_alive() and t is not current_thread
+      }
+
+  def _set_checkpoint_infos(self, checkpoint_infos: List[CheckpointInfo]):
+    """Replaces the tracked checkpoints."""
+    self._checkpoints.set(checkpoint_infos)
+    self._retention_tracker.reset(checkpoint_infos)
+
+  def _remove_checkpoint_infos(self, steps: Sequence[int]):
+    """Stops tracking `steps`."""
+    steps = set(steps)
+    self._checkpoints.delete_if(lambda info: info.step in steps)
+    self._retention_tracker.remove(steps)
+
+  def _maybe_reset_retention_tracker(self):
+    # `self._checkpoints` may have been updated without the tracker, e.g. by a
+    # subclass.
+    if len(self._retention_tracker) != self._checkpoints.size():
+      self._retention_tracker.reset(self._checkpoints)
+
+  def _add_checkpoint_info(self, step: int, metrics: Optional[PyTree]):
+    info = CheckpointInfo(
+        step, datetime.datetime.now(tz=datetime.timezone.utc), metrics
     )
+    self._checkpoints.append(info)
+    self._retention_tracker.add(info)
 
   def _root_metadata_file_path(self, legacy: bool = False) -> epath.Path:
     if not self._metadata_dir.exists():
@@ -1834,29 +2119,6 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
       return self._get_step_metadata(step)
     return self._get_root_metadata()
 
-  def _sort_checkpoints_by_metrics(
-      self, checkpoints: checkpoint_info.CheckpointInfos
-  ) -> Tuple[List[CheckpointInfo], List[CheckpointInfo]]:
-    """Sorts `checkpoints` in order of increasing metric quality.
-
-    Checkpoints without corresponding metrics set will be at the beginning.
-
-    Args:
-      checkpoints: CheckpointInfos to sort.
-
-    Returns:
-      Tuple of CheckpointInfo lists:
-      (checkpoints_without_metrics, checkpoints_sorted_by_metrics)
-    """
-    without_metrics = [info for info in checkpoints if info.metrics is None]
-    with_metrics = [info for info in checkpoints if info.metrics is not None]
-
-    return without_metrics, sorted(
-        with_metrics,
-        key=lambda info: self._options.best_fn(info.metrics),
-        reverse=(self._options.best_mode == 'min'),
-    )
-
   def _cleanup_tmp_directories(self):
     utils.cleanup_tmp_directories(
         self.directory,
@@ -1874,98 +2136,22 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     if self._checkpoints.size() <= self._options.max_to_keep:
       return []
 
+    self._maybe_reset_retention_tracker()
     # This isn't a duration but there isn't a general counter that we can use so
     # we abuse a duration metric to count the number of steps examined.
     jax.monitoring.record_event_duration_secs(
         '/jax/checkpoint/write/old_steps_examined_count',
-        self._checkpoints.size(),
+        self._retention_tracker.num_candidates,
     )
+    return self._retention_tracker.steps_to_remove()
 
-    if self._track_best:
-      # Best steps (to keep) are at the end, after sorting.
-      (
-          checkpoints_without_metrics,
-          sorted_checkpoints,
-      ) = self._sort_checkpoints_by_metrics(self._checkpoints)
-    else:
-      # checkpoints already sorted by ascending step
-      checkpoints_without_metrics = []
-      sorted_checkpoints = [info for info in self._checkpoints]
-
-    keep = int(self._options.max_to_keep)
-    if self._options.keep_checkpoints_without_metrics:
-      maybe_delete = (
-          sorted_checkpoints[:-keep] if keep > 0 else sorted_checkpoints
-      )
-      active_checkpoints = set(
-          checkpoints_without_metrics
-          + (sorted_checkpoints[-keep:] if keep > 0 else [])
-      )
-    else:
-      all_checkpoints = checkpoints_without_metrics + sorted_checkpoints
-      maybe_delete = all_checkpoints[:-keep] if keep > 0 else sorted_checkpoints
-      active_checkpoints = set(all_checkpoints[-keep:] if keep > 0 else [])
-
-    interval_preserved_checkpoints = self._get_interval_preserved_checkpoints(
-        self._checkpoints
-    )
-    kept_checkpoints = set()
-    for info in maybe_delete:
-      if (
-          self._options.keep_time_interval is not None
-          and interval_preserved_checkpoints
-      ):
-        if info in interval_preserved_checkpoints:
-          logging.info(
-              'Preserving %s: (Reason: older falling on keep_time_interval).',
-              info,
-          )
-          kept_checkpoints.add(info)
-          continue
-        elif info.time >= (
-            interval_preserved_checkpoints[-1].time
-            + self._options.keep_time_interval
-        ):
-          interval_preserved_checkpoints.append(info)
-          logging.info(
-              'Preserving %s: (Reason: latest falling on keep_time_interval).',
-              info,
-          )
-          kept_checkpoints.add(info)
-          continue
-      if (
-          self._options.should_keep_fn is not None
-          and self._options.should_keep_fn(info.step)
-      ):
-        logging.info(
-            'Preserving %s: (Reason: on should_keep_fn callback).', info
-        )
-        kept_checkpoints.add(info)
-        continue
-      if (
-          self._options.keep_period is not None
-          and info.step % self._options.keep_period == 0
-      ):
-        logging.info(
-            'Preserving %s: (Reason: on keep_period=%s).',
-            info,
-            self._options.keep_period,
-        )
-        kept_checkpoints.add(info)
-        continue
-
-    kept_checkpoints.update(active_checkpoints)
-
-    steps_to_remove = []
-    for info in self._checkpoints:
-      if info not in kept_checkpoints:
-        reason = 'worse metric' if self._track_best else 'old checkpoint'
-        logging.info('Deleting %s: (Reason: %s).', info, reason)
-        steps_to_remove.append(info.step)
-    return steps_to_remove
-
-  def _wait_for_checkpointers(self):
-    if is_async_checkpointer(self._checkpointer):
+  def _wait_for_checkpointers(
+      self, commit_future: Optional[future.Future] = None
+  ):
+    if commit_future is not None:
+      # Raises the error of this save only.
+      commit_future.result()
+    elif is_async_checkpointer(self._checkpointer):
       self._checkpointer.wait_until_finished()  # pytype: disable=attribute-error
 
   def wait_until_finished(self):
@@ -1978,22 +2164,36 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     If some checkpointers are of type AsyncCheckpointer, however, this method
     will wait until each of these checkpointers is finished.
     """
-    process_index = multihost.process_index()
-    current_thread = threading.current_thread()
-
-    if self._finalize_thread.map(
-        lambda t: t is None or (not t.is_alive() and t.exception is None)
+    with self._finalize_threads_lock:
+      finalize_threads = list(self._finalize_threads)
+    if all(
+        not t.is_alive() and t.exception is None for t in finalize_threads
     ):
       logging.info(
           '[process=%s][thread=%s][wait_until_finished] No Save Finalize'
           ' thread to wait for. Returning.',
-          process_index,
-          current_thread.name,
+          multihost.process_index(),
+          threading.current_thread().name,
       )
+      self._forget_finalize_threads(finalize_threads)
       return
+    for finalize_thread in finalize_threads:
+      self._join_finalize_thread(finalize_thread)
+
+  def _forget_finalize_threads(
+      self, finalize_threads: Sequence[_FinalizeThread]
+  ):
+    with self._finalize_threads_lock:
+      self._finalize_threads = [
+          t for t in self._finalize_threads if t not in finalize_threads
+      ]
 
-    step = self._finalize_thread.get_not_none().step()
-    finalize_thread_name = self._finalize_thread.get_not_none().name
+  def _join_finalize_thread(self, finalize_thread: _FinalizeThread):
+    """Joins `finalize_thread`, raising its exception if any."""
+    process_index = multihost.process_index()
+    current_thread = threading.current_thread()
+    step = finalize_thread.step()
+    finalize_thread_name = finalize_thread.name
     try:
       logging.info(
           '[process=%s][thread=%s][step=%s][wait_until_finished] Waiting for'
@@ -2006,7 +2206,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
       # Let all threads join and wait for the finalize thread to complete.
       # Don't call join() with a lock otherwise we will end up serializing the
       # access to the finalize thread.
-      self._finalize_thread.get_not_none().join()
+      finalize_thread.join()
       logging.info(
           '[process=%s][thread=%s][step=%s][wait_until_finished] Done'
           ' waiting for Save Finalize thread (%s) running at step=%d.',
@@ -2025,12 +2225,42 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
           step,
           finalize_thread_name,
       )
-      self._checkpoints.delete_if(lambda info: info.step == step)
+      self._remove_checkpoint_infos([step])
       raise
+    finally:
+      self._forget_finalize_threads([finalize_thread])
+
+  def _overlaps_saves(self) -> bool:
+    """Whether a save may start before the previous one is finalized."""
+    async_options = self._options.async_options or AsyncOptions()
+    return (
+        is_async_checkpointer(self._checkpointer)
+        and async_options.max_in_flight_saves > 1
+    )
+
+  def _wait_for_save_capacity(self):
+    """Waits until fewer than `max_in_flight_saves` saves are in progress.
+
+    Joins finished Save Finalize threads, raising their exceptions, and then
+    the oldest ones still running, in the order in which they were started.
+    """
+    max_in_flight_saves = (
+        self._options.async_options or AsyncOptions()
+    ).max_in_flight_saves
+    while True:
+      with self._finalize_threads_lock:
+        finalize_threads = list(self._finalize_threads)
+      if not finalize_threads or (
+          finalize_threads[0].is_alive()
+          and len(finalize_threads) < max_in_flight_saves
+      ):
+        return
+      self._join_finalize_thread(finalize_threads[0])
 
   def is_saving_in_progress(self) -> bool:
     """Returns whether a checkpoint save is in progress."""
-    return self._finalize_thread.map(lambda t: t is not None and t.is_alive())
+    with self._finalize_threads_lock:
+      return any(t.is_alive() for t in self._finalize_threads)
 
   def check_for_errors(self):
     """Checks for any outstanding errors in completed asynchronous save operations.
@@ -2040,7 +2270,7 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
     if is_async_checkpointer(self._checkpointer):
       self._checkpointer.check_for_errors()  # pytype: disable=attribute-error
 
-  def _finalize_checkpoint(self, step: int):
+  def _finalize_checkpoint(self, step: int, check_for_errors: bool = True):
     """Executes final actions just before the checkpoint write completes.
 
     * Logs error if any.
@@ -2048,10 +2278,14 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
 
     Args:
       step: finalized checkpoint step.
+      check_for_errors: Whether to check for errors of the checkpointer. False
+        if the errors of this step were already raised, while later saves may
+        still be in progress.
     """
     if utils.is_primary_host(self._multiprocessing_options.primary_host):
       try:
-        self.check_for_errors()
+        if check_for_errors:
+          self.check_for_errors()
       except Exception:  # pylint: disable=broad-except
         logging.exception(
             (
@@ -2077,17 +2311,38 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
             duration.total_seconds(),
         )
 
-  def _finalize(self, step: int, steps_to_remove: List[int]):
-    """Finalizes individual items and starts garbage collection."""
+  def _finalize(
+      self,
+      step: int,
+      steps_to_remove: List[int],
+      *,
+      commit_future: Optional[future.Future] = None,
+      previous: Optional[_FinalizeThread] = None,
+  ):
+    """Finalizes individual items and starts garbage collection.
+
+    Args:
+      step: The step to finalize.
+      steps_to_remove: Steps to delete once `step` is committed.
+      commit_future: If provided, only this commit of the checkpointer is
+        waited for, since later saves may be in progress.
+      previous: The Save Finalize thread of the previous save, which must
+        finish first, so that steps are deleted and indexed in order, and not
+        before the saves of these steps are finalized.
+    """
+    start_time = time.time()
     process_index = multihost.process_index()
     current_thread = threading.current_thread()
+    if previous is not None:
+      previous.wait()
     self._non_blocking_metadata_store.wait_until_finished()
-    self._wait_for_checkpointers()
+    self._wait_for_checkpointers(commit_future)
     # If an error is encountered while waiting for commit futures to complete,
     # we will not proceed past this point.
-    self._finalize_checkpoint(step)
+    self._finalize_checkpoint(step, check_for_errors=commit_future is None)
     remove_steps_start_time = time.time()
     self._checkpoint_deleter.delete_steps(steps_to_remove)
+    self._update_step_index(added_step=step, deleted_steps=steps_to_remove)
     jax.monitoring.record_event_duration_secs(
         '/jax/checkpoint/write/remove_steps_duration_secs',
         time.time() - remove_steps_start_time,
@@ -2114,6 +2369,13 @@ class CheckpointManager(AbstractCheckpointManager, epy.ContextManager):
         current_thread.name,
         step,
     )
+    tracing.record(
+        'CheckpointManager.finalize',
+        start_time,
+        time.time(),
+        step=step,
+        num_steps_removed=len(steps_to_remove),
+    )
 
   def close(self):
     """Waits for outstanding operations to finish and closes internal objects."""
@@ -119,6 +119,14 @@ class CheckpointManagerOptionsTest(parameterized.TestCase):
     self.assertIsNone(options.keep_period)
     self.assertIsNotNone(options.should_keep_fn)
 
+  @parameterized.parameters(
+      ({'delete_max_workers': 0},),
+      ({'enable_distributed_delete': True, 'enable_background_delete': True},),
+  )
+  def test_invalid_delete_options(self, kwargs):
+    with self.assertRaises(ValueError):
+      ocp.CheckpointManagerOptions(**kwargs)
+
   @parameterized.named_parameters(
       dict(
           testcase_name='error_step_name_format_false',
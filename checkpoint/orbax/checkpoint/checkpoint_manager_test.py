@@ -0,0 +1,322 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for CheckpointManager."""
+
+import threading
+from typing import Optional
+from unittest import mock
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from etils import epath
+import numpy as np
+from orbax.checkpoint import args as args_lib
+from orbax.checkpoint import checkpoint_manager
+from orbax.checkpoint import options as options_lib
+from orbax.checkpoint._src.handlers import handler_registration
+from orbax.checkpoint._src.handlers import json_checkpoint_handler
+from orbax.checkpoint._src.metadata import step_index as step_index_lib
+
+
+CheckpointManager = checkpoint_manager.CheckpointManager
+CheckpointManagerOptions = checkpoint_manager.CheckpointManagerOptions
+
+
+class StepIndexTest(parameterized.TestCase):
+  """Tests for `CheckpointManagerOptions.enable_step_index`."""
+
+  def setUp(self):
+    super().setUp()
+    self.directory = epath.Path(self.create_tempdir().full_path)
+    self.index = step_index_lib.StepIndex(
+        step_index_lib.step_index_file_path(
+            self.directory / checkpoint_manager.METADATA_ITEM_NAME
+        )
+    )
+
+  def _manager(self, **kwargs) -> CheckpointManager:
+    options = CheckpointManagerOptions(
+        enable_step_index=kwargs.pop('enable_step_index', True), **kwargs
+    )
+    manager = CheckpointManager(self.directory, options=options)
+    self.addCleanup(manager.close)
+    return manager
+
+  def _save(self, manager: CheckpointManager, step: int):
+    manager.save(
+        step,
+        args=args_lib.StandardSave({'a': np.arange(8) + step}),
+        metrics={'loss': float(step)},
+    )
+    manager.wait_until_finished()
+
+  def _indexed_steps(self) -> list[int]:
+    return [info.step for info in self.index.read()]
+
+  @parameterized.parameters(True, False)
+  def test_save_and_delete_update_index(self, enable_async_checkpointing):
+    manager = self._manager(
+        enable_async_checkpointing=enable_async_checkpointing
+    )
+    for step in range(3):
+      self._save(manager, step)
+    self.assertEqual(self._indexed_steps(), [0, 1, 2])
+    self.assertEqual(
+        [info.metrics for info in self.index.read()],
+        [{'loss': 0.0}, {'loss': 1.0}, {'loss': 2.0}],
+    )
+
+    manager.delete(1)
+    self.assertEqual(self._indexed_steps(), [0, 2])
+    self.assertEqual(self._indexed_steps(), list(manager.all_steps()))
+
+  def test_garbage_collection_updates_index(self):
+    manager = self._manager(max_to_keep=2)
+    for step in range(5):
+      self._save(manager, step)
+    self.assertEqual(list(manager.all_steps()), [3, 4])
+    self.assertEqual(self._indexed_steps(), [3, 4])
+
+  def test_reopen_reads_index(self):
+    manager = self._manager()
+    for step in range(3):
+      self._save(manager, step)
+    manager.close()
+
+    with mock.patch.object(
+        CheckpointManager, 'metrics', autospec=True
+    ) as mock_metrics:
+      reopened = self._manager()
+    mock_metrics.assert_not_called()
+    self.assertEqual(list(reopened.all_steps()), [0, 1, 2])
+    self.assertEqual(reopened.latest_step(), 2)
+
+  def test_reopen_drops_deleted_steps(self):
+    manager = self._manager()
+    for step in range(3):
+      self._save(manager, step)
+    manager.close()
+    (self.directory / '1').rmtree()
+
+    reopened = self._manager()
+    self.assertEqual(list(reopened.all_steps()), [0, 2])
+    self.assertEqual(self._indexed_steps(), [0, 2])
+
+  def test_reopen_with_stale_index(self):
+    manager = self._manager()
+    self._save(manager, 0)
+    manager.close()
+    # Steps saved without the index are missing from it.
+    manager = self._manager(enable_step_index=False)
+    self._save(manager, 1)
+    manager.close()
+    self.assertEqual(self._indexed_steps(), [0])
+
+    reopened = self._manager()
+    self.assertEqual(list(reopened.all_steps()), [0, 1])
+    self.assertEqual(self._indexed_steps(), [0, 1])
+
+  @parameterized.parameters(True, False)
+  def test_reopen_with_missing_or_invalid_index(self, missing):
+    manager = self._manager()
+    for step in range(2):
+      self._save(manager, step)
+    manager.close()
+    if missing:
+      self.index.path.unlink()
+    else:
+      self.index.path.write_text('{"add": 0, "time"')
+
+    reopened = self._manager()
+    self.assertEqual(list(reopened.all_steps()), [0, 1])
+    self.assertEqual(self._indexed_steps(), [0, 1])
+    self._save(reopened, 2)
+    self.assertEqual(self._indexed_steps(), [0, 1, 2])
+
+  def test_read_only_does_not_write_index(self):
+    manager = self._manager(enable_step_index=False)
+    self._save(manager, 0)
+    manager.close()
+
+    reopened = self._manager(read_only=True)
+    self.assertEqual(list(reopened.all_steps()), [0])
+    self.assertFalse(self.index.path.exists())
+
+
+class _BlockingCommit:
+  """Commit future that completes once its step is released."""
+
+  def __init__(self, released: threading.Event, errors: dict[int, Exception]):
+    self._released = released
+    self._errors = errors
+    self.step = None
+
+  def result(self, timeout: Optional[float] = None):
+    self._released.wait(timeout)
+    if self.step in self._errors:
+      raise self._errors[self.step]
+
+
+class _BlockingJsonCheckpointHandler(
+    json_checkpoint_handler.JsonCheckpointHandler
+):
+  """Does not commit a step until `release` is called for it."""
+
+  def __init__(self):
+    super().__init__()
+    self._released = {}
+    self._errors = {}
+    self._lock = threading.Lock()
+
+  def _event(self, step: int) -> threading.Event:
+    with self._lock:
+      return self._released.setdefault(step, threading.Event())
+
+  def release(self, step: int, error: Optional[Exception] = None):
+    if error is not None:
+      self._errors[step] = error
+    self._event(step).set()
+
+  async def async_save(self, directory, *args, **kwargs):
+    commit_futures = await super().async_save(directory, *args, **kwargs)
+    # `directory` is the item directory within the temporary step directory.
+    step = int(directory.parent.name.split('.')[0])
+    blocking_commit = _BlockingCommit(self._event(step), self._errors)
+    blocking_commit.step = step
+    return commit_futures + [blocking_commit]
+
+
+class InFlightSavesTest(absltest.TestCase):
+  """Tests for `AsyncOptions.max_in_flight_saves`."""
+
+  def _manager(self, **kwargs) -> CheckpointManager:
+    self.handler = _BlockingJsonCheckpointHandler()
+    registry = handler_registration.DefaultCheckpointHandlerRegistry()
+    registry.add('blocker', args_lib.JsonSave, self.handler)
+    registry.add('blocker', args_lib.JsonRestore, self.handler)
+    manager = CheckpointManager(
+        epath.Path(self.create_tempdir().full_path),
+        options=CheckpointManagerOptions(
+            async_options=options_lib.AsyncOptions(max_in_flight_saves=2),
+            **kwargs,
+        ),
+        handler_registry=registry,
+    )
+    self.addCleanup(manager.close)
+    return manager
+
+  def _save(self, manager: CheckpointManager, step: int):
+    manager.save(
+        step,
+        args=args_lib.Composite(
+            state=args_lib.StandardSave({'a': np.arange(8) + step}),
+            blocker=args_lib.JsonSave({'step': step}),
+        ),
+    )
+
+  def _step_directories(self, manager: CheckpointManager) -> list[str]:
+    return sorted(
+        path.name
+        for path in manager.directory.iterdir()
+        if path.name != checkpoint_manager.METADATA_ITEM_NAME
+    )
+
+  def test_overlapping_commits(self):
+    manager = self._manager(max_to_keep=1, enable_step_index=True)
+    index = step_index_lib.StepIndex(
+        step_index_lib.step_index_file_path(
+            manager.directory / checkpoint_manager.METADATA_ITEM_NAME
+        )
+    )
+    self._save(manager, 0)
+    # Does not wait for the commit of step 0.
+    self._save(manager, 1)
+    self.assertTrue(manager.is_saving_in_progress())
+    # Step 0 is removed by retention, but not deleted while it is committed.
+    self.assertEqual(list(manager.all_steps()), [1])
+    self.handler.release(1)
+    with self.assertRaises(TimeoutError):
+      manager._checkpointer._async_manager._in_flight()[-1].result(timeout=0.1)
+    self.assertLen(self._step_directories(manager), 2)
+    self.assertTrue(
+        all('tmp' in name for name in self._step_directories(manager))
+    )
+
+    # A third save waits for the oldest save to be finalized.
+    third_save = threading.Thread(target=self._save, args=(manager, 2))
+    third_save.start()
+    third_save.join(timeout=0.1)
+    self.assertTrue(third_save.is_alive())
+
+    self.handler.release(0)
+    third_save.join()
+    self.handler.release(2)
+    manager.wait_until_finished()
+    self.assertFalse(manager.is_saving_in_progress())
+    self.assertEqual(list(manager.all_steps()), [2])
+    self.assertEqual(self._step_directories(manager), ['2'])
+    self.assertEqual([info.step for info in index.read()], [2])
+
+  def test_errors_per_step(self):
+    manager = self._manager()
+    self._save(manager, 0)
+    self._save(manager, 1)
+    self.handler.release(0, ValueError('step 0 failed'))
+    self.handler.release(1)
+
+    with self.assertRaisesRegex(ValueError, 'step 0 failed'):
+      manager.wait_until_finished()
+    manager.wait_until_finished()
+    self.assertEqual(list(manager.all_steps()), [1])
+    restored = manager.restore(
+        1,
+        args=args_lib.Composite(
+            state=args_lib.StandardRestore(),
+            blocker=args_lib.JsonRestore(),
+        ),
+    )
+    np.testing.assert_array_equal(restored.state['a'], np.arange(8) + 1)
+    self.assertEqual(restored.blocker, {'step': 1})
+
+  def test_save_restore(self):
+    directory = epath.Path(self.create_tempdir().full_path)
+    options = CheckpointManagerOptions(
+        async_options=options_lib.AsyncOptions(max_in_flight_saves=2),
+    )
+    with CheckpointManager(directory, options=options) as manager:
+      for step in range(3):
+        manager.save(
+            step,
+            args=args_lib.Composite(
+                state=args_lib.StandardSave({'a': np.arange(8) + step}),
+                metadata=args_lib.JsonSave({'step': step}),
+            ),
+        )
+      manager.wait_until_finished()
+      self.assertEqual(list(manager.all_steps()), [0, 1, 2])
+      for step in range(3):
+        restored = manager.restore(
+            step,
+            args=args_lib.Composite(
+                state=args_lib.StandardRestore(),
+                metadata=args_lib.JsonRestore(),
+            ),
+        )
+        np.testing.assert_array_equal(restored.state['a'], np.arange(8) + step)
+        self.assertEqual(restored.metadata, {'step': step})
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -55,6 +55,8 @@ from orbax.checkpoint._src.path import step as step_lib
 from orbax.checkpoint._src.serialization import type_handlers
 from orbax.checkpoint.experimental.emergency import local_checkpoint_data_debugging
 from orbax.checkpoint.experimental.emergency import mesh_consistency
+from orbax.checkpoint.experimental.emergency import peer_restore
+from orbax.checkpoint.experimental.emergency import persistent_upload
 from orbax.checkpoint.experimental.emergency import process_metadata_checkpoint_handler
 from typing_extensions import Self  # for Python version < 3.11
 
@@ -82,6 +84,7 @@ _PROCESS_METADATA_NAME = 'process_metadata'
 
 local_all_steps_broadcast_counter = itertools.count()
 find_complete_slice_broadcast_counter = itertools.count()
+peer_restore_plan_counter = itertools.count()
 
 
 def _local_checkpoint_handler(
@@ -155,12 +158,19 @@ class LocalCheckpointOptions:
     accepts step number and optional latest step number as param and returns
     bool. If present then `save_interval_steps` and `save_on_steps` options are
     ignored.
+  peer_restore_staging_directory:
+    If provided, a directory visible to all hosts, through which hosts missing a
+    local checkpoint, e.g. after being replaced, fetch their shards from hosts
+    of other slices holding replicas, when no slice holds a complete local
+    checkpoint. Otherwise, such checkpoints are restored from persistent
+    storage.
   """
 
   save_interval_steps: int = 10
   max_to_keep: int = 1
   read_only: bool = False
   should_save_fn: Optional[Callable[[int, Optional[int]], bool]] = None
+  peer_restore_staging_directory: Optional[epath.PathLike] = None
 
   debug_use_full_global_mesh: bool = False
 
@@ -183,11 +193,28 @@ class PersistentCheckpointOptions:
     accepts step number and optional latest step number as param and returns
     bool. If present then `save_interval_steps` and `save_on_steps` options are
     ignored.
+  upload_from_local:
+    If True, persistent checkpoints are not saved by the primary slice, but
+    uploaded in the background from the local checkpoints of the slice of the
+    local primary host, so that the state is transferred to host memory and
+    serialized once per step. Steps to save persistently are then always saved
+    locally. Persistent steps are listed from storage whenever requested, as
+    they are finalized and garbage collected by the uploading slice.
+  upload_bytes_per_second:
+    If provided with `upload_from_local`, the maximum rate at which each process
+    uploads its local checkpoint to persistent storage.
+  upload_timeout_secs:
+    With `upload_from_local`, the timeout in seconds for uploading a local
+    checkpoint, after which the upload fails. Since uploads are rate limited,
+    this is separate from `MultiprocessingOptions.coordination_timeout_secs`.
   """
 
   save_interval_steps: int = 1000
   max_to_keep: Optional[int] = None
   should_save_fn: Optional[Callable[[int, Optional[int]], bool]] = None
+  upload_from_local: bool = False
+  upload_bytes_per_second: Optional[int] = None
+  upload_timeout_secs: int = 3600
 
 
 @dataclasses.dataclass
@@ -525,7 +552,7 @@ class _LocalCheckpointManager(checkpoint_manager.CheckpointManager):
   def _run_initial_garbage_collection(self):
     """Remove steps that might be left over from previous runs."""
     steps_to_remove = self._get_old_steps_to_remove()
-    self._checkpoints.delete_if(lambda info: info.step in steps_to_remove)
+    self._remove_checkpoint_infos(steps_to_remove)
     self._checkpoint_deleter.delete_steps(steps_to_remove)
 
   def local_host_steps(self, read: bool) -> Sequence[int]:
@@ -808,8 +835,39 @@ class _MultisliceCheckpointManager(
           primary_replica_id
       )
 
+    self._uploader = None
+    if (
+        options.persistent.upload_from_local
+        and not self._in_primary_slice
+        and multislice.in_slice(
+            multihost.process_index(),
+            global_mesh,
+            replica_axis_index=self._replica_axis_index,
+            replica_id=secondary_replica_id,
+        )
+    ):
+      self._uploader = persistent_upload.LocalCheckpointUploader(
+          self._local_directory,
+          self._persistent_directory,
+          step_name_format=options.step_name_format,
+          local_item_name=_UNNAMED_ITEM_NAME,
+          persistent_item_name=checkpoint_manager.DEFAULT_ITEM_NAME,
+          processes=multihost.unique_processes_from_devices(
+              multislice.slice_devices(
+                  self._global_mesh,
+                  replica_axis_index=self._replica_axis_index,
+                  replica_id=secondary_replica_id,
+              )
+          ),
+          primary_host=self._local_primary_host,
+          bytes_per_second=options.persistent.upload_bytes_per_second,
+          max_to_keep=options.persistent.max_to_keep,
+          timeout_secs=options.persistent.upload_timeout_secs,
+      )
+
     self._local_steps = []
     self._persistent_steps = []
+    self._per_process_local_steps = {}
     # clean up tmp directories in ram
     self._cleanup_local_tmp_directories()
 
@@ -817,6 +875,8 @@ class _MultisliceCheckpointManager(
     self.all_steps(read=True)
 
     self._global_broadcast_fn = _get_global_broadcast_fn()
+    if options.persistent.upload_from_local:
+      self._resume_interrupted_upload()
 
     logging.info(
         'Created emergency.CheckpointManager with slice_id=%d,'
@@ -837,6 +897,30 @@ class _MultisliceCheckpointManager(
       logging.info('Deleting temporary checkpoint: %s.', tmp_file)
       (self._local_directory / tmp_file).rmtree()
 
+  def _resume_interrupted_upload(self):
+    """Resumes the latest upload, if interrupted while its step is local."""
+    if self._options.cleanup_tmp_directories:
+      return
+    interrupted_steps = persistent_upload.interrupted_uploads(
+        self._persistent_directory, self._options.step_name_format
+    )
+    if not interrupted_steps:
+      return
+    step = interrupted_steps[-1]
+    missing = self._uploader is not None and (
+        step not in step_lib.checkpoint_steps(self._local_directory)
+    )
+    if _global_max([int(missing)], self._global_broadcast_fn)[0]:
+      logging.warning(
+          'Not resuming interrupted upload of step %d, missing from local'
+          ' storage.',
+          step,
+      )
+      return
+    logging.info('Resuming interrupted upload of step %d.', step)
+    if self._uploader is not None:
+      self._uploader.upload(step)
+
   def _make_persistent_checkpoint_manager(
       self,
       persistent_multiprocessing_options: checkpoint_manager.MultiprocessingOptions,
@@ -893,6 +977,9 @@ class _MultisliceCheckpointManager(
     if read:
       per_slice_local_steps = self._get_per_slice_local_steps()
       self._local_steps = list(set.union(*per_slice_local_steps.values()))
+    # Uploads from local checkpoints finalize and garbage collect persistent
+    # checkpoints in the background, on the uploading slice only.
+    if read or self._options.persistent.upload_from_local:
       self._persistent_steps = step_lib.checkpoint_steps(
           self._persistent_directory
       )
@@ -981,7 +1068,21 @@ class _MultisliceCheckpointManager(
     # TODO: b/330608746 - implement save op on different slices
     persistent_saved = False
     local_saved = False
-    if self.in_primary_slice:
+    upload = False
+    if self._options.persistent.upload_from_local:
+      should_upload = self.in_primary_slice and (
+          force or self._persistent_checkpoint_manager.should_save(step)
+      )
+      upload = bool(
+          _global_max([int(should_upload)], self._global_broadcast_fn)[0]
+      )
+    if self.in_primary_slice and self._options.persistent.upload_from_local:
+      logging.info(
+          'Skipping persistent save at step %d, uploaded from local'
+          ' checkpoints instead.',
+          step,
+      )
+    elif self.in_primary_slice:
       logging.info('Maybe saving at step %d (persistent).', step)
       persistent_saved = self._persistent_checkpoint_manager.save(
           step, args=args, force=force
@@ -999,7 +1100,7 @@ class _MultisliceCheckpointManager(
       })
 
       local_saved = self._local_checkpoint_manager.save(
-          step, args=args, force=force
+          step, args=args, force=force or upload
       )
 
     start = time.time()
@@ -1021,6 +1122,8 @@ class _MultisliceCheckpointManager(
     if local_saved:
       self._local_steps.append(step)
       self._local_steps = self._local_steps[-self._local_max_to_keep :]
+    if upload and local_saved and self._uploader is not None:
+      self._uploader.upload(step)
 
     return persistent_saved or local_saved
 
@@ -1040,6 +1143,7 @@ class _MultisliceCheckpointManager(
         barrier_id=_BarrierIdentifier.FIND_COMPLETE_SLICE,
     )
     logging.vlog(1, 'per_process_steps=%s', per_process_steps)
+    self._per_process_local_steps = per_process_steps
     per_slice_steps = _common_values_per_slice(
         per_process_steps,
         self._global_mesh,
@@ -1057,6 +1161,128 @@ class _MultisliceCheckpointManager(
         return slice_id
     return -1
 
+  def _complete_local_checkpoint_from_peers(self, step: int) -> int:
+    """Fetches the local shards missing in a slice from peers in other slices.
+
+    Uses the per-process steps found by the latest call to
+    `_get_per_slice_local_steps`. Must be called on all processes.
+
+    Args:
+      step: The step to restore.
+
+    Returns:
+      The slice id whose local checkpoint was completed, or -1.
+    """
+    step_processes = {
+        process
+        for process, steps in self._per_process_local_steps.items()
+        if step in steps
+    }
+    if not step_processes:
+      return -1
+    counter = next(peer_restore_plan_counter)
+    process_index = multihost.process_index()
+    # Process metadata is the same on all processes holding the step, so the
+    # first of them plans for all processes.
+    planner = min(step_processes)
+    client = multihost.get_jax_distributed_client()
+    plan_key = unique_barrier_key(f'peer_restore_plan_{step}_{counter}')
+    if process_index == planner:
+      try:
+        distributed_to_device_ids, device_ids = (
+            ProcessMetadataCheckpointHandler().restore(
+                self._options.step_name_format.find_step(
+                    self._local_directory, step
+                ).path
+                / _PROCESS_METADATA_NAME,
+                process_metadata_checkpoint_handler.ProcessMetadataRestoreArgs(),
+            )
+        )
+        plan = peer_restore.plan_peer_restore(
+            peer_restore.process_mesh_from_metadata(
+                distributed_to_device_ids,
+                device_ids,
+                self._global_mesh.devices.shape,
+                current_distributed_to_device_ids=(
+                    multihost.distributed_to_device_ids()
+                ),
+                device_process_indices={
+                    d.id: d.process_index for d in jax.devices()
+                },
+            ),
+            step_processes,
+            replica_axis_index=self._replica_axis_index,
+        )
+      except Exception:  # pylint: disable=broad-exception-caught
+        # Other processes are waiting for the plan, and all fall back to
+        # restoring from persistent storage.
+        logging.exception(
+            'Failed to plan completing local checkpoint for step %d.', step
+        )
+        plan = None
+      client.key_value_set(plan_key, plan.to_json() if plan else 'null')
+    else:
+      plan = peer_restore.PeerRestorePlan.from_json(
+          client.blocking_key_value_get(
+              plan_key, self._coordination_timeout_secs * 1000
+          )
+      )
+    if plan is None:
+      logging.info(
+          'No slice can complete its local checkpoint for step %d from peers.',
+          step,
+      )
+      return -1
+    logging.info(
+        'Completing local checkpoint for step %d of slice %d from peers: %s',
+        step,
+        plan.slice_id,
+        plan.peers,
+    )
+
+    transport = peer_restore.SharedDirectoryTransport(
+        self._options.local.peer_restore_staging_directory
+    )
+    failed = False
+    try:
+      for receiver, sender in plan.peers.items():
+        if sender == process_index:
+          transport.send(
+              self._options.step_name_format.find_step(
+                  self._local_directory, step
+              ).path,
+              step,
+              receiver,
+          )
+    except Exception:  # pylint: disable=broad-exception-caught
+      logging.exception('Failed to send local checkpoint for step %d.', step)
+      failed = True
+    multihost.sync_global_processes(
+        multihost.unique_barrier_key(
+            'CheckpointManager:peer_restore_sent',
+            prefix='emergency_checkpoint_manager',
+            suffix=f'{step}_{counter}',
+        )
+    )
+    if process_index in plan.peers:
+      try:
+        transport.receive(
+            step,
+            process_index,
+            self._local_directory
+            / self._options.step_name_format.build_name(step),
+        )
+      except Exception:  # pylint: disable=broad-exception-caught
+        logging.exception(
+            'Failed to receive local checkpoint for step %d.', step
+        )
+        failed = True
+    # Agree on the outcome, once all transfers are done.
+    failed = bool(_global_max([int(failed)], self._global_broadcast_fn)[0])
+    if process_index == planner:
+      transport.cleanup(step)
+    return -1 if failed else plan.slice_id
+
   def _restore_from_local(
       self,
       step: int,
@@ -1237,6 +1463,7 @@ class _MultisliceCheckpointManager(
         self._global_mesh,
         replica_axis_index=self._replica_axis_index,
         is_source=is_restoring_slice,
+        source_replica_id=restoring_slice_id,
     )
     broadcast_elapsed_s = time.time() - start_broadcast
     jax.monitoring.record_event_duration_secs(
@@ -1315,6 +1542,11 @@ class _MultisliceCheckpointManager(
         )
     logging.info('Restoring at step %d.', step)
     restoring_slice_id = self._find_slice_with_complete_local_checkpoint(step)
+    if (
+        restoring_slice_id < 0
+        and self._options.local.peer_restore_staging_directory is not None
+    ):
+      restoring_slice_id = self._complete_local_checkpoint_from_peers(step)
     if restoring_slice_id > -1:
       # restore from LCM
       return self._restore_from_local(
@@ -1356,6 +1588,8 @@ class _MultisliceCheckpointManager(
       self._persistent_checkpoint_manager.wait_until_finished()
     else:
       self._local_checkpoint_manager.wait_until_finished()
+    if self._uploader is not None:
+      self._uploader.wait_until_finished()
 
   def check_for_errors(self):
     """Checks for any outstanding errors in completed asynchronous save operations.
@@ -1366,6 +1600,8 @@ class _MultisliceCheckpointManager(
       self._persistent_checkpoint_manager.check_for_errors()
     else:
       self._local_checkpoint_manager.check_for_errors()
+    if self._uploader is not None:
+      self._uploader.check_for_errors()
 
   def close(self):
     """Waits for outstanding operations to finish and closes Checkpointers."""
@@ -1375,6 +1611,8 @@ class _MultisliceCheckpointManager(
       self._persistent_checkpoint_manager.close()
     else:
       self._local_checkpoint_manager.close()
+    if self._uploader is not None:
+      self._uploader.close()
 
   def __contextmanager__(
       self,
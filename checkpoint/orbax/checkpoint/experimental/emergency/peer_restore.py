@@ -0,0 +1,226 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utils for restoring local checkpoints missing on some hosts from peers.
+
+Each process saves the shards of its devices to its local storage. When a host
+is replaced, its slice no longer holds a complete local checkpoint, but other
+slices hold replicas of its shards. Another process, holding the same shards in
+another slice, then sends its local checkpoint to the replaced host, after
+which the slice of the replaced host can restore from local storage.
+
+The shards of a process are identified by the positions of its devices in the
+mesh used to save the local checkpoint, as recorded in process metadata.
+Processes are identified by their current process index, which may differ from
+the one of the incarnation which saved the local checkpoint.
+
+Local checkpoints are transferred whole, so a process missing its local
+checkpoint can only be completed by a single peer holding replicas of all of
+its shards.
+"""
+
+import dataclasses
+import json
+from typing import Dict, List, Optional, Set
+
+from absl import logging
+from etils import epath
+import numpy as np
+from orbax.checkpoint._src.path import step as step_lib
+
+
+def process_mesh_from_metadata(
+    previous_distributed_to_device_ids: List[List[int]],
+    previous_device_ids: List[int],
+    mesh_shape: tuple[int, ...],
+    *,
+    current_distributed_to_device_ids: List[List[int]],
+    device_process_indices: Dict[int, int],
+) -> np.ndarray:
+  """Returns the current process holding the shards of each device of the mesh.
+
+  As in `multihost.consistent_restore_mesh`, the devices of a distributed id
+  are the same hardware across incarnations, although their ids, and the index
+  of their process, may change. The shards saved by a device are thus held by
+  the current process of the same hardware device.
+
+  Args:
+    previous_distributed_to_device_ids: The distributed id to device ids mapping
+      of the incarnation which saved the local checkpoint.
+    previous_device_ids: The device ids of the mesh which saved the local
+      checkpoint.
+    mesh_shape: The shape of the mesh.
+    current_distributed_to_device_ids: The distributed id to device ids mapping
+      of the current incarnation.
+    device_process_indices: The current process index of each current device
+      id.
+  """
+  device_id_across_restarts = {
+      previous_id: current_id
+      for previous_ids, current_ids in zip(
+          previous_distributed_to_device_ids,
+          current_distributed_to_device_ids,
+      )
+      for previous_id, current_id in zip(previous_ids, current_ids)
+  }
+  return np.asarray([
+      device_process_indices[device_id_across_restarts[device_id]]
+      for device_id in previous_device_ids
+  ]).reshape(mesh_shape)
+
+
+@dataclasses.dataclass(frozen=True)
+class PeerRestorePlan:
+  """Plan to complete the local checkpoint of a slice.
+
+  Attributes:
+    slice_id: The slice which restores the local checkpoint once complete.
+    peers: Mapping of each process of the slice missing the local checkpoint to
+      a process of another slice holding a replica of its shards.
+  """
+
+  slice_id: int
+  peers: Dict[int, int]
+
+  def to_json(self) -> str:
+    return json.dumps({'slice_id': self.slice_id, 'peers': self.peers})
+
+  @classmethod
+  def from_json(cls, value: str) -> Optional['PeerRestorePlan']:
+    plan = json.loads(value)
+    if plan is None:
+      return None
+    return cls(
+        slice_id=plan['slice_id'],
+        peers={int(k): v for k, v in plan['peers'].items()},
+    )
+
+
+def plan_peer_restore(
+    process_mesh: np.ndarray,
+    step_processes: Set[int],
+    *,
+    replica_axis_index: int,
+) -> Optional[PeerRestorePlan]:
+  """Plans fetching the shards missing in one slice from other slices.
+
+  A process missing the local checkpoint can fetch it from a process of another
+  slice whose devices held the shards of all of its devices. Shards of a
+  process are not fetched from several peers. Among the slices
+  whose missing shards can all be fetched, the one missing the fewest processes
+  is chosen.
+
+  Args:
+    process_mesh: The process which saved the shards of each device of the
+      mesh, as returned by `process_mesh_from_metadata`.
+    step_processes: The processes holding the local checkpoint.
+    replica_axis_index: The index of the replica axis in the mesh.
+
+  Returns:
+    The plan, or None if no slice can be completed.
+  """
+  num_slices = process_mesh.shape[replica_axis_index]
+  slice_process_meshes = [
+      np.take(process_mesh, slice_id, axis=replica_axis_index)
+      for slice_id in range(num_slices)
+  ]
+  best_plan = None
+  for slice_id, slice_process_mesh in enumerate(slice_process_meshes):
+    missing_processes = set(slice_process_mesh.flat) - step_processes
+    if not missing_processes:
+      continue
+    if best_plan is not None and len(missing_processes) >= len(
+        best_plan.peers
+    ):
+      continue
+    peers = {}
+    for process in sorted(missing_processes):
+      positions = slice_process_mesh == process
+      for peer_slice_id, peer_process_mesh in enumerate(slice_process_meshes):
+        if peer_slice_id == slice_id:
+          continue
+        candidates = set(peer_process_mesh[positions].flat)
+        if len(candidates) == 1 and candidates <= step_processes:
+          peers[process] = candidates.pop()
+          break
+      else:
+        break
+    if len(peers) == len(missing_processes):
+      best_plan = PeerRestorePlan(slice_id=slice_id, peers=peers)
+  return best_plan
+
+
+def _copy_tree(src: epath.Path, dst: epath.Path):
+  dst.mkdir(parents=True, exist_ok=True)
+  for path in src.iterdir():
+    if path.is_dir():
+      _copy_tree(path, dst / path.name)
+    else:
+      path.copy(dst / path.name)
+
+
+def _copy_tree_atomically(src: epath.Path, dst: epath.Path):
+  """Copies `src` to `dst`, which only exists once the copy completes."""
+  # Named as a temporary checkpoint, so that it is cleaned up if left behind.
+  tmp_dst = dst.parent / f'{dst.name}{step_lib.TMP_DIR_SUFFIX}0'
+  if tmp_dst.exists():
+    tmp_dst.rmtree()
+  _copy_tree(src, tmp_dst)
+  tmp_dst.rename(dst)
+
+
+class SharedDirectoryTransport:
+  """Transfers local checkpoints between processes via a shared directory.
+
+  The sender stages its local checkpoint in a directory visible to all hosts,
+  from which the receiver copies it to its local storage.
+  """
+
+  def __init__(self, staging_directory: epath.PathLike):
+    self._staging_directory = epath.Path(staging_directory)
+
+  def _staging_path(self, step: int, receiver: int) -> epath.Path:
+    return self._staging_directory / str(step) / str(receiver)
+
+  def send(self, step_directory: epath.Path, step: int, receiver: int):
+    """Stages the local checkpoint in `step_directory` for `receiver`."""
+    staging_path = self._staging_path(step, receiver)
+    logging.info(
+        'Staging local checkpoint %s for process %d at %s.',
+        step_directory,
+        receiver,
+        staging_path,
+    )
+    _copy_tree_atomically(step_directory, staging_path)
+
+  def receive(self, step: int, receiver: int, step_directory: epath.Path):
+    """Copies the local checkpoint staged for `receiver` to `step_directory`."""
+    staging_path = self._staging_path(step, receiver)
+    if not staging_path.exists():
+      raise FileNotFoundError(
+          f'No local checkpoint staged for process {receiver} at'
+          f' {staging_path}.'
+      )
+    logging.info(
+        'Copying local checkpoint staged at %s to %s.',
+        staging_path,
+        step_directory,
+    )
+    _copy_tree_atomically(staging_path, step_directory)
+
+  def cleanup(self, step: int):
+    """Removes the local checkpoints staged for `step`."""
+    staging_path = self._staging_directory / str(step)
+    if staging_path.exists():
+      staging_path.rmtree()
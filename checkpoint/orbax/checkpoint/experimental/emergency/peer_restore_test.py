@@ -0,0 +1,143 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for peer_restore module."""
+
+from absl.testing import absltest
+from absl.testing import parameterized
+from etils import epath
+import numpy as np
+from orbax.checkpoint.experimental.emergency import peer_restore
+
+
+def _process_mesh(replica_axis_index: int) -> np.ndarray:
+  # 3 slices of 2 processes, each with 2 devices.
+  process_mesh = np.asarray(
+      [[0, 0, 1, 1], [2, 2, 3, 3], [5, 5, 4, 4]]
+  )
+  return process_mesh if replica_axis_index == 0 else process_mesh.T
+
+
+class PeerRestoreTest(parameterized.TestCase):
+
+  def test_process_mesh_from_metadata(self):
+    process_mesh = peer_restore.process_mesh_from_metadata(
+        previous_distributed_to_device_ids=[[0, 1], [2, 3], [4, 5]],
+        previous_device_ids=[4, 0, 1, 5, 2, 3],
+        mesh_shape=(2, 3),
+        current_distributed_to_device_ids=[[0, 1], [2, 3], [4, 5]],
+        device_process_indices={0: 0, 1: 0, 2: 1, 3: 1, 4: 2, 5: 2},
+    )
+    np.testing.assert_array_equal(process_mesh, [[2, 0, 0], [2, 1, 1]])
+
+  def test_process_mesh_from_metadata_with_permuted_ids(self):
+    # The hardware of distributed ids 0 and 1 has swapped device ids, and the
+    # processes of distributed ids 1 and 2 have swapped process indices.
+    process_mesh = peer_restore.process_mesh_from_metadata(
+        previous_distributed_to_device_ids=[[0, 1], [2, 3], [4, 5]],
+        previous_device_ids=[4, 0, 1, 5, 2, 3],
+        mesh_shape=(2, 3),
+        current_distributed_to_device_ids=[[2, 3], [0, 1], [4, 5]],
+        device_process_indices={0: 2, 1: 2, 2: 0, 3: 0, 4: 1, 5: 1},
+    )
+    np.testing.assert_array_equal(process_mesh, [[1, 0, 0], [1, 2, 2]])
+
+  def test_plan_with_permuted_ids(self):
+    # Two slices of two processes with one device each. The hosts which saved
+    # the shards of devices 1 and 2 now run processes 2 and 1.
+    process_mesh = peer_restore.process_mesh_from_metadata(
+        previous_distributed_to_device_ids=[[0], [1], [2], [3]],
+        previous_device_ids=[0, 1, 2, 3],
+        mesh_shape=(2, 2),
+        current_distributed_to_device_ids=[[0], [1], [2], [3]],
+        device_process_indices={0: 0, 1: 2, 2: 1, 3: 3},
+    )
+    # The replaced host, now process 2 in slice 0, misses the local checkpoint.
+    plan = peer_restore.plan_peer_restore(
+        process_mesh, {0, 1, 3}, replica_axis_index=0
+    )
+    self.assertEqual(plan, peer_restore.PeerRestorePlan(0, {2: 3}))
+
+  @parameterized.parameters(0, 1)
+  def test_plan(self, replica_axis_index):
+    plan = peer_restore.plan_peer_restore(
+        _process_mesh(replica_axis_index),
+        {0, 2, 5},
+        replica_axis_index=replica_axis_index,
+    )
+    # Slice 2 misses process 4, which holds the same shards as process 1 and
+    # process 3, which are both missing too.
+    self.assertIsNone(plan)
+
+    plan = peer_restore.plan_peer_restore(
+        _process_mesh(replica_axis_index),
+        {0, 2, 4, 5},
+        replica_axis_index=replica_axis_index,
+    )
+    self.assertEqual(plan, peer_restore.PeerRestorePlan(0, {1: 4}))
+
+  def test_plan_fewest_missing_processes(self):
+    process_mesh = np.asarray([[0, 1, 2], [3, 4, 5], [6, 7, 8]])
+    plan = peer_restore.plan_peer_restore(
+        process_mesh, {3, 5, 6, 7}, replica_axis_index=0
+    )
+    self.assertEqual(plan, peer_restore.PeerRestorePlan(1, {4: 7}))
+
+  def test_plan_requires_single_peer(self):
+    # Process 4 holds the shards of processes 0 and 1.
+    process_mesh = np.asarray([[0, 0, 1, 1], [2, 3, 3, 2], [4, 4, 4, 4]])
+    plan = peer_restore.plan_peer_restore(
+        process_mesh, {1, 2, 4}, replica_axis_index=0
+    )
+    self.assertEqual(plan, peer_restore.PeerRestorePlan(0, {0: 4}))
+    plan = peer_restore.plan_peer_restore(
+        process_mesh, {0, 1, 2}, replica_axis_index=0
+    )
+    # Process 3 holds shards of processes 0 and 1.
+    self.assertIsNone(plan)
+
+  def test_plan_json(self):
+    plan = peer_restore.PeerRestorePlan(1, {4: 7, 5: 8})
+    self.assertEqual(
+        peer_restore.PeerRestorePlan.from_json(plan.to_json()), plan
+    )
+    self.assertIsNone(peer_restore.PeerRestorePlan.from_json('null'))
+
+  def test_shared_directory_transport(self):
+    root = epath.Path(self.create_tempdir().full_path)
+    step_directory = root / 'sender' / '3'
+    (step_directory / 'state' / 'd').mkdir(parents=True)
+    (step_directory / 'state' / 'd' / 'chunk').write_text('data')
+    (step_directory / 'process_metadata').mkdir()
+    (step_directory / 'process_metadata' / 'mesh.json').write_text('[]')
+    transport = peer_restore.SharedDirectoryTransport(root / 'staging')
+
+    transport.send(step_directory, step=3, receiver=1)
+    received = root / 'receiver' / '3'
+    with self.assertRaises(FileNotFoundError):
+      transport.receive(3, receiver=2, step_directory=received)
+    received.parent.mkdir()
+    transport.receive(3, receiver=1, step_directory=received)
+    self.assertEqual((received / 'state' / 'd' / 'chunk').read_text(), 'data')
+    self.assertEqual(
+        (received / 'process_metadata' / 'mesh.json').read_text(), '[]'
+    )
+    self.assertEqual(list(received.parent.iterdir()), [received])
+
+    transport.cleanup(3)
+    self.assertFalse((root / 'staging' / '3').exists())
+
+
+if __name__ == '__main__':
+  absltest.main()
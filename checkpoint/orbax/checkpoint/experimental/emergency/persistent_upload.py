@@ -0,0 +1,539 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Utils for producing persistent checkpoints from local checkpoints.
+
+Each process of a slice saves the shards of its devices to its local storage,
+in a per-process OCDBT subdirectory, so that the local checkpoints of a slice
+together hold a complete replica of the state. Instead of serializing the state
+a second time to persistent storage, each process uploads its per-process
+subdirectory to the persistent directory, after which the primary process
+merges them, as `BasePyTreeCheckpointHandler.finalize` would have done. The
+result is a persistent checkpoint identical in layout to one saved directly.
+
+Uploads run in a background thread, at a limited rate, to avoid contending
+with training for host and network bandwidth. Files are copied whole and
+skipped if already present at the destination, so that an interrupted upload
+can be resumed.
+"""
+
+import concurrent.futures
+import itertools
+import os
+import threading
+import time
+from typing import Callable, List, Optional, Set
+
+from absl import logging
+from etils import epath
+from orbax.checkpoint._src import asyncio_utils
+from orbax.checkpoint._src.metadata import checkpoint as checkpoint_metadata
+from orbax.checkpoint._src.multihost import multihost
+from orbax.checkpoint._src.path import atomicity_defaults
+from orbax.checkpoint._src.path import step as step_lib
+from orbax.checkpoint._src.serialization import tensorstore_utils as ts_utils
+from orbax.checkpoint._src.serialization import type_handlers
+
+
+_UPLOAD_SUFFIX = 'upload'
+_PARTIAL_FILE_SUFFIX = '.partial'
+# Regenerated by merging the per-process subdirectories.
+_MERGED_OCDBT_ENTRIES = frozenset({'manifest.ocdbt', 'd'})
+_DEFAULT_CHUNK_BYTES = 8 * 2**20
+_POLL_INTERVAL_SECS = 0.1
+_UPLOAD_SUCCEEDED = 'ok'
+
+
+class RateLimiter:
+  """Limits the rate at which bytes are transferred, using a token bucket.
+
+  Allows bursts of up to one second worth of bytes. A transfer exceeding the
+  available bytes is allowed, after sleeping until the deficit is replenished.
+  """
+
+  def __init__(
+      self,
+      bytes_per_second: int,
+      *,
+      clock: Callable[[], float] = time.monotonic,
+      sleep: Callable[[float], None] = time.sleep,
+  ):
+    if bytes_per_second <= 0:
+      raise ValueError(
+          f'bytes_per_second must be positive, got {bytes_per_second}.'
+      )
+    self._bytes_per_second = bytes_per_second
+    self._clock = clock
+    self._sleep = sleep
+    self._available = float(bytes_per_second)
+    self._last = clock()
+    self._lock = threading.Lock()
+
+  def acquire(self, num_bytes: int):
+    """Blocks until `num_bytes` may be transferred."""
+    with self._lock:
+      now = self._clock()
+      self._available = min(
+          float(self._bytes_per_second),
+          self._available + (now - self._last) * self._bytes_per_second,
+      )
+      self._last = now
+      self._available -= num_bytes
+      wait_secs = max(0.0, -self._available / self._bytes_per_second)
+    if wait_secs > 0:
+      self._sleep(wait_secs)
+
+
+def copy_file(
+    src: epath.Path,
+    dst: epath.Path,
+    *,
+    rate_limiter: Optional[RateLimiter] = None,
+    chunk_bytes: int = _DEFAULT_CHUNK_BYTES,
+) -> int:
+  """Copies `src` to `dst`, unless already copied.
+
+  The file is written under a temporary name and renamed once complete, so
+  that a file present at `dst` is always complete. Objects on GCS only become
+  visible once written, and are written to `dst` directly.
+
+  Args:
+    src: The file to copy.
+    dst: The destination.
+    rate_limiter: If provided, limits the rate at which bytes are copied.
+    chunk_bytes: The number of bytes read and written at a time.
+
+  Returns:
+    The number of bytes copied, which is 0 if `dst` already held a file of the
+    same size.
+  """
+  size = src.stat().length
+  if dst.exists():
+    if dst.stat().length == size:
+      return 0
+    dst.unlink()
+  if step_lib.is_gcs_path(dst):
+    tmp_dst = dst
+  else:
+    tmp_dst = dst.parent / f'{dst.name}{_PARTIAL_FILE_SUFFIX}'
+  with src.open('rb') as reader, tmp_dst.open('wb') as writer:
+    while chunk := reader.read(chunk_bytes):
+      if rate_limiter is not None:
+        rate_limiter.acquire(len(chunk))
+      writer.write(chunk)
+  if tmp_dst != dst:
+    tmp_dst.rename(dst)
+  return size
+
+
+def copy_tree(
+    src: epath.Path,
+    dst: epath.Path,
+    *,
+    rate_limiter: Optional[RateLimiter] = None,
+    chunk_bytes: int = _DEFAULT_CHUNK_BYTES,
+) -> int:
+  """Copies the files under `src` to `dst` with `copy_file`.
+
+  Args:
+    src: The directory to copy.
+    dst: The destination.
+    rate_limiter: If provided, limits the rate at which bytes are copied.
+    chunk_bytes: The number of bytes read and written at a time.
+
+  Returns:
+    The number of bytes copied.
+  """
+  dst.mkdir(parents=True, exist_ok=True)
+  copied = 0
+  for path in sorted(src.iterdir()):
+    if path.is_dir():
+      copied += copy_tree(
+          path,
+          dst / path.name,
+          rate_limiter=rate_limiter,
+          chunk_bytes=chunk_bytes,
+      )
+    else:
+      copied += copy_file(
+          path,
+          dst / path.name,
+          rate_limiter=rate_limiter,
+          chunk_bytes=chunk_bytes,
+      )
+  return copied
+
+
+def _link_tree(src: epath.Path, dst: epath.Path):
+  """Hard links the files under `src` to `dst`, copying if not supported."""
+  dst.mkdir(parents=True, exist_ok=True)
+  for path in src.iterdir():
+    if path.is_dir():
+      _link_tree(path, dst / path.name)
+    else:
+      try:
+        os.link(os.fspath(path), os.fspath(dst / path.name))
+      except OSError:
+        path.copy(dst / path.name)
+
+
+def upload_directory(final_path: epath.Path) -> epath.Path:
+  """Returns the directory to which the checkpoint at `final_path` uploads.
+
+  The name is deterministic, so that all processes, including after a restart,
+  upload to the same directory. As with checkpoints saved directly, it is
+  temporary, except on GCS, where a checkpoint is finalized by a commit file.
+
+  Args:
+    final_path: The path of the finalized persistent checkpoint.
+  """
+  if step_lib.is_gcs_path(final_path):
+    return final_path
+  return final_path.parent / (
+      f'{final_path.name}{step_lib.TMP_DIR_SUFFIX}{_UPLOAD_SUFFIX}'
+  )
+
+
+def interrupted_uploads(
+    persistent_directory: epath.Path,
+    step_name_format: step_lib.NameFormat[step_lib.Metadata],
+) -> List[int]:
+  """Returns the steps whose upload was interrupted, in increasing order."""
+  suffix = f'{step_lib.TMP_DIR_SUFFIX}{_UPLOAD_SUFFIX}'
+  steps = []
+  for path in persistent_directory.iterdir():
+    name = path.name.removesuffix(suffix)
+    if name == path.name and not step_lib.is_gcs_path(path):
+      continue
+    if not step_lib.is_tmp_checkpoint(path):
+      continue
+    try:
+      step = step_lib.step_from_checkpoint_name(name)
+    except ValueError:
+      continue
+    final_path = step_lib.build_step_path(
+        persistent_directory, step_name_format, step
+    )
+    if upload_directory(final_path) == path:
+      steps.append(step)
+  return sorted(steps)
+
+
+class LocalCheckpointUploader:
+  """Uploads finalized local checkpoints to persistent storage.
+
+  Uploads run one at a time, in the order of `upload` calls, in a background
+  thread. Each of `processes` uploads its per-process OCDBT subdirectory, and
+  `primary_host` additionally uploads the files shared by all processes, then
+  merges the subdirectories and finalizes the persistent checkpoint. Each
+  process publishes the outcome of its upload to the JAX distributed key-value
+  store, so that `primary_host` stops waiting as soon as one of them fails.
+
+  A snapshot of the local checkpoint is taken by hard links when `upload` is
+  called, or as soon as the local checkpoint is finalized if it is not yet,
+  rather than when previous uploads are done. The local checkpoint may then be
+  garbage collected by the local checkpoint manager while queued or uploading.
+  """
+
+  def __init__(
+      self,
+      local_directory: epath.PathLike,
+      persistent_directory: epath.PathLike,
+      *,
+      step_name_format: step_lib.NameFormat[step_lib.Metadata],
+      local_item_name: str,
+      persistent_item_name: str,
+      processes: Set[int],
+      primary_host: int,
+      bytes_per_second: Optional[int] = None,
+      max_to_keep: Optional[int] = None,
+      timeout_secs: int = 600,
+  ):
+    """Constructor.
+
+    Args:
+      local_directory: The directory of local checkpoints.
+      persistent_directory: The directory of persistent checkpoints.
+      step_name_format: NameFormat of steps in both directories.
+      local_item_name: The name of the item in local checkpoints.
+      persistent_item_name: The name of the item in persistent checkpoints.
+      processes: The processes of the slice whose local checkpoints are
+        uploaded.
+      primary_host: The process among `processes` which finalizes uploads.
+      bytes_per_second: If provided, the maximum rate at which each process
+        uploads.
+      max_to_keep: If provided, the maximum number of persistent checkpoints to
+        keep after an upload. Older checkpoints are removed.
+      timeout_secs: The timeout to wait for the local checkpoint to be
+        finalized, and for the other processes to complete their upload. Since
+        uploads are rate limited, this should allow for uploading a whole
+        local checkpoint.
+    """
+    self._local_directory = epath.Path(local_directory)
+    self._persistent_directory = epath.Path(persistent_directory)
+    self._step_name_format = step_name_format
+    self._local_item_name = local_item_name
+    self._persistent_item_name = persistent_item_name
+    self._processes = processes
+    self._primary_host = primary_host
+    self._rate_limiter = (
+        None if bytes_per_second is None else RateLimiter(bytes_per_second)
+    )
+    self._max_to_keep = max_to_keep
+    self._timeout_secs = timeout_secs
+    self._executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix='local_checkpoint_upload'
+    )
+    # Waits for local checkpoints to be finalized and snapshots them, without
+    # waiting for previous uploads.
+    self._snapshot_executor = concurrent.futures.ThreadPoolExecutor(
+        max_workers=1, thread_name_prefix='local_checkpoint_snapshot'
+    )
+    self._futures: List[concurrent.futures.Future[None]] = []
+    self._lock = threading.Lock()
+    # Identifies uploads across processes, which make the same `upload` calls.
+    self._upload_counter = itertools.count()
+
+  def _local_path(self, step: int) -> epath.Path:
+    return step_lib.build_step_path(
+        self._local_directory, self._step_name_format, step
+    )
+
+  def _persistent_path(self, step: int) -> epath.Path:
+    return step_lib.build_step_path(
+        self._persistent_directory, self._step_name_format, step
+    )
+
+  def upload(self, step: int):
+    """Uploads the local checkpoint of `step` in the background."""
+    if self._local_path(step).exists():
+      snapshot = concurrent.futures.Future()
+      try:
+        snapshot.set_result(self._snapshot(step))
+      except Exception as e:  # pylint: disable=broad-exception-caught
+        snapshot.set_exception(e)
+    else:
+      snapshot = self._snapshot_executor.submit(self._snapshot, step)
+    counter = next(self._upload_counter)
+    with self._lock:
+      self._futures.append(
+          self._executor.submit(self._upload, step, counter, snapshot)
+      )
+
+  def _wait_for_local_checkpoint(self, step: int) -> epath.Path:
+    local_path = self._local_path(step)
+    deadline = time.monotonic() + self._timeout_secs
+    while not local_path.exists():
+      if time.monotonic() > deadline:
+        raise TimeoutError(
+            f'Local checkpoint {local_path} was not finalized within'
+            f' {self._timeout_secs} seconds.'
+        )
+      time.sleep(_POLL_INTERVAL_SECS)
+    return local_path
+
+  def _snapshot(self, step: int) -> epath.Path:
+    """Hard links the finalized local checkpoint of `step` to a snapshot."""
+    local_path = self._wait_for_local_checkpoint(step)
+    snapshot_path = local_path.parent / (
+        f'{local_path.name}{step_lib.TMP_DIR_SUFFIX}{_UPLOAD_SUFFIX}'
+    )
+    if snapshot_path.exists():
+      snapshot_path.rmtree()
+    _link_tree(local_path, snapshot_path)
+    return snapshot_path
+
+  def _status_key(self, step: int, counter: int, process_index: int) -> str:
+    return multihost._unique_barrier_key(  # pylint: disable=protected-access
+        multihost.unique_barrier_key(
+            'LocalCheckpointUploader:status',
+            prefix='emergency_checkpoint_manager',
+            suffix=f'{step}_{counter}_{process_index}',
+        )
+    )
+
+  def _upload(
+      self,
+      step: int,
+      counter: int,
+      snapshot: concurrent.futures.Future[epath.Path],
+  ):
+    """Uploads the local checkpoint of `step`, and finalizes it if primary."""
+    process_index = multihost.process_index()
+    sync = not multihost.should_skip_process_sync(self._processes)
+    final_path = self._persistent_path(step)
+    upload_path = upload_directory(final_path)
+    try:
+      snapshot_path = snapshot.result()
+      try:
+        local_metadata = self._copy(step, snapshot_path, upload_path)
+      finally:
+        snapshot_path.rmtree()
+    except Exception as e:
+      if sync and process_index != self._primary_host:
+        multihost.get_jax_distributed_client().key_value_set(
+            self._status_key(step, counter, process_index),
+            f'{type(e).__name__}: {e}',
+        )
+      raise
+
+    if process_index != self._primary_host:
+      if sync:
+        multihost.get_jax_distributed_client().key_value_set(
+            self._status_key(step, counter, process_index), _UPLOAD_SUCCEEDED
+        )
+      return
+    if sync:
+      self._wait_for_other_processes(step, counter)
+    self._finalize(step, upload_path, final_path, local_metadata)
+
+  def _copy(
+      self, step: int, snapshot_path: epath.Path, upload_path: epath.Path
+  ) -> Optional[checkpoint_metadata.SerializedMetadata]:
+    """Copies a snapshot to `upload_path`, and returns its step metadata."""
+    process_index = multihost.process_index()
+    start = time.time()
+    local_item = snapshot_path / self._local_item_name
+    persistent_item = upload_path / self._persistent_item_name
+    persistent_item.mkdir(parents=True, exist_ok=True)
+    copied = 0
+    for path in sorted(local_item.iterdir()):
+      if path.name.startswith(ts_utils.PROCESS_SUBDIR_PREFIX):
+        copied += copy_tree(
+            path,
+            persistent_item / path.name,
+            rate_limiter=self._rate_limiter,
+        )
+      elif (
+          process_index == self._primary_host
+          and path.name not in _MERGED_OCDBT_ENTRIES
+      ):
+        if path.is_dir():
+          copied += copy_tree(
+              path,
+              persistent_item / path.name,
+              rate_limiter=self._rate_limiter,
+          )
+        else:
+          copied += copy_file(
+              path,
+              persistent_item / path.name,
+              rate_limiter=self._rate_limiter,
+          )
+    logging.info(
+        '[process=%s] Uploaded %d bytes of local checkpoint %s to %s in'
+        ' %.2f seconds.',
+        process_index,
+        copied,
+        self._local_path(step),
+        upload_path,
+        time.time() - start,
+    )
+    return checkpoint_metadata.metadata_store(enable_write=False).read(
+        checkpoint_metadata.step_metadata_file_path(snapshot_path)
+    )
+
+  def _wait_for_other_processes(self, step: int, counter: int):
+    """Waits for the other processes to upload `step`, raising if one fails."""
+    client = multihost.get_jax_distributed_client()
+    deadline = time.monotonic() + self._timeout_secs
+    for process_index in sorted(self._processes - {self._primary_host}):
+      timeout_ms = max(int((deadline - time.monotonic()) * 1000), 1)
+      try:
+        status = client.blocking_key_value_get(
+            self._status_key(step, counter, process_index), timeout_ms
+        )
+      except Exception as e:
+        raise TimeoutError(
+            f'Process {process_index} did not report uploading step {step}'
+            f' within {self._timeout_secs} seconds.'
+        ) from e
+      if status != _UPLOAD_SUCCEEDED:
+        raise RuntimeError(
+            f'Process {process_index} failed to upload step {step}: {status}'
+        )
+
+  def _finalize(
+      self,
+      step: int,
+      upload_path: epath.Path,
+      final_path: epath.Path,
+      local_metadata: Optional[checkpoint_metadata.SerializedMetadata],
+  ):
+    """Merges the uploaded subdirectories and finalizes the checkpoint."""
+    asyncio_utils.run_sync(
+        type_handlers.merge_ocdbt_per_process_files(
+            upload_path / self._persistent_item_name,
+            ts_context=ts_utils.get_ts_context(use_ocdbt=True),
+            use_zarr3=True,
+        )
+    )
+    metadata = dict(local_metadata or {})
+    item_handlers = metadata.get('item_handlers') or {}
+    metadata['item_handlers'] = {
+        self._persistent_item_name: item_handlers.get(self._local_item_name)
+    }
+    metadata_store = checkpoint_metadata.metadata_store(
+        enable_write=True, blocking_write=True
+    )
+    metadata_store.write(
+        checkpoint_metadata.step_metadata_file_path(upload_path), metadata
+    )
+    atomicity_defaults.get_default_temporary_path_class(final_path)(
+        upload_path, final_path, checkpoint_metadata_store=metadata_store
+    ).finalize()
+    ts_utils.invalidate_open_handle_caches(final_path)
+    logging.info('Finalized persistent checkpoint %s.', final_path)
+    self._remove_old_checkpoints()
+
+  def _remove_old_checkpoints(self):
+    """Removes the oldest persistent checkpoints beyond `max_to_keep`.
+
+    Checkpoint managers of the persistent directory do not track these
+    removals, and must re-read its steps.
+    """
+    if self._max_to_keep is None:
+      return
+    steps = sorted(step_lib.checkpoint_steps(self._persistent_directory))
+    for step in steps[: max(len(steps) - self._max_to_keep, 0)]:
+      path = self._step_name_format.find_step(
+          self._persistent_directory, step
+      ).path
+      logging.info('Deleting persistent checkpoint: %s.', path)
+      ts_utils.invalidate_open_handle_caches(path)
+      path.rmtree()
+
+  def check_for_errors(self):
+    """Raises the error of the first failed upload, if any."""
+    with self._lock:
+      done = [f for f in self._futures if f.done()]
+      self._futures = [f for f in self._futures if not f.done()]
+    for future in done:
+      future.result()
+
+  def wait_until_finished(self):
+    """Blocks until all uploads complete, raising the first error, if any."""
+    with self._lock:
+      futures, self._futures = self._futures, []
+    concurrent.futures.wait(futures)
+    for future in futures:
+      future.result()
+
+  def close(self):
+    """Waits for outstanding uploads, then releases the background thread."""
+    try:
+      self.wait_until_finished()
+    finally:
+      self._executor.shutdown()
+      self._snapshot_executor.shutdown()
@@ -0,0 +1,318 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Tests for persistent_upload module."""
+
+import threading
+from unittest import mock
+
+from absl.testing import absltest
+from etils import epath
+import jax
+import numpy as np
+from orbax.checkpoint import args as args_lib
+from orbax.checkpoint import checkpoint_manager
+from orbax.checkpoint._src.handlers import pytree_checkpoint_handler
+from orbax.checkpoint._src.multihost import multihost
+from orbax.checkpoint._src.path import step as step_lib
+from orbax.checkpoint.experimental.emergency import persistent_upload
+
+
+def _checkpoint_manager(
+    directory: epath.Path, item_name: str
+) -> checkpoint_manager.CheckpointManager:
+  return checkpoint_manager.CheckpointManager(
+      directory,
+      options=checkpoint_manager.CheckpointManagerOptions(
+          enable_async_checkpointing=False, save_root_metadata=False
+      ),
+      item_handlers={
+          item_name: pytree_checkpoint_handler.PyTreeCheckpointHandler(
+              use_ocdbt=True, use_zarr3=True
+          )
+      },
+  )
+
+
+class _FakeClock:
+
+  def __init__(self):
+    self.now = 0.0
+    self.sleeps = []
+
+  def __call__(self) -> float:
+    return self.now
+
+  def sleep(self, secs: float):
+    self.sleeps.append(secs)
+    self.now += secs
+
+
+class _FakeKeyValueStore:
+  """Stands in for the key-value store of the JAX distributed client."""
+
+  def __init__(self):
+    self._values = {}
+    self._condition = threading.Condition()
+
+  def key_value_set(self, key: str, value: str):
+    with self._condition:
+      self._values[key] = value
+      self._condition.notify_all()
+
+  def blocking_key_value_get(self, key: str, timeout_in_ms: int) -> str:
+    with self._condition:
+      if not self._condition.wait_for(
+          lambda: key in self._values, timeout_in_ms / 1000
+      ):
+        raise RuntimeError(f'DEADLINE_EXCEEDED: {key}')
+      return self._values[key]
+
+
+class RateLimiterTest(absltest.TestCase):
+
+  def test_acquire(self):
+    clock = _FakeClock()
+    limiter = persistent_upload.RateLimiter(
+        100, clock=clock, sleep=clock.sleep
+    )
+    # Bursts up to one second worth of bytes.
+    limiter.acquire(100)
+    self.assertEqual(clock.sleeps, [])
+    limiter.acquire(50)
+    self.assertEqual(clock.sleeps, [0.5])
+    clock.now += 10
+    limiter.acquire(250)
+    self.assertEqual(clock.sleeps, [0.5, 1.5])
+
+  def test_invalid_rate(self):
+    with self.assertRaises(ValueError):
+      persistent_upload.RateLimiter(0)
+
+
+class CopyTest(absltest.TestCase):
+
+  def test_copy_tree_skips_copied_files(self):
+    root = epath.Path(self.create_tempdir().full_path)
+    (root / 'src' / 'd').mkdir(parents=True)
+    (root / 'src' / 'd' / 'a').write_text('aaaa')
+    (root / 'src' / 'b').write_text('bb')
+    (root / 'dst' / 'd').mkdir(parents=True)
+    (root / 'dst' / 'd' / 'a').write_text('aaaa')
+    # Left behind by an interrupted copy.
+    (root / 'dst' / 'b.partial').write_text('b')
+
+    copied = persistent_upload.copy_tree(
+        root / 'src', root / 'dst', chunk_bytes=1
+    )
+
+    self.assertEqual(copied, 2)
+    self.assertEqual((root / 'dst' / 'b').read_text(), 'bb')
+    self.assertFalse((root / 'dst' / 'b.partial').exists())
+    self.assertEqual(
+        persistent_upload.copy_tree(root / 'src', root / 'dst'), 0
+    )
+
+
+class LocalCheckpointUploaderTest(absltest.TestCase):
+
+  def setUp(self):
+    super().setUp()
+    root = epath.Path(self.create_tempdir().full_path)
+    self.local_directory = root / 'local'
+    self.persistent_directory = root / 'persistent'
+    self.local_directory.mkdir()
+    self.persistent_directory.mkdir()
+    self.state = {
+        'a': jax.numpy.arange(16.0),
+        'b': {'c': jax.numpy.ones((4, 2), dtype=np.int32)},
+    }
+
+  def _save_local(self, step: int):
+    with _checkpoint_manager(self.local_directory, 'state') as mngr:
+      mngr.save(
+          step,
+          args=args_lib.Composite(state=args_lib.PyTreeSave(self.state)),
+      )
+
+  def _uploader(self, **kwargs) -> persistent_upload.LocalCheckpointUploader:
+    kwargs = {'processes': {0}, 'primary_host': 0, 'timeout_secs': 10} | kwargs
+    uploader = persistent_upload.LocalCheckpointUploader(
+        self.local_directory,
+        self.persistent_directory,
+        step_name_format=step_lib.standard_name_format(),
+        local_item_name='state',
+        persistent_item_name='default',
+        bytes_per_second=2**30,
+        **kwargs,
+    )
+    self.addCleanup(uploader.close)
+    return uploader
+
+  def _interrupted_uploads(self):
+    return persistent_upload.interrupted_uploads(
+        self.persistent_directory, step_lib.standard_name_format()
+    )
+
+  def _assert_restores(self, step: int):
+    with _checkpoint_manager(self.persistent_directory, 'default') as mngr:
+      restored = mngr.restore(
+          step,
+          args=args_lib.Composite(default=args_lib.PyTreeRestore(self.state)),
+      ).default
+      self.assertEqual(
+          mngr.metadata(step).item_handlers,
+          {
+              'default': (
+                  'orbax.checkpoint._src.handlers.pytree_checkpoint_handler'
+                  '.PyTreeCheckpointHandler'
+              )
+          },
+      )
+    jax.tree.map(np.testing.assert_array_equal, restored, self.state)
+
+  def test_upload(self):
+    uploader = self._uploader()
+    uploader.upload(1)
+    # The upload waits for the local checkpoint to be finalized.
+    self._save_local(1)
+    uploader.wait_until_finished()
+
+    self.assertEqual(step_lib.checkpoint_steps(self.persistent_directory), [1])
+    self._assert_restores(1)
+    self.assertEqual(step_lib.tmp_checkpoints(self.local_directory), [])
+    self.assertEqual(self._interrupted_uploads(), [])
+
+  def test_upload_snapshots_local_checkpoint(self):
+    uploader = self._uploader()
+    for step in range(2):
+      self._save_local(step)
+      uploader.upload(step)
+      # The local checkpoint may be garbage collected once `upload` returns,
+      # even if the upload is queued.
+      (self.local_directory / str(step)).rmtree()
+    uploader.wait_until_finished()
+
+    self.assertEqual(
+        sorted(step_lib.checkpoint_steps(self.persistent_directory)), [0, 1]
+    )
+    self._assert_restores(0)
+    self._assert_restores(1)
+    self.assertEqual(step_lib.tmp_checkpoints(self.local_directory), [])
+
+  def test_resume_interrupted_upload(self):
+    self._save_local(2)
+    upload_path = persistent_upload.upload_directory(
+        self.persistent_directory / '2'
+    )
+    (upload_path / 'default').mkdir(parents=True)
+    (upload_path / 'default' / '_METADATA').write_text('partial')
+    uploader = self._uploader()
+    self.assertEqual(self._interrupted_uploads(), [2])
+
+    uploader.upload(2)
+    uploader.wait_until_finished()
+    self._assert_restores(2)
+    self.assertEqual(self._interrupted_uploads(), [])
+
+  def test_max_to_keep(self):
+    uploader = self._uploader(max_to_keep=2)
+    for step in range(3):
+      self._save_local(step)
+      uploader.upload(step)
+    uploader.wait_until_finished()
+    self.assertEqual(
+        sorted(step_lib.checkpoint_steps(self.persistent_directory)), [1, 2]
+    )
+
+  def _upload_as_primary_of_two_processes(
+      self, store: _FakeKeyValueStore, **kwargs
+  ):
+    """Uploads step 1 as the primary of processes 0 and 1."""
+    uploader = self._uploader(processes={0, 1}, **kwargs)
+    self._save_local(1)
+    with mock.patch.object(
+        multihost, 'should_skip_process_sync', return_value=False
+    ), mock.patch.object(
+        multihost, 'get_jax_distributed_client', return_value=store
+    ):
+      uploader.upload(1)
+      uploader.wait_until_finished()
+
+  def test_waits_for_other_processes(self):
+    store = _FakeKeyValueStore()
+    threading.Timer(
+        0.5,
+        store.key_value_set,
+        args=(
+            'emergency_checkpoint_manager_LocalCheckpointUploader:status.1_0_1',
+            'ok',
+        ),
+    ).start()
+    self._upload_as_primary_of_two_processes(store)
+    self._assert_restores(1)
+
+  def test_other_process_fails(self):
+    store = _FakeKeyValueStore()
+    store.key_value_set(
+        'emergency_checkpoint_manager_LocalCheckpointUploader:status.1_0_1',
+        'OSError: disk full',
+    )
+    with self.assertRaisesRegex(
+        RuntimeError, 'Process 1 failed to upload step 1: OSError: disk full'
+    ):
+      self._upload_as_primary_of_two_processes(store)
+    self.assertEqual(step_lib.checkpoint_steps(self.persistent_directory), [])
+
+  def test_other_process_times_out(self):
+    with self.assertRaisesRegex(
+        TimeoutError, 'Process 1 did not report uploading step 1'
+    ):
+      self._upload_as_primary_of_two_processes(
+          _FakeKeyValueStore(), timeout_secs=1
+      )
+    self.assertEqual(step_lib.checkpoint_steps(self.persistent_directory), [])
+
+  def test_publishes_failure(self):
+    store = _FakeKeyValueStore()
+    uploader = self._uploader(
+        processes={0, 1}, primary_host=1, timeout_secs=0
+    )
+    with mock.patch.object(
+        multihost, 'should_skip_process_sync', return_value=False
+    ), mock.patch.object(
+        multihost, 'get_jax_distributed_client', return_value=store
+    ):
+      uploader.upload(3)
+      with self.assertRaises(TimeoutError):
+        uploader.wait_until_finished()
+    self.assertStartsWith(
+        store.blocking_key_value_get(
+            'emergency_checkpoint_manager_LocalCheckpointUploader:status.3_0_0',
+            0,
+        ),
+        'TimeoutError: Local checkpoint',
+    )
+
+  def test_missing_local_checkpoint(self):
+    uploader = self._uploader()
+    uploader._timeout_secs = 0
+    uploader.upload(3)
+    with self.assertRaises(TimeoutError):
+      uploader.wait_until_finished()
+    uploader.check_for_errors()
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -210,23 +210,18 @@ class PyTreeHandler(CheckpointableHandler[PyTree, PyTree]):
         directory, commit_futures=commit_futures, operation_id=operation_id
     )
 
-  async def _background_load(
-      self,
-      directory: path_types.Path,
-      abstract_checkpointable: PyTree | None = None,
-  ) -> PyTree:
-    return self._handler_impl.restore(
-        directory,
-        args=create_v0_restore_args(self._context, abstract_checkpointable),
-    )
-
   async def load(
       self,
       directory: path_types.Path,
       abstract_checkpointable: PyTree | None = None,
   ) -> Awaitable[PyTree]:
     # TODO(b/406252214): Add validation for PyTrees and abstract PyTrees.
-    return self._background_load(directory, abstract_checkpointable)
+    # Metadata is read and validated here, while the values are read and
+    # transferred to device when awaiting the result.
+    return await self._handler_impl.async_restore(
+        directory,
+        args=create_v0_restore_args(self._context, abstract_checkpointable),
+    )
 
   async def metadata(
       self, directory: path_types.Path
@@ -14,15 +14,20 @@
 
 """Defines free-function interface for loading."""
 
-from typing import Any
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Iterator
 
 from etils import epath
+from orbax.checkpoint._src import asyncio_utils
 from orbax.checkpoint._src.checkpointers import async_checkpointer
 from orbax.checkpoint._src.handlers import composite_checkpoint_handler
 from orbax.checkpoint._src.handlers import handler_registration as legacy_handler_registration
 from orbax.checkpoint.experimental.v1._src.context import context as context_lib
 from orbax.checkpoint.experimental.v1._src.handlers import compatibility as handler_compatibility
 from orbax.checkpoint.experimental.v1._src.handlers import composite_handler
+from orbax.checkpoint.experimental.v1._src.handlers import types as handler_types
 import orbax.checkpoint.experimental.v1._src.handlers.global_registration  # pylint: disable=unused-import
 from orbax.checkpoint.experimental.v1._src.metadata import types as metadata_types
 from orbax.checkpoint.experimental.v1._src.path import format_utils
@@ -159,15 +164,120 @@ def load_checkpointables(
   return {k: v for k, v in zip(restored.keys(), restored.values())}
 
 
+class _LoadResponse(async_types.AsyncResponse[dict[str, Any]]):
+  """An `AsyncResponse` representing the result of `load_checkpointables_async`.
+
+  Checkpointables are loaded concurrently in a background thread, each
+  resolving its own future, so that a checkpointable can be obtained with
+  `checkpointable_result` as soon as it is loaded, or with `as_completed` in
+  the order in which loading completes.
+  """
+
+  def __init__(self, load_awaitables: dict[str, Awaitable[Any]]):
+    self._futures = {
+        name: concurrent.futures.Future() for name in load_awaitables
+    }
+    self._thread = threading.Thread(
+        target=self._run, args=(load_awaitables,), name='load_checkpointables'
+    )
+    self._thread.start()
+
+  def _run(self, load_awaitables: dict[str, Awaitable[Any]]):
+    async def _load(name: str, load_awaitable: Awaitable[Any]):
+      future = self._futures[name]
+      try:
+        future.set_result(await load_awaitable)
+      except BaseException as e:  # pylint: disable=broad-exception-caught
+        future.set_exception(e)
+
+    async def _load_all():
+      await asyncio.gather(
+          *(_load(name, a) for name, a in load_awaitables.items())
+      )
+
+    asyncio.run(_load_all())
+
+  def checkpointable_result(self, name: str, timeout: float | None = None):
+    """Blocks until the checkpointable `name` is loaded and returns it."""
+    if name not in self._futures:
+      raise KeyError(
+          f'Checkpointable "{name}" is not being loaded. Available:'
+          f' {list(self._futures.keys())}.'
+      )
+    return self._futures[name].result(timeout=timeout)
+
+  def as_completed(
+      self, timeout: float | None = None
+  ) -> Iterator[tuple[str, Any]]:
+    """Yields (name, checkpointable) pairs as each checkpointable is loaded."""
+    names = {future: name for name, future in self._futures.items()}
+    for future in concurrent.futures.as_completed(names, timeout=timeout):
+      yield names[future], future.result()
+
+  def result(self, timeout: float | None = None) -> dict[str, Any]:
+    _, not_done = concurrent.futures.wait(
+        self._futures.values(), timeout=timeout
+    )
+    if not_done:
+      raise TimeoutError(
+          f'Loading checkpointables did not complete within {timeout} seconds.'
+      )
+    return {name: future.result() for name, future in self._futures.items()}
+
+
+class _PyTreeLoadResponse(
+    async_types.AsyncResponse[tree_types.PyTreeOf[tree_types.LeafType]]
+):
+  """An `AsyncResponse` representing the result of `load_pytree_async`."""
+
+  def __init__(self, response: _LoadResponse):
+    self._response = response
+
+  def result(
+      self, timeout: float | None = None
+  ) -> tree_types.PyTreeOf[tree_types.LeafType]:
+    return self._response.checkpointable_result(
+        PYTREE_CHECKPOINTABLE_KEY, timeout=timeout
+    )
+
+
 def load_pytree_async(
     directory: path_types.PathLike,
     abstract_pytree: (
         AbstractPyTree | CheckpointMetadata[AbstractPyTree] | None
     ) = None,
 ) -> async_types.AsyncResponse[tree_types.PyTreeOf[tree_types.LeafType]]:
-  """Loads a PyTree asynchronously. Not yet implemented."""
-  del directory, abstract_pytree
-  raise NotImplementedError('Asynchronous loading is not yet supported.')
+  """Loads a PyTree asynchronously.
+
+  Unlike `load_pytree`, this function returns once the checkpoint metadata has
+  been read and validated against `abstract_pytree`. Reading the arrays and
+  transferring them to device continue in a background thread, which allows
+  overlapping loading with other work, like compiling the model or warming up
+  the dataset. An `AsyncResponse` is returned that can be used to block until
+  loading is complete and obtain the PyTree (using `response.result()`).
+
+  See `load_pytree` for more details.
+
+  Args:
+    directory: The directory to load the checkpoint from. This directory must
+      contain a subdirectory named `pytree`.
+    abstract_pytree: Provides a tree structure for the checkpoint to be restored
+      into. May be omitted to load exactly as saved, but this is much more
+      brittle than providing the tree.
+
+  Returns:
+    An `AsyncResponse` resolving to the restored PyTree.
+  """
+  format_utils.validate_pytree_checkpoint(directory)
+  response = _load_checkpointables_async(
+      directory,
+      {
+          PYTREE_CHECKPOINTABLE_KEY: _standardize_abstract_checkpointables(
+              abstract_pytree
+          )
+      },
+  )
+  return _PyTreeLoadResponse(response)
 
 
 def load_checkpointables_async(
@@ -176,21 +286,69 @@ def load_checkpointables_async(
         dict[str, Any] | CheckpointMetadata[dict[str, Any]] | None
     ) = None,
 ) -> async_types.AsyncResponse[dict[str, Any]]:
-  """Loads a checkpointables asynchronously. Not yet implemented."""
-  del directory, abstract_checkpointables
-  raise NotImplementedError('Asynchronous loading is not yet supported.')
+  """Loads checkpointables asynchronously.
 
+  Unlike `load_checkpointables`, this function returns once the metadata of
+  each checkpointable has been read and validated. Loading then continues in a
+  background thread, where checkpointables are loaded concurrently. This allows
+  overlapping loading with other work, like compiling the model or warming up
+  the dataset.
 
-def get_v0_checkpointer_and_args(
+  An `AsyncResponse` is returned, on which `response.result()` blocks until all
+  checkpointables are loaded and returns them as a dictionary. Individual
+  checkpointables are available as soon as they are loaded, using
+  `response.checkpointable_result(name)`, or in the order in which loading
+  completes, using `for name, checkpointable in response.as_completed()`.
+
+  Unlike `load_checkpointables`, processes are not synchronized once loading
+  completes.
+
+  See `load_checkpointables` for more details.
+
+  Args:
+    directory: The directory to load the checkpoint from.
+    abstract_checkpointables: A dictionary of abstract checkpointables.
+      Dictionary keys represent the names of the checkpointables, while the
+      values are the abstract checkpointable objects themselves.
+
+  Returns:
+    An `AsyncResponse` resolving to a dictionary of checkpointables.
+  """
+  return _load_checkpointables_async(directory, abstract_checkpointables)
+
+
+def _load_checkpointables_async(
+    directory: path_types.PathLike,
+    abstract_checkpointables: (
+        dict[str, Any] | CheckpointMetadata[dict[str, Any]] | None
+    ),
+) -> _LoadResponse:
+  """Starts loading checkpointables, see `load_checkpointables_async`."""
+  directory = epath.Path(directory)
+  format_utils.validate_checkpoint(directory)
+  handlers, abstract_checkpointables = _get_loadable_handlers(
+      directory,
+      _standardize_abstract_checkpointables(abstract_checkpointables),
+      context=context_lib.get_context(),
+  )
+
+  async def _start_loads() -> list[Awaitable[Any]]:
+    return await asyncio.gather(*(
+        handlers[name].load(directory / name, abstract_checkpointable)
+        for name, abstract_checkpointable in abstract_checkpointables.items()
+    ))
+
+  load_awaitables = asyncio_utils.run_sync(_start_loads())
+  return _LoadResponse(dict(zip(abstract_checkpointables, load_awaitables)))
+
+
+def _get_loadable_handlers(
     directory: path_types.Path,
     abstract_checkpointables: dict[str, Any] | None,
     *,
     context: context_lib.Context,
-) -> tuple[
-    async_checkpointer.AsyncCheckpointer,
-    composite_checkpoint_handler.CompositeArgs,
-]:
-  """Construct V0 Checkpointer and Args for loading."""
+) -> tuple[dict[str, handler_types.CheckpointableHandler], dict[str, Any]]:
+  """Returns handlers and abstract checkpointables for loading."""
   abstract_checkpointables = abstract_checkpointables or {}
   if (
       provided_reserved_keys := abstract_checkpointables.keys()
@@ -212,6 +370,22 @@ def get_v0_checkpointer_and_args(
         if name not in format_utils.RESERVED_CHECKPOINTABLE_KEYS
         and (directory / name).exists()
     }
+  return handlers, abstract_checkpointables
+
+
+def get_v0_checkpointer_and_args(
+    directory: path_types.Path,
+    abstract_checkpointables: dict[str, Any] | None,
+    *,
+    context: context_lib.Context,
+) -> tuple[
+    async_checkpointer.AsyncCheckpointer,
+    composite_checkpoint_handler.CompositeArgs,
+]:
+  """Construct V0 Checkpointer and Args for loading."""
+  handlers, abstract_checkpointables = _get_loadable_handlers(
+      directory, abstract_checkpointables, context=context
+  )
 
   compatibility_handlers = {
       name: handler_compatibility.get_compatibility_handler(handler)
@@ -101,8 +101,12 @@ class SaveLoadTestBase:
         self.assertIsNone(ocp.save_pytree(*args, **kwargs))
 
     def load_and_wait(self, *args, use_async: bool, **kwargs):
-      del use_async
-      return ocp.load_pytree(*args, **kwargs)
+      if use_async:
+        response = ocp.load_pytree_async(*args, **kwargs)
+        self.assertIsNotNone(response)
+        return response.result()
+      else:
+        return ocp.load_pytree(*args, **kwargs)
 
     @parameterized.parameters((True,), (False,))
     def test_save_load_pytree(self, use_async):
@@ -158,6 +162,74 @@ class SaveLoadTestBase:
       )
       test_utils.assert_tree_equal(self, self.pytree, restored)
 
+    def test_load_pytree_async(self):
+      ocp.save_pytree(self.directory, self.pytree)
+      start_deserialize = threading.Event()
+      original_deserialize = serialization.async_deserialize
+
+      async def mock_deserialize(*args, **kwargs):
+        # Wait for explicit signal before proceeding.
+        await asyncio.to_thread(start_deserialize.wait)
+        return await original_deserialize(*args, **kwargs)
+
+      # Reading arrays does not start until receiving an explicit signal.
+      self.enter_context(
+          mock.patch.object(
+              serialization, 'async_deserialize', new=mock_deserialize
+          )
+      )
+
+      response = ocp.load_pytree_async(self.directory, self.abstract_pytree)
+      with self.assertRaises(TimeoutError):
+        response.result(timeout=0)
+      start_deserialize.set()
+
+      test_utils.assert_tree_equal(self, self.pytree, response.result())
+
+    def test_load_checkpointables_async(self):
+      checkpointables = {'pytree': self.pytree, 'other': {'a': 1}}
+      ocp.save_checkpointables(self.directory, checkpointables)
+      start_deserialize = threading.Event()
+      original_deserialize = serialization.async_deserialize
+
+      async def mock_deserialize(*args, **kwargs):
+        await asyncio.to_thread(start_deserialize.wait)
+        return await original_deserialize(*args, **kwargs)
+
+      self.enter_context(
+          mock.patch.object(
+              serialization, 'async_deserialize', new=mock_deserialize
+          )
+      )
+
+      response = ocp.load_checkpointables_async(
+          self.directory,
+          {'pytree': self.abstract_pytree, 'other': None},
+      )
+      # Checkpointables are available as soon as they are loaded.
+      self.assertEqual({'a': 1}, response.checkpointable_result('other'))
+      with self.assertRaises(TimeoutError):
+        response.checkpointable_result('pytree', timeout=0)
+      start_deserialize.set()
+
+      self.assertEqual(
+          ['other', 'pytree'], [name for name, _ in response.as_completed()]
+      )
+      loaded = response.result()
+      test_utils.assert_tree_equal(self, self.pytree, loaded['pytree'])
+      self.assertEqual({'a': 1}, loaded['other'])
+      with self.assertRaises(KeyError):
+        response.checkpointable_result('missing')
+
+    def test_load_async_raises_before_returning(self):
+      ocp.save_pytree(self.directory, self.pytree)
+      reference_item = self.abstract_pytree.copy()
+      del reference_item['b']
+      with self.assertRaisesRegex(
+          ValueError, 'User-provided restore item and on-disk value'
+      ):
+        ocp.load_pytree_async(self.directory, reference_item)
+
     @parameterized.parameters(
         (tuple([]),),
         (dict(),),
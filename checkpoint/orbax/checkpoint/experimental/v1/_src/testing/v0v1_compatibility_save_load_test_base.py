@@ -119,27 +119,22 @@ class CompatibilitySaveLoadTestBase:
           to_checkpointable_subdir,
       )
 
-      if load_async:
-        with self.assertRaises(NotImplementedError):
-          ocp.load_pytree_async(
-              self.directory,
-              self.abstract_pytree if with_abstract_pytree else None,
-          )
-      else:
-        with self.assertRaisesRegex(
-            FileNotFoundError, 'must contain a subdirectory named "pytree"'
-        ):
-          ocp.load_pytree(
-              self.directory,
-              self.abstract_pytree if with_abstract_pytree else None,
-          )
-        with self.assertRaisesRegex(
-            FileNotFoundError, 'must contain a subdirectory named "pytree"'
-        ):
-          ocp.load_pytree(
-              self.directory / checkpointable_name,
-              self.abstract_pytree if with_abstract_pytree else None,
-          )
+      # Validation errors are raised before asynchronous loading starts.
+      load_pytree = ocp.load_pytree_async if load_async else ocp.load_pytree
+      with self.assertRaisesRegex(
+          FileNotFoundError, 'must contain a subdirectory named "pytree"'
+      ):
+        load_pytree(
+            self.directory,
+            self.abstract_pytree if with_abstract_pytree else None,
+        )
+      with self.assertRaisesRegex(
+          FileNotFoundError, 'must contain a subdirectory named "pytree"'
+      ):
+        load_pytree(
+            self.directory / checkpointable_name,
+            self.abstract_pytree if with_abstract_pytree else None,
+        )
 
     @parameterized.product(
         checkpointable_name=['default', 'state'],
@@ -167,29 +162,26 @@ class CompatibilitySaveLoadTestBase:
           else None
       )
 
-      if load_async:
-        with self.assertRaises(NotImplementedError):
-          ocp.load_checkpointables_async(
-              self.directory, abstract_checkpointables
-          )
-      else:
-        with self.subTest('with_context'):
-          checkpointables_options = (
-              ocp.options.CheckpointablesOptions.create_with_handlers(
-                  **{checkpointable_name: ocp.handlers.PyTreeHandler}
-              )
-          )
-          with ocp.Context(checkpointables_options=checkpointables_options):
-            loaded = ocp.load_checkpointables(
-                self.directory, abstract_checkpointables
-            )
-            test_utils.assert_tree_equal(
-                self, self.pytree, loaded[checkpointable_name]
+      def load_checkpointables(*args):
+        if load_async:
+          return ocp.load_checkpointables_async(*args).result()
+        return ocp.load_checkpointables(*args)
+
+      with self.subTest('with_context'):
+        checkpointables_options = (
+            ocp.options.CheckpointablesOptions.create_with_handlers(
+                **{checkpointable_name: ocp.handlers.PyTreeHandler}
             )
-        with self.subTest('without_context'):
-          loaded = ocp.load_checkpointables(
+        )
+        with ocp.Context(checkpointables_options=checkpointables_options):
+          loaded = load_checkpointables(
               self.directory, abstract_checkpointables
           )
           test_utils.assert_tree_equal(
               self, self.pytree, loaded[checkpointable_name]
           )
+      with self.subTest('without_context'):
+        loaded = load_checkpointables(self.directory, abstract_checkpointables)
+        test_utils.assert_tree_equal(
+            self, self.pytree, loaded[checkpointable_name]
+        )
@@ -414,16 +414,46 @@ class Checkpointer(epy.ContextManager):
           tree_types.PyTreeOf[tree_types.AbstractLeafType] | None
       ) = None,
   ) -> async_types.AsyncResponse[tree_types.PyTreeOf[tree_types.LeafType]]:
-    """Not yet supported."""
-    raise NotImplementedError()
+    """Loads a PyTree checkpoint asynchronously at the given step.
+
+    This function behaves similarly to `ocp.load_pytree_async` (see
+    documentation).
+
+    Args:
+      step: The step number or `CheckpointMetadata` to load.
+      abstract_pytree: The abstract PyTree to load.
+
+    Returns:
+      An `AsyncResponse` resolving to the loaded PyTree.
+    """
+    step = self._resolve_existing_step(step)
+    return loading.load_pytree_async(
+        self.directory / self._step_name_format.build_name(step),
+        abstract_pytree,
+    )
 
   def load_checkpointables_async(
       self,
       step: int | CheckpointMetadata | None = None,
       abstract_checkpointables: dict[str, Any] | None = None,
   ) -> async_types.AsyncResponse[dict[str, Any]]:
-    """Loads a set of checkpointables asynchronously at the given step."""
-    raise NotImplementedError()
+    """Loads a set of checkpointables asynchronously at the given step.
+
+    This function behaves similarly to `ocp.load_checkpointables_async` (see
+    documentation).
+
+    Args:
+      step: The step number or `CheckpointMetadata` to load.
+      abstract_checkpointables: The abstract checkpointables to load.
+
+    Returns:
+      An `AsyncResponse` resolving to the loaded checkpointables.
+    """
+    step = self._resolve_existing_step(step)
+    return loading.load_checkpointables_async(
+        self.directory / self._step_name_format.build_name(step),
+        abstract_checkpointables,
+    )
 
   def pytree_metadata(
       self, step: int
@@ -20,6 +20,7 @@ from orbax.checkpoint._src.logging.abstract_logger import AbstractLogger
 from orbax.checkpoint._src.logging.composite_logger import CompositeLogger
 from orbax.checkpoint._src.logging.standard_logger import StandardLogger
 from orbax.checkpoint.logging import step_statistics
+from orbax.checkpoint.logging import tracing
 
 try:
   from orbax.checkpoint._src.logging.cloud_logger import CloudLogger
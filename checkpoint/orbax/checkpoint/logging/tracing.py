@@ -0,0 +1,31 @@
+# Copyright 2024 The Orbax Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Defines symbols for package orbax.checkpoint.logging.tracing."""
+
+# pylint: disable=g-importing-member, g-multiple-import, unused-import
+
+from orbax.checkpoint._src.logging.tracing import (
+    Span,
+    clear,
+    disable,
+    enable,
+    export_chrome_trace,
+    is_enabled,
+    record,
+    span,
+    spans,
+    to_chrome_trace,
+    traced,
+)
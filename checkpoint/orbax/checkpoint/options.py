@@ -26,12 +26,26 @@ class AsyncOptions:
   """Options used to configure async behavior.
 
   See `AsyncCheckpointer` for details.
+
+  max_in_flight_saves: Maximum number of saves whose commits run concurrently
+    in the background. A new save blocks until fewer saves are in flight.
+    Checkpoints are finalized in the order in which they were saved. Handlers
+    keeping per-save state until `finalize` must key it by save directory,
+    as `CompositeCheckpointHandler` does. `CheckpointManager` deletes the old
+    checkpoints chosen by a save, and updates its step index, only once that
+    save and all saves started before it are finalized.
+  max_in_flight_bytes: If provided, a new save also blocks while the host
+    memory held by in-flight saves, estimated from the arrays being saved,
+    would exceed this many bytes. A single save larger than this limit is
+    started once no other save is in flight.
   """
 
   timeout_secs: int = 600  # 10 minutes. Same as default in `AsyncCheckpointer`.
   barrier_sync_fn: Optional[multihost.BarrierSyncFn] = None
   post_finalization_callback: Optional[Callable[[], None]] = None
   create_directories_asynchronously: bool = True
+  max_in_flight_saves: int = 1
+  max_in_flight_bytes: Optional[int] = None
 
 
 @dataclasses.dataclass
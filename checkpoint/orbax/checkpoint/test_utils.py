@@ -691,8 +691,8 @@ class TestLimitInFlightBytes(serialization.LimitInFlightBytes):
     self.sleep_time = sleep_time
     self.completion_times = []
 
-  async def wait_for_bytes(self, requested_bytes: int):
-    await super().wait_for_bytes(requested_bytes)
+  async def wait_for_bytes(self, requested_bytes: int, *, priority: int = 0):
+    await super().wait_for_bytes(requested_bytes, priority=priority)
     await asyncio.sleep(self.sleep_time / 2)
 
   async def release_bytes(self, requested_bytes: int):